@@ -0,0 +1,20 @@
+-- ============================================
+-- Migration: Per-user achievement counters
+-- Created: 2026-10-16
+-- Description: One row per (user, requirement_type) holding the current
+--              value used for achievement thresholds. Maintained
+--              incrementally by AchievementService.record_event and
+--              rebuilt by AchievementService.check_achievements.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS user_achievement_counters (
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    requirement_type VARCHAR(30) NOT NULL,  -- matches achievements.requirement_type
+    value INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (user_id, requirement_type)
+);
+
+-- Threshold lookups go by requirement_type, then value
+CREATE INDEX IF NOT EXISTS idx_achievements_requirement
+ON achievements(requirement_type, requirement_value);
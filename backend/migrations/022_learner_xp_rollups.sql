@@ -0,0 +1,44 @@
+-- ============================================
+-- Migration: Materialized learner XP rollups for leaderboards
+-- Created: 2026-10-16
+-- Description: Per-learner XP per leaderboard period bucket, maintained by
+--              LevelService.add_xp, so XP leaderboards no longer aggregate
+--              xp_history on every request.
+--              - weekly:   bucket_start = Monday of the week (UTC)
+--              - monthly:  bucket_start = 1st of the month (UTC)
+--              - all_time: bucket_start = 1970-01-01, xp = user_xp.total_xp
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS learner_xp_rollups (
+    learner_id UUID NOT NULL REFERENCES public.learners(id) ON DELETE CASCADE,
+    period VARCHAR(10) NOT NULL,
+    bucket_start DATE NOT NULL,
+    xp INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (period, bucket_start, learner_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_learner_xp_rollups_rank
+ON learner_xp_rollups(period, bucket_start, xp DESC);
+
+-- Backfill weekly/monthly buckets from xp_history
+INSERT INTO learner_xp_rollups (learner_id, period, bucket_start, xp)
+SELECT learner_id, 'weekly', DATE_TRUNC('week', earned_at AT TIME ZONE 'UTC')::date, SUM(xp_amount)
+FROM xp_history
+WHERE learner_id IS NOT NULL
+GROUP BY learner_id, DATE_TRUNC('week', earned_at AT TIME ZONE 'UTC')::date
+ON CONFLICT (period, bucket_start, learner_id) DO UPDATE SET xp = EXCLUDED.xp, updated_at = NOW();
+
+INSERT INTO learner_xp_rollups (learner_id, period, bucket_start, xp)
+SELECT learner_id, 'monthly', DATE_TRUNC('month', earned_at AT TIME ZONE 'UTC')::date, SUM(xp_amount)
+FROM xp_history
+WHERE learner_id IS NOT NULL
+GROUP BY learner_id, DATE_TRUNC('month', earned_at AT TIME ZONE 'UTC')::date
+ON CONFLICT (period, bucket_start, learner_id) DO UPDATE SET xp = EXCLUDED.xp, updated_at = NOW();
+
+-- All-time bucket mirrors user_xp.total_xp
+INSERT INTO learner_xp_rollups (learner_id, period, bucket_start, xp)
+SELECT learner_id, 'all_time', DATE '1970-01-01', COALESCE(total_xp, 0)
+FROM user_xp
+WHERE learner_id IS NOT NULL
+ON CONFLICT (period, bucket_start, learner_id) DO UPDATE SET xp = EXCLUDED.xp, updated_at = NOW();
@@ -0,0 +1,18 @@
+-- ============================================
+-- Migration: Persisted learner streak state
+-- Created: 2026-10-16
+-- Description: Current/longest streak and last active date per learner,
+--              updated atomically by
+--              LearningVelocityService.record_activity_and_check_streak so
+--              streak reads are a single-row lookup instead of a 90-day
+--              DISTINCT scan. Populate existing learners with
+--              scripts/backfill_streaks.py --all.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS learner_streaks (
+    learner_id UUID PRIMARY KEY REFERENCES public.learners(id) ON DELETE CASCADE,
+    current_streak INT NOT NULL DEFAULT 0,       -- as of last_active_date
+    longest_streak INT NOT NULL DEFAULT 0,
+    last_active_date DATE,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
@@ -0,0 +1,52 @@
+"""
+Backfill Learner Streaks
+
+Rebuilds learner_streaks (migration 023) from learning_progress and
+fsrs_review_history activity dates. Safe to re-run: rows are upserted.
+
+Usage:
+    python -m scripts.backfill_streaks [--user-id USER_ID] [--all]
+"""
+
+import argparse
+import logging
+import sys
+from uuid import UUID
+
+# Add parent directory to path
+sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
+
+from src.database.postgres_connection import PostgresConnection
+from src.services.learning_velocity import LearningVelocityService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill learner streak state')
+    parser.add_argument('--user-id', type=str, help='Backfill learners of a specific user ID')
+    parser.add_argument('--all', action='store_true', help='Backfill all learners')
+
+    args = parser.parse_args()
+    if not args.user_id and not args.all:
+        parser.print_help()
+        sys.exit(1)
+
+    conn = PostgresConnection()
+    db = conn.get_session()
+
+    try:
+        user_id = UUID(args.user_id) if args.user_id else None
+        count = LearningVelocityService(db).backfill_streaks(user_id)
+        db.commit()
+        logger.info(f"Backfilled streaks for {count} learners")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Build Vocabulary Snapshot Script
+
+Compiles the V3 vocabulary.json into a memory-mapped binary snapshot
+(string table + fixed-width sense records + prebuilt byWord/byBand/byPos
+index groups + rank-sorted and trap-pool arrays). VocabularyStore maps the snapshot read-only when it is at
+least as new as the JSON, so uvicorn workers share its pages and skip the
+json.load at startup.
+
+Usage:
+  python scripts/build_vocabulary_snapshot.py
+  python scripts/build_vocabulary_snapshot.py --input data/vocabulary.json --output data/vocabulary.snapshot
+  python scripts/build_vocabulary_snapshot.py --verify
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.vocabulary_snapshot import (
+    VocabularySnapshot,
+    build_snapshot,
+    snapshot_path_for,
+)
+
+
+def verify_snapshot(data: dict, snapshot_path: Path) -> bool:
+    """Check every sense in the snapshot round-trips to the JSON data."""
+    snapshot = VocabularySnapshot.open(snapshot_path, cache_size=0)
+    try:
+        senses = data.get('senses', {})
+        if len(snapshot.senses) != len(senses):
+            print(f"  ✗ Sense count mismatch: {len(snapshot.senses)} != {len(senses)}")
+            return False
+        for sense_id, sense in senses.items():
+            if snapshot.senses.get(sense_id) != sense:
+                print(f"  ✗ Sense mismatch: {sense_id}")
+                return False
+        for band, ids in data.get('indices', {}).get('byBand', {}).items():
+            if snapshot.by_band.get(int(band), []) != [s for s in ids if s in senses]:
+                print(f"  ✗ byBand mismatch: {band}")
+                return False
+        print(f"  ✓ Verified {len(senses)} senses")
+        return True
+    finally:
+        snapshot.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile vocabulary.json into a binary snapshot')
+    parser.add_argument('--input', type=str, default='data/vocabulary.json',
+                        help='Input V3 vocabulary JSON (default: data/vocabulary.json)')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Output snapshot path (default: next to the input)')
+    parser.add_argument('--verify', action='store_true',
+                        help='Verify the snapshot round-trips every sense')
+    args = parser.parse_args()
+
+    input_path = Path(args.input)
+    if not input_path.exists():
+        print(f"❌ Input not found: {input_path}")
+        return 1
+    output_path = Path(args.output) if args.output else snapshot_path_for(input_path)
+
+    print(f"Loading {input_path}...")
+    with open(input_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    print(f"Building snapshot {output_path}...")
+    start = time.perf_counter()
+    stats = build_snapshot(data, output_path, source=input_path.name)
+    elapsed = time.perf_counter() - start
+    print(f"  Senses: {stats['senses']}")
+    print(f"  Lemmas: {stats['lemmas']}")
+    print(f"  Size: {stats['bytes'] / 1024 / 1024:.2f} MB")
+    print(f"  Built in {elapsed:.2f}s")
+
+    if args.verify and not verify_snapshot(data, output_path):
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
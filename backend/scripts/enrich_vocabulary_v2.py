@@ -63,6 +63,8 @@ from src.ai.translator import generate_translation
 from src.ai.example_gen import generate_example
 from src.ai.validator import validate_example, quick_validate_example
 from src.pipeline.status import get_status_manager, PipelineState
+from src.services.vocabulary_snapshot import build_snapshot, snapshot_path_for
+from src.services.edit_distance_index import EditDistanceIndex, levenshtein_distance
 
 
 @dataclass
@@ -363,25 +365,15 @@ class VocabularyPipelineV2:
     
     def _levenshtein_distance(self, s1: str, s2: str) -> int:
         """Calculate Levenshtein edit distance between two strings."""
-        if len(s1) < len(s2):
-            return self._levenshtein_distance(s2, s1)
-        
-        if len(s2) == 0:
-            return len(s1)
-        
-        previous_row = range(len(s2) + 1)
-        for i, c1 in enumerate(s1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-        
-        return previous_row[-1]
+        return levenshtein_distance(s1, s2)
     
-    def mine_confused_words(self, word: str, pos: str, all_words: Set[str]) -> List[Dict]:
+    def mine_confused_words(
+        self,
+        word: str,
+        pos: str,
+        all_words: Set[str],
+        index: Optional[EditDistanceIndex] = None
+    ) -> List[Dict]:
         """
         Find words that could be confused with the target word.
         
@@ -393,6 +385,7 @@ class VocabularyPipelineV2:
             word: Target word
             pos: Part of speech
             all_words: Set of all words in vocabulary (for Levenshtein matching)
+            index: Prebuilt EditDistanceIndex over all_words (built if omitted)
         
         Returns:
             List of {word, reason} dicts
@@ -408,38 +401,24 @@ class VocabularyPipelineV2:
                     confused.append({'word': confused_word, 'reason': reason})
                     seen_words.add(confused_word)
         
-        # 2. Find spelling-similar words via Levenshtein (limit to avoid explosion)
-        word_len = len(word)
-        candidates_checked = 0
-        max_candidates = 500  # Limit for performance
+        # 2. Find spelling-similar words via the edit-distance index
+        # (every match within distance 2, closest first)
+        if index is None:
+            index = EditDistanceIndex(all_words, max_distance=2)
         
-        for candidate in all_words:
-            if candidates_checked >= max_candidates:
-                break
-            
+        for candidate, distance in index.lookup(word_lower, max_distance=2):
             candidate_lower = candidate.lower()
             
             # Skip if same word or already found
             if candidate_lower in seen_words:
                 continue
             
-            # Only check words of similar length (optimization)
-            if abs(len(candidate) - word_len) > 2:
-                continue
-            
-            candidates_checked += 1
+            confused.append({'word': candidate, 'reason': 'spelling'})
+            seen_words.add(candidate_lower)
             
-            # Calculate edit distance
-            distance = self._levenshtein_distance(word_lower, candidate_lower)
-            
-            # Add if distance is 1-2 (very similar but not identical)
-            if 0 < distance <= 2:
-                confused.append({'word': candidate, 'reason': 'spelling'})
-                seen_words.add(candidate_lower)
-                
-                # Limit total confused words
-                if len(confused) >= 10:
-                    break
+            # Limit total confused words
+            if len(confused) >= 10:
+                break
         
         return confused
     
@@ -783,6 +762,7 @@ class VocabularyPipelineV2:
         
         # Mine CONFUSED_WITH relationships for each word
         print("  Mining CONFUSED_WITH relationships...")
+        edit_index = EditDistanceIndex(all_words, max_distance=2)
         word_confused_cache = {}
         for word in tqdm(all_words, desc="  Mining confused"):
             # Get primary sense to determine POS
@@ -793,7 +773,7 @@ class VocabularyPipelineV2:
             else:
                 pos = 'n'
             
-            confused = self.mine_confused_words(word, pos, all_words)
+            confused = self.mine_confused_words(word, pos, all_words, index=edit_index)
             
             # Convert word-level confused to sense-level
             confused_senses = []
@@ -973,6 +953,11 @@ class VocabularyPipelineV2:
         # Calculate file size
         size_mb = self.output_backend.stat().st_size / 1024 / 1024
         print(f"  File size: {size_mb:.2f} MB")
+        
+        # Compile the memory-mapped snapshot used by VocabularyStore
+        snapshot_path = snapshot_path_for(self.output_backend)
+        snapshot_stats = build_snapshot(output_data, snapshot_path, source=self.output_backend.name)
+        print(f"  Snapshot: {snapshot_path} ({snapshot_stats['bytes'] / 1024 / 1024:.2f} MB)")
     
     def save_report(self):
         """Save enrichment report."""
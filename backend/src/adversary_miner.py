@@ -10,6 +10,9 @@ Adapts V6.1 Schema:
 2. Uses attached Sense Skeletons to find Antonyms and Synonyms in WordNet.
 3. Checks if the target word exists in our Graph.
 4. Creates relationships if both words exist.
+
+WordNet lookups run in-process; the resulting pairs are written with
+UNWIND in batches instead of one MERGE round trip per pair.
 """
 
 import nltk
@@ -41,6 +44,29 @@ def get_semantic_targets(sense_id: str):
         "synonyms": list(synonyms)
     }
 
+WRITE_BATCH_SIZE = 1000
+
+
+def merge_relationships(session, rel_type: str, pairs):
+    """
+    MERGE (source)-[rel_type]->(target) for (source, target) word pairs.
+    
+    Pairs whose words are not both in the graph are skipped by the MATCH.
+    Returns the number of relationships matched or created.
+    """
+    created = 0
+    for start in range(0, len(pairs), WRITE_BATCH_SIZE):
+        batch = [{"source": s, "target": t} for s, t in pairs[start:start + WRITE_BATCH_SIZE]]
+        res = session.run(f"""
+            UNWIND $pairs AS pair
+            MATCH (source:Word {{name: pair.source}})
+            MATCH (target:Word {{name: pair.target}})
+            MERGE (source)-[r:{rel_type}]->(target)
+            RETURN count(r) as created
+        """, pairs=batch)
+        created += res.single()["created"]
+    return created
+
 def run_adversary_miner(conn: Neo4jConnection):
     print("😈 Starting Adversary Mining (WordNet Edition)...")
     
@@ -54,43 +80,30 @@ def run_adversary_miner(conn: Neo4jConnection):
         records = list(result)
         print(f"Scanning {len(records)} words for relationships...")
         
-        rel_counts = {"OPPOSITE_TO": 0, "RELATED_TO": 0}
-        
+        # 2. Collect candidate pairs from WordNet (no graph access)
+        opposite_pairs = []
+        related_pairs = []
         for rec in records:
             source_word = rec["word"]
-            sense_ids = rec["sense_ids"]
             
-            for sid in sense_ids:
+            for sid in rec["sense_ids"]:
                 targets = get_semantic_targets(sid)
                 
-                # 1. Antonyms (OPPOSITE_TO)
+                # Antonyms (OPPOSITE_TO)
                 for target_word in targets["antonyms"]:
-                    if target_word == source_word: continue
-                    
-                    # Cypher: Only create if target word exists in our graph
-                    res = session.run("""
-                        MATCH (source:Word {name: $source})
-                        MATCH (target:Word {name: $target})
-                        MERGE (source)-[r:OPPOSITE_TO]->(target)
-                        RETURN count(r) as created
-                    """, source=source_word, target=target_word)
-                    
-                    if res.peek():
-                        rel_counts["OPPOSITE_TO"] += 1
-
-                # 2. Synonyms (RELATED_TO)
+                    if target_word != source_word:
+                        opposite_pairs.append((source_word, target_word))
+                
+                # Synonyms (RELATED_TO)
                 for target_word in targets["synonyms"]:
-                    if target_word == source_word: continue
-                    
-                    res = session.run("""
-                        MATCH (source:Word {name: $source})
-                        MATCH (target:Word {name: $target})
-                        MERGE (source)-[r:RELATED_TO]->(target)
-                        RETURN count(r) as created
-                    """, source=source_word, target=target_word)
-                    
-                    if res.peek():
-                        rel_counts["RELATED_TO"] += 1
+                    if target_word != source_word:
+                        related_pairs.append((source_word, target_word))
+        
+        # 3. Batched writes (only where the target word exists in our graph)
+        rel_counts = {
+            "OPPOSITE_TO": merge_relationships(session, "OPPOSITE_TO", list(dict.fromkeys(opposite_pairs))),
+            "RELATED_TO": merge_relationships(session, "RELATED_TO", list(dict.fromkeys(related_pairs))),
+        }
                         
         print(f"✅ Adversary Mining Complete.")
         print(f"  Created {rel_counts['OPPOSITE_TO']} Antonym links.")
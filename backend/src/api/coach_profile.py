@@ -19,6 +19,7 @@ from ..services.learning_velocity import LearningVelocityService
 from ..services.achievements import AchievementService
 from ..services.levels import LevelService
 from ..services.goals import GoalsService
+from ..services.learner_summary import LearnerSummaryService
 
 router = APIRouter(prefix="/api/v1/profile/coach", tags=["Coach Profile"])
 
@@ -119,17 +120,32 @@ async def get_coach_dashboard(
 ):
     """
     TEMPORARY STUB for Emoji MVP.
-    Coach features are disabled - returns empty dashboard data.
+    Coach features are disabled - returns empty dashboard data, except for
+    the overview of learner profiles the caller manages (batched summary).
     """
+    overview = {}
     try:
-        db.close()  # Close the session immediately since we're not using it
-    except:
-        pass
+        owned = db.execute(
+            text("""
+                SELECT 1 FROM public.learners
+                WHERE id = :learner_id AND (guardian_id = :coach_id OR user_id = :coach_id)
+            """),
+            {'learner_id': learner_id, 'coach_id': coach_id}
+        ).fetchone()
+        if owned:
+            overview = LearnerSummaryService(db).get_summaries([learner_id])[str(learner_id)]
+    except Exception as e:
+        print(f"⚠️ Coach overview unavailable for learner {learner_id}: {e}")
+    finally:
+        try:
+            db.close()
+        except:
+            pass
     
     # Return minimal valid response to satisfy the schema
     return CoachDashboardResponse(
         learner_id=str(learner_id),
-        overview={}, 
+        overview=overview, 
         vocabulary={}, 
         activity={}, 
         performance={}, 
@@ -6,19 +6,13 @@ Combines data from multiple sources for complete learner profile.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import Dict, List, Optional, Any
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import text
 
-from ..database.postgres_connection import PostgresConnection
 from ..middleware.auth import get_current_user_id
-from ..services.vocabulary_size import VocabularySizeService
-from ..services.learning_velocity import LearningVelocityService
-from ..services.levels import LevelService
-from ..services.achievements import AchievementService
-from ..spaced_repetition.assignment_service import AssignmentService
+from ..services.dashboard_aggregator import dashboard_aggregator
 
 router = APIRouter(prefix="/api/v1/dashboard", tags=["Dashboard"])
 
@@ -86,18 +80,9 @@ class DashboardResponse(BaseModel):
     gamification: GamificationStats
 
 
-# --- Dependency Injection ---
-
-def get_db_session():
-    """Get database session."""
-    conn = PostgresConnection()
-    return conn.get_session()
-
-
 @router.get("", response_model=DashboardResponse)
 async def get_dashboard(
-    user_id: UUID = Depends(get_current_user_id),
-    db: Session = Depends(get_db_session)
+    user_id: UUID = Depends(get_current_user_id)
 ):
     """
     Get complete learner dashboard data.
@@ -108,109 +93,26 @@ async def get_dashboard(
     - Performance metrics
     - Points and earnings
     
-    Returns comprehensive learner status in a single API call.
+    Returns comprehensive learner status in a single API call. The sources
+    are queried concurrently by the dashboard aggregator and the merged
+    snapshot is cached briefly per learner (invalidated on answer submission).
     """
     try:
-        # 1. Vocabulary Statistics
-        vocab_service = VocabularySizeService(db)
-        vocab_stats = vocab_service.get_vocabulary_stats(user_id)
-        
-        # 2. Activity and Velocity
-        velocity_service = LearningVelocityService(db)
-        activity_stats = velocity_service.get_activity_summary(user_id)
-        
-        # 3. Gamification (Level, XP, Achievements)
-        level_service = LevelService(db)
-        achievement_service = AchievementService(db)
-        
-        level_info = level_service.get_level_info(user_id)
-        achievements = achievement_service.get_user_achievements(user_id)
-        unlocked_count = sum(1 for a in achievements if a['unlocked'])
-        recent_achievements = achievement_service.get_recent_achievements(user_id, days=7)
-        
-        # 4. Performance Metrics (from verification system)
-        assignment_service = AssignmentService(db)
-        algorithm = assignment_service.get_or_assign(user_id, db)
-        
-        # Get review totals
-        review_result = db.execute(
-            text("""
-                SELECT 
-                    COUNT(*) as total_reviews,
-                    SUM(CASE WHEN retention_actual THEN 1 ELSE 0 END) as total_correct,
-                    COUNT(*) FILTER (WHERE DATE(review_date) = CURRENT_DATE) as reviews_today
-                FROM fsrs_review_history
-                WHERE user_id = :user_id
-            """),
-            {'user_id': user_id}
-        )
-        review_row = review_result.fetchone()
-        total_reviews = review_row[0] or 0
-        total_correct = review_row[1] or 0
-        reviews_today = review_row[2] or 0
-        retention_rate = total_correct / total_reviews if total_reviews > 0 else 0
-        
-        # Get card counts by mastery
-        card_result = db.execute(
-            text("""
-                SELECT 
-                    mastery_level,
-                    COUNT(*) as count
-                FROM verification_schedule
-                WHERE user_id = :user_id
-                GROUP BY mastery_level
-            """),
-            {'user_id': user_id}
-        )
-        
-        mastery_counts = {
-            'learning': 0, 'familiar': 0, 'known': 0, 
-            'mastered': 0, 'leech': 0
-        }
-        for row in card_result.fetchall():
-            level = row[0] or 'learning'
-            mastery_counts[level] = row[1]
-        
-        # Get average interval
-        interval_result = db.execute(
-            text("""
-                SELECT AVG(current_interval)
-                FROM verification_schedule
-                WHERE user_id = :user_id
-            """),
-            {'user_id': user_id}
-        )
-        avg_interval = interval_result.scalar() or 0
+        snapshot = await run_in_threadpool(dashboard_aggregator.get_snapshot, user_id)
         
-        # 5. Points Statistics
-        points_result = db.execute(
-            text("""
-                SELECT 
-                    total_earned,
-                    available_points,
-                    locked_points,
-                    withdrawn_points
-                FROM points_accounts
-                WHERE user_id = :user_id
-            """),
-            {'user_id': user_id}
-        )
-        points_row = points_result.fetchone()
+        vocab_stats = snapshot['vocabulary']
+        activity_stats = snapshot['activity']
+        level_info = snapshot['level']
+        achievements = snapshot['achievements']
+        reviews = snapshot['reviews']
+        mastery_counts = snapshot['cards']['mastery_counts']
+        avg_interval = snapshot['cards']['avg_interval']
+        points_stats = snapshot['points']
         
-        if points_row:
-            points_stats = {
-                "total_earned": points_row[0] or 0,
-                "available_points": points_row[1] or 0,
-                "locked_points": points_row[2] or 0,
-                "withdrawn_points": points_row[3] or 0
-            }
-        else:
-            points_stats = {
-                "total_earned": 0,
-                "available_points": 0,
-                "locked_points": 0,
-                "withdrawn_points": 0
-            }
+        total_reviews = reviews['total_reviews']
+        total_correct = reviews['total_correct']
+        reviews_today = reviews['reviews_today']
+        retention_rate = reviews['retention_rate']
         
         # Compile learner profile summary
         learner_profile = {
@@ -234,7 +136,7 @@ async def get_dashboard(
             ),
             activity=ActivityStats(**activity_stats),
             performance=PerformanceStats(
-                algorithm=algorithm.value,
+                algorithm=snapshot['algorithm'],
                 total_reviews=total_reviews,
                 total_correct=total_correct,
                 retention_rate=round(retention_rate, 3),
@@ -253,14 +155,12 @@ async def get_dashboard(
                 xp_to_next_level=level_info['xp_to_next_level'],
                 xp_in_current_level=level_info['xp_in_current_level'],
                 progress_percentage=level_info['progress_percentage'],
-                unlocked_achievements=unlocked_count,
-                total_achievements=len(achievements),
-                recent_achievements=recent_achievements
+                unlocked_achievements=achievements['unlocked'],
+                total_achievements=achievements['total'],
+                recent_achievements=achievements['recent']
             )
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get dashboard: {str(e)}")
-    finally:
-        db.close()
 
@@ -11,9 +11,15 @@ Endpoints:
 - POST /api/v1/mcq/submit - Submit MCQ answer (with real-time gamification feedback)
 - GET /api/v1/mcq/quality - Get MCQ quality report
 - POST /api/v1/mcq/recalculate - Trigger quality recalculation
+
+Endpoints built on the synchronous services are plain `def` (FastAPI runs
+them in its threadpool, off the event loop); pure-SQL polling endpoints use
+the async session from src.database.async_connection.
 """
 
 import logging
+import threading
+from collections import OrderedDict
 from typing import Optional, List, Dict, Any, Generator, Tuple
 from uuid import UUID
 from datetime import datetime, date
@@ -24,13 +30,14 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from src.database.postgres_connection import PostgresConnection
+from src.database.async_connection import AsyncSession, get_async_db_session
 from src.database.neo4j_connection import Neo4jConnection
 from src.middleware.auth import get_current_user_id
 from src.mcq_adaptive import (
     MCQAdaptiveService,
     MCQSelection,
     AnswerResult,
-    select_options_from_pool,
+    select_option_indices_from_pool,
 )
 from src.database.postgres_crud import mcq_stats
 from src.database.postgres_crud.progress import _get_learner_id_for_user
@@ -44,6 +51,7 @@ from src.services.levels import LevelService
 from src.services.achievements import AchievementService
 from src.services.learning_velocity import LearningVelocityService
 from src.services.currencies import CurrencyService
+from src.services.dashboard_aggregator import dashboard_aggregator
 # Helper functions for verification integration (duplicated from verification.py to avoid circular imports)
 def _get_card_state_for_mcq(
     db: Session,
@@ -435,7 +443,7 @@ class MCQIssueResponse(BaseModel):
 # ============================================
 
 @router.get("/get", response_model=MCQResponse)
-async def get_mcq_for_verification(
+def get_mcq_for_verification(
     sense_id: str = Query(..., description="Sense ID to get MCQ for"),
     mcq_type: Optional[str] = Query(None, description="MCQ type: meaning, usage, discrimination"),
     user_id: UUID = Depends(get_current_user_id),
@@ -464,7 +472,7 @@ async def get_mcq_for_verification(
         mcq = selection.mcq
         
         # Select 6-option subset (5 distractors + 1 correct) based on user ability
-        selected_options, new_correct_idx = select_options_from_pool(
+        pool_indices, new_correct_idx = select_option_indices_from_pool(
             mcq.options,
             distractor_count=5,  # 5 distractors + 1 correct = 6 options
             user_ability=selection.user_ability
@@ -473,11 +481,11 @@ async def get_mcq_for_verification(
         # Format selected options for frontend
         options = [
             MCQOptionResponse(
-                text=opt.get('text', ''),
-                source=opt.get('source', 'unknown'),
-                pool_index=mcq.options.index(opt) if opt in mcq.options else None,
+                text=mcq.options[i].get('text', ''),
+                source=mcq.options[i].get('source', 'unknown'),
+                pool_index=i,
             )
-            for opt in selected_options
+            for i in pool_indices
         ]
         
         return MCQResponse(
@@ -501,7 +509,7 @@ async def get_mcq_for_verification(
 
 
 @router.get("/session", response_model=List[MCQResponse])
-async def get_mcqs_for_session(
+def get_mcqs_for_session(
     sense_id: str = Query(..., description="Sense ID to verify"),
     count: int = Query(3, ge=1, le=5, description="Number of MCQs"),
     user_id: UUID = Depends(get_current_user_id),
@@ -532,7 +540,7 @@ async def get_mcqs_for_session(
             mcq = selection.mcq
             
             # Select 6-option subset (5 distractors + 1 correct)
-            selected_options, new_correct_idx = select_options_from_pool(
+            pool_indices, new_correct_idx = select_option_indices_from_pool(
                 mcq.options,
                 distractor_count=5,
                 user_ability=selection.user_ability
@@ -540,11 +548,11 @@ async def get_mcqs_for_session(
             
             options = [
                 MCQOptionResponse(
-                    text=opt.get('text', ''),
-                    source=opt.get('source', 'unknown'),
-                    pool_index=mcq.options.index(opt) if opt in mcq.options else None,
+                    text=mcq.options[i].get('text', ''),
+                    source=mcq.options[i].get('source', 'unknown'),
+                    pool_index=i,
                 )
-                for opt in selected_options
+                for i in pool_indices
             ]
             
             responses.append(MCQResponse(
@@ -595,8 +603,105 @@ class GetBundlesRequest(BaseModel):
     sense_ids: List[str] = Field(..., max_length=100, description="Sense IDs to get bundles for")
 
 
+BUNDLE_CACHE_MAX_ENTRIES = 20000
+
+
+class _BundleMCQCache:
+    """
+    Pre-shuffled VerificationBundleMCQ per MCQ.
+    
+    Entries are keyed by (mcq_id, updated_at), so an edited MCQ row is
+    re-shuffled on the next request; deactivated MCQs simply stop being
+    returned by the query. LRU-bounded, shared across requests.
+    """
+    
+    def __init__(self, max_entries: int = BUNDLE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[VerificationBundleMCQ]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, mcq: MCQPool) -> Tuple[bool, Optional[VerificationBundleMCQ]]:
+        """Return (hit, bundle). A cached None means the MCQ was invalid."""
+        key = str(mcq.id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != mcq.updated_at:
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[1]
+    
+    def put(self, mcq: MCQPool, bundle: Optional[VerificationBundleMCQ]):
+        key = str(mcq.id)
+        with self._lock:
+            self._entries[key] = (mcq.updated_at, bundle)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, mcq_id: Optional[str] = None):
+        """Drop one MCQ (or everything) from the cache."""
+        with self._lock:
+            if mcq_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(mcq_id), None)
+
+
+_bundle_cache = _BundleMCQCache()
+
+
+def _build_bundle_mcq(m: MCQPool, sense_id: str) -> Optional[VerificationBundleMCQ]:
+    """
+    Pre-shuffle one MCQ into its 6-option cached form.
+    
+    Returns None (and logs why) if the stored pool can't produce a valid MCQ.
+    """
+    # "Last War" approach: Pre-process at write time
+    # Filter to 6 options (1 correct + 5 distractors)
+    try:
+        pool_indices, new_correct_idx = select_option_indices_from_pool(
+            m.options,
+            distractor_count=5,  # 5 distractors + 1 correct = 6 total
+            user_ability=0.5,  # Default for pre-caching (no user context)
+            shuffle=True
+        )
+    except (ValueError, IndexError) as e:
+        # Skip MCQs that don't have enough options
+        logger.warning(f"Skipping MCQ {m.id} for sense {sense_id}: {e}")
+        return None
+    
+    # Validate we have at least 4 options (minimum for valid MCQ)
+    # Accept 4-6 options (4 = 1 correct + 3 distractors, 6 = 1 correct + 5 distractors)
+    if len(pool_indices) < 4 or len(pool_indices) > 6:
+        logger.warning(
+            f"Skipping MCQ {m.id} for sense {sense_id}: "
+            f"Invalid option count: {len(pool_indices)} (need 4-6). "
+            f"MCQ has {len(m.options)} total options in pool."
+        )
+        return None
+    
+    # Format options with pool_index for grading alignment
+    formatted_options = []
+    for i in pool_indices:
+        opt = m.options[i]
+        formatted_options.append(MCQOptionResponse(
+            text=opt.get('text', ''),
+            source=opt.get('source', 'unknown'),
+            pool_index=i,
+        ))
+    
+    return VerificationBundleMCQ(
+        mcq_id=str(m.id),
+        question=m.question,
+        context=m.context,
+        options=formatted_options,  # Already filtered to 6!
+        correct_index=new_correct_idx,  # Recalculated after filtering!
+        mcq_type=m.mcq_type,
+    )
+
+
 @router.post("/bundles", response_model=Dict[str, VerificationBundle])
-async def get_verification_bundles(
+def get_verification_bundles(
     request: GetBundlesRequest,
     db: Session = Depends(get_db_session),
 ):
@@ -606,80 +711,44 @@ async def get_verification_bundles(
     Returns pre-generated MCQs with correct_index for client-side caching.
     This enables instant MCQ loading and immediate answer feedback.
     
+    All senses are fetched in a single query; each MCQ's shuffled 6-option
+    form is cached until its row changes.
+    
     Returns dict keyed by sense_id. Senses without MCQs are omitted.
     Max 100 senses per request.
     """
     result: Dict[str, VerificationBundle] = {}
+    sense_ids = request.sense_ids[:100]  # Enforce limit
     
-    for sense_id in request.sense_ids[:100]:  # Enforce limit
-        # Normalize sense_id (strip _N suffix if present)
-        normalized = MCQAdaptiveService._normalize_sense_id(sense_id)
-        
-        # Get MCQs for this sense
-        mcqs = mcq_stats.get_mcqs_for_sense(db, normalized, active_only=True)
-        
-        if mcqs and len(mcqs) > 0:
-            mcqs_list = []
-            for m in mcqs[:5]:  # Max 5 MCQs per sense
-                # "Last War" approach: Pre-process at write time
-                # Filter to 6 options (1 correct + 5 distractors)
-                try:
-                    selected_options, new_correct_idx = select_options_from_pool(
-                        m.options,
-                        distractor_count=5,  # 5 distractors + 1 correct = 6 total
-                        user_ability=0.5,  # Default for pre-caching (no user context)
-                        shuffle=True
-                    )
-                    
-                    # Validate we have at least 4 options (minimum for valid MCQ)
-                    # Accept 4-6 options (4 = 1 correct + 3 distractors, 6 = 1 correct + 5 distractors)
-                    if len(selected_options) < 4 or len(selected_options) > 6:
-                        logger.warning(
-                            f"Skipping MCQ {m.id} for sense {sense_id}: "
-                            f"Invalid option count: {len(selected_options)} (need 4-6). "
-                            f"MCQ has {len(m.options)} total options in pool."
-                        )
-                        continue
-                    
-                    # Validate correct_index is within bounds
-                    if new_correct_idx < 0 or new_correct_idx >= len(selected_options):
-                        logger.warning(
-                            f"Skipping MCQ {m.id} for sense {sense_id}: "
-                            f"Invalid correct_index {new_correct_idx} for {len(selected_options)} options"
-                        )
-                        continue
-                    
-                    # Format options with pool_index for grading alignment
-                    formatted_options = [
-                        MCQOptionResponse(
-                            text=opt.get('text', ''),
-                            source=opt.get('source', 'unknown'),
-                            pool_index=m.options.index(opt) if opt in m.options else None,
-                        )
-                        for opt in selected_options
-                    ]
-                    
-                    mcqs_list.append(VerificationBundleMCQ(
-                        mcq_id=str(m.id),
-                        question=m.question,
-                        context=m.context,
-                        options=formatted_options,  # Already filtered to 6!
-                        correct_index=new_correct_idx,  # Recalculated after filtering!
-                        mcq_type=m.mcq_type,
-                    ))
-                except (ValueError, IndexError) as e:
-                    # Skip MCQs that don't have enough options
-                    logger.warning(f"Skipping MCQ {m.id} for sense {sense_id}: {e}")
-                    continue
-            
-            if mcqs_list:
-                result[sense_id] = VerificationBundle(
-                    sense_id=sense_id,
-                    word=mcqs[0].word,
-                    mcqs=mcqs_list
-                )
-                # Log bundle generation for debugging
-                logger.info(f"Bundle for {sense_id}: {len(mcqs_list)} MCQs, each with 6 options")
+    # Normalize sense_id (strip _N suffix if present)
+    normalized_ids = {
+        sense_id: MCQAdaptiveService._normalize_sense_id(sense_id)
+        for sense_id in sense_ids
+    }
+    mcqs_by_sense = mcq_stats.get_mcqs_for_senses(
+        db, list(set(normalized_ids.values())), active_only=True
+    )
+    
+    for sense_id in sense_ids:
+        mcqs = mcqs_by_sense.get(normalized_ids[sense_id])
+        if not mcqs:
+            continue
+        
+        mcqs_list = []
+        for m in mcqs[:5]:  # Max 5 MCQs per sense
+            hit, bundle_mcq = _bundle_cache.get(m)
+            if not hit:
+                bundle_mcq = _build_bundle_mcq(m, sense_id)
+                _bundle_cache.put(m, bundle_mcq)
+            if bundle_mcq is not None:
+                mcqs_list.append(bundle_mcq)
+        
+        if mcqs_list:
+            result[sense_id] = VerificationBundle(
+                sense_id=sense_id,
+                word=mcqs[0].word,
+                mcqs=mcqs_list
+            )
     
     logger.info(f"Returned verification bundles for {len(result)}/{len(request.sense_ids)} senses")
     return result
@@ -774,8 +843,8 @@ def _save_batch_to_db(user_id: UUID, batch_data: List[Dict], total_xp: int, lear
     Background task: Save batch answers to DB.
     Runs AFTER response is sent to user.
     """
-    from src.database.models import MCQAttempt
     from src.database.postgres_crud.progress import _get_learner_id_for_user
+    from src.database.postgres_crud.verification import bulk_complete_verifications
     
     conn = PostgresConnection()
     db = conn.get_session()
@@ -784,44 +853,50 @@ def _save_batch_to_db(user_id: UUID, batch_data: List[Dict], total_xp: int, lear
         if learner_id is None:
             learner_id = _get_learner_id_for_user(db, user_id)
         
-        # 1. Record all attempts
-        for item in batch_data:
-            db.add(MCQAttempt(
-                user_id=user_id,
-                mcq_id=UUID(item['mcq_id']),
-                sense_id=item['sense_id'],
-                is_correct=item['is_correct'],
-                response_time_ms=item['response_time_ms'],
-                selected_option_index=item['selected_idx'],
-                verification_schedule_id=item['schedule_id'],
-                attempt_context='verification'
-            ))
-            
-            # Mark schedule complete
-            if item['schedule_id']:
-                db.execute(text("""
-                    UPDATE verification_schedule 
-                    SET completed = true, completed_at = NOW(), passed = :passed
-                    WHERE id = :sid AND user_id = :uid
-                """), {'sid': item['schedule_id'], 'uid': user_id, 'passed': item['is_correct']})
-        
-        # 2. Award XP (using learner_id)
+        # 1. Record all attempts (one multi-row INSERT)
+        mcq_stats.bulk_record_attempts(db, [
+            {
+                'user_id': user_id,
+                'mcq_id': UUID(item['mcq_id']),
+                'sense_id': item['sense_id'],
+                'is_correct': item['is_correct'],
+                'response_time_ms': item['response_time_ms'],
+                'selected_option_index': item['selected_idx'],
+                'verification_schedule_id': item['schedule_id'],
+                'attempt_context': 'verification',
+            }
+            for item in batch_data
+        ])
+        
+        # Mark schedules complete (one UPDATE ... FROM (VALUES ...))
+        bulk_complete_verifications(db, user_id, [
+            (item['schedule_id'], item['is_correct'])
+            for item in batch_data if item['schedule_id']
+        ])
+        
+        # 2. Award currencies for correct answers (one aggregated award)
+        correct_count = sum(1 for item in batch_data if item['is_correct'])
+        if correct_count > 0:
+            try:
+                with db.begin_nested():
+                    CurrencyService(db).award_mcq_results_batch(user_id, correct=correct_count, commit=False)
+            except Exception as e:
+                logger.warning(f"Currency award failed for batch ({user_id}): {e}")
+        
+        # 3. Award XP (using learner_id)
         if total_xp > 0 and learner_id:
             level_service = LevelService(db)
             level_service.add_xp(learner_id, total_xp, 'review')
         
-        # 3. Award currencies for correct answers
-        correct_count = sum(1 for item in batch_data if item['is_correct'])
-        if correct_count > 0:
-            currency_service = CurrencyService(db)
-            for item in batch_data:
-                if item['is_correct']:
-                    try:
-                        currency_service.award_mcq_result(user_id, True, False, False, None)
-                    except:
-                        pass
+        # 4. Advance the daily streak (same activity as a single submit)
+        if learner_id:
+            try:
+                LearningVelocityService(db).record_activity_and_check_streak(user_id, learner_id)
+            except Exception as e:
+                logger.warning(f"Streak update failed for batch ({user_id}): {e}")
         
         db.commit()
+        dashboard_aggregator.invalidate(user_id)
         logger.info(f"✅ Background save: {len(batch_data)} answers, +{total_xp}XP for {user_id}")
         
     except Exception as e:
@@ -831,7 +906,12 @@ def _save_batch_to_db(user_id: UUID, batch_data: List[Dict], total_xp: int, lear
         db.close()
 
 
-def _process_background_tasks(user_id: UUID, learner_id: Optional[UUID] = None, retry_count: int = 0):
+def _process_background_tasks(
+    user_id: UUID,
+    learner_id: Optional[UUID] = None,
+    retry_count: int = 0,
+    achievement_event: Optional[Dict[str, Dict[str, int]]] = None
+):
     """
     Combined background task: Achievement checking + currency recalculation.
     
@@ -843,6 +923,8 @@ def _process_background_tasks(user_id: UUID, learner_id: Optional[UUID] = None,
         user_id: User ID to process
         learner_id: Optional learner ID (resolved if not provided)
         retry_count: Internal retry counter (for transient failures)
+        achievement_event: Counter changes ({'increments': ..., 'values': ...})
+            for incremental achievement evaluation; full check if None
     """
     from src.database.postgres_crud.progress import _get_learner_id_for_user
     
@@ -854,9 +936,12 @@ def _process_background_tasks(user_id: UUID, learner_id: Optional[UUID] = None,
     if learner_id is None:
         learner_id = _get_learner_id_for_user(db, user_id)
     try:
-        # 1. Check achievements (the slowest part)
+        # 1. Check achievements (incremental when the event is known)
         achievement_service = AchievementService(db)
-        newly_unlocked = achievement_service.check_achievements(user_id)
+        if achievement_event is not None:
+            newly_unlocked = achievement_service.record_event(user_id, **achievement_event)
+        else:
+            newly_unlocked = achievement_service.check_achievements(user_id)
         logger.info(f"Background: Checked achievements for user {user_id}, unlocked {len(newly_unlocked)}")
         
         # 2. Update currency totals if needed (optional - can use cached values)
@@ -867,6 +952,7 @@ def _process_background_tasks(user_id: UUID, learner_id: Optional[UUID] = None,
         
         # Commit background updates
         db.commit()
+        dashboard_aggregator.invalidate(user_id)
         
     except Exception as e:
         db.rollback()
@@ -876,7 +962,7 @@ def _process_background_tasks(user_id: UUID, learner_id: Optional[UUID] = None,
             time.sleep(1)  # Brief delay before retry
             logger.warning(f"Background task failed (attempt {retry_count + 1}/{MAX_RETRIES}), retrying: {e}")
             db.close()
-            _process_background_tasks(user_id, learner_id, retry_count + 1)
+            _process_background_tasks(user_id, learner_id, retry_count + 1, achievement_event)
         else:
             logger.error(f"Background task failed after {retry_count + 1} attempts: {e}")
     finally:
@@ -884,7 +970,7 @@ def _process_background_tasks(user_id: UUID, learner_id: Optional[UUID] = None,
 
 
 @router.post("/submit", response_model=SubmitAnswerResponse)
-async def submit_answer(
+def submit_answer(
     request: SubmitAnswerRequest,
     background_tasks: BackgroundTasks,  # <--- ADD THIS
     user_id: UUID = Depends(get_current_user_id),
@@ -966,7 +1052,7 @@ async def submit_answer(
         streak_extended = False
         xp_multiplier = 1.0
         try:
-            current_streak, streak_extended, xp_multiplier = velocity_service.record_activity_and_check_streak(user_id)
+            current_streak, streak_extended, xp_multiplier = velocity_service.record_activity_and_check_streak(user_id, learner_id)
         except Exception as e:
             logger.error(f"Failed to check streak: {e}")
             # Continue without streak bonus
@@ -1116,6 +1202,7 @@ async def submit_answer(
         # ============================================
         
         verification_result = None
+        achievement_event = {'increments': {}, 'values': {'streak_days': current_streak}}
         if request.verification_schedule_id:
             try:
                 # Get verification schedule to find learning_progress_id
@@ -1168,6 +1255,14 @@ async def submit_answer(
                         schedule.score = 1.0 if result.is_correct else 0.0
                         db.commit()
                         
+                        # Counter deltas for incremental achievement checks
+                        increments = achievement_event['increments']
+                        increments['total_reviews'] = 1
+                        was_mastered = card_state.mastery_level == 'mastered'
+                        is_mastered = review_result.new_state.mastery_level == 'mastered'
+                        if was_mastered != is_mastered:
+                            increments['blocks_mastered'] = 1 if is_mastered else -1
+                        
                         verification_result = {
                             "next_review_date": review_result.next_review_date.isoformat(),
                             "next_interval_days": review_result.next_interval_days,
@@ -1194,13 +1289,15 @@ async def submit_answer(
         # --- COMMIT CRITICAL TRANSACTION ---
         # Commit all critical updates before background tasks
         db.commit()
+        dashboard_aggregator.invalidate(user_id)
         
         # --- DEFERRED PHASE: Background Tasks ---
         # Single combined task runs AFTER the response is sent to the user
         background_tasks.add_task(
             _process_background_tasks,
             user_id,  # Only pass user_id, not db session!
-            learner_id  # Pass learner_id for XP awards in background
+            learner_id,  # Pass learner_id for XP awards in background
+            achievement_event=achievement_event
         )
         
         # Modify feedback to include speed warning if applicable
@@ -1229,7 +1326,7 @@ async def submit_answer(
 
 
 @router.post("/submit-batch", response_model=List[SubmitAnswerResponse])
-async def submit_batch_answers(
+def submit_batch_answers(
     request: SubmitBatchRequest,
     background_tasks: BackgroundTasks,
     user_id: UUID = Depends(get_current_user_id),
@@ -1390,7 +1487,7 @@ async def submit_batch_answers(
 async def get_recent_achievements(
     seconds: int = Query(60, ge=1, le=300, description="Look back window in seconds"),
     user_id: UUID = Depends(get_current_user_id),
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_async_db_session),
 ):
     """
     Get achievements unlocked in the last N seconds.
@@ -1402,7 +1499,7 @@ async def get_recent_achievements(
         from datetime import timedelta
         cutoff = datetime.now() - timedelta(seconds=seconds)
         
-        result = db.execute(
+        result = await db.execute(
             text("""
                 SELECT ua.achievement_id, a.code, a.name_en, a.name_zh,
                        a.description_en, a.description_zh, a.icon,
@@ -1438,7 +1535,7 @@ async def get_recent_achievements(
 
 
 @router.post("/generate", response_model=GenerateMCQsResponse)
-async def generate_mcqs(
+def generate_mcqs(
     request: GenerateMCQsRequest,
     db: Session = Depends(get_db_session),
 ):
@@ -1505,7 +1602,7 @@ async def generate_mcqs(
 
 
 @router.get("/quality", response_model=QualityReportResponse)
-async def get_quality_report(
+def get_quality_report(
     db: Session = Depends(get_db_session),
 ):
     """
@@ -1532,7 +1629,7 @@ async def get_quality_report(
 
 
 @router.get("/needs-attention", response_model=List[MCQIssueResponse])
-async def get_mcqs_needing_attention(
+def get_mcqs_needing_attention(
     limit: int = Query(20, ge=1, le=100, description="Maximum MCQs to return"),
     db: Session = Depends(get_db_session),
 ):
@@ -1564,7 +1661,7 @@ async def get_mcqs_needing_attention(
 
 
 @router.post("/recalculate")
-async def recalculate_quality_metrics(
+def recalculate_quality_metrics(
     db: Session = Depends(get_db_session),
 ):
     """
@@ -1589,7 +1686,7 @@ async def recalculate_quality_metrics(
 
 
 @router.get("/stats/user")
-async def get_user_mcq_stats(
+def get_user_mcq_stats(
     user_id: UUID = Depends(get_current_user_id),
     db: Session = Depends(get_db_session),
 ):
@@ -1611,8 +1708,7 @@ async def get_user_mcq_stats(
         sense_ids = list(set(a.sense_id for a in recent_attempts))[:10]
         
         sense_abilities = {}
-        for sense_id in sense_ids:
-            ability = service.estimate_ability(user_id, sense_id)
+        for sense_id, ability in service.estimate_abilities(user_id, sense_ids).items():
             sense_abilities[sense_id] = {
                 "ability": ability.ability,
                 "confidence": ability.confidence,
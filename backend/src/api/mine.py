@@ -20,6 +20,7 @@ from ..middleware.auth import get_current_user_id
 from ..services.vocabulary_store import vocabulary_store
 from ..database.postgres_crud.progress import create_learning_progress, _get_learner_id_for_user
 from ..database.postgres_crud.verification import create_verification_schedule
+from ..services.learning_velocity import LearningVelocityService
 
 # Optional Neo4j import for legacy support
 try:
@@ -730,6 +731,14 @@ async def start_forging(
                 detail=f"Failed to create verification schedule: {error_msg}"
             )
 
+        # New learning_progress rows are streak activity (as in the backfill)
+        try:
+            LearningVelocityService(db).record_activity_and_check_streak(user_id, effective_learner_id)
+            db.commit()
+        except Exception as streak_error:
+            print(f"[start_forging] Warning: Streak update failed for {effective_learner_id}: {streak_error}")
+            db.rollback()
+
         # Delta Strategy: Award discovery bonus (5 XP, 1 spark for new word)
         DISCOVERY_XP = 5
         DISCOVERY_SPARKS = 1
@@ -92,30 +92,22 @@ class StartSurveyRequest(BaseModel):
 # --- Dependency Injection ---
 def get_engine() -> LexiSurveyEngine:
     """
-    Creates a fresh instance of the engine with a Neo4j connection.
+    Creates the shared survey engine.
     
     Uses probability-based vocabulary estimation (V2 methodology).
-    Falls back to VocabularyStore if Neo4j is not available.
+    Questions are generated from the in-memory VocabularyStore when it is
+    loaded (no Neo4j round trips per step); Neo4j is the fallback.
     """
     global _engine, _neo4j_conn
     if _engine is None:
-        # Try Neo4j first
-        if NEO4J_AVAILABLE:
-            try:
-                if _neo4j_conn is None:
-                    _neo4j_conn = Neo4jConnection()
-                _engine = LexiSurveyEngine(_neo4j_conn)
-                logger.info("Survey engine initialized with Neo4j")
-            except Exception as e:
-                logger.warning(f"Neo4j connection failed: {e}")
-                if VOCABULARY_STORE_AVAILABLE:
-                    _engine = LexiSurveyEngine(conn=None, use_vocabulary_store=True)
-                    logger.info("Survey engine initialized with VocabularyStore fallback")
-                else:
-                    raise
-        elif VOCABULARY_STORE_AVAILABLE:
+        if VOCABULARY_STORE_AVAILABLE:
             _engine = LexiSurveyEngine(conn=None, use_vocabulary_store=True)
-            logger.info("Survey engine initialized with VocabularyStore (no Neo4j)")
+            logger.info("Survey engine initialized with VocabularyStore (in-memory)")
+        elif NEO4J_AVAILABLE:
+            if _neo4j_conn is None:
+                _neo4j_conn = Neo4jConnection()
+            _engine = LexiSurveyEngine(_neo4j_conn)
+            logger.info("Survey engine initialized with Neo4j (VocabularyStore not loaded)")
         else:
             raise ValueError(
                 "Neither Neo4j nor VocabularyStore available. "
@@ -6,21 +6,25 @@ This enables offline-first behavior where clients queue actions locally
 and sync them in batches.
 """
 
-from typing import List, Optional, Generator
+import logging
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
 from sqlalchemy import text
 
-from ..database.postgres_connection import PostgresConnection
+from ..database.async_connection import AsyncSession, get_async_db_session
 from ..middleware.auth import get_current_user_id
 from ..database.postgres_crud.progress import create_learning_progress
 from ..database.postgres_crud.verification import create_verification_schedule
+from ..services.achievements import AchievementService
+from ..services.learning_velocity import LearningVelocityService
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/v1/sync", tags=["Sync"])
 
 
@@ -46,15 +50,48 @@ class BatchSyncResponse(BaseModel):
     errors: Optional[List[str]] = Field(None, description="Error messages for failed actions")
 
 
-# --- Dependency Injection ---
+# --- Helpers ---
 
-def get_db_session() -> Generator[Session, None, None]:
-    """Get database session."""
-    db = PostgresConnection().get_session()
-    try:
-        yield db
-    finally:
-        db.close()
+def _start_forging(db, user_id: UUID, sense_id: str):
+    """Create learning progress and its verification schedule (sync session)."""
+    progress = create_learning_progress(
+        session=db,
+        user_id=user_id,
+        learning_point_id=sense_id,
+        tier=1,
+        status='pending'
+    )
+    create_verification_schedule(
+        session=db,
+        user_id=user_id,
+        learning_progress_id=progress.id,
+        learning_point_id=sense_id,
+        initial_difficulty=0.5
+    )
+
+
+def _record_activity(db, user_id: UUID) -> int:
+    """Advance the streak of the user's own learner profile (sync session); returns the streak."""
+    current_streak, _, _ = LearningVelocityService(db).record_activity_and_check_streak(user_id)
+    return current_streak
+
+
+def _check_achievements(db, user_id: UUID, forged: int, verifications: int, current_streak: Optional[int]):
+    """
+    Update achievement progress for the synced actions (sync session).
+    
+    Completed verifications change state the incremental counters do not
+    track, so they fall back to a full recompute; new blocks and progress
+    updates are an incremental event (record_event re-reads vocabulary size).
+    """
+    service = AchievementService(db)
+    if verifications:
+        return service.check_achievements(user_id)
+    return service.record_event(
+        user_id,
+        increments={'blocks_learned': forged},
+        values={'streak_days': current_streak},
+    )
 
 
 # --- Endpoints ---
@@ -63,7 +100,7 @@ def get_db_session() -> Generator[Session, None, None]:
 async def batch_sync(
     request: BatchSyncRequest,
     user_id: UUID = Depends(get_current_user_id),
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_async_db_session)
 ):
     """
     Process a batch of user actions.
@@ -72,41 +109,32 @@ async def batch_sync(
     - START_FORGING: Begin learning a new block
     - COMPLETE_VERIFICATION: Mark a verification as complete
     - UPDATE_PROGRESS: Update learning progress
+    
+    Runs on the async session so queued actions from many clients overlap
+    their I/O; the synchronous CRUD helpers run through run_sync.
     """
     synced = 0
     failed = 0
     errors: List[str] = []
+    forged = 0
+    verifications = 0
+    progress_updates = 0
     
     for action in request.actions:
         try:
             if action.type == "START_FORGING":
                 # Check if already exists
-                existing = db.execute(
+                existing = (await db.execute(
                     text("""
                         SELECT id FROM learning_progress
                         WHERE user_id = :user_id AND learning_point_id = :sense_id
                     """),
                     {"user_id": user_id, "sense_id": action.sense_id}
-                ).fetchone()
+                )).fetchone()
                 
                 if not existing:
-                    # Create new learning progress
-                    progress = create_learning_progress(
-                        session=db,
-                        user_id=user_id,
-                        learning_point_id=action.sense_id,
-                        tier=1,
-                        status='pending'
-                    )
-                    
-                    # Create verification schedule
-                    create_verification_schedule(
-                        session=db,
-                        user_id=user_id,
-                        learning_progress_id=progress.id,
-                        learning_point_id=action.sense_id,
-                        initial_difficulty=0.5
-                    )
+                    await db.run_sync(_start_forging, user_id, action.sense_id)
+                    forged += 1
                 
                 synced += 1
                 
@@ -116,7 +144,7 @@ async def batch_sync(
                 passed = action.payload.get("passed", False) if action.payload else False
                 
                 if verification_id:
-                    db.execute(
+                    await db.execute(
                         text("""
                             UPDATE verification_schedule
                             SET completed = true,
@@ -127,6 +155,7 @@ async def batch_sync(
                         """),
                         {"verification_id": verification_id, "passed": passed, "user_id": user_id}
                     )
+                    verifications += 1
                     synced += 1
                 else:
                     failed += 1
@@ -137,7 +166,7 @@ async def batch_sync(
                 new_status = action.payload.get("status") if action.payload else None
                 
                 if new_status:
-                    db.execute(
+                    await db.execute(
                         text("""
                             UPDATE learning_progress
                             SET status = :status, updated_at = NOW()
@@ -146,6 +175,7 @@ async def batch_sync(
                         """),
                         {"status": new_status, "user_id": user_id, "sense_id": action.sense_id}
                     )
+                    progress_updates += 1
                     synced += 1
                 else:
                     failed += 1
@@ -159,17 +189,32 @@ async def batch_sync(
             failed += 1
             errors.append(f"Error processing {action.type} for {action.sense_id}: {str(e)}")
     
+    # New learning progress counts towards today's streak (savepointed upsert)
+    current_streak = None
+    if forged:
+        try:
+            current_streak = await db.run_sync(_record_activity, user_id)
+        except Exception as e:
+            logger.warning(f"Streak update failed for sync ({user_id}): {e}")
+    
     # Commit all changes
     try:
-        db.commit()
+        await db.commit()
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         return BatchSyncResponse(
             synced=0,
             failed=len(request.actions),
             errors=[f"Database commit failed: {str(e)}"]
         )
     
+    # Achievements run after the commit so a failure cannot undo synced actions
+    if forged or verifications or progress_updates:
+        try:
+            await db.run_sync(_check_achievements, user_id, forged, verifications, current_streak)
+        except Exception as e:
+            logger.error(f"Failed to check achievements for sync ({user_id}): {e}")
+    
     return BatchSyncResponse(
         synced=synced,
         failed=failed,
@@ -561,69 +561,35 @@ async def get_children_summary(
         # Get children
         children = user_crud.get_user_children(db, user_id)
         logger.info(f"📊 Found {len(children)} children")
-        summaries = []
         
-        # Import services
-        from ..services.levels import LevelService
-        from ..services.learning_velocity import LearningVelocityService
-        from ..services.vocabulary_size import VocabularySizeService
+        # Stats for all children in a fixed number of grouped queries
+        from ..services.learner_summary import LearnerSummaryService, empty_summary
+        
+        try:
+            stats = LearnerSummaryService(db).get_user_summaries([child.id for child in children])
+        except Exception as stats_error:
+            logger.error(f"  ❌ Failed to get children stats: {stats_error}")
+            import traceback
+            traceback.print_exc()
+            # Rollback the transaction to recover; children get default values
+            db.rollback()
+            stats = {}
         
+        summaries = []
         for child in children:
-            logger.info(f"📊 Processing child {child.id} ({child.name})")
-            
-            # Check if child user actually exists (handle orphaned relationships)
-            user_exists = user_crud.get_user_by_id(db, child.id)
-            if not user_exists:
-                logger.warning(f"  ⚠️ Child {child.id} has no user record (orphaned relationship), skipping")
-                continue
-            
-            try:
-                # Get basic stats (lightweight queries)
-                level_service = LevelService(db)
-                level_info = level_service.get_level_info(child.id)
-                logger.info(f"  ✅ Level: {level_info}")
-                
-                velocity_service = LearningVelocityService(db)
-                activity = velocity_service.get_activity_summary(child.id)
-                logger.info(f"  ✅ Activity: {activity}")
-                
-                vocab_service = VocabularySizeService(db)
-                vocab = vocab_service.get_vocabulary_stats(child.id)
-                logger.info(f"  ✅ Vocab: {vocab}")
-                
-                summaries.append(ChildSummary(
-                    id=str(child.id),
-                    name=child.name,
-                    age=child.age,
-                    email=child.email,
-                    level=level_info['level'],
-                    total_xp=level_info['total_xp'],
-                    current_streak=activity['activity_streak_days'],
-                    vocabulary_size=vocab['vocabulary_size'],
-                    words_learned_this_week=activity.get('words_learned_this_week', 0),
-                    last_active_date=activity.get('last_active_date')
-                ))
-                logger.info(f"  ✅ Added summary for {child.name}")
-            except Exception as child_error:
-                logger.error(f"  ❌ Failed to get stats for child {child.id}: {child_error}")
-                import traceback
-                traceback.print_exc()
-                # Rollback the transaction to recover
-                db.rollback()
-                # Add child with default values (Level 1, no progress)
-                summaries.append(ChildSummary(
-                    id=str(child.id),
-                    name=child.name,
-                    age=child.age,
-                    email=child.email,
-                    level=1,
-                    total_xp=0,
-                    current_streak=0,
-                    vocabulary_size=0,
-                    words_learned_this_week=0,
-                    last_active_date=None
-                ))
-                logger.info(f"  ⚠️ Added default summary for {child.name} (new learner with no progress yet)")
+            child_stats = stats.get(str(child.id)) or empty_summary()
+            summaries.append(ChildSummary(
+                id=str(child.id),
+                name=child.name,
+                age=child.age,
+                email=child.email,
+                level=child_stats['level'],
+                total_xp=child_stats['total_xp'],
+                current_streak=child_stats['current_streak'],
+                vocabulary_size=child_stats['vocabulary_size'],
+                words_learned_this_week=child_stats['words_learned_this_week'],
+                last_active_date=child_stats['last_active_date']
+            ))
         
         logger.info(f"✅ Returning {len(summaries)} summaries")
         return summaries
@@ -689,120 +655,37 @@ async def get_learners_summary(
         logger.info(f"📊 Found {len(learners)} learners for guardian {user_id}")
         if len(learners) == 0:
             logger.warning(f"⚠️ No learners found for guardian {user_id} - this might indicate a data issue")
-        summaries = []
-        
-        # Import services
-        from ..services.levels import LevelService
-        from ..services.learning_velocity import LearningVelocityService
-        from ..database.postgres_crud.progress import _get_learner_id_for_user
+        # Stats for all learners in a fixed number of grouped queries
+        from ..services.learner_summary import LearnerSummaryService, empty_summary
+        
+        try:
+            stats = LearnerSummaryService(db).get_summaries([learner['id'] for learner in learners])
+        except Exception as stats_error:
+            logger.error(f"  ❌ Failed to get learner stats: {stats_error}")
+            import traceback
+            traceback.print_exc()
+            # Rollback the transaction to recover; learners get default values
+            db.rollback()
+            stats = {}
         
+        summaries = []
         for learner in learners:
-            learner_id = learner['id']
-            logger.info(f"📊 Processing learner {learner_id} ({learner['display_name']})")
-            
-            try:
-                # Get level info (learner-scoped)
-                level_service = LevelService(db)
-                level_info = level_service.get_level_info(learner_id)
-                logger.info(f"  ✅ Level: {level_info}")
-                
-                # Get activity summary (need to resolve user_id for legacy service)
-                # Try to get user_id from learner record
-                learner_user_id = None
-                if learner.get('user_id'):
-                    learner_user_id = UUID(learner['user_id'])
-                else:
-                    # For children without user accounts, try to find via guardian relationship
-                    # This is a fallback - ideally all learners should have user_id
-                    logger.warning(f"  ⚠️ Learner {learner_id} has no user_id, skipping activity summary")
-                
-                activity = {
-                    'activity_streak_days': 0,
-                    'words_learned_this_week': 0,
-                    'last_active_date': None
-                }
-                
-                if learner_user_id:
-                    try:
-                        velocity_service = LearningVelocityService(db)
-                        activity = velocity_service.get_activity_summary(learner_user_id)
-                        logger.info(f"  ✅ Activity: {activity}")
-                    except Exception as activity_error:
-                        logger.warning(f"  ⚠️ Failed to get activity for learner {learner_id}: {activity_error}")
-                
-                # Get vocabulary stats (learner-scoped - query directly)
-                vocab_result = db.execute(
-                    text("""
-                        SELECT 
-                            COUNT(CASE WHEN status = 'verified' THEN 1 END) as vocabulary_size,
-                            COUNT(CASE WHEN status IN ('hollow', 'learning', 'pending') THEN 1 END) as words_in_progress
-                        FROM learning_progress
-                        WHERE learner_id = :learner_id
-                    """),
-                    {'learner_id': learner_id}
-                )
-                vocab_row = vocab_result.fetchone()
-                vocabulary_size = vocab_row[0] or 0 if vocab_row else 0
-                words_in_progress = vocab_row[1] or 0 if vocab_row else 0
-                
-                logger.info(f"  ✅ Vocab: size={vocabulary_size}, in_progress={words_in_progress}")
-                
-                # Calculate period-based XP from xp_history (learner-scoped)
-                xp_period_result = db.execute(
-                    text("""
-                        SELECT 
-                            COALESCE(SUM(CASE WHEN earned_at >= NOW() - INTERVAL '7 days' THEN xp_amount ELSE 0 END), 0) as weekly_xp,
-                            COALESCE(SUM(CASE WHEN earned_at >= NOW() - INTERVAL '30 days' THEN xp_amount ELSE 0 END), 0) as monthly_xp
-                        FROM xp_history
-                        WHERE learner_id = :learner_id
-                    """),
-                    {'learner_id': learner_id}
-                )
-                xp_period_row = xp_period_result.fetchone()
-                weekly_xp = xp_period_row[0] or 0 if xp_period_row else 0
-                monthly_xp = xp_period_row[1] or 0 if xp_period_row else 0
-                
-                logger.info(f"  ✅ XP Periods: weekly={weekly_xp}, monthly={monthly_xp}, total={level_info['total_xp']}")
-                
-                summaries.append(LearnerSummary(
-                    learner_id=str(learner_id),
-                    display_name=learner['display_name'],
-                    avatar_emoji=learner['avatar_emoji'],
-                    is_parent_profile=learner['is_parent_profile'],
-                    level=level_info['level'],
-                    total_xp=level_info['total_xp'],
-                    weekly_xp=weekly_xp,
-                    monthly_xp=monthly_xp,
-                    current_streak=activity.get('activity_streak_days', 0),
-                    vocabulary_size=vocabulary_size,
-                    words_in_progress=words_in_progress,
-                    words_learned_this_week=activity.get('words_learned_this_week', 0),
-                    last_active_date=activity.get('last_active_date')
-                ))
-                logger.info(f"  ✅ Added summary for {learner['display_name']}")
-            except Exception as learner_error:
-                logger.error(f"  ❌ Failed to get stats for learner {learner_id}: {learner_error}")
-                import traceback
-                traceback.print_exc()
-                # Rollback the transaction to recover
-                db.rollback()
-                # Add learner with default values (Level 1, no progress)
-                summaries.append(LearnerSummary(
-                    learner_id=str(learner_id),
-                    display_name=learner['display_name'],
-                    avatar_emoji=learner['avatar_emoji'],
-                    is_parent_profile=learner['is_parent_profile'],
-                    level=1,
-                    total_xp=0,
-                    weekly_xp=0,
-                    monthly_xp=0,
-                    current_streak=0,
-                    vocabulary_size=0,
-                    words_in_progress=0,
-                    words_learned_this_week=0,
-                    last_active_date=None
-                ))
-                logger.info(f"  ⚠️ Added default summary for {learner['display_name']} (new learner with no progress yet)")
+            learner_stats = stats.get(str(learner['id'])) or empty_summary()
+            summaries.append(LearnerSummary(
+                learner_id=str(learner['id']),
+                display_name=learner['display_name'],
+                avatar_emoji=learner['avatar_emoji'],
+                is_parent_profile=learner['is_parent_profile'],
+                level=learner_stats['level'],
+                total_xp=learner_stats['total_xp'],
+                weekly_xp=learner_stats['weekly_xp'],
+                monthly_xp=learner_stats['monthly_xp'],
+                current_streak=learner_stats['current_streak'],
+                vocabulary_size=learner_stats['vocabulary_size'],
+                words_in_progress=learner_stats['words_in_progress'],
+                words_learned_this_week=learner_stats['words_learned_this_week'],
+                last_active_date=learner_stats['last_active_date']
+            ))
         
         logger.info(f"✅ Returning {len(summaries)} learner summaries")
         if len(summaries) > 0:
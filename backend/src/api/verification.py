@@ -8,11 +8,16 @@ Endpoints:
 - GET /api/v1/verification/algorithm - Get user's algorithm info
 - GET /api/v1/verification/due - Get due cards for review
 - GET /api/v1/verification/stats - Get user's review statistics
+
+/due and /stats run on the async session; endpoints that call the
+synchronous spaced-repetition services are plain `def` so FastAPI runs them
+in its threadpool instead of on the event loop.
 """
 
+import json
 import logging
 from datetime import date, datetime
-from typing import Optional, List, Dict, Any, Generator
+from typing import Optional, List, Dict, Any, Generator, Tuple
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Depends, Query
@@ -21,7 +26,11 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from src.database.postgres_connection import PostgresConnection
+from src.database.async_connection import AsyncSession, get_async_db_session
 from src.middleware.auth import get_current_user_id
+from src.services.achievements import AchievementService
+from src.services.dashboard_aggregator import dashboard_aggregator
+from src.services.learning_velocity import LearningVelocityService
 from src.spaced_repetition import (
     get_algorithm_for_user,
     CardState,
@@ -145,7 +154,7 @@ class UserStatsResponse(BaseModel):
 # Endpoints
 
 @router.post("/review", response_model=ProcessReviewResponse)
-async def process_review(
+def process_review(
     request: ProcessReviewRequest,
     user_id: UUID = Depends(get_current_user_id),
     db: Session = Depends(get_db_session),
@@ -176,11 +185,16 @@ async def process_review(
             review_date=date.today(),
         )
         
-        # Save updated state to database
-        _save_card_state(db, result.new_state)
+        # Save updated state, review history and streak in one commit
+        _save_card_state(db, result.new_state, commit=False)
+        _save_review_history(db, user_id, request, result, card_state, commit=False)
+        current_streak = _record_review_activity(db, user_id)
+        db.commit()
+        dashboard_aggregator.invalidate(user_id)
         
-        # Save review history
-        _save_review_history(db, user_id, request, result, card_state)
+        _record_review_achievements(
+            db, user_id, 1, _mastered_delta([(card_state, result.new_state)]), current_streak
+        )
         
         return ProcessReviewResponse(
             success=True,
@@ -203,7 +217,7 @@ async def process_review(
 
 
 @router.post("/review/batch", response_model=BatchReviewResponse)
-async def process_batch_review(
+def process_batch_review(
     request: BatchReviewRequest,
     user_id: UUID = Depends(get_current_user_id),
     db: Session = Depends(get_db_session),
@@ -215,6 +229,9 @@ async def process_batch_review(
     - Validates that all learning_progress_ids belong to the provided learner_id
     - Verifies user_id is guardian/owner of that learner_id
     - Processes all reviews atomically (all-or-nothing transaction)
+    
+    Card states are loaded with one query, the algorithm runs over them in
+    memory, and schedules and history are written with one statement each.
     """
     results = []
     total_succeeded = 0
@@ -240,87 +257,77 @@ async def process_batch_review(
     # Step 2: Get algorithm once (shared across all reviews)
     algorithm = get_algorithm_for_user(user_id, db)
     
-    # Step 3: Process each review
+    # Step 3: Load every card state (and progress owner) in one query
+    card_states = _get_card_states(
+        db, user_id, [review.learning_progress_id for review in request.reviews]
+    )
+    
+    # Step 4: Run the algorithm in memory. A card reviewed twice in one batch
+    # sees the state left by its earlier review, as with sequential writes.
+    today = date.today()
+    updated_states: Dict[int, CardState] = {}
+    history: List[Tuple[ProcessReviewRequest, ReviewResult, CardState]] = []
     for review_request in request.reviews:
+        progress_id = review_request.learning_progress_id
+        learner_id, card_state = card_states.get(progress_id, (None, None))
+        
+        error = None
+        if request.learner_id and progress_id not in card_states:
+            error = "Learning progress not found"
+        elif request.learner_id and learner_id != request.learner_id:
+            error = "Learner mismatch"
+        elif card_state is None:
+            error = "Card state not found"
+        if error:
+            results.append(BatchReviewItemResponse(
+                learning_progress_id=progress_id,
+                success=False,
+                error=error
+            ))
+            total_failed += 1
+            continue
+        
+        card_state = updated_states.get(progress_id, card_state)
         try:
-            # Validate learning_progress belongs to learner_id (if provided)
-            if request.learner_id:
-                progress_check = db.execute(
-                    text("""
-                        SELECT lp.id, lp.learner_id
-                        FROM learning_progress lp
-                        WHERE lp.id = :progress_id
-                    """),
-                    {'progress_id': review_request.learning_progress_id}
-                ).fetchone()
-                
-                if not progress_check:
-                    results.append(BatchReviewItemResponse(
-                        learning_progress_id=review_request.learning_progress_id,
-                        success=False,
-                        error="Learning progress not found"
-                    ))
-                    total_failed += 1
-                    continue
-                
-                if progress_check[1] != request.learner_id:
-                    results.append(BatchReviewItemResponse(
-                        learning_progress_id=review_request.learning_progress_id,
-                        success=False,
-                        error="Learner mismatch"
-                    ))
-                    total_failed += 1
-                    continue
-            
-            # Get card state
-            card_state = _get_card_state(db, user_id, review_request.learning_progress_id)
-            if not card_state:
-                results.append(BatchReviewItemResponse(
-                    learning_progress_id=review_request.learning_progress_id,
-                    success=False,
-                    error="Card state not found"
-                ))
-                total_failed += 1
-                continue
-            
-            # Process review
             rating = PerformanceRating(review_request.performance_rating)
             result = algorithm.process_review(
                 state=card_state,
                 rating=rating,
                 response_time_ms=review_request.response_time_ms,
-                review_date=date.today(),
+                review_date=today,
             )
-            
-            # Save state and history (deferred commit - batch endpoint handles commit)
-            _save_card_state(db, result.new_state, commit=False)
-            _save_review_history(db, user_id, review_request, result, card_state, commit=False)
-            
-            results.append(BatchReviewItemResponse(
-                learning_progress_id=review_request.learning_progress_id,
-                success=True,
-                next_review_date=result.next_review_date.isoformat(),
-                next_interval_days=result.next_interval_days,
-                was_correct=result.was_correct,
-                retention_predicted=result.retention_predicted,
-                mastery_level=result.new_state.mastery_level,
-                mastery_changed=result.mastery_changed,
-                became_leech=result.became_leech,
-                algorithm_type=result.algorithm_type,
-            ))
-            total_succeeded += 1
-            
         except Exception as e:
-            logger.error(f"Failed to process review for learning_progress_id {review_request.learning_progress_id}: {e}")
+            logger.error(f"Failed to process review for learning_progress_id {progress_id}: {e}")
             results.append(BatchReviewItemResponse(
-                learning_progress_id=review_request.learning_progress_id,
+                learning_progress_id=progress_id,
                 success=False,
                 error=str(e)
             ))
             total_failed += 1
+            continue
+        
+        updated_states[progress_id] = result.new_state
+        history.append((review_request, result, card_state))
+        results.append(BatchReviewItemResponse(
+            learning_progress_id=progress_id,
+            success=True,
+            next_review_date=result.next_review_date.isoformat(),
+            next_interval_days=result.next_interval_days,
+            was_correct=result.was_correct,
+            retention_predicted=result.retention_predicted,
+            mastery_level=result.new_state.mastery_level,
+            mastery_changed=result.mastery_changed,
+            became_leech=result.became_leech,
+            algorithm_type=result.algorithm_type,
+        ))
+        total_succeeded += 1
     
-    # Step 4: Commit all successful reviews in one transaction
+    # Step 5: One UPDATE for the schedules, one INSERT for the history, one
+    # commit; any failure rolls back every review in the batch
     try:
+        _save_card_states(db, user_id, list(updated_states.values()))
+        _save_review_histories(db, user_id, history)
+        current_streak = _record_review_activity(db, user_id) if history else None
         db.commit()
     except Exception as e:
         db.rollback()
@@ -329,6 +336,14 @@ async def process_batch_review(
             status_code=500,
             detail=f"Transaction failed: {str(e)}"
         )
+    dashboard_aggregator.invalidate(user_id)
+    
+    # Step 6: Achievement counters (first loaded state vs. final state per card)
+    if history:
+        mastered_delta = _mastered_delta([
+            (card_states[progress_id][1], state) for progress_id, state in updated_states.items()
+        ])
+        _record_review_achievements(db, user_id, len(history), mastered_delta, current_streak)
     
     return BatchReviewResponse(
         total_processed=len(request.reviews),
@@ -339,7 +354,7 @@ async def process_batch_review(
 
 
 @router.get("/algorithm", response_model=AlgorithmInfoResponse)
-async def get_algorithm_info(
+def get_algorithm_info(
     user_id: UUID = Depends(get_current_user_id),
     db: Session = Depends(get_db_session),
 ):
@@ -387,7 +402,7 @@ async def get_algorithm_info(
 
 
 @router.post("/migrate-to-fsrs")
-async def migrate_to_fsrs(
+def migrate_to_fsrs(
     user_id: UUID = Depends(get_current_user_id),
     db: Session = Depends(get_db_session),
 ):
@@ -424,7 +439,7 @@ async def get_due_cards(
     limit: int = 20,
     learner_id: Optional[UUID] = Query(None, description="Learner ID (defaults to parent's learner profile)"),
     user_id: UUID = Depends(get_current_user_id),
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_async_db_session),
 ):
     """
     Get cards due for review.
@@ -442,13 +457,13 @@ async def get_due_cards(
         
         if learner_id:
             # Security check: Verify user is guardian of this learner
-            learner_check = db.execute(
+            learner_check = (await db.execute(
                 text("""
                     SELECT id FROM public.learners
                     WHERE id = :learner_id AND guardian_id = :guardian_id
                 """),
                 {'learner_id': learner_id, 'guardian_id': user_id}
-            ).fetchone()
+            )).fetchone()
             
             if not learner_check:
                 raise HTTPException(
@@ -458,13 +473,13 @@ async def get_due_cards(
             target_learner_id = learner_id
         else:
             # Fallback: Find parent's own learner profile
-            parent_learner = db.execute(
+            parent_learner = (await db.execute(
                 text("""
                     SELECT id FROM public.learners
                     WHERE user_id = :user_id AND is_parent_profile = true
                 """),
                 {'user_id': user_id}
-            ).fetchone()
+            )).fetchone()
             
             if parent_learner:
                 target_learner_id = parent_learner[0]
@@ -475,7 +490,7 @@ async def get_due_cards(
         # 2. Query verification_schedule filtered by learner_id via learning_progress
         if target_learner_id:
             # New system: Filter by learner_id via learning_progress
-            result = db.execute(
+            result = await db.execute(
                 text("""
                     SELECT 
                         vs.id,
@@ -496,7 +511,7 @@ async def get_due_cards(
             )
         else:
             # Legacy: Filter by user_id (backward compatibility)
-            result = db.execute(
+            result = await db.execute(
                 text("""
                     SELECT 
                         vs.id,
@@ -554,7 +569,7 @@ async def get_due_cards(
 @router.get("/stats", response_model=UserStatsResponse)
 async def get_user_stats(
     user_id: UUID = Depends(get_current_user_id),
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_async_db_session),
 ):
     """
     Get user's review statistics.
@@ -565,12 +580,13 @@ async def get_user_stats(
     - Today's review count
     """
     try:
-        # Get algorithm
-        service = AssignmentService(db)
-        algorithm = service.get_or_assign(user_id, db)
+        # Get algorithm (assignment service is synchronous)
+        algorithm = await db.run_sync(
+            lambda session: AssignmentService(session).get_or_assign(user_id, session)
+        )
         
         # Get review totals
-        review_result = db.execute(
+        review_result = await db.execute(
             text("""
                 SELECT 
                     COUNT(*) as total_reviews,
@@ -588,7 +604,7 @@ async def get_user_stats(
         retention_rate = total_correct / total_reviews if total_reviews > 0 else 0
         
         # Get card counts by mastery
-        card_result = db.execute(
+        card_result = await db.execute(
             text("""
                 SELECT 
                     mastery_level,
@@ -609,7 +625,7 @@ async def get_user_stats(
             mastery_counts[level] = row[1]
         
         # Get average interval
-        interval_result = db.execute(
+        interval_result = await db.execute(
             text("""
                 SELECT AVG(current_interval)
                 FROM verification_schedule
@@ -640,15 +656,8 @@ async def get_user_stats(
 
 # Helper functions
 
-def _get_card_state(
-    db: Session,
-    user_id: UUID,
-    learning_progress_id: int,
-) -> Optional[CardState]:
-    """Load card state from database."""
-    result = db.execute(
-        text("""
-            SELECT 
+# Column order shared by the card-state SELECTs (see _card_state_from_row)
+CARD_STATE_COLUMNS = """
                 vs.learning_progress_id,
                 lp.learning_point_id,
                 vs.algorithm_type,
@@ -666,18 +675,55 @@ def _get_card_state(
                 vs.retention_probability,
                 vs.fsrs_state,
                 vs.avg_response_time_ms
-            FROM verification_schedule vs
-            JOIN learning_progress lp ON lp.id = vs.learning_progress_id
-            WHERE vs.user_id = :user_id
-            AND vs.learning_progress_id = :learning_progress_id
-        """),
-        {'user_id': user_id, 'learning_progress_id': learning_progress_id}
-    )
+"""
+
+
+def _record_review_activity(db: Session, user_id: UUID) -> Optional[int]:
+    """
+    Advance the streak of the user's own learner profile for today's reviews.
     
-    row = result.fetchone()
-    if not row:
-        return None
+    Reviews are attributed like fsrs_review_history in the streak backfill;
+    a failed upsert is rolled back to its savepoint and does not fail the review.
     
+    Returns:
+        The current streak, or None if it could not be updated
+    """
+    try:
+        current_streak, _, _ = LearningVelocityService(db).record_activity_and_check_streak(user_id)
+        return current_streak
+    except Exception as e:
+        logger.warning(f"Streak update failed for reviews ({user_id}): {e}")
+        return None
+
+
+def _mastered_delta(transitions: List[Tuple[CardState, CardState]]) -> int:
+    """Net change in mastered cards over (old_state, new_state) pairs."""
+    return sum(
+        (new.mastery_level == 'mastered') - (old.mastery_level == 'mastered')
+        for old, new in transitions
+    )
+
+
+def _record_review_achievements(
+    db: Session,
+    user_id: UUID,
+    reviews: int,
+    mastered_delta: int,
+    current_streak: Optional[int],
+) -> None:
+    """Apply committed reviews to the achievement counters (incremental check)."""
+    try:
+        AchievementService(db).record_event(
+            user_id,
+            increments={'total_reviews': reviews, 'blocks_mastered': mastered_delta},
+            values={'streak_days': current_streak},
+        )
+    except Exception as e:
+        logger.error(f"Failed to check achievements: {e}")
+
+
+def _card_state_from_row(user_id: UUID, row) -> CardState:
+    """Build a CardState from CARD_STATE_COLUMNS."""
     return CardState(
         user_id=user_id,
         learning_progress_id=row[0],
@@ -700,10 +746,91 @@ def _get_card_state(
     )
 
 
+def _get_card_state(
+    db: Session,
+    user_id: UUID,
+    learning_progress_id: int,
+) -> Optional[CardState]:
+    """Load card state from database."""
+    result = db.execute(
+        text(f"""
+            SELECT {CARD_STATE_COLUMNS}
+            FROM verification_schedule vs
+            JOIN learning_progress lp ON lp.id = vs.learning_progress_id
+            WHERE vs.user_id = :user_id
+            AND vs.learning_progress_id = :learning_progress_id
+        """),
+        {'user_id': user_id, 'learning_progress_id': learning_progress_id}
+    )
+    
+    row = result.fetchone()
+    if not row:
+        return None
+    
+    return _card_state_from_row(user_id, row)
+
+
+def _get_card_states(
+    db: Session,
+    user_id: UUID,
+    learning_progress_ids: List[int],
+) -> Dict[int, Tuple[Any, Optional[CardState]]]:
+    """
+    Load learning progress owners and card states in one query.
+    
+    Returns:
+        {learning_progress_id: (learner_id, card_state)}; card_state is None
+        when the progress row has no schedule for this user, and ids that do
+        not exist are missing
+    """
+    result = db.execute(
+        text(f"""
+            SELECT
+                lp.id,
+                lp.learner_id,
+                {CARD_STATE_COLUMNS}
+            FROM learning_progress lp
+            LEFT JOIN verification_schedule vs
+                ON vs.learning_progress_id = lp.id
+                AND vs.user_id = :user_id
+            WHERE lp.id = ANY(CAST(:learning_progress_ids AS int[]))
+        """),
+        {'user_id': user_id, 'learning_progress_ids': list(set(learning_progress_ids))}
+    )
+    
+    states: Dict[int, Tuple[Any, Optional[CardState]]] = {}
+    for row in result.fetchall():
+        if row[0] in states:
+            continue
+        card_state = _card_state_from_row(user_id, row[2:]) if row[2] is not None else None
+        states[row[0]] = (row[1], card_state)
+    return states
+
+
+def _card_state_params(state: CardState) -> Dict[str, Any]:
+    """Bind parameters for a verification_schedule update."""
+    return {
+        'learning_progress_id': state.learning_progress_id,
+        'algorithm_type': state.algorithm_type,
+        'current_interval': state.current_interval,
+        'scheduled_date': state.scheduled_date,
+        'last_review_date': state.last_review_date,
+        'total_reviews': state.total_reviews,
+        'total_correct': state.total_correct,
+        'mastery_level': state.mastery_level,
+        'is_leech': state.is_leech,
+        'ease_factor': state.ease_factor,
+        'consecutive_correct': state.consecutive_correct,
+        'stability': state.stability,
+        'difficulty': state.difficulty,
+        'retention_probability': state.retention_probability,
+        'fsrs_state': json.dumps(state.fsrs_state) if state.fsrs_state else None,
+        'avg_response_time_ms': state.avg_response_time_ms,
+    }
+
+
 def _save_card_state(db: Session, state: CardState, commit: bool = True) -> None:
     """Save card state to database."""
-    import json
-    
     db.execute(
         text("""
             UPDATE verification_schedule
@@ -727,30 +854,90 @@ def _save_card_state(db: Session, state: CardState, commit: bool = True) -> None
             WHERE user_id = :user_id
             AND learning_progress_id = :learning_progress_id
         """),
-        {
-            'user_id': state.user_id,
-            'learning_progress_id': state.learning_progress_id,
-            'algorithm_type': state.algorithm_type,
-            'current_interval': state.current_interval,
-            'scheduled_date': state.scheduled_date,
-            'last_review_date': state.last_review_date,
-            'total_reviews': state.total_reviews,
-            'total_correct': state.total_correct,
-            'mastery_level': state.mastery_level,
-            'is_leech': state.is_leech,
-            'ease_factor': state.ease_factor,
-            'consecutive_correct': state.consecutive_correct,
-            'stability': state.stability,
-            'difficulty': state.difficulty,
-            'retention_probability': state.retention_probability,
-            'fsrs_state': json.dumps(state.fsrs_state) if state.fsrs_state else None,
-            'avg_response_time_ms': state.avg_response_time_ms,
-        }
+        {'user_id': state.user_id, **_card_state_params(state)}
     )
     if commit:
         db.commit()
 
 
+def _save_card_states(db: Session, user_id: UUID, states: List[CardState]) -> None:
+    """Save many card states with one UPDATE ... FROM unnest (no commit)."""
+    if not states:
+        return
+    rows = [_card_state_params(state) for state in states]
+    db.execute(
+        text("""
+            UPDATE verification_schedule vs
+            SET 
+                algorithm_type = u.algorithm_type,
+                current_interval = u.current_interval,
+                scheduled_date = u.scheduled_date,
+                last_review_date = u.last_review_date,
+                total_reviews = u.total_reviews,
+                total_correct = u.total_correct,
+                mastery_level = u.mastery_level,
+                is_leech = u.is_leech,
+                ease_factor = u.ease_factor,
+                consecutive_correct = u.consecutive_correct,
+                stability = u.stability,
+                difficulty = u.difficulty,
+                retention_probability = u.retention_probability,
+                fsrs_state = u.fsrs_state,
+                avg_response_time_ms = u.avg_response_time_ms,
+                updated_at = NOW()
+            FROM unnest(
+                CAST(:learning_progress_id AS int[]),
+                CAST(:algorithm_type AS text[]),
+                CAST(:current_interval AS int[]),
+                CAST(:scheduled_date AS date[]),
+                CAST(:last_review_date AS date[]),
+                CAST(:total_reviews AS int[]),
+                CAST(:total_correct AS int[]),
+                CAST(:mastery_level AS text[]),
+                CAST(:is_leech AS boolean[]),
+                CAST(:ease_factor AS float8[]),
+                CAST(:consecutive_correct AS int[]),
+                CAST(:stability AS float8[]),
+                CAST(:difficulty AS float8[]),
+                CAST(:retention_probability AS float8[]),
+                CAST(:fsrs_state AS jsonb[]),
+                CAST(:avg_response_time_ms AS int[])
+            ) AS u(
+                learning_progress_id, algorithm_type, current_interval,
+                scheduled_date, last_review_date, total_reviews, total_correct,
+                mastery_level, is_leech, ease_factor, consecutive_correct,
+                stability, difficulty, retention_probability, fsrs_state,
+                avg_response_time_ms
+            )
+            WHERE vs.user_id = :user_id
+            AND vs.learning_progress_id = u.learning_progress_id
+        """),
+        {'user_id': user_id, **{key: [row[key] for row in rows] for key in rows[0]}}
+    )
+
+
+def _review_history_params(
+    request: ProcessReviewRequest,
+    result: ReviewResult,
+    old_state: CardState,
+) -> Dict[str, Any]:
+    """Bind parameters for an fsrs_review_history row."""
+    return {
+        'learning_progress_id': request.learning_progress_id,
+        'performance_rating': request.performance_rating,
+        'response_time_ms': request.response_time_ms,
+        'stability_before': old_state.stability,
+        'difficulty_before': old_state.difficulty,
+        'retention_predicted': result.retention_predicted,
+        'elapsed_days': (date.today() - old_state.last_review_date).days if old_state.last_review_date else 0,
+        'stability_after': result.new_state.stability,
+        'difficulty_after': result.new_state.difficulty,
+        'interval_after': result.next_interval_days,
+        'retention_actual': result.was_correct,
+        'algorithm_type': result.algorithm_type,
+    }
+
+
 def _save_review_history(
     db: Session,
     user_id: UUID,
@@ -760,8 +947,6 @@ def _save_review_history(
     commit: bool = True,
 ) -> None:
     """Save review to history table."""
-    import json
-    
     db.execute(
         text("""
             INSERT INTO fsrs_review_history (
@@ -794,22 +979,54 @@ def _save_review_history(
                 :algorithm_type
             )
         """),
-        {
-            'user_id': user_id,
-            'learning_progress_id': request.learning_progress_id,
-            'performance_rating': request.performance_rating,
-            'response_time_ms': request.response_time_ms,
-            'stability_before': old_state.stability,
-            'difficulty_before': old_state.difficulty,
-            'retention_predicted': result.retention_predicted,
-            'elapsed_days': (date.today() - old_state.last_review_date).days if old_state.last_review_date else 0,
-            'stability_after': result.new_state.stability,
-            'difficulty_after': result.new_state.difficulty,
-            'interval_after': result.next_interval_days,
-            'retention_actual': result.was_correct,
-            'algorithm_type': result.algorithm_type,
-        }
+        {'user_id': user_id, **_review_history_params(request, result, old_state)}
     )
     if commit:
         db.commit()
 
+
+def _save_review_histories(
+    db: Session,
+    user_id: UUID,
+    reviews: List[Tuple[ProcessReviewRequest, ReviewResult, CardState]],
+) -> None:
+    """Insert many history rows with one INSERT ... SELECT FROM unnest (no commit)."""
+    if not reviews:
+        return
+    rows = [_review_history_params(*review) for review in reviews]
+    db.execute(
+        text("""
+            INSERT INTO fsrs_review_history (
+                user_id,
+                learning_progress_id,
+                performance_rating,
+                response_time_ms,
+                stability_before,
+                difficulty_before,
+                retention_predicted,
+                elapsed_days,
+                stability_after,
+                difficulty_after,
+                interval_after,
+                retention_actual,
+                algorithm_type
+            )
+            SELECT CAST(:user_id AS uuid), h.*
+            FROM unnest(
+                CAST(:learning_progress_id AS int[]),
+                CAST(:performance_rating AS int[]),
+                CAST(:response_time_ms AS int[]),
+                CAST(:stability_before AS float8[]),
+                CAST(:difficulty_before AS float8[]),
+                CAST(:retention_predicted AS float8[]),
+                CAST(:elapsed_days AS float8[]),
+                CAST(:stability_after AS float8[]),
+                CAST(:difficulty_after AS float8[]),
+                CAST(:interval_after AS int[]),
+                CAST(:retention_actual AS boolean[]),
+                CAST(:algorithm_type AS text[])
+            ) AS h
+        """),
+        {'user_id': str(user_id), **{key: [row[key] for row in rows] for key in rows[0]}}
+    )
+
@@ -28,6 +28,7 @@ from src.database.postgres_crud.verification import create_verification_schedule
 from src.services.levels import LevelService
 from src.services.achievements import AchievementService
 from src.services.learning_velocity import LearningVelocityService
+from src.services.dashboard_aggregator import dashboard_aggregator
 
 logger = logging.getLogger(__name__)
 
@@ -239,14 +240,9 @@ async def start_verification(
         try:
             from src.database.postgres_crud.mcq_stats import get_mcqs_for_sense
             from src.mcq_assembler import MCQAssembler, store_mcqs_to_postgres
-            from src.services.vocabulary_store import vocabulary_store
-            import re
+            from src.services.vocabulary_store import normalize_sense_id, vocabulary_store
             
             # Normalize sense_id (strip index suffix like _99)
-            def normalize_sense_id(sense_id: str) -> str:
-                match = re.match(r'^(.+\.\w+\.\d+)_\d+$', sense_id)
-                return match.group(1) if match else sense_id
-            
             normalized_sense_id = normalize_sense_id(request.learning_point_id)
             
             # Check if MCQs already exist for this sense
@@ -274,7 +270,7 @@ async def start_verification(
         streak_extended = False
         xp_multiplier = 1.0
         try:
-            current_streak, streak_extended, xp_multiplier = velocity_service.record_activity_and_check_streak(user_id)
+            current_streak, streak_extended, xp_multiplier = velocity_service.record_activity_and_check_streak(user_id, learner_id)
         except Exception as e:
             logger.error(f"Failed to check streak: {e}")
         
@@ -320,7 +316,11 @@ async def start_verification(
         # Check for newly unlocked achievements
         newly_unlocked = []
         try:
-            newly_unlocked = achievement_service.check_achievements(user_id)
+            newly_unlocked = achievement_service.record_event(
+                user_id,
+                increments={'blocks_learned': 1},
+                values={'streak_days': current_streak}
+            )
         except Exception as e:
             logger.error(f"Failed to check achievements: {e}")
         
@@ -363,6 +363,7 @@ async def start_verification(
             level_up=level_up_info,
             achievements_unlocked=achievements_unlocked,
         )
+        dashboard_aggregator.invalidate(user_id)
         
         return StartVerificationResponse(
             success=True,
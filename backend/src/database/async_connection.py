@@ -0,0 +1,158 @@
+"""
+Async PostgreSQL Connection (asyncpg)
+
+AsyncSession for FastAPI endpoints that should not block the event loop.
+Endpoints opt in with `db: AsyncSession = Depends(get_async_db_session)`;
+synchronous helpers (CRUD, services) can still be called through
+`await db.run_sync(fn)`.
+
+- Same DATABASE_URL and DB_POOL_MODE settings as postgres_connection
+- asyncpg statement caching is disabled and prepared statements get unique
+  names, so transaction-mode poolers (Supabase 6543, pgbouncer) are safe
+- Requires the optional asyncpg + greenlet packages (sqlalchemy[asyncio])
+
+Usage:
+    from src.database.async_connection import get_async_db_session
+
+    @router.get("/due")
+    async def get_due_cards(db: AsyncSession = Depends(get_async_db_session)):
+        result = await db.execute(text("SELECT ..."), {...})
+"""
+
+import os
+from typing import Any, AsyncGenerator, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from uuid import uuid4
+
+from .postgres_connection import (
+    MAX_OVERFLOW,
+    POOL_MODE,
+    POOL_RECYCLE_SECONDS,
+    POOL_SIZE,
+    POOL_TIMEOUT_SECONDS,
+)
+
+try:
+    import asyncpg  # noqa: F401
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+    HAS_ASYNC_DB = True
+except ImportError:
+    AsyncSession = Any  # Annotation placeholder; get_async_engine() raises
+    HAS_ASYNC_DB = False
+
+
+# libpq-only URL parameters; sslmode is translated to asyncpg's `ssl`
+_LIBPQ_ONLY_PARAMS = {
+    'sslmode', 'connect_timeout', 'keepalives', 'keepalives_idle',
+    'keepalives_interval', 'keepalives_count', 'application_name',
+}
+
+DEFAULT_SSL_MODE = "prefer"
+
+# Global async engine singleton
+_async_engine = None
+_AsyncSessionLocal = None
+
+
+def to_async_url(connection_string: str) -> Tuple[str, Dict]:
+    """
+    Convert a libpq/psycopg2 URL into an asyncpg URL plus connect args.
+
+    Args:
+        connection_string: e.g. postgresql://user:pw@host:6543/db?sslmode=require
+
+    Returns:
+        (postgresql+asyncpg://... URL without libpq-only params, connect_args)
+    """
+    parts = urlsplit(connection_string)
+    scheme = parts.scheme.split('+', 1)[0]
+    if scheme == 'postgres':
+        scheme = 'postgresql'
+
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    params = dict(query)
+    kept = [(key, value) for key, value in query if key not in _LIBPQ_ONLY_PARAMS]
+
+    connect_args = {
+        'ssl': params.get('sslmode', DEFAULT_SSL_MODE),
+        'timeout': int(params.get('connect_timeout', 30)),
+        # Transaction-mode poolers hand each transaction a different backend,
+        # so never reuse named prepared statements across transactions
+        'statement_cache_size': 0,
+        'prepared_statement_cache_size': 0,
+        'prepared_statement_name_func': lambda: f"__asyncpg_{uuid4()}__",
+    }
+    url = urlunsplit((f"{scheme}+asyncpg", parts.netloc, parts.path, urlencode(kept), parts.fragment))
+    return url, connect_args
+
+
+def _create_async_engine(connection_string: str, pool_mode: Optional[str] = None):
+    """Create an async engine using the configured pooling mode."""
+    url, connect_args = to_async_url(connection_string)
+    pool_mode = (pool_mode or POOL_MODE).lower()
+    if pool_mode == "queue":
+        pool_kwargs = {
+            "poolclass": AsyncAdaptedQueuePool,
+            "pool_size": POOL_SIZE,
+            "max_overflow": MAX_OVERFLOW,
+            "pool_recycle": POOL_RECYCLE_SECONDS,
+            "pool_timeout": POOL_TIMEOUT_SECONDS,
+            "pool_use_lifo": True,
+        }
+    elif pool_mode == "null":
+        pool_kwargs = {"poolclass": NullPool}
+    else:
+        raise ValueError(f"Invalid DB_POOL_MODE: {pool_mode} (expected 'null' or 'queue')")
+
+    return create_async_engine(
+        url,
+        pool_pre_ping=True,
+        connect_args=connect_args,
+        echo=False,
+        **pool_kwargs
+    )
+
+
+def get_async_engine():
+    """Get or create the global async engine and session factory."""
+    global _async_engine, _AsyncSessionLocal
+
+    if not HAS_ASYNC_DB:
+        raise RuntimeError(
+            "Async database support requires asyncpg and greenlet "
+            "(pip install 'sqlalchemy[asyncio]' asyncpg)."
+        )
+
+    if _async_engine is None:
+        connection_string = os.getenv("DATABASE_URL")
+        if not connection_string:
+            raise ValueError(
+                "PostgreSQL connection string missing. "
+                "Set DATABASE_URL environment variable."
+            )
+
+        _async_engine = _create_async_engine(connection_string)
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=_async_engine,
+            autoflush=False,
+            expire_on_commit=False  # Prevent lazy loading issues after commit
+        )
+
+    return _async_engine, _AsyncSessionLocal
+
+
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency yielding an AsyncSession (rolled back if left open)."""
+    _, AsyncSessionLocal = get_async_engine()
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def dispose_async_engine():
+    """Close pooled async connections (call on application shutdown)."""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _AsyncSessionLocal = None
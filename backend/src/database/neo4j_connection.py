@@ -2,52 +2,219 @@
 Neo4j Connection Manager
 
 Handles connection to Neo4j Aura instance and provides session management.
+
+Drivers are process-wide: every Neo4jConnection for the same URI/user shares
+one GraphDatabase.driver (and its connection pool), so per-request or
+per-task connections reuse warm sockets instead of reconnecting.
+
+- Pool settings: NEO4J_MAX_POOL_SIZE, NEO4J_ACQUISITION_TIMEOUT,
+  NEO4J_MAX_CONNECTION_LIFETIME
+- execute_read / execute_write run managed transactions (reads are routed
+  to read replicas on clusters) and record timing per query name
+- neo4j_query_metrics.snapshot() is served on /internal/metrics
+
+Usage:
+    conn = Neo4jConnection()
+    records = conn.execute_read("mine.block_detail", "MATCH ... RETURN ...", sense_id=sid)
 """
-from neo4j import GraphDatabase
-from typing import Optional
+from neo4j import GraphDatabase, READ_ACCESS, WRITE_ACCESS
+from typing import Any, Dict, List, Optional, Tuple
+import atexit
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
+MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+ACQUISITION_TIMEOUT_SECONDS = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "60"))
+# Below Aura's idle-connection cutoff so pooled sockets are not silently dropped
+MAX_CONNECTION_LIFETIME_SECONDS = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "1800"))
+
+
+# ============================================
+# Query timing
+# ============================================
+
+class QueryMetrics:
+    """Call counts and latency per Cypher query name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, name: str, seconds: float, failed: bool = False):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = {'count': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+            elapsed_ms = seconds * 1000
+            stats['count'] += 1
+            stats['errors'] += 1 if failed else 0
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-query stats, the queries with the most total time first."""
+        with self._lock:
+            items = sorted(self._stats.items(), key=lambda item: item[1]['total_ms'], reverse=True)
+            return {
+                name: {
+                    'count': int(stats['count']),
+                    'errors': int(stats['errors']),
+                    'total_ms': round(stats['total_ms'], 3),
+                    'avg_ms': round(stats['total_ms'] / stats['count'], 3),
+                    'max_ms': round(stats['max_ms'], 3),
+                }
+                for name, stats in items
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+# Process-wide query metrics (recorded by execute_read / execute_write)
+neo4j_query_metrics = QueryMetrics()
+
+
+# ============================================
+# Driver registry
+# ============================================
+
+_drivers: Dict[Tuple[str, str], Any] = {}
+_drivers_lock = threading.Lock()
+
+
+def get_driver(uri: str, user: str, password: str):
+    """Shared driver for (uri, user), created on first use."""
+    key = (uri, user)
+    with _drivers_lock:
+        driver = _drivers.get(key)
+        if driver is None:
+            driver = GraphDatabase.driver(
+                uri,
+                auth=(user, password),
+                max_connection_pool_size=MAX_POOL_SIZE,
+                connection_acquisition_timeout=ACQUISITION_TIMEOUT_SECONDS,
+                max_connection_lifetime=MAX_CONNECTION_LIFETIME_SECONDS,
+            )
+            _drivers[key] = driver
+        return driver
+
+
+def close_all_drivers():
+    """Close every shared driver (application shutdown / process exit)."""
+    with _drivers_lock:
+        drivers = list(_drivers.values())
+        _drivers.clear()
+    for driver in drivers:
+        try:
+            driver.close()
+        except Exception as e:
+            print(f"Failed to close Neo4j driver: {e}")
+
+
+atexit.register(close_all_drivers)
+
 
 class Neo4jConnection:
     """Manages Neo4j database connection and sessions."""
-    
-    def __init__(self, uri: Optional[str] = None, user: Optional[str] = None, password: Optional[str] = None):
+
+    def __init__(
+        self,
+        uri: Optional[str] = None,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        shared: bool = True
+    ):
         """
         Initialize Neo4j connection.
-        
+
         Args:
             uri: Neo4j connection URI (defaults to NEO4J_URI env var)
             user: Neo4j username (defaults to NEO4J_USER env var)
             password: Neo4j password (defaults to NEO4J_PASSWORD env var)
+            shared: Use the process-wide driver (False creates a private
+                driver that close() shuts down)
         """
         self.uri = uri or os.getenv("NEO4J_URI")
         self.user = user or os.getenv("NEO4J_USER")
         self.password = password or os.getenv("NEO4J_PASSWORD")
-        
+
         if not all([self.uri, self.user, self.password]):
             raise ValueError(
                 "Neo4j connection parameters missing. "
                 "Provide uri/user/password or set NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD environment variables."
             )
-        
-        self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
-    
+
+        self.shared = shared
+        if shared:
+            self.driver = get_driver(self.uri, self.user, self.password)
+        else:
+            self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
+
     def close(self):
-        """Close the Neo4j driver connection."""
-        if self.driver:
+        """Close the Neo4j driver connection (shared drivers stay open)."""
+        if self.driver and not self.shared:
             self.driver.close()
-    
-    def get_session(self):
+
+    def get_session(self, **kwargs):
         """Get a new Neo4j session."""
-        return self.driver.session()
-    
+        return self.driver.session(**kwargs)
+
+    # ============================================
+    # Managed transactions
+    # ============================================
+
+    def _execute(self, query_name: str, cypher: str, params: Dict[str, Any], write: bool) -> List:
+        start = time.perf_counter()
+        failed = False
+        try:
+            access_mode = WRITE_ACCESS if write else READ_ACCESS
+            with self.driver.session(default_access_mode=access_mode) as session:
+                work = session.execute_write if write else session.execute_read
+                # Records are materialized inside the transaction (retries re-run it)
+                return work(lambda tx: list(tx.run(cypher, params)))
+        except Exception:
+            failed = True
+            raise
+        finally:
+            neo4j_query_metrics.record(query_name, time.perf_counter() - start, failed)
+
+    def execute_read(self, query_name: str, cypher: str, **params) -> List:
+        """
+        Run a read query in a managed (retried, read-routed) transaction.
+
+        Args:
+            query_name: Stable name for timing metrics (e.g. "mine.block_detail")
+            cypher: Cypher query
+            **params: Query parameters
+
+        Returns:
+            List of neo4j Records
+        """
+        return self._execute(query_name, cypher, params, write=False)
+
+    def execute_write(self, query_name: str, cypher: str, **params) -> List:
+        """
+        Run a write query in a managed (retried) transaction.
+
+        Args:
+            query_name: Stable name for timing metrics
+            cypher: Cypher query
+            **params: Query parameters
+
+        Returns:
+            List of neo4j Records
+        """
+        return self._execute(query_name, cypher, params, write=True)
+
     def verify_connectivity(self) -> bool:
         """
         Verify that the connection to Neo4j is working.
-        
+
         Returns:
             True if connection is successful, False otherwise
         """
@@ -59,12 +226,11 @@ class Neo4jConnection:
         except Exception as e:
             print(f"Connection verification failed: {e}")
             return False
-    
+
     def __enter__(self):
         """Context manager entry."""
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
         self.close()
-
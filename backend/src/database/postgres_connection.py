@@ -3,22 +3,148 @@ PostgreSQL Connection Manager (Supabase)
 
 Handles connection to Supabase PostgreSQL instance and provides session management.
 Optimized for Supabase Transaction mode pooler (port 6543).
+
+Pooling is selected with DB_POOL_MODE:
+- "null" (default): NullPool, a fresh connection per checkout; the external
+  pooler (Supabase / pgbouncer) does all pooling
+- "queue": QueuePool kept in-process (DB_POOL_SIZE, DB_MAX_OVERFLOW,
+  DB_POOL_RECYCLE, DB_POOL_TIMEOUT), for a local pgbouncer or direct Postgres.
+  psycopg2 does not use server-side prepared statements, and connections are
+  rolled back on return, so this is safe behind transaction-mode poolers too
+
+pool_metrics() reports checkouts, connects and checkout wait time for the
+shared engine (served on /internal/metrics).
 """
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import NullPool
-from typing import Optional, Generator
+from sqlalchemy.pool import NullPool, QueuePool
+from typing import Any, Dict, Optional, Generator
 from contextlib import contextmanager
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
+POOL_MODE = os.getenv("DB_POOL_MODE", "null").lower()
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+CONNECT_ARGS = {
+    "sslmode": "prefer",  # Try 'prefer' first, fallback to 'require' if needed
+    "connect_timeout": 30,
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 10,
+    "keepalives_count": 5,
+}
+
 # Global engine singleton - reuse across requests
 _engine = None
 _SessionLocal = None
 
 
+# ============================================
+# Instrumented pools
+# ============================================
+
+class PoolStats:
+    """Checkout counters and wait times for one pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_checkout(self, wait_seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'connects': self.connects,
+                'timeouts': self.timeouts,
+                'avg_wait_ms': round(self.wait_seconds_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                'max_wait_ms': round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+class _TimedPoolMixin:
+    """Times each checkout (queue wait plus connect, when one is opened)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _create_connection(self):
+        self.stats.record_connect()
+        return super()._create_connection()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record_checkout(time.perf_counter() - start)
+        return connection
+
+
+class TimedNullPool(_TimedPoolMixin, NullPool):
+    pass
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+def _create_engine(connection_string: str, pool_mode: Optional[str] = None):
+    """Create an engine using the configured pooling mode."""
+    pool_mode = (pool_mode or POOL_MODE).lower()
+    if pool_mode == "queue":
+        pool_kwargs = {
+            "poolclass": TimedQueuePool,
+            "pool_size": POOL_SIZE,
+            "max_overflow": MAX_OVERFLOW,
+            "pool_recycle": POOL_RECYCLE_SECONDS,  # Stay under server/pooler idle timeouts
+            "pool_timeout": POOL_TIMEOUT_SECONDS,
+            "pool_use_lifo": True,  # Let surplus idle connections age out
+        }
+    elif pool_mode == "null":
+        # Supabase handles connection pooling
+        pool_kwargs = {"poolclass": TimedNullPool}  # Essential for Transaction mode
+    else:
+        raise ValueError(f"Invalid DB_POOL_MODE: {pool_mode} (expected 'null' or 'queue')")
+    
+    return create_engine(
+        connection_string,
+        pool_pre_ping=True,  # Test connections before using (fixes stale SSL connections)
+        connect_args=CONNECT_ARGS,
+        echo=False,
+        **pool_kwargs
+    )
+
+
 def _get_engine():
     """Get or create the global engine singleton."""
     global _engine, _SessionLocal
@@ -31,22 +157,7 @@ def _get_engine():
                 "Set DATABASE_URL environment variable."
             )
         
-        # Create engine for Transaction Pooler (port 6543)
-        # Use NullPool - Supabase handles connection pooling
-        _engine = create_engine(
-            connection_string,
-            poolclass=NullPool,  # Essential for Transaction mode
-            pool_pre_ping=True,  # Test connections before using (fixes stale SSL connections)
-            connect_args={
-                "sslmode": "prefer",  # Try 'prefer' first, fallback to 'require' if needed
-                "connect_timeout": 30,
-                "keepalives": 1,
-                "keepalives_idle": 30,
-                "keepalives_interval": 10,
-                "keepalives_count": 5,
-            },
-            echo=False
-        )
+        _engine = _create_engine(connection_string)
         
         _SessionLocal = sessionmaker(
             autocommit=False,
@@ -58,6 +169,36 @@ def _get_engine():
     return _engine, _SessionLocal
 
 
+def pool_metrics(engine=None) -> Dict[str, Any]:
+    """
+    Pool state for an engine (the shared engine by default).
+
+    Returns:
+        Mode, checked-out/overflow counts (queue mode) and checkout stats;
+        {'initialized': False} before the shared engine is created
+    """
+    engine = engine if engine is not None else _engine
+    if engine is None:
+        return {'initialized': False}
+    
+    pool = engine.pool
+    metrics: Dict[str, Any] = {
+        'initialized': True,
+        'mode': 'queue' if isinstance(pool, QueuePool) else 'null',
+    }
+    if isinstance(pool, QueuePool):
+        metrics.update({
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': pool.overflow(),
+        })
+    stats = getattr(pool, 'stats', None)
+    if stats is not None:
+        metrics.update(stats.snapshot())
+    return metrics
+
+
 @contextmanager
 def get_db_session() -> Generator[Session, None, None]:
     """
@@ -103,20 +244,7 @@ class PostgresConnection:
             self.engine, self.SessionLocal = _get_engine()
         else:
             # Custom connection string - create new engine
-            self.engine = create_engine(
-                self.connection_string,
-                poolclass=NullPool,
-                pool_pre_ping=True,  # Test connections before using (fixes stale SSL connections)
-                connect_args={
-                    "sslmode": "prefer",  # Try 'prefer' first, fallback to 'require' if needed
-                    "connect_timeout": 30,
-                    "keepalives": 1,
-                    "keepalives_idle": 30,
-                    "keepalives_interval": 10,
-                    "keepalives_count": 5,
-                },
-                echo=False
-            )
+            self.engine = _create_engine(self.connection_string)
             self.SessionLocal = sessionmaker(
                 autocommit=False,
                 autoflush=False,
@@ -148,7 +276,8 @@ class PostgresConnection:
     def close(self):
         """Close the database engine."""
         # Don't dispose global engine
-        pass
+        if self.engine is not _engine:
+            self.engine.dispose()
     
     def __enter__(self):
         """Context manager entry."""
@@ -7,12 +7,16 @@ Provides:
 - Statistics retrieval (quality metrics)
 - Adaptive selection helpers (get MCQs by difficulty)
 """
+import io
+import json
+from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
 from datetime import datetime
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import and_, or_, func, desc, insert, text, any_, bindparam, String
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from ..models import MCQPool, MCQStatistics, MCQAttempt
 
@@ -113,6 +117,37 @@ def get_mcqs_for_sense(
     return query.all()
 
 
+def get_mcqs_for_senses(
+    session: Session,
+    sense_ids: List[str],
+    active_only: bool = True
+) -> Dict[str, List[MCQPool]]:
+    """
+    Get MCQs for many senses in one round trip (sense_id = ANY(:sense_ids)).
+    
+    Args:
+        session: Database session
+        sense_ids: Neo4j sense IDs
+        active_only: Only return active MCQs
+    
+    Returns:
+        Dict of sense_id -> MCQPool list (senses without MCQs are omitted)
+    """
+    if not sense_ids:
+        return {}
+    
+    ids_param = bindparam('sense_ids', value=list(sense_ids), type_=ARRAY(String))
+    query = session.query(MCQPool).filter(MCQPool.sense_id == any_(ids_param))
+    
+    if active_only:
+        query = query.filter(MCQPool.is_active == True)
+    
+    result: Dict[str, List[MCQPool]] = {}
+    for mcq in query.order_by(MCQPool.sense_id, MCQPool.created_at).all():
+        result.setdefault(mcq.sense_id, []).append(mcq)
+    return result
+
+
 def get_mcqs_for_word(
     session: Session,
     word: str,
@@ -238,6 +273,105 @@ def bulk_create_mcqs(
     return mcqs
 
 
+# Column order used by copy_mcqs (matches the mcq_pool table)
+MCQ_POOL_COPY_COLUMNS = (
+    'sense_id', 'word', 'mcq_type', 'question', 'context',
+    'options', 'correct_index', 'explanation', 'metadata',
+)
+
+
+def _copy_field(value: Any) -> str:
+    """Encode one value for COPY ... (FORMAT csv): None -> NULL, else quoted."""
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False)
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def copy_mcqs(
+    session: Session,
+    mcqs_data: List[Dict],
+    deactivate_existing: bool = False,
+    commit: bool = False
+) -> int:
+    """
+    Bulk insert MCQs with a single COPY (multi-row INSERT fallback).
+    
+    Unlike bulk_create_mcqs, no ORM objects are created or refreshed, so
+    thousands of rows cost one statement.
+    
+    Args:
+        session: Database session
+        mcqs_data: List of dicts with MCQ data (same shape as bulk_create_mcqs)
+        deactivate_existing: Deactivate currently active MCQs for the same
+            senses first (regeneration replaces them without deleting
+            attempt history)
+        commit: Whether to commit after inserting
+    
+    Returns:
+        Number of MCQs inserted
+    """
+    if not mcqs_data:
+        return 0
+    
+    if deactivate_existing:
+        session.execute(
+            text("""
+                UPDATE mcq_pool
+                SET is_active = FALSE, updated_at = NOW()
+                WHERE is_active = TRUE AND sense_id = ANY(:sense_ids)
+            """),
+            {"sense_ids": sorted({d['sense_id'] for d in mcqs_data})}
+        )
+    
+    # DBAPI cursor on the session's current connection/transaction
+    cursor = session.connection().connection.cursor()
+    try:
+        if hasattr(cursor, 'copy_expert'):
+            # psycopg2: stream all rows through one COPY
+            buf = io.StringIO()
+            for data in mcqs_data:
+                row = dict(data, metadata=data.get('metadata') or {})
+                buf.write(','.join(_copy_field(row.get(col)) for col in MCQ_POOL_COPY_COLUMNS))
+                buf.write('\n')
+            buf.seek(0)
+            cursor.copy_expert(
+                f"COPY mcq_pool ({', '.join(MCQ_POOL_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buf
+            )
+        else:
+            # Other drivers: multi-row INSERT (insertmanyvalues)
+            session.execute(insert(MCQPool), [
+                {
+                    'sense_id': data['sense_id'],
+                    'word': data['word'],
+                    'mcq_type': data['mcq_type'],
+                    'question': data['question'],
+                    'options': data['options'],
+                    'correct_index': data['correct_index'],
+                    'context': data.get('context'),
+                    'explanation': data.get('explanation'),
+                    'mcq_metadata': data.get('metadata') or {},
+                }
+                for data in mcqs_data
+            ])
+    finally:
+        cursor.close()
+    
+    if commit:
+        session.commit()
+    return len(mcqs_data)
+
+
+def get_active_mcq_sense_ids(session: Session, mcq_type: Optional[str] = None) -> set:
+    """Get the set of sense IDs that already have active MCQs (optionally of one type)."""
+    query = session.query(MCQPool.sense_id).filter(MCQPool.is_active == True).distinct()
+    if mcq_type:
+        query = query.filter(MCQPool.mcq_type == mcq_type)
+    return {row[0] for row in query.all()}
+
+
 # ============================================
 # MCQ Attempt Operations
 # ============================================
@@ -297,6 +431,170 @@ def record_attempt(
     return attempt
 
 
+def bulk_record_attempts(session: Session, attempts: List[Dict[str, Any]]) -> int:
+    """
+    Insert many mcq_attempts rows with one multi-row INSERT.
+    
+    Statistics are not updated here (same as inserting MCQAttempt rows
+    directly). Does not commit.
+    
+    Args:
+        session: Database session
+        attempts: MCQAttempt column dicts; every dict must have the same keys
+    
+    Returns:
+        Number of attempts inserted
+    """
+    if not attempts:
+        return 0
+    session.execute(insert(MCQAttempt).values(attempts))
+    return len(attempts)
+
+
+@dataclass
+class MCQStatsDelta:
+    """Additive change to one mcq_statistics row (one or more attempts)."""
+    total_attempts: int = 0
+    correct_attempts: int = 0
+    total_response_time_ms: int = 0
+    distractor_selections: Dict[str, int] = field(default_factory=dict)
+    ability_sum_correct: float = 0.0
+    ability_sum_wrong: float = 0.0
+    ability_count_correct: int = 0
+    ability_count_wrong: int = 0
+    
+    def add_attempt(
+        self,
+        is_correct: bool,
+        response_time_ms: Optional[int] = None,
+        selected_option_source: Optional[str] = None,
+        user_ability_estimate: Optional[float] = None
+    ):
+        self.total_attempts += 1
+        if is_correct:
+            self.correct_attempts += 1
+        if response_time_ms:
+            self.total_response_time_ms += response_time_ms
+        if selected_option_source:
+            self.distractor_selections[selected_option_source] = (
+                self.distractor_selections.get(selected_option_source, 0) + 1
+            )
+        if user_ability_estimate is not None:
+            if is_correct:
+                self.ability_sum_correct += float(user_ability_estimate)
+                self.ability_count_correct += 1
+            else:
+                self.ability_sum_wrong += float(user_ability_estimate)
+                self.ability_count_wrong += 1
+    
+    def merge(self, other: "MCQStatsDelta"):
+        self.total_attempts += other.total_attempts
+        self.correct_attempts += other.correct_attempts
+        self.total_response_time_ms += other.total_response_time_ms
+        for source, count in other.distractor_selections.items():
+            self.distractor_selections[source] = self.distractor_selections.get(source, 0) + count
+        self.ability_sum_correct += other.ability_sum_correct
+        self.ability_sum_wrong += other.ability_sum_wrong
+        self.ability_count_correct += other.ability_count_correct
+        self.ability_count_wrong += other.ability_count_wrong
+
+
+# Rows per INSERT ... ON CONFLICT statement
+STATS_UPSERT_CHUNK = 500
+
+_STATS_UPSERT_SQL = """
+    INSERT INTO mcq_statistics (
+        mcq_id, total_attempts, correct_attempts, total_response_time_ms,
+        avg_response_time_ms, distractor_selections,
+        ability_sum_correct, ability_sum_wrong, ability_count_correct, ability_count_wrong,
+        difficulty_index, needs_recalculation
+    )
+    VALUES {values}
+    ON CONFLICT (mcq_id) DO UPDATE SET
+        total_attempts = mcq_statistics.total_attempts + excluded.total_attempts,
+        correct_attempts = mcq_statistics.correct_attempts + excluded.correct_attempts,
+        total_response_time_ms = COALESCE(mcq_statistics.total_response_time_ms, 0) + excluded.total_response_time_ms,
+        avg_response_time_ms = CASE
+            WHEN excluded.total_response_time_ms > 0 THEN
+                (COALESCE(mcq_statistics.total_response_time_ms, 0) + excluded.total_response_time_ms)
+                / (mcq_statistics.total_attempts + excluded.total_attempts)
+            ELSE mcq_statistics.avg_response_time_ms
+        END,
+        distractor_selections = (
+            SELECT COALESCE(jsonb_object_agg(s.key, s.total), '{{}}'::jsonb)
+            FROM (
+                SELECT e.key, SUM(e.value::int) AS total
+                FROM (
+                    SELECT * FROM jsonb_each_text(COALESCE(mcq_statistics.distractor_selections, '{{}}'::jsonb))
+                    UNION ALL
+                    SELECT * FROM jsonb_each_text(excluded.distractor_selections)
+                ) e
+                GROUP BY e.key
+            ) s
+        ),
+        ability_sum_correct = COALESCE(mcq_statistics.ability_sum_correct, 0) + excluded.ability_sum_correct,
+        ability_sum_wrong = COALESCE(mcq_statistics.ability_sum_wrong, 0) + excluded.ability_sum_wrong,
+        ability_count_correct = mcq_statistics.ability_count_correct + excluded.ability_count_correct,
+        ability_count_wrong = mcq_statistics.ability_count_wrong + excluded.ability_count_wrong,
+        difficulty_index = (mcq_statistics.correct_attempts + excluded.correct_attempts)::numeric
+            / NULLIF(mcq_statistics.total_attempts + excluded.total_attempts, 0),
+        needs_recalculation = TRUE,
+        updated_at = NOW()
+"""
+
+
+def upsert_mcq_statistics_deltas(session: Session, deltas: Dict[Any, MCQStatsDelta]) -> int:
+    """
+    Apply accumulated per-MCQ deltas with INSERT ... ON CONFLICT DO UPDATE.
+    
+    Counters are added server-side (x = x + excluded.x), so concurrent
+    writers never lose updates and no row is read first. Rows are written
+    in mcq_id order to keep lock acquisition consistent across writers.
+    Does not commit.
+    
+    Args:
+        session: Database session
+        deltas: mcq_id -> MCQStatsDelta (one entry per MCQ)
+    
+    Returns:
+        Number of MCQ rows upserted
+    """
+    items = sorted(
+        ((str(mcq_id), delta) for mcq_id, delta in deltas.items() if delta.total_attempts),
+        key=lambda item: item[0]
+    )
+    
+    for start in range(0, len(items), STATS_UPSERT_CHUNK):
+        chunk = items[start:start + STATS_UPSERT_CHUNK]
+        values = []
+        params: Dict[str, Any] = {}
+        for i, (mcq_id, delta) in enumerate(chunk):
+            values.append(
+                f"(CAST(:mcq_id_{i} AS uuid), :total_{i}, :correct_{i}, :rt_{i}, "
+                f":avg_rt_{i}, CAST(:sel_{i} AS jsonb), :asc_{i}, :asw_{i}, :acc_{i}, :acw_{i}, "
+                f":diff_{i}, TRUE)"
+            )
+            params.update({
+                f"mcq_id_{i}": mcq_id,
+                f"total_{i}": delta.total_attempts,
+                f"correct_{i}": delta.correct_attempts,
+                f"rt_{i}": delta.total_response_time_ms,
+                f"avg_rt_{i}": (
+                    delta.total_response_time_ms // delta.total_attempts
+                    if delta.total_response_time_ms else None
+                ),
+                f"sel_{i}": json.dumps(delta.distractor_selections),
+                f"asc_{i}": delta.ability_sum_correct,
+                f"asw_{i}": delta.ability_sum_wrong,
+                f"acc_{i}": delta.ability_count_correct,
+                f"acw_{i}": delta.ability_count_wrong,
+                f"diff_{i}": delta.correct_attempts / delta.total_attempts,
+            })
+        session.execute(text(_STATS_UPSERT_SQL.format(values=",\n".join(values))), params)
+    
+    return len(items)
+
+
 def _update_mcq_statistics(
     session: Session,
     mcq_id: UUID,
@@ -305,56 +603,22 @@ def _update_mcq_statistics(
     selected_option_source: Optional[str],
     user_ability_estimate: Optional[float]
 ):
-    """Update MCQ statistics after an attempt."""
-    stats = session.query(MCQStatistics).filter(MCQStatistics.mcq_id == mcq_id).first()
-    
-    if not stats:
-        # Create new stats record
-        stats = MCQStatistics(
-            mcq_id=mcq_id,
-            total_attempts=0,
-            correct_attempts=0,
-            total_response_time_ms=0,
-            distractor_selections={},
-            ability_sum_correct=Decimal('0'),
-            ability_sum_wrong=Decimal('0'),
-            ability_count_correct=0,
-            ability_count_wrong=0,
-            needs_recalculation=True
-        )
-        session.add(stats)
-    
-    # Update counts
-    stats.total_attempts += 1
-    if is_correct:
-        stats.correct_attempts += 1
-    
-    # Update response time
-    if response_time_ms:
-        stats.total_response_time_ms = (stats.total_response_time_ms or 0) + response_time_ms
-        stats.avg_response_time_ms = stats.total_response_time_ms // stats.total_attempts
-    
-    # Update distractor selections
-    if selected_option_source:
-        selections = dict(stats.distractor_selections or {})
-        selections[selected_option_source] = selections.get(selected_option_source, 0) + 1
-        stats.distractor_selections = selections
-    
-    # Update ability sums for discrimination calculation
-    if user_ability_estimate is not None:
-        if is_correct:
-            stats.ability_sum_correct = (stats.ability_sum_correct or Decimal('0')) + Decimal(str(user_ability_estimate))
-            stats.ability_count_correct += 1
-        else:
-            stats.ability_sum_wrong = (stats.ability_sum_wrong or Decimal('0')) + Decimal(str(user_ability_estimate))
-            stats.ability_count_wrong += 1
+    """
+    Update MCQ statistics after an attempt.
     
-    # Calculate difficulty index
-    stats.difficulty_index = Decimal(str(stats.correct_attempts / stats.total_attempts))
+    When the write-behind accumulator is running (API process) the delta is
+    buffered and flushed in batches; otherwise it is upserted immediately.
+    """
+    from src.services.mcq_stats_accumulator import mcq_stats_accumulator
+    
+    delta = MCQStatsDelta()
+    delta.add_attempt(is_correct, response_time_ms, selected_option_source, user_ability_estimate)
     
-    # Mark for full quality recalculation
-    stats.needs_recalculation = True
+    if mcq_stats_accumulator.is_running:
+        mcq_stats_accumulator.add(mcq_id, delta)
+        return
     
+    upsert_mcq_statistics_deltas(session, {mcq_id: delta})
     session.commit()
 
 
@@ -529,18 +793,40 @@ def estimate_user_ability_from_history(
     
     recent_attempts = query.order_by(desc(MCQAttempt.created_at)).limit(recent_limit).all()
     
-    if not recent_attempts:
+    outcomes = []
+    for i, attempt in enumerate(recent_attempts):
+        difficulty = None
+        if i < 20:  # Only recent attempts get a difficulty adjustment
+            stats = get_mcq_statistics(session, attempt.mcq_id)
+            if stats and stats.difficulty_index:
+                difficulty = float(stats.difficulty_index)
+        outcomes.append((attempt.is_correct, difficulty))
+    
+    return ability_from_attempts(outcomes)
+
+
+def ability_from_attempts(outcomes: List[Tuple[bool, Optional[float]]]) -> float:
+    """
+    Ability (0.0-1.0) from recent attempt outcomes, most recent first.
+    
+    Args:
+        outcomes: (is_correct, mcq difficulty_index or None) per attempt
+    
+    Returns:
+        Recency-weighted accuracy adjusted for MCQ difficulty; 0.5 without attempts
+    """
+    if not outcomes:
         return 0.5  # Default: middle ability
     
     # Weight more recent attempts higher
     total_weight = 0
     weighted_correct = 0
     
-    for i, attempt in enumerate(recent_attempts):
+    for i, (is_correct, _) in enumerate(outcomes):
         # More recent = higher weight (exponential decay)
         weight = 0.95 ** i
         total_weight += weight
-        if attempt.is_correct:
+        if is_correct:
             weighted_correct += weight
     
     base_ability = weighted_correct / total_weight if total_weight > 0 else 0.5
@@ -548,15 +834,14 @@ def estimate_user_ability_from_history(
     # Adjust for MCQ difficulty if we have stats
     # (correct on hard MCQ = higher ability)
     difficulty_adjustments = []
-    for attempt in recent_attempts[:20]:  # Only use recent for difficulty adjustment
-        stats = get_mcq_statistics(session, attempt.mcq_id)
-        if stats and stats.difficulty_index:
-            if attempt.is_correct:
+    for is_correct, difficulty in outcomes[:20]:  # Only use recent for difficulty adjustment
+        if difficulty:
+            if is_correct:
                 # Correct on hard MCQ = bonus
-                adjustment = (1 - float(stats.difficulty_index)) * 0.1
+                adjustment = (1 - difficulty) * 0.1
             else:
                 # Wrong on easy MCQ = penalty
-                adjustment = -float(stats.difficulty_index) * 0.1
+                adjustment = -difficulty * 0.1
             difficulty_adjustments.append(adjustment)
     
     difficulty_bonus = sum(difficulty_adjustments) / len(difficulty_adjustments) if difficulty_adjustments else 0
@@ -565,6 +850,57 @@ def estimate_user_ability_from_history(
     return max(0.0, min(1.0, final_ability))  # Clamp to [0, 1]
 
 
+def get_recent_attempt_outcomes(
+    session: Session,
+    user_id: UUID,
+    sense_ids: List[str],
+    recent_limit: int = 50
+) -> Dict[str, Tuple[List[Tuple[bool, Optional[float]]], int]]:
+    """
+    Recent attempt outcomes for many senses in one query.
+    
+    Args:
+        session: Database session
+        user_id: User whose attempts to read
+        sense_ids: Senses to read (exact match)
+        recent_limit: Attempts kept per sense
+    
+    Returns:
+        Dict of sense_id -> (outcomes most recent first, total attempt count);
+        outcomes are (is_correct, difficulty_index or None) with difficulty
+        only for the 20 most recent, as in estimate_user_ability_from_history.
+        Senses without attempts are omitted.
+    """
+    if not sense_ids:
+        return {}
+    
+    rows = session.execute(text("""
+        SELECT a.sense_id, a.is_correct, a.total,
+               CASE WHEN a.rn <= 20 THEN s.difficulty_index END AS difficulty_index
+        FROM (
+            SELECT sense_id, mcq_id, is_correct,
+                   row_number() OVER (PARTITION BY sense_id ORDER BY created_at DESC) AS rn,
+                   count(*) OVER (PARTITION BY sense_id) AS total
+            FROM mcq_attempts
+            WHERE user_id = :user_id
+              AND sense_id = ANY(CAST(:sense_ids AS text[]))
+        ) a
+        LEFT JOIN mcq_statistics s ON s.mcq_id = a.mcq_id
+        WHERE a.rn <= :recent_limit
+        ORDER BY a.sense_id, a.rn
+    """), {
+        'user_id': str(user_id),
+        'sense_ids': list(sense_ids),
+        'recent_limit': recent_limit,
+    }).fetchall()
+    
+    result: Dict[str, Tuple[List[Tuple[bool, Optional[float]]], int]] = {}
+    for sense_id, is_correct, total, difficulty in rows:
+        outcomes, _ = result.setdefault(sense_id, ([], int(total)))
+        outcomes.append((bool(is_correct), float(difficulty) if difficulty is not None else None))
+    return result
+
+
 def _generate_and_store_mcqs(session: Session, sense_id: str) -> List[MCQPool]:
     """Generate MCQs for a sense and store them in the pool."""
     try:
@@ -3,7 +3,7 @@ CRUD operations for Verification Schedule table.
 
 Updated to support both SM-2+ and FSRS algorithms via algorithm interface.
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
 from datetime import date, datetime
 from sqlalchemy.orm import Session
@@ -132,6 +132,47 @@ def complete_verification(
     return schedule
 
 
+def bulk_complete_verifications(
+    session: Session,
+    user_id: UUID,
+    results: List[Tuple[int, bool]]
+) -> int:
+    """
+    Mark several of a user's schedules completed in one statement.
+    
+    Uses UPDATE ... FROM (VALUES ...); when a schedule appears more than
+    once the last result wins, as with sequential updates. Does not commit.
+    
+    Args:
+        session: Database session
+        user_id: Owner of the schedules (other users' rows are never touched)
+        results: (schedule_id, passed) pairs
+    
+    Returns:
+        Number of schedules updated
+    """
+    passed_by_id: Dict[int, bool] = {}
+    for schedule_id, passed in results:
+        passed_by_id[schedule_id] = bool(passed)
+    if not passed_by_id:
+        return 0
+    
+    values = []
+    params: Dict[str, Any] = {'user_id': user_id}
+    for i, (schedule_id, passed) in enumerate(passed_by_id.items()):
+        values.append(f"(CAST(:sid_{i} AS integer), CAST(:passed_{i} AS boolean))")
+        params[f'sid_{i}'] = schedule_id
+        params[f'passed_{i}'] = passed
+    
+    result = session.execute(text(f"""
+        UPDATE verification_schedule AS vs
+        SET completed = true, completed_at = NOW(), passed = v.passed
+        FROM (VALUES {", ".join(values)}) AS v(id, passed)
+        WHERE vs.id = v.id AND vs.user_id = :user_id
+    """), params)
+    return result.rowcount
+
+
 def delete_verification_schedule(session: Session, schedule_id: int) -> bool:
     """Delete a verification schedule entry."""
     schedule = get_verification_schedule_by_id(session, schedule_id)
@@ -4,7 +4,7 @@ FastAPI Main Application Entry Point
 LexiCraft API V8.1 - Survey Engine Backend with FSRS A/B Testing
 """
 
-from fastapi import FastAPI, Request, status
+from fastapi import Depends, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
@@ -32,6 +32,11 @@ from src.api import sync as sync_router
 from src.api import pipeline as pipeline_router
 from src.api import currencies as currencies_router
 from src.api import items as items_router
+from src.services.mcq_stats_accumulator import mcq_stats_accumulator
+from src.database.postgres_connection import pool_metrics
+from src.database.async_connection import dispose_async_engine
+from src.database.neo4j_connection import close_all_drivers, neo4j_query_metrics
+from src.middleware.auth import require_internal_token
 
 app = FastAPI(
     title="LexiCraft API V8.1",
@@ -148,6 +153,44 @@ def health_check():
     return {"status": "ok", "version": "8.1"}
 
 
+@app.on_event("startup")
+def start_background_writers():
+    """Start write-behind buffers."""
+    mcq_stats_accumulator.start()
+
+
+@app.on_event("shutdown")
+def flush_background_writers():
+    """Flush write-behind buffers so no buffered statistics are lost."""
+    mcq_stats_accumulator.stop()
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    """Close pooled asyncpg connections."""
+    await dispose_async_engine()
+
+
+@app.on_event("shutdown")
+def close_neo4j_drivers():
+    """Close the shared Neo4j drivers."""
+    close_all_drivers()
+
+
+@app.get("/internal/metrics", dependencies=[Depends(require_internal_token)])
+def internal_metrics():
+    """
+    Process-local operational metrics (write-behind buffers, DB pool, graph queries).
+    
+    Requires the X-Internal-Token header to match INTERNAL_API_TOKEN.
+    """
+    return {
+        "mcq_stats": mcq_stats_accumulator.metrics(),
+        "postgres_pool": pool_metrics(),
+        "neo4j_queries": neo4j_query_metrics.snapshot(),
+    }
+
+
 @app.get("/health")
 def health():
     """Detailed health check endpoint."""
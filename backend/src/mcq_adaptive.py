@@ -32,13 +32,11 @@ from enum import Enum
 from decimal import Decimal
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import and_, or_, func, desc, text
 
-from src.database.models import (
-    MCQPool, MCQStatistics, MCQAttempt, 
-    VerificationSchedule, LearningProgress
-)
+from src.database.models import MCQPool, MCQStatistics, MCQAttempt
 from src.database.postgres_crud import mcq_stats
+from src.services.vocabulary_store import normalize_sense_id
 
 
 class AbilitySource(Enum):
@@ -85,6 +83,9 @@ class MCQAdaptiveService:
     Integrates with existing FSRS/SM-2+ data for ability estimation.
     """
     
+    # Recent attempts considered for history-based estimates
+    HISTORY_RECENT_LIMIT = 30
+    
     def __init__(self, db_session: Session, neo4j_conn=None):
         """
         Initialize the service.
@@ -123,58 +124,94 @@ class MCQAdaptiveService:
         Returns:
             AbilityEstimate with ability, confidence, and source
         """
-        # Try to get FSRS/SM2+ data from verification schedule
-        if use_fsrs_data:
-            schedule_ability = self._estimate_from_schedule(user_id, sense_id)
-            if schedule_ability:
-                return schedule_ability
+        return self.estimate_abilities(user_id, [sense_id], use_fsrs_data)[sense_id]
+    
+    def estimate_abilities(
+        self,
+        user_id: UUID,
+        sense_ids: List[str],
+        use_fsrs_data: bool = True
+    ) -> Dict[str, AbilityEstimate]:
+        """
+        Estimate user's ability for many senses with at most two queries.
         
-        # Fall back to MCQ attempt history
-        history_ability = self._estimate_from_history(user_id, sense_id)
-        if history_ability.data_points > 0:
-            return history_ability
+        Same priority order as estimate_ability: one query reads the latest
+        FSRS/SM-2+ schedule per sense, one more reads attempt history for
+        the senses the schedules did not cover.
         
-        # Default
-        return AbilityEstimate(
-            ability=0.5,
-            confidence=0.0,
-            source=AbilitySource.DEFAULT,
-            data_points=0
-        )
+        Args:
+            user_id: User to estimate for
+            sense_ids: Senses being tested (index suffixes like _99 allowed)
+            use_fsrs_data: Whether to use FSRS/SM2+ data
+        
+        Returns:
+            Dict of sense_id (as given) -> AbilityEstimate
+        """
+        estimates: Dict[str, AbilityEstimate] = {}
+        if not sense_ids:
+            return estimates
+        
+        if use_fsrs_data:
+            schedules = self._fetch_latest_schedules(user_id, sense_ids)
+            for sense_id in sense_ids:
+                row = schedules.get(sense_id) or schedules.get(self._normalize_sense_id(sense_id))
+                estimate = self._estimate_from_schedule(row) if row else None
+                if estimate:
+                    estimates[sense_id] = estimate
+        
+        remaining = [sid for sid in dict.fromkeys(sense_ids) if sid not in estimates]
+        if remaining:
+            history = mcq_stats.get_recent_attempt_outcomes(
+                self.db, user_id, remaining, recent_limit=self.HISTORY_RECENT_LIMIT
+            )
+            for sense_id in remaining:
+                estimates[sense_id] = self._estimate_from_history(*history.get(sense_id, ([], 0)))
+        
+        return estimates
     
-    def _estimate_from_schedule(
-        self, 
-        user_id: UUID, 
-        sense_id: str
-    ) -> Optional[AbilityEstimate]:
+    def _fetch_latest_schedules(self, user_id: UUID, sense_ids: List[str]) -> Dict[str, Any]:
+        """
+        Latest verification schedule per learning point, in one query.
+        
+        Progress is matched on the exact sense IDs and their normalised forms
+        (indexable, unlike a LIKE '%...%' scan).
+        
+        Returns:
+            Dict of learning_point_id -> schedule row
+        """
+        candidates = list(dict.fromkeys(
+            [*sense_ids, *(self._normalize_sense_id(sid) for sid in sense_ids)]
+        ))
+        rows = self.db.execute(text("""
+            SELECT DISTINCT ON (lp.learning_point_id)
+                   lp.learning_point_id,
+                   vs.stability,
+                   vs.difficulty,
+                   vs.retention_probability,
+                   vs.ease_factor,
+                   vs.consecutive_correct,
+                   vs.total_reviews
+            FROM learning_progress lp
+            JOIN verification_schedule vs ON vs.learning_progress_id = lp.id
+            WHERE lp.user_id = :user_id
+              AND lp.learning_point_id = ANY(CAST(:sense_ids AS text[]))
+            ORDER BY lp.learning_point_id, vs.created_at DESC
+        """), {'user_id': str(user_id), 'sense_ids': candidates}).fetchall()
+        
+        return {row.learning_point_id: row for row in rows}
+    
+    def _estimate_from_schedule(self, schedule) -> Optional[AbilityEstimate]:
         """
-        Estimate ability from FSRS/SM2+ verification schedule data.
+        Estimate ability from a FSRS/SM2+ verification schedule row.
         
         Uses:
         - FSRS: stability, difficulty, retention_probability
         - SM2+: ease_factor, consecutive_correct
         """
-        # Get learning progress for this sense
-        progress = self.db.query(LearningProgress).filter(
-            LearningProgress.user_id == user_id,
-            LearningProgress.learning_point_id.like(f"%{sense_id}%")
-        ).first()
-        
-        if not progress:
-            return None
-        
-        # Get most recent verification schedule with FSRS/SM2+ data
-        schedule = self.db.query(VerificationSchedule).filter(
-            VerificationSchedule.learning_progress_id == progress.id
-        ).order_by(desc(VerificationSchedule.created_at)).first()
-        
-        if not schedule:
-            return None
-        
-        # Check for FSRS data (from migration 011)
-        stability = getattr(schedule, 'stability', None)
-        difficulty = getattr(schedule, 'difficulty', None)
-        retention_prob = getattr(schedule, 'retention_probability', None)
+        stability = schedule.stability
+        difficulty = schedule.difficulty
+        retention_prob = schedule.retention_probability
+        data_points = schedule.total_reviews if schedule.total_reviews is not None else 1
         
         if stability is not None and difficulty is not None:
             # FSRS estimate: ability = (1 - difficulty) * retention_weight
@@ -184,12 +221,12 @@ class MCQAdaptiveService:
                 ability=max(0.0, min(1.0, ability)),
                 confidence=0.8,  # FSRS data is reliable
                 source=AbilitySource.FSRS,
-                data_points=schedule.total_reviews if hasattr(schedule, 'total_reviews') else 1
+                data_points=data_points
             )
         
         # Check for SM-2+ data
-        ease_factor = getattr(schedule, 'ease_factor', None)
-        consecutive_correct = getattr(schedule, 'consecutive_correct', None)
+        ease_factor = schedule.ease_factor
+        consecutive_correct = schedule.consecutive_correct
         
         if ease_factor is not None:
             # SM-2+ estimate: normalize ease factor to 0-1
@@ -204,31 +241,29 @@ class MCQAdaptiveService:
                 ability=max(0.0, min(1.0, ability)),
                 confidence=0.6,  # SM-2+ is less precise than FSRS
                 source=AbilitySource.SM2_PLUS,
-                data_points=schedule.total_reviews if hasattr(schedule, 'total_reviews') else 1
+                data_points=data_points
             )
         
         return None
     
     def _estimate_from_history(
-        self, 
-        user_id: UUID, 
-        sense_id: str,
-        recent_limit: int = 30
+        self,
+        outcomes: List[Tuple[bool, Optional[float]]],
+        total: int
     ) -> AbilityEstimate:
-        """Estimate ability from MCQ attempt history."""
-        ability = mcq_stats.estimate_user_ability_from_history(
-            self.db, user_id, sense_id, recent_limit
-        )
-        
-        # Count data points
-        total, correct = mcq_stats.count_user_attempts(self.db, user_id, sense_id)
+        """Estimate ability from MCQ attempt outcomes (default if there are none)."""
+        if total == 0:
+            return AbilityEstimate(
+                ability=0.5,
+                confidence=0.0,
+                source=AbilitySource.DEFAULT,
+                data_points=0
+            )
         
         # Confidence based on number of attempts
-        confidence = min(0.9, total * 0.05) if total > 0 else 0.0
-        
         return AbilityEstimate(
-            ability=ability,
-            confidence=confidence,
+            ability=mcq_stats.ability_from_attempts(outcomes),
+            confidence=min(0.9, total * 0.05),
             source=AbilitySource.HISTORY,
             data_points=total
         )
@@ -309,12 +344,7 @@ class MCQAdaptiveService:
             - 'be.v.01_0' -> 'be.v.01'
             - 'drop.n.02' -> 'drop.n.02' (unchanged)
         """
-        import re
-        # Match pattern: word.pos.num_index where index is digits
-        match = re.match(r'^(.+\.\w+\.\d+)_\d+$', sense_id)
-        if match:
-            return match.group(1)
-        return sense_id
+        return normalize_sense_id(sense_id)
     
     def get_mcqs_for_session(
         self,
@@ -620,51 +650,36 @@ def create_adaptive_service(db_session: Session, neo4j_conn=None) -> MCQAdaptive
     return MCQAdaptiveService(db_session, neo4j_conn)
 
 
-def select_options_from_pool(
+def select_option_indices_from_pool(
     options: List[Dict],
     distractor_count: int = 3,
     user_ability: float = 0.5,
     shuffle: bool = True
-) -> Tuple[List[Dict], int]:
+) -> Tuple[List[int], int]:
     """
-    Select distractors from the 8-distractor pool based on format and user ability.
-    
-    This enables serving 4-option or 6-option MCQs from the same stored pool,
-    with adaptive difficulty based on user ability:
-    - High ability (>0.7): Pick harder distractors (lower tier = more confusing)
-    - Low ability (<0.3): Pick easier distractors (higher tier = less confusing)
-    - Medium ability: Mix of tiers for balanced challenge
+    Index-based core of select_options_from_pool.
     
-    Args:
-        options: Full pool from MCQ (1 correct + up to 8 distractors = 9 total)
-        distractor_count: Number of distractors to include (3 for 4-option, 5 for 6-option)
-        user_ability: User's ability estimate (0.0-1.0)
-        shuffle: Whether to shuffle the final options
+    Returns the selected positions within `options` (i.e. the pool_index of
+    each served option) instead of the option dicts, so callers don't have
+    to look the options up again with options.index().
     
     Returns:
-        Tuple of (selected_options list, correct_index after selection)
-    
-    Example:
-        # For 4-option MCQ
-        options, correct_idx = select_options_from_pool(mcq.options, distractor_count=3)
-        
-        # For 6-option MCQ
-        options, correct_idx = select_options_from_pool(mcq.options, distractor_count=5)
-        
-        # Adaptive for high-ability user (harder distractors)
-        options, correct_idx = select_options_from_pool(mcq.options, 3, user_ability=0.85)
+        Tuple of (selected pool indices, correct_index within the selection)
     """
     # Separate correct answer from distractors
-    correct_options = [o for o in options if o.get("is_correct")]
-    distractors = [o for o in options if not o.get("is_correct")]
+    correct_indices = [i for i, o in enumerate(options) if o.get("is_correct")]
+    distractors = [i for i, o in enumerate(options) if not o.get("is_correct")]
     
-    if not correct_options:
+    if not correct_indices:
         raise ValueError("No correct option found in pool")
     
-    correct = correct_options[0]
+    correct = correct_indices[0]
+    
+    def tier(i: int) -> int:
+        return options[i].get("tier", 5)
     
     # Sort distractors by tier (lower tier = harder/better distractor)
-    distractors.sort(key=lambda d: (d.get("tier", 5), random.random()))
+    distractors.sort(key=lambda i: (tier(i), random.random()))
     
     # Select distractors based on user ability
     if len(distractors) <= distractor_count:
@@ -676,8 +691,8 @@ def select_options_from_pool(
     elif user_ability < 0.3:
         # Low ability: Pick easier distractors (tier 4-5 preferred)
         # But still include at least one "real" distractor (tier 1-2)
-        hard_distractors = [d for d in distractors if d.get("tier", 5) <= 2]
-        easy_distractors = [d for d in distractors if d.get("tier", 5) > 2]
+        hard_distractors = [i for i in distractors if tier(i) <= 2]
+        easy_distractors = [i for i in distractors if tier(i) > 2]
         
         if hard_distractors and easy_distractors:
             # Mix: 1 hard + rest easy
@@ -689,9 +704,9 @@ def select_options_from_pool(
         # Medium ability: Balanced mix from available tiers
         # Take from each tier category if available
         tier_groups = {
-            "hard": [d for d in distractors if d.get("tier", 5) <= 2],
-            "medium": [d for d in distractors if d.get("tier", 5) == 3],
-            "easy": [d for d in distractors if d.get("tier", 5) >= 4]
+            "hard": [i for i in distractors if tier(i) <= 2],
+            "medium": [i for i in distractors if tier(i) == 3],
+            "easy": [i for i in distractors if tier(i) >= 4]
         }
         
         selected = []
@@ -704,10 +719,8 @@ def select_options_from_pool(
         
         # If still short, fill from remaining
         if len(selected) < distractor_count:
-            remaining = distractors[:]
-            for s in selected:
-                if s in remaining:
-                    remaining.remove(s)
+            taken = set(selected)
+            remaining = [i for i in distractors if i not in taken]
             selected.extend(remaining[:distractor_count - len(selected)])
     
     # Build final options list
@@ -717,10 +730,47 @@ def select_options_from_pool(
     if shuffle:
         random.shuffle(result)
     
-    # Find correct index
-    correct_index = next(i for i, opt in enumerate(result) if opt.get("is_correct"))
+    return result, result.index(correct)
+
+
+def select_options_from_pool(
+    options: List[Dict],
+    distractor_count: int = 3,
+    user_ability: float = 0.5,
+    shuffle: bool = True
+) -> Tuple[List[Dict], int]:
+    """
+    Select distractors from the 8-distractor pool based on format and user ability.
     
-    return result, correct_index
+    This enables serving 4-option or 6-option MCQs from the same stored pool,
+    with adaptive difficulty based on user ability:
+    - High ability (>0.7): Pick harder distractors (lower tier = more confusing)
+    - Low ability (<0.3): Pick easier distractors (higher tier = less confusing)
+    - Medium ability: Mix of tiers for balanced challenge
+    
+    Args:
+        options: Full pool from MCQ (1 correct + up to 8 distractors = 9 total)
+        distractor_count: Number of distractors to include (3 for 4-option, 5 for 6-option)
+        user_ability: User's ability estimate (0.0-1.0)
+        shuffle: Whether to shuffle the final options
+    
+    Returns:
+        Tuple of (selected_options list, correct_index after selection)
+    
+    Example:
+        # For 4-option MCQ
+        options, correct_idx = select_options_from_pool(mcq.options, distractor_count=3)
+        
+        # For 6-option MCQ
+        options, correct_idx = select_options_from_pool(mcq.options, distractor_count=5)
+        
+        # Adaptive for high-ability user (harder distractors)
+        options, correct_idx = select_options_from_pool(mcq.options, 3, user_ability=0.85)
+    """
+    indices, correct_index = select_option_indices_from_pool(
+        options, distractor_count, user_ability, shuffle
+    )
+    return [options[i] for i in indices], correct_index
 
 
 def get_tier_distribution(options: List[Dict]) -> Dict[str, int]:
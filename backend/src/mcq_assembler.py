@@ -30,6 +30,7 @@ from enum import Enum
 
 # Import VocabularyStore (primary data source in V3)
 from src.services.vocabulary_store import vocabulary_store, VocabularyStore
+from src.services.edit_distance_index import levenshtein_distance
 
 # Neo4j is optional (fallback)
 try:
@@ -364,23 +365,7 @@ class MCQAssembler:
     
     def _levenshtein_distance(self, s1: str, s2: str) -> int:
         """Calculate Levenshtein edit distance between two strings."""
-        if len(s1) < len(s2):
-            return self._levenshtein_distance(s2, s1)
-        
-        if len(s2) == 0:
-            return len(s1)
-        
-        previous_row = range(len(s2) + 1)
-        for i, c1 in enumerate(s1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-        
-        return previous_row[-1]
+        return levenshtein_distance(s1, s2)
     
     def _get_orthographic_candidates(
         self,
@@ -393,48 +378,44 @@ class MCQAssembler:
     ) -> List[Dict]:
         """
         Find words with small edit distance (1-2) that could cause spelling confusion.
-        Uses VocabularyStore for candidate search.
+        Uses the VocabularyStore edit-distance index, so every word within
+        max_distance is considered (closest first), not a sample of the band.
         """
         candidates = []
         word_lower = word.lower()
-        word_len = len(word)
         
-        # Get senses in similar frequency band from VocabularyStore
+        # Only keep candidates in a similar frequency band
         min_rank = max(1, (target_rank or 5000) - self.FREQUENCY_BAND_TOLERANCE)
         max_rank = (target_rank or 5000) + self.FREQUENCY_BAND_TOLERANCE
         
-        # Get candidate senses from VocabularyStore
-        candidate_senses = self.vocab.get_senses_by_rank_range(
-            min_rank=min_rank,
-            max_rank=max_rank,
-            exclude_words=exclude_words,
-            limit=500  # Get a pool to search through
-        )
-        
         seen_words = set(exclude_words)
         seen_words.add(word_lower)
         
-        for sense in candidate_senses:
-            candidate_word = sense.get("word", "")
-            candidate_lower = candidate_word.lower()
-            
-            # Skip if already used or wrong length
-            if candidate_lower in seen_words:
-                continue
-            if abs(len(candidate_word) - word_len) > 2:
+        # (lemma, distance) pairs, sorted by distance (closer = better distractor)
+        neighbours = self.vocab.get_words_within_distance(word_lower, max_distance=max_distance)
+        
+        for neighbour, distance in neighbours:
+            if neighbour.lower() in seen_words:
                 continue
             
-            # Calculate edit distance
-            distance = self._levenshtein_distance(word_lower, candidate_lower)
-            
-            if distance <= max_distance and distance > 0:
+            for sense in self.vocab.get_senses_for_word(neighbour):
+                candidate_word = sense.get("word", "")
+                candidate_lower = candidate_word.lower()
+                rank = sense.get("frequency_rank")
+                
+                # Skip if already used or outside the frequency band
+                if candidate_lower in seen_words or candidate_word in exclude_words:
+                    continue
+                if rank is None or not (min_rank <= rank <= max_rank):
+                    continue
+                
                 candidate = {
                     "word": candidate_word,
                     "definition_zh": sense.get("definition_zh", ""),
                     "definition_en": sense.get("definition_en", ""),
                     "sense_id": sense.get("id", ""),
                     "pos": sense.get("pos"),
-                    "frequency_rank": sense.get("frequency_rank"),
+                    "frequency_rank": rank,
                     "edit_distance": distance
                 }
                 
@@ -442,12 +423,12 @@ class MCQAssembler:
                 if self._validate_distractor(candidate, target_pos, target_rank, strict_pos=False):
                     candidates.append(candidate)
                     seen_words.add(candidate_lower)
-                    
-                    if len(candidates) >= limit:
-                        break
+                    seen_words.add(neighbour.lower())
+                    break
+            
+            if len(candidates) >= limit:
+                break
         
-        # Sort by edit distance (closer = better distractor)
-        candidates.sort(key=lambda x: x.get("edit_distance", 999))
         return candidates[:limit]
     
     def _get_band_sample_candidates(
@@ -1189,7 +1170,7 @@ class MCQAssembler:
         all_mcqs = []
         
         # Get sense IDs from VocabularyStore
-        senses = list(self.vocab._senses.values())[:limit]
+        senses = [self.vocab.get_sense(sid) or {} for sid in self.vocab.get_all_sense_ids()[:limit]]
         sense_ids = [s.get("id") for s in senses if s.get("definition_zh")]
         
         print(f"🎯 Generating MCQs for {len(sense_ids)} senses...")
@@ -1253,10 +1234,39 @@ def format_mcq_display(mcq: MCQ) -> str:
     return "\n".join(lines)
 
 
+def mcq_to_pool_row(mcq: MCQ) -> Dict:
+    """Convert MCQ to an mcq_pool row dict (as used by mcq_stats bulk inserts)."""
+    return {
+        "sense_id": mcq.sense_id,
+        "word": mcq.word,
+        "mcq_type": mcq.mcq_type.value,
+        "question": mcq.question,
+        "context": mcq.context,
+        "options": [
+            {
+                "text": opt.text,
+                "is_correct": opt.is_correct,
+                "source": opt.source,
+                "source_word": opt.source_word,
+                "tier": opt.tier,
+                "frequency_rank": opt.frequency_rank,
+                "pos": opt.pos
+            }
+            for opt in mcq.options
+        ],
+        "correct_index": mcq.correct_index,
+        "explanation": mcq.explanation,
+        "metadata": mcq.metadata
+    }
+
+
 def store_mcqs_to_postgres(mcqs: List[MCQ], db_session, max_retries: int = 3, commit: bool = True) -> int:
     """
     Store generated MCQs to PostgreSQL with retry logic and session recovery.
     
+    All MCQs are written with one bulk statement (COPY / multi-row INSERT)
+    instead of one INSERT plus a health check per row.
+    
     Args:
         mcqs: List of MCQ objects to store
         db_session: Database session
@@ -1270,81 +1280,40 @@ def store_mcqs_to_postgres(mcqs: List[MCQ], db_session, max_retries: int = 3, co
     import psycopg2
     from sqlalchemy.exc import OperationalError, DisconnectionError
     
+    if not mcqs:
+        return 0
+    
+    rows = [mcq_to_pool_row(mcq) for mcq in mcqs]
     stored_count = 0
+    retry_count = 0
     
-    for mcq in mcqs:
-        retry_count = 0
-        stored = False
-        
-        while retry_count < max_retries and not stored:
-            try:
-                # Check if session is in a bad state and recover
-                try:
-                    from sqlalchemy import text
-                    db_session.execute(text("SELECT 1"))
-                except (OperationalError, DisconnectionError) as e:
-                    # Session is in bad state, rollback and continue
-                    db_session.rollback()
-                    if retry_count < max_retries - 1:
-                        retry_count += 1
-                        continue
-                    else:
-                        raise
-                
-                options = [
-                    {
-                        "text": opt.text,
-                        "is_correct": opt.is_correct,
-                        "source": opt.source,
-                        "source_word": opt.source_word,
-                        "tier": opt.tier,
-                        "frequency_rank": opt.frequency_rank,
-                        "pos": opt.pos
-                    }
-                    for opt in mcq.options
-                ]
-                
-                mcq_stats.create_mcq(
-                    session=db_session,
-                    sense_id=mcq.sense_id,
-                    word=mcq.word,
-                    mcq_type=mcq.mcq_type.value,
-                    question=mcq.question,
-                    options=options,
-                    correct_index=mcq.correct_index,
-                    context=mcq.context,
-                    explanation=mcq.explanation,
-                    metadata=mcq.metadata,
-                    commit=False  # Batch commit at end
-                )
-                stored_count += 1
-                stored = True
+    while retry_count < max_retries:
+        try:
+            stored_count = mcq_stats.copy_mcqs(db_session, rows, commit=False)
+            break
+            
+        except (OperationalError, DisconnectionError, psycopg2.OperationalError) as e:
+            # SSL or connection error - rollback and retry
+            db_session.rollback()
+            error_msg = str(e).lower()
+            if "ssl" in error_msg or "connection" in error_msg or "closed" in error_msg:
+                retry_count += 1
+                if retry_count < max_retries:
+                    continue
+                print(f"⚠️ Failed to store {len(rows)} MCQs after {max_retries} retries: {e}")
+            else:
+                # Other operational error - don't retry
+                print(f"⚠️ Failed to store {len(rows)} MCQs: {e}")
+            break
                 
-            except (OperationalError, DisconnectionError, psycopg2.OperationalError) as e:
-                # SSL or connection error - rollback and retry
-                error_msg = str(e).lower()
-                if "ssl" in error_msg or "connection" in error_msg or "closed" in error_msg:
-                    db_session.rollback()
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        continue
-                    else:
-                        print(f"⚠️ Failed to store MCQ for {mcq.sense_id} after {max_retries} retries: {e}")
-                        break
-                else:
-                    # Other operational error - don't retry
-                    db_session.rollback()
-                    print(f"⚠️ Failed to store MCQ for {mcq.sense_id}: {e}")
-                    break
-                    
-            except Exception as e:
-                # Other errors - rollback and skip
-                db_session.rollback()
-                print(f"⚠️ Failed to store MCQ for {mcq.sense_id}: {e}")
-                break
+        except Exception as e:
+            # Other errors - rollback and skip
+            db_session.rollback()
+            print(f"⚠️ Failed to store {len(rows)} MCQs: {e}")
+            break
     
     # Commit all successful inserts in one batch (if commit=True)
-    if commit:
+    if commit and stored_count:
         try:
             db_session.commit()
         except Exception as e:
@@ -0,0 +1,425 @@
+"""
+MCQ Pipeline: Parallel Generation with Bulk Storage
+
+Regenerates the mcq_pool table from VocabularyStore:
+
+1. Sense IDs are split into chunks and fanned out over a process pool
+   ('spawn' context). Each worker builds its own MCQAssembler on top of
+   VocabularyStore; when the memory-mapped snapshot is present all workers
+   share its pages instead of each parsing vocabulary.json.
+2. Workers return plain mcq_pool row dicts. The parent keeps a bounded
+   number of chunks in flight and pushes results through a bounded queue,
+   so generation can never run unboundedly ahead of storage.
+3. A writer thread accumulates rows and flushes them in large batches via
+   COPY (mcq_stats.copy_mcqs), one transaction per batch. Batches always
+   contain whole senses.
+4. Sense IDs are appended to a checkpoint file only after their batch has
+   committed, so --resume skips exactly the senses that are stored.
+
+Usage:
+    python3 -m src.mcq_pipeline                          # all senses without active MCQs
+    python3 -m src.mcq_pipeline --replace --workers 8    # regenerate the full pool
+    python3 -m src.mcq_pipeline --resume                 # continue after a crash
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.mcq_assembler import MCQAssembler, mcq_to_pool_row
+from src.services.vocabulary_store import vocabulary_store
+
+
+DEFAULT_CHECKPOINT = Path(__file__).parent.parent / "logs" / "mcq_pipeline_checkpoint.txt"
+
+# (sense_id, mcq_pool rows, error message)
+ChunkResult = List[Tuple[str, List[Dict], Optional[str]]]
+
+_DONE = object()
+
+
+@dataclass
+class PipelineStats:
+    """Counters reported by MCQPipeline.run()."""
+    senses_total: int = 0
+    senses_skipped: int = 0
+    senses_stored: int = 0
+    senses_empty: int = 0
+    senses_failed: int = 0
+    mcqs_written: int = 0
+    batches_written: int = 0
+    by_type: Dict[str, int] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+
+# =============================================================================
+# WORKER SIDE
+# =============================================================================
+
+_worker_assembler: Optional[MCQAssembler] = None
+_worker_mcq_type: Optional[str] = None
+
+
+def _init_worker(mcq_type_filter: Optional[str] = None):
+    """Process-pool initializer: one assembler per worker process."""
+    global _worker_assembler, _worker_mcq_type
+    _worker_assembler = MCQAssembler()
+    _worker_mcq_type = mcq_type_filter
+
+
+def _generate_chunk(sense_ids: List[str]) -> ChunkResult:
+    """Generate mcq_pool rows for a chunk of senses (runs in a worker)."""
+    results = []
+    for sense_id in sense_ids:
+        try:
+            mcqs = _worker_assembler.assemble_mcqs_for_sense(sense_id)
+            if _worker_mcq_type:
+                mcqs = [m for m in mcqs if m.mcq_type.value == _worker_mcq_type]
+            results.append((sense_id, [mcq_to_pool_row(m) for m in mcqs], None))
+        except Exception as e:
+            results.append((sense_id, [], str(e)))
+    return results
+
+
+# =============================================================================
+# CHECKPOINT
+# =============================================================================
+
+class SenseCheckpoint:
+    """Append-only file of sense IDs whose MCQs have been committed."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def load(self) -> Set[str]:
+        if not self.path.exists():
+            return set()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def reset(self):
+        if self.path.exists():
+            self.path.unlink()
+
+    def record(self, sense_ids: Iterable[str]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for sense_id in sense_ids:
+                f.write(f"{sense_id}\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+class MCQPipeline:
+    """
+    Process-pool MCQ generator streaming into batched COPY writes.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunk_size: int = 25,
+        batch_rows: int = 5000,
+        queue_size: int = 16,
+        mcq_type_filter: Optional[str] = None,
+        replace: bool = False,
+        skip_existing: bool = True,
+        checkpoint_path: Path = DEFAULT_CHECKPOINT,
+        session_factory: Optional[Callable] = None,
+        write_batch: Optional[Callable[[List[Dict]], int]] = None,
+        max_retries: int = 3
+    ):
+        """
+        Args:
+            workers: Worker processes (0 = generate in-process)
+            chunk_size: Senses per worker task
+            batch_rows: Rows per COPY batch (flushed at sense boundaries)
+            queue_size: Max chunk results buffered between workers and writer
+            mcq_type_filter: Only keep MCQs of this type
+            replace: Deactivate existing active MCQs of each regenerated sense
+            skip_existing: Skip senses that already have active MCQs (ignored with replace)
+            checkpoint_path: Checkpoint file for resume by sense ID
+            session_factory: Callable returning a DB session (defaults to PostgresConnection)
+            write_batch: Override for the batch writer (rows -> rows written)
+            max_retries: Attempts per batch before its senses are marked failed
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.chunk_size = chunk_size
+        self.batch_rows = batch_rows
+        self.mcq_type_filter = mcq_type_filter
+        self.replace = replace
+        self.skip_existing = skip_existing and not replace
+        self.checkpoint = SenseCheckpoint(checkpoint_path)
+        self.max_retries = max_retries
+        self._session_factory = session_factory
+        self._write_batch = write_batch or self._write_batch_to_postgres
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._writer_error: Optional[BaseException] = None
+        self.stats = PipelineStats()
+
+    # -------------------------------------------------------------------------
+    # Storage
+    # -------------------------------------------------------------------------
+
+    def _get_session(self):
+        if self._session_factory is None:
+            from src.database.postgres_connection import PostgresConnection
+            self._session_factory = PostgresConnection().get_session
+        return self._session_factory()
+
+    def _write_batch_to_postgres(self, rows: List[Dict]) -> int:
+        """COPY one batch into mcq_pool in its own transaction."""
+        from src.database.postgres_crud import mcq_stats
+
+        session = self._get_session()
+        try:
+            written = mcq_stats.copy_mcqs(session, rows, deactivate_existing=self.replace)
+            session.commit()
+            return written
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _existing_sense_ids(self) -> Set[str]:
+        from src.database.postgres_crud import mcq_stats
+
+        session = self._get_session()
+        try:
+            return mcq_stats.get_active_mcq_sense_ids(session, self.mcq_type_filter)
+        finally:
+            session.close()
+
+    def _flush(self, rows: List[Dict], sense_ids: List[str], stored_senses: int):
+        if not sense_ids:
+            return
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                written = self._write_batch(rows) if rows else 0
+                break
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.stats.senses_failed += stored_senses
+                    print(f"⚠️ Batch of {len(rows)} MCQs failed after {attempt} attempts: {e}")
+                    return
+                time.sleep(min(2 ** attempt, 10))
+
+        self.checkpoint.record(sense_ids)
+        self.stats.mcqs_written += written
+        self.stats.senses_stored += stored_senses
+        self.stats.senses_empty += len(sense_ids) - stored_senses
+        self.stats.batches_written += 1
+        for row in rows:
+            self.stats.by_type[row['mcq_type']] = self.stats.by_type.get(row['mcq_type'], 0) + 1
+
+        done = self.stats.senses_stored + self.stats.senses_empty + self.stats.senses_failed
+        print(f"  💾 {self.stats.mcqs_written:,} MCQs stored "
+              f"({done:,}/{self.stats.senses_total - self.stats.senses_skipped:,} senses)")
+
+    def _writer_loop(self):
+        rows: List[Dict] = []
+        sense_ids: List[str] = []
+        stored_senses = 0
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _DONE:
+                    break
+                for sense_id, sense_rows, error in item:
+                    if error:
+                        self.stats.senses_failed += 1
+                        print(f"  ⚠️ {sense_id}: {error}")
+                        continue
+                    sense_ids.append(sense_id)
+                    if sense_rows:
+                        rows.extend(sense_rows)
+                        stored_senses += 1
+                if len(rows) >= self.batch_rows:
+                    self._flush(rows, sense_ids, stored_senses)
+                    rows, sense_ids, stored_senses = [], [], 0
+            self._flush(rows, sense_ids, stored_senses)
+        except BaseException as e:
+            self._writer_error = e
+
+    def _put(self, item, writer: threading.Thread):
+        """Blocking put that gives up if the writer thread has died."""
+        while True:
+            if self._writer_error is not None or not writer.is_alive():
+                raise RuntimeError(f"MCQ writer stopped: {self._writer_error}")
+            try:
+                self._queue.put(item, timeout=1.0)
+                return
+            except queue.Full:
+                continue
+
+    # -------------------------------------------------------------------------
+    # Run
+    # -------------------------------------------------------------------------
+
+    def pending_sense_ids(self, sense_ids: List[str], resume: bool = False) -> List[str]:
+        """Filter out checkpointed senses (resume) and senses with active MCQs."""
+        skip: Set[str] = set()
+        if resume:
+            skip |= self.checkpoint.load()
+        else:
+            self.checkpoint.reset()
+        if self.skip_existing:
+            skip |= self._existing_sense_ids()
+        return [sid for sid in sense_ids if sid not in skip]
+
+    def run(self, sense_ids: List[str], resume: bool = False) -> PipelineStats:
+        """
+        Generate and store MCQs for the given senses.
+
+        Args:
+            sense_ids: Sense IDs to process
+            resume: Skip senses recorded in the checkpoint file
+
+        Returns:
+            PipelineStats
+        """
+        start = time.time()
+        self.stats = PipelineStats(senses_total=len(sense_ids))
+        todo = self.pending_sense_ids(sense_ids, resume=resume)
+        self.stats.senses_skipped = len(sense_ids) - len(todo)
+        chunks = [todo[i:i + self.chunk_size] for i in range(0, len(todo), self.chunk_size)]
+
+        print(f"🎯 {len(todo):,} senses to process "
+              f"({self.stats.senses_skipped:,} skipped, {len(chunks):,} chunks, {self.workers} workers)")
+
+        writer = threading.Thread(target=self._writer_loop, name="mcq-writer", daemon=True)
+        writer.start()
+        try:
+            if self.workers <= 0:
+                _init_worker(self.mcq_type_filter)
+                for chunk in chunks:
+                    self._put(_generate_chunk(chunk), writer)
+            else:
+                self._run_pool(chunks, writer)
+        finally:
+            if writer.is_alive():
+                self._queue.put(_DONE)
+            writer.join()
+
+        if self._writer_error is not None:
+            raise RuntimeError(f"MCQ writer failed: {self._writer_error}") from self._writer_error
+
+        self.stats.elapsed_seconds = time.time() - start
+        return self.stats
+
+    def _run_pool(self, chunks: List[List[str]], writer: threading.Thread):
+        # 'spawn' avoids inheriting SQLAlchemy/SSL state from the parent
+        ctx = multiprocessing.get_context('spawn')
+        max_in_flight = self.workers * 2
+        remaining = iter(chunks)
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(self.mcq_type_filter,)
+        ) as pool:
+            in_flight = set()
+            while True:
+                # Keep at most max_in_flight chunks outstanding (backpressure)
+                while len(in_flight) < max_in_flight:
+                    chunk = next(remaining, None)
+                    if chunk is None:
+                        break
+                    in_flight.add(pool.submit(_generate_chunk, chunk))
+                if not in_flight:
+                    break
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._put(future.result(), writer)
+
+
+def run_pipeline(
+    workers: Optional[int] = None,
+    limit: Optional[int] = None,
+    replace: bool = False,
+    resume: bool = False,
+    skip_existing: bool = True,
+    mcq_type_filter: Optional[str] = None,
+    batch_rows: int = 5000,
+    chunk_size: int = 25,
+    checkpoint_path: Path = DEFAULT_CHECKPOINT
+) -> Optional[PipelineStats]:
+    """Main entry point for bulk MCQ regeneration."""
+    if not vocabulary_store.is_loaded:
+        print("❌ VocabularyStore not loaded. Run enrich_vocabulary_v2.py first.")
+        return None
+
+    print(f"✅ Using VocabularyStore V{vocabulary_store.version}")
+    if not vocabulary_store.is_memory_mapped:
+        print("⚠️ No vocabulary snapshot found - every worker will parse vocabulary.json. "
+              "Run scripts/build_vocabulary_snapshot.py first for faster startup.")
+
+    sense_ids = vocabulary_store.get_all_sense_ids()
+    if limit:
+        sense_ids = sense_ids[:limit]
+
+    pipeline = MCQPipeline(
+        workers=workers,
+        chunk_size=chunk_size,
+        batch_rows=batch_rows,
+        mcq_type_filter=mcq_type_filter,
+        replace=replace,
+        skip_existing=skip_existing,
+        checkpoint_path=checkpoint_path
+    )
+    stats = pipeline.run(sense_ids, resume=resume)
+
+    print(f"\n{'='*70}")
+    print("📊 MCQ PIPELINE RESULTS")
+    print(f"{'='*70}")
+    print(f"Senses stored: {stats.senses_stored:,} (empty: {stats.senses_empty:,}, "
+          f"failed: {stats.senses_failed:,}, skipped: {stats.senses_skipped:,})")
+    print(f"MCQs written: {stats.mcqs_written:,} in {stats.batches_written:,} batches")
+    for mcq_type, count in sorted(stats.by_type.items()):
+        print(f"  {mcq_type}: {count:,}")
+    if stats.elapsed_seconds:
+        print(f"Time: {stats.elapsed_seconds:.1f}s "
+              f"({(stats.senses_stored + stats.senses_empty) / stats.elapsed_seconds:.1f} senses/sec)")
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Parallel MCQ pool generation with bulk COPY storage")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count, 0 = in-process)")
+    parser.add_argument("--limit", type=int, help="Only process the first N senses")
+    parser.add_argument("--replace", action="store_true", help="Regenerate senses that already have MCQs (old ones are deactivated)")
+    parser.add_argument("--no-skip", action="store_true", help="Don't skip senses that already have active MCQs")
+    parser.add_argument("--resume", action="store_true", help="Resume from the checkpoint file")
+    parser.add_argument("--checkpoint", type=str, help=f"Checkpoint file (default: {DEFAULT_CHECKPOINT})")
+    parser.add_argument("--mcq-type", type=str, choices=['meaning', 'usage', 'discrimination'],
+                        help="Only generate MCQs of this type")
+    parser.add_argument("--batch-rows", type=int, default=5000, help="Rows per COPY batch")
+    parser.add_argument("--chunk-size", type=int, default=25, help="Senses per worker task")
+    args = parser.parse_args()
+
+    run_pipeline(
+        workers=args.workers,
+        limit=args.limit,
+        replace=args.replace,
+        resume=args.resume,
+        skip_existing=not args.no_skip,
+        mcq_type_filter=args.mcq_type,
+        batch_rows=args.batch_rows,
+        chunk_size=args.chunk_size,
+        checkpoint_path=Path(args.checkpoint) if args.checkpoint else DEFAULT_CHECKPOINT
+    )
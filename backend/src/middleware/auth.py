@@ -4,6 +4,7 @@ Authentication middleware for FastAPI.
 Extracts and verifies Supabase JWT tokens from Authorization header.
 """
 
+import hmac
 import os
 import jwt
 from typing import Optional
@@ -20,6 +21,9 @@ from typing import Generator
 SUPABASE_URL = os.getenv("SUPABASE_URL") or os.getenv("NEXT_PUBLIC_SUPABASE_URL")
 SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
 
+# Shared secret for internal-only endpoints (e.g. /internal/metrics)
+INTERNAL_API_TOKEN = os.getenv("INTERNAL_API_TOKEN")
+
 # Fallback: If JWT_SECRET is not set, we'll try to get it from Supabase
 # For now, we'll decode without verification if secret is not available
 # In production, you should always set SUPABASE_JWT_SECRET
@@ -81,6 +85,27 @@ def extract_token_from_header(authorization: Optional[str] = Header(None)) -> st
     return token
 
 
+def require_internal_token(x_internal_token: Optional[str] = Header(None)) -> None:
+    """
+    Guard internal-only endpoints with the INTERNAL_API_TOKEN shared secret.
+    
+    The endpoint is reported as missing when no token is configured, so it
+    stays hidden on deployments that never opted in.
+    
+    Args:
+        x_internal_token: X-Internal-Token header value
+    
+    Raises:
+        HTTPException: 404 if no token is configured, 403 if the header does not match
+    """
+    if not INTERNAL_API_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_internal_token or not hmac.compare_digest(
+        x_internal_token.encode(), INTERNAL_API_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Invalid internal token")
+
+
 def verify_supabase_token(token: str) -> dict:
     """
     Verify Supabase JWT token and extract payload.
@@ -6,6 +6,9 @@ Schema Optimization & Vector Embeddings Generation
 2. Indexes on frequency_rank, moe_level
 3. Vector embeddings for Word and Sense nodes
 4. Vector indexes for similarity search
+5. Export of all embeddings to a memory-mapped float32 matrix
+   (data/embeddings.npy, see src/services/embedding_matrix.py) so the API
+   can check similarity in-process
 """
 
 import os
@@ -20,6 +23,7 @@ from tqdm import tqdm
 # sys.path.append(str(Path(__file__).parent.parent)) 
 
 from src.database.neo4j_connection import Neo4jConnection
+from src.services.embedding_matrix import EmbeddingMatrix, default_matrix_dirs
 
 # Load environment variables
 load_dotenv()
@@ -35,6 +39,7 @@ genai.configure(api_key=API_KEY)
 EMBEDDING_MODEL = "models/text-embedding-004"
 BATCH_SIZE = 100  # Process 100 nodes at a time
 EMBEDDING_DIMENSIONS = 768  # text-embedding-004 produces 768-dimensional vectors
+EXPORT_BATCH_SIZE = 2000  # Embeddings read per round trip when exporting
 
 
 def optimize_schema(conn: Neo4jConnection):
@@ -377,6 +382,65 @@ def generate_sense_embeddings(conn: Neo4jConnection):
     print(f"\n✅ Sense Embeddings Complete. Processed {processed} senses.")
 
 
+def fetch_embeddings_after(conn: Neo4jConnection, node_type: str, after: str, batch_size: int) -> List[Dict[str, Any]]:
+    """
+    Fetch the next batch of (key, embedding) ordered by key.
+    
+    Keyset pagination on the unique Word.name / Sense.id constraints, so each
+    batch is an index seek rather than a growing SKIP.
+    """
+    key_property = "name" if node_type == "Word" else "id"
+    with conn.get_session() as session:
+        result = session.run(f"""
+            MATCH (n:{node_type})
+            WHERE n.{key_property} > $after AND n.embedding IS NOT NULL
+            RETURN n.{key_property} as key, n.embedding as embedding
+            ORDER BY n.{key_property}
+            LIMIT $batch_size
+        """, after=after, batch_size=batch_size)
+        
+        return [{"key": record["key"], "embedding": record["embedding"]} for record in result]
+
+
+def collect_embeddings(conn: Neo4jConnection, node_type: str) -> Dict[str, List[float]]:
+    """Read every stored embedding of a node type, keyed by name / sense ID."""
+    vectors = {}
+    after = ""
+    with tqdm(desc=f"Exporting {node_type}s", unit="vectors") as pbar:
+        while True:
+            rows = fetch_embeddings_after(conn, node_type, after, EXPORT_BATCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                if len(row["embedding"]) == EMBEDDING_DIMENSIONS:
+                    vectors[row["key"]] = row["embedding"]
+            after = rows[-1]["key"]
+            pbar.update(len(rows))
+    return vectors
+
+
+def export_embedding_matrix(conn: Neo4jConnection, output_dir: Optional[Path] = None):
+    """
+    Export Word and Sense embeddings to data/embeddings.npy (+ keys JSON).
+    
+    Rows are L2-normalised float32; EmbeddingMatrix memory-maps the file.
+    """
+    print("\n" + "="*60)
+    print("Exporting Embedding Matrix")
+    print("="*60)
+    
+    output_dir = output_dir or default_matrix_dirs()[0]
+    word_vectors = collect_embeddings(conn, "Word")
+    sense_vectors = collect_embeddings(conn, "Sense")
+    
+    matrix = EmbeddingMatrix.from_vectors(word_vectors, sense_vectors)
+    matrix.save(output_dir)
+    
+    size_mb = len(matrix) * EMBEDDING_DIMENSIONS * 4 / (1024 * 1024)
+    print(f"✅ Exported {len(word_vectors)} word + {len(sense_vectors)} sense embeddings "
+          f"({size_mb:.1f} MB) to {output_dir}")
+
+
 def main():
     """Main execution function."""
     print("="*60)
@@ -391,7 +455,7 @@ def main():
             return
         
         # Step 1: Schema optimizations
-            optimize_schema(conn)
+        optimize_schema(conn)
         
         # Step 2: Generate Word embeddings
         generate_word_embeddings(conn)
@@ -402,6 +466,9 @@ def main():
         # Step 4: Create vector indexes (optional, may fail on older Neo4j versions)
         create_vector_indexes(conn)
         
+        # Step 5: Export the in-process embedding matrix
+        export_embedding_matrix(conn)
+        
         print("\n" + "="*60)
         print("✅ All Optimizations Complete!")
         print("="*60)
@@ -2,8 +2,19 @@
 Achievement Service
 
 Handles achievement checking, unlocking, and progress tracking.
+
+Two evaluation paths:
+- record_event(): incremental. Per-user counters (user_achievement_counters)
+  are updated from answer/learning/streak events, and only achievements
+  whose threshold lies between the old and new counter value are unlocked.
+  Point-in-time types (vocabulary size, words this week, ...) are re-read
+  with one query each while the user still has one of them to earn.
+- check_achievements(): full recompute. Recomputes every requirement value
+  from source tables, rewrites the counters and unlocks anything earned.
+  Used for repair, manual checks, and to seed users without counters.
 """
 
+import time
 from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime, timedelta
@@ -15,6 +26,36 @@ from ..services.learning_velocity import LearningVelocityService
 from ..services.vocabulary_size import VocabularySizeService
 
 
+# Requirement types kept up to date by record_event() as counters
+COUNTER_TYPES = (
+    'blocks_learned',
+    'blocks_mastered',
+    'streak_days',
+    'total_reviews',
+    'survey_complete',
+)
+
+# Requirement types that are not monotonic counters (verified words can be
+# un-verified, weekly/monthly windows reset); record_event() re-reads them
+# from source tables while the user has an unearned achievement of the type
+RECOMPUTED_TYPES = (
+    'vocabulary_size',
+    'words_this_week',
+    'words_this_month',
+    'perfect_week',
+    'challenges_completed',
+)
+
+# Requirement types that read the same counter
+COUNTER_ALIASES = {
+    'mastered_count': 'blocks_mastered',
+}
+
+# Achievement definitions rarely change; cache them per process
+DEFINITIONS_TTL_SECONDS = 300
+_definitions_cache: Dict[str, object] = {'loaded_at': 0.0, 'rows': [], 'by_counter': {}}
+
+
 class AchievementService:
     """Service for managing achievements and unlocks."""
     
@@ -23,10 +64,203 @@ class AchievementService:
         self.velocity_service = LearningVelocityService(db)
         self.vocab_service = VocabularySizeService(db)
     
+    # ============================================
+    # DEFINITIONS & COUNTERS
+    # ============================================
+    
+    def _get_definitions(self) -> Tuple[List[tuple], Dict[str, List[tuple]]]:
+        """
+        All achievement rows, plus those per counter sorted by requirement_value.
+        """
+        now = time.monotonic()
+        if now - _definitions_cache['loaded_at'] > DEFINITIONS_TTL_SECONDS or not _definitions_cache['rows']:
+            # Explicit column order: the row indexes used throughout this
+            # service (8 = requirement_type, 9 = requirement_value, ...)
+            rows = self.db.execute(
+                text("""
+                    SELECT id, code, name_en, name_zh, description_en, description_zh,
+                           icon, category, requirement_type, requirement_value,
+                           xp_reward, points_bonus, crystal_reward, tier
+                    FROM achievements
+                    ORDER BY requirement_value ASC
+                """)
+            ).fetchall()
+            by_counter: Dict[str, List[tuple]] = {}
+            for row in rows:
+                counter = COUNTER_ALIASES.get(row[8], row[8])
+                if counter in COUNTER_TYPES:
+                    by_counter.setdefault(counter, []).append(row)
+            _definitions_cache.update({'loaded_at': now, 'rows': rows, 'by_counter': by_counter})
+        return _definitions_cache['rows'], _definitions_cache['by_counter']
+    
+    @staticmethod
+    def invalidate_definitions():
+        """Force achievement definitions to be reloaded (after seeding/editing)."""
+        _definitions_cache['loaded_at'] = 0.0
+    
+    def get_counters(self, user_id: UUID) -> Dict[str, int]:
+        """Current counter values for a user (empty if never seeded)."""
+        result = self.db.execute(
+            text("""
+                SELECT requirement_type, value
+                FROM user_achievement_counters
+                WHERE user_id = :user_id
+            """),
+            {'user_id': user_id}
+        )
+        return {row[0]: row[1] for row in result.fetchall()}
+    
+    def _write_counters(self, user_id: UUID, values: Dict[str, int], increment: bool) -> Dict[str, int]:
+        """
+        Upsert counters in one statement.
+        
+        Args:
+            user_id: User ID
+            values: requirement_type -> delta (increment=True) or absolute value
+            increment: Add to the stored value instead of replacing it
+        
+        Returns:
+            requirement_type -> value after the write
+        """
+        if not values:
+            return {}
+        rows = []
+        params = {'user_id': user_id}
+        for i, (counter, value) in enumerate(values.items()):
+            rows.append(f"(:user_id, :type_{i}, :value_{i}, NOW())")
+            params[f'type_{i}'] = counter
+            params[f'value_{i}'] = int(value)
+        new_value = (
+            "user_achievement_counters.value + excluded.value" if increment else "excluded.value"
+        )
+        result = self.db.execute(
+            text(f"""
+                INSERT INTO user_achievement_counters (user_id, requirement_type, value, updated_at)
+                VALUES {", ".join(rows)}
+                ON CONFLICT (user_id, requirement_type) DO UPDATE SET
+                    value = {new_value},
+                    updated_at = NOW()
+                RETURNING requirement_type, value
+            """),
+            params
+        )
+        return {row[0]: row[1] for row in result.fetchall()}
+    
+    # ============================================
+    # INCREMENTAL EVALUATION
+    # ============================================
+    
+    def record_event(
+        self,
+        user_id: UUID,
+        increments: Optional[Dict[str, int]] = None,
+        values: Optional[Dict[str, int]] = None
+    ) -> List[Dict]:
+        """
+        Apply an activity event to the user's counters and unlock crossed achievements.
+        
+        Earned achievements of RECOMPUTED_TYPES are unlocked as well. Users
+        without counters are seeded with a full recompute instead.
+        
+        Args:
+            user_id: User ID
+            increments: requirement_type -> delta (e.g. {'total_reviews': 1})
+            values: requirement_type -> absolute value (e.g. {'streak_days': 5})
+        
+        Returns:
+            List of newly unlocked achievements
+        """
+        increments = {
+            COUNTER_ALIASES.get(k, k): v for k, v in (increments or {}).items()
+            if v and COUNTER_ALIASES.get(k, k) in COUNTER_TYPES
+        }
+        values = {
+            COUNTER_ALIASES.get(k, k): v for k, v in (values or {}).items()
+            if v is not None and COUNTER_ALIASES.get(k, k) in COUNTER_TYPES
+        }
+        old_values = self.get_counters(user_id)
+        if not old_values:
+            return self.check_achievements(user_id)
+        
+        new_values = {}
+        if increments or values:
+            new_values = self._write_counters(user_id, increments, increment=True)
+            new_values.update(self._write_counters(user_id, values, increment=False))
+            self.db.commit()
+        
+        achievements, by_counter = self._get_definitions()
+        newly_unlocked = self._check_recomputed(user_id, achievements)
+        for counter, new_value in new_values.items():
+            old_value = old_values.get(counter, 0)
+            if new_value <= old_value:
+                continue
+            for achievement in by_counter.get(counter, []):
+                requirement_value = int(achievement[9])
+                if requirement_value > new_value:
+                    break
+                if requirement_value > old_value and self._unlock_achievement(user_id, achievement[0], achievement):
+                    newly_unlocked.append(self._achievement_payload(achievement))
+        
+        return newly_unlocked
+    
+    def _check_recomputed(self, user_id: UUID, achievements: List[tuple]) -> List[Dict]:
+        """
+        Unlock earned achievements of RECOMPUTED_TYPES.
+        
+        Only types the user still has locked achievements of are read, each
+        with a single query (not the full vocabulary/activity stats).
+        """
+        candidates = [a for a in achievements if a[8] in RECOMPUTED_TYPES]
+        if not candidates:
+            return []
+        unlocked_ids = self._get_unlocked_ids(user_id)
+        pending = [a for a in candidates if a[0] not in unlocked_ids]
+        if not pending:
+            return []
+        
+        requirement_types = {a[8] for a in pending}
+        vocab_stats = {}
+        if 'vocabulary_size' in requirement_types:
+            vocab_stats['vocabulary_size'] = self.vocab_service.calculate_vocabulary_size(user_id)
+        activity_stats = {}
+        if 'words_this_week' in requirement_types:
+            activity_stats['words_learned_this_week'] = self.velocity_service.get_words_learned_this_week(user_id)
+        if 'words_this_month' in requirement_types:
+            activity_stats['words_learned_this_month'] = self.velocity_service.get_words_learned_this_month(user_id)
+        current_values = {
+            requirement_type: self._get_current_value(user_id, requirement_type, vocab_stats, activity_stats, {})
+            for requirement_type in requirement_types
+        }
+        
+        newly_unlocked = []
+        for achievement in pending:
+            if current_values[achievement[8]] >= int(achievement[9]):
+                if self._unlock_achievement(user_id, achievement[0], achievement):
+                    newly_unlocked.append(self._achievement_payload(achievement))
+        return newly_unlocked
+    
+    def _get_unlocked_ids(self, user_id: UUID) -> set:
+        """IDs of the achievements the user has unlocked."""
+        result = self.db.execute(
+            text("""
+                SELECT achievement_id FROM user_achievements
+                WHERE user_id = :user_id AND unlocked_at IS NOT NULL
+            """),
+            {'user_id': user_id}
+        )
+        return {row[0] for row in result.fetchall()}
+    
+    # ============================================
+    # FULL RECOMPUTE
+    # ============================================
+    
     def check_achievements(self, user_id: UUID) -> List[Dict]:
         """
         Check all achievements and unlock any that are newly earned.
         
+        Recomputes every requirement value from source tables and rewrites
+        the user's counters, so this also repairs counter drift.
+        
         Args:
             user_id: User ID
             
@@ -36,10 +270,7 @@ class AchievementService:
         newly_unlocked = []
         
         # Get all achievements
-        achievements_result = self.db.execute(
-            text("SELECT * FROM achievements ORDER BY requirement_value ASC")
-        )
-        achievements = achievements_result.fetchall()
+        achievements, _ = self._get_definitions()
         
         # Get user's current stats
         vocab_stats = self.vocab_service.get_vocabulary_stats(user_id)
@@ -56,55 +287,55 @@ class AchievementService:
             {'user_id': user_id}
         )
         mastery_counts = {row[0] or 'learning': row[1] for row in mastery_result.fetchall()}
-        mastered_count = mastery_counts.get('mastered', 0)
+        
+        # One value per requirement type (not per achievement)
+        requirement_types = set(COUNTER_TYPES) | {a[8] for a in achievements}
+        current_values = {
+            requirement_type: self._get_current_value(
+                user_id, requirement_type, vocab_stats, activity_stats, mastery_counts
+            )
+            for requirement_type in requirement_types
+        }
+        self._write_counters(
+            user_id, {counter: current_values[counter] for counter in COUNTER_TYPES}, increment=False
+        )
+        self.db.commit()
+        
+        # Already-unlocked achievements in one query
+        unlocked_ids = self._get_unlocked_ids(user_id)
         
         for achievement in achievements:
             achievement_id = achievement[0]
-            code = achievement[1]
-            requirement_type = achievement[8]
-            requirement_value = int(achievement[9])  # Convert to int (comes from DB as string sometimes)
-            
-            # Check if already unlocked
-            existing = self.db.execute(
-                text("""
-                    SELECT unlocked_at FROM user_achievements
-                    WHERE user_id = :user_id AND achievement_id = :achievement_id
-                """),
-                {'user_id': user_id, 'achievement_id': achievement_id}
-            ).fetchone()
-            
-            if existing and existing[0]:  # Already unlocked
+            if achievement_id in unlocked_ids:  # Already unlocked
                 continue
             
-            # Check if requirement is met
-            current_value = self._get_current_value(
-                user_id, requirement_type, vocab_stats, activity_stats, mastery_counts
-            )
-            
-            if current_value >= requirement_value:
-                # Unlock achievement
-                self._unlock_achievement(user_id, achievement_id, achievement)
-                
-                # Get crystal reward (column 12 if exists, else use points_bonus from column 11)
-                crystal_reward = achievement[12] if len(achievement) > 12 and achievement[12] else (achievement[11] if len(achievement) > 11 else 0)
-                
-                newly_unlocked.append({
-                    'achievement_id': str(achievement_id),
-                    'code': code,
-                    'name_en': achievement[2],
-                    'name_zh': achievement[3],
-                    'description_en': achievement[4],
-                    'description_zh': achievement[5],
-                    'icon': achievement[6],
-                    'category': achievement[7],
-                    'tier': achievement[8],
-                    'xp_reward': achievement[10] if len(achievement) > 10 else 0,
-                    'crystal_reward': crystal_reward,
-                    'points_bonus': achievement[11] if len(achievement) > 11 else 0  # Keep for backwards compatibility
-                })
+            requirement_value = int(achievement[9])  # Convert to int (comes from DB as string sometimes)
+            if current_values[achievement[8]] >= requirement_value:
+                if self._unlock_achievement(user_id, achievement_id, achievement):
+                    newly_unlocked.append(self._achievement_payload(achievement))
         
         return newly_unlocked
     
+    def _achievement_payload(self, achievement: tuple) -> Dict:
+        """Newly-unlocked achievement dict returned to callers."""
+        # Get crystal reward (column 12 if exists, else use points_bonus from column 11)
+        crystal_reward = achievement[12] if len(achievement) > 12 and achievement[12] else (achievement[11] if len(achievement) > 11 else 0)
+        
+        return {
+            'achievement_id': str(achievement[0]),
+            'code': achievement[1],
+            'name_en': achievement[2],
+            'name_zh': achievement[3],
+            'description_en': achievement[4],
+            'description_zh': achievement[5],
+            'icon': achievement[6],
+            'category': achievement[7],
+            'tier': achievement[13] if len(achievement) > 13 else None,
+            'xp_reward': achievement[10] if len(achievement) > 10 else 0,
+            'crystal_reward': crystal_reward,
+            'points_bonus': achievement[11] if len(achievement) > 11 else 0  # Keep for backwards compatibility
+        }
+    
     def _get_current_value(
         self,
         user_id: UUID,
@@ -170,23 +401,32 @@ class AchievementService:
         else:
             return 0
     
-    def _unlock_achievement(self, user_id: UUID, achievement_id: UUID, achievement: tuple):
-        """Unlock an achievement for a user."""
-        # Insert or update user_achievement
-        self.db.execute(
+    def _unlock_achievement(self, user_id: UUID, achievement_id: UUID, achievement: tuple) -> bool:
+        """
+        Unlock an achievement for a user.
+        
+        Returns:
+            False if it was already unlocked (no rewards are granted again)
+        """
+        # Insert or update user_achievement (no-op if already unlocked)
+        unlocked = self.db.execute(
             text("""
                 INSERT INTO user_achievements (user_id, achievement_id, unlocked_at, progress)
                 VALUES (:user_id, :achievement_id, NOW(), :requirement_value)
                 ON CONFLICT (user_id, achievement_id) DO UPDATE SET
                     unlocked_at = NOW(),
                     progress = :requirement_value
+                WHERE user_achievements.unlocked_at IS NULL
+                RETURNING achievement_id
             """),
             {
                 'user_id': user_id,
                 'achievement_id': achievement_id,
                 'requirement_value': achievement[9]
             }
-        )
+        ).fetchone()
+        if unlocked is None:
+            return False
         
         # Award XP if reward exists (column index 10)
         xp_reward = achievement[10] if len(achievement) > 10 else 0
@@ -226,6 +466,7 @@ class AchievementService:
                 pass
         
         self.db.commit()
+        return True
     
     def get_user_achievements(self, user_id: UUID) -> List[Dict]:
         """
@@ -0,0 +1,197 @@
+"""
+ANN Index - Batched Nearest-Neighbour Search over the Embedding Matrix
+
+Offline jobs (AdversaryBuilder) need the semantic neighbours of thousands of
+words at once. Instead of one Neo4j vector query per word, an index is
+built in-process over rows of the exported EmbeddingMatrix and queried for
+every word in one batch.
+
+Backends:
+- hnswlib (optional, `pip install hnswlib`): HNSW graph, inner-product
+  space over the normalised rows
+- NumPy fallback: exact top-k by blocked matrix products (argpartition per
+  row); a few thousand words against a few thousand candidates is a
+  sub-second job
+
+Both return (key, cosine similarity) pairs, most similar first, and never
+return a query key as its own neighbour.
+
+Usage:
+    from src.services.ann_index import AnnIndex
+    from src.services.embedding_matrix import get_embedding_matrix
+
+    index = AnnIndex.build(get_embedding_matrix(), keys=high_frequency_words)
+    neighbours = index.query_keys(high_frequency_words, k=5)
+    # {"adopt": [("embrace", 0.58), ...], ...}
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+# hnswlib is optional; without it queries are exact NumPy products
+try:
+    import hnswlib
+    HAS_HNSWLIB = True
+except ImportError:
+    hnswlib = None
+    HAS_HNSWLIB = False
+
+from .embedding_matrix import EmbeddingMatrix, WORD
+
+
+# Query rows per matrix product in the exact backend (bounds peak memory)
+QUERY_BLOCK_SIZE = 1024
+
+# HNSW parameters (recall > 0.99 at these sizes)
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+
+class AnnIndex:
+    """Nearest-neighbour index over a subset of embedding rows."""
+
+    def __init__(self, keys: Sequence[str], vectors, use_hnsw: Optional[bool] = None):
+        """
+        Args:
+            keys: Key for each row of `vectors`
+            vectors: n x d float32 array of L2-normalised rows
+            use_hnsw: Force (True) or disable (False) hnswlib; default is
+                to use it when installed
+        """
+        if not HAS_NUMPY:
+            raise RuntimeError("AnnIndex requires NumPy")
+        self.keys = list(keys)
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self._positions = {key: i for i, key in enumerate(self.keys)}
+
+        self.use_hnsw = HAS_HNSWLIB if use_hnsw is None else use_hnsw
+        if self.use_hnsw and not HAS_HNSWLIB:
+            raise RuntimeError("hnswlib is not installed (pip install hnswlib)")
+        self._hnsw = self._build_hnsw() if self.use_hnsw and self.keys else None
+
+    @classmethod
+    def build(
+        cls,
+        matrix: EmbeddingMatrix,
+        keys: Optional[Iterable[str]] = None,
+        kind: str = WORD,
+        use_hnsw: Optional[bool] = None
+    ) -> 'AnnIndex':
+        """
+        Index the given keys (default: every key of the kind) of a matrix.
+
+        Keys without an embedding are skipped.
+        """
+        all_keys = matrix.words if kind == WORD else matrix.senses
+        candidates = all_keys if keys is None else keys
+        indexed = []
+        rows = []
+        for key in candidates:
+            row = matrix.row(key, kind)
+            if row is not None:
+                indexed.append(key)
+                rows.append(row)
+        vectors = matrix.vectors[rows] if rows else np.zeros((0, matrix.dimensions), dtype=np.float32)
+        return cls(indexed, vectors, use_hnsw=use_hnsw)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._positions
+
+    @property
+    def backend(self) -> str:
+        return 'hnsw' if self._hnsw is not None else 'exact'
+
+    def _build_hnsw(self):
+        index = hnswlib.Index(space='ip', dim=self.vectors.shape[1])
+        index.init_index(max_elements=len(self.keys), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+        index.add_items(self.vectors, np.arange(len(self.keys)))
+        index.set_ef(HNSW_EF_SEARCH)
+        return index
+
+    # =========================================================================
+    # QUERIES
+    # =========================================================================
+
+    def query_vectors(
+        self,
+        queries,
+        k: int = 10,
+        exclude_positions: Optional[Sequence[int]] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Top-k neighbours for each query vector.
+
+        Args:
+            queries: m x d array (normalised like the index rows)
+            k: Neighbours per query
+            exclude_positions: Per query, an index position never returned
+                (-1 for none); used to drop the query key itself
+
+        Returns:
+            One list of (key, similarity) per query, most similar first
+        """
+        queries = np.ascontiguousarray(np.atleast_2d(queries), dtype=np.float32)
+        if not len(self.keys) or k <= 0 or not len(queries):
+            return [[] for _ in range(len(queries))]
+
+        excluded = (
+            np.full(len(queries), -1, dtype=np.int64) if exclude_positions is None
+            else np.asarray(exclude_positions, dtype=np.int64)
+        )
+        # One extra candidate so dropping the query itself still leaves k
+        want = min(k + 1, len(self.keys))
+        if self._hnsw is not None:
+            self._hnsw.set_ef(max(HNSW_EF_SEARCH, want))
+            labels, distances = self._hnsw.knn_query(queries, k=want)
+            scores = 1.0 - distances  # ip space distance = 1 - dot
+        else:
+            labels, scores = self._exact_top(queries, want)
+
+        results = []
+        for i in range(len(queries)):
+            row = [
+                (self.keys[label], float(score))
+                for label, score in zip(labels[i], scores[i])
+                if label != excluded[i]
+            ]
+            results.append(row[:k])
+        return results
+
+    def _exact_top(self, queries, want: int):
+        """Exact top-`want` labels and scores per query row."""
+        labels = np.empty((len(queries), want), dtype=np.int64)
+        scores = np.empty((len(queries), want), dtype=np.float32)
+        for start in range(0, len(queries), QUERY_BLOCK_SIZE):
+            block = queries[start:start + QUERY_BLOCK_SIZE] @ self.vectors.T
+            if want < block.shape[1]:
+                top = np.argpartition(-block, want - 1, axis=1)[:, :want]
+            else:
+                top = np.tile(np.arange(block.shape[1]), (len(block), 1))
+            top_scores = np.take_along_axis(block, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind='stable')
+            labels[start:start + len(block)] = np.take_along_axis(top, order, axis=1)
+            scores[start:start + len(block)] = np.take_along_axis(top_scores, order, axis=1)
+        return labels, scores
+
+    def query_keys(self, keys: Iterable[str], k: int = 10) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        Neighbours of indexed keys, all in one batch (the key itself excluded).
+
+        Keys that are not in the index are omitted from the result.
+        """
+        present = [key for key in keys if key in self._positions]
+        positions = [self._positions[key] for key in present]
+        if not present:
+            return {}
+        neighbours = self.query_vectors(self.vectors[positions], k=k, exclude_positions=positions)
+        return dict(zip(present, neighbours))
@@ -14,6 +14,8 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+from src.services.level_curve import level_for_xp
+
 
 class CurrencyService:
     """Service for managing the three-currency economy."""
@@ -393,6 +395,130 @@ class CurrencyService:
             'energy_granted': sparks_result.get('energy_granted', 0)
         }
     
+    def award_mcq_results_batch(
+        self,
+        user_id: UUID,
+        correct: int = 0,
+        fast_correct: int = 0,
+        wrong: int = 0,
+        commit: bool = True
+    ) -> Dict:
+        """
+        Award currencies for many MCQ results as one aggregated update.
+        
+        Equivalent to calling award_mcq_result once per answer (without the
+        word-mastery bonus), but costs a fixed number of statements: one
+        balance UPDATE ... RETURNING, one level update, and one aggregated
+        row per currency in currency_transactions and xp_history.
+        
+        Args:
+            user_id: User ID
+            correct: Correct answers (not fast)
+            fast_correct: Fast correct answers
+            wrong: Wrong answers
+            commit: Commit when done (False lets callers batch with other writes)
+            
+        Returns:
+            Dictionary with sparks/essence/energy added and new totals
+        """
+        sparks_amount = (
+            correct * self.SPARKS_REWARDS.get('mcq_correct', 0)
+            + fast_correct * self.SPARKS_REWARDS.get('mcq_fast_correct', 0)
+            + wrong * self.SPARKS_REWARDS.get('mcq_wrong', 0)
+        )
+        essence_amount = (
+            correct * self.ESSENCE_REWARDS.get('mcq_correct', 0)
+            + fast_correct * self.ESSENCE_REWARDS.get('mcq_fast_correct', 0)
+        )
+        result = {
+            'sparks_added': 0, 'sparks_total': 0,
+            'essence_added': 0, 'essence_total': 0,
+            'energy_granted': 0, 'energy_total': 0,
+            'level_up': False
+        }
+        if sparks_amount <= 0 and essence_amount <= 0:
+            return result
+        
+        self._ensure_user_currencies(user_id, commit=False)
+        
+        row = self.db.execute(
+            text("""
+                UPDATE user_xp
+                SET sparks = sparks + :sparks,
+                    essence = essence + :essence,
+                    total_xp = COALESCE(total_xp, 0) + :sparks,
+                    updated_at = NOW()
+                WHERE user_id = :user_id
+                RETURNING sparks, essence, energy, total_xp, current_level
+            """),
+            {'user_id': user_id, 'sparks': sparks_amount, 'essence': essence_amount}
+        ).fetchone()
+        
+        new_sparks, new_essence, old_energy, new_total_xp, old_level = (
+            row[0] or 0, row[1] or 0, row[2] or 0, row[3] or 0, row[4] or 1
+        )
+        
+        # Level-up from the sparks added (Sparks = XP for leveling)
+        level_info = self._calculate_level(new_total_xp)
+        new_level = level_info['level']
+        energy_granted = 0
+        for lvl in range(old_level + 1, new_level + 1):
+            energy_granted += self.LEVEL_ENERGY_REWARDS.get(lvl, self.DEFAULT_ENERGY_REWARD)
+        new_energy = old_energy + energy_granted
+        
+        self.db.execute(
+            text("""
+                UPDATE user_xp
+                SET energy = energy + :energy_granted,
+                    current_level = :level,
+                    xp_to_next_level = :xp_to_next,
+                    xp_in_current_level = :xp_in_level
+                WHERE user_id = :user_id
+            """),
+            {
+                'user_id': user_id,
+                'energy_granted': energy_granted,
+                'level': new_level,
+                'xp_to_next': level_info['xp_to_next'],
+                'xp_in_level': level_info['xp_in_level']
+            }
+        )
+        
+        transactions = []
+        if sparks_amount > 0:
+            transactions.append(('sparks', sparks_amount, new_sparks, 'mcq_batch', None))
+        if essence_amount > 0:
+            transactions.append(('essence', essence_amount, new_essence, 'mcq_batch', None))
+        if energy_granted > 0:
+            transactions.append(('energy', energy_granted, new_energy, 'level_up', f'Level up to {new_level}'))
+        self._record_transactions(user_id, transactions)
+        
+        if sparks_amount > 0:
+            # Also record in xp_history for backwards compatibility
+            self.db.execute(
+                text("""
+                    INSERT INTO xp_history (user_id, xp_amount, source, source_id)
+                    VALUES (:user_id, :amount, 'mcq_batch', NULL)
+                """),
+                {'user_id': user_id, 'amount': sparks_amount}
+            )
+        
+        if commit:
+            self.db.commit()
+        
+        result.update({
+            'sparks_added': sparks_amount,
+            'sparks_total': new_sparks,
+            'essence_added': essence_amount,
+            'essence_total': new_essence,
+            'energy_granted': energy_granted,
+            'energy_total': new_energy,
+            'level_up': new_level > old_level,
+            'old_level': old_level,
+            'new_level': new_level
+        })
+        return result
+    
     # ============================================
     # SPENDING CURRENCIES
     # ============================================
@@ -471,7 +597,7 @@ class CurrencyService:
     # HELPER METHODS
     # ============================================
     
-    def _ensure_user_currencies(self, user_id: UUID):
+    def _ensure_user_currencies(self, user_id: UUID, commit: bool = True):
         """Ensure user has currency columns initialized."""
         self.db.execute(
             text("""
@@ -485,32 +611,12 @@ class CurrencyService:
             """),
             {'user_id': user_id}
         )
-        self.db.commit()
+        if commit:
+            self.db.commit()
     
     def _calculate_level(self, total_xp: int) -> Dict:
-        """
-        Calculate level from total XP (same as Sparks).
-        
-        Formula: Level N requires 100 + (N-1) * 50 XP
-        - Level 2: 100 XP (100 total)
-        - Level 3: 150 XP (250 total)
-        - Level 4: 200 XP (450 total)
-        etc.
-        """
-        level = 1
-        xp_needed = 100
-        remaining_xp = total_xp
-        
-        while remaining_xp >= xp_needed:
-            remaining_xp -= xp_needed
-            level += 1
-            xp_needed = 100 + (level - 1) * 50
-        
-        return {
-            'level': level,
-            'xp_to_next': xp_needed,
-            'xp_in_level': remaining_xp
-        }
+        """Calculate level from total XP (same as Sparks; see level_curve)."""
+        return level_for_xp(total_xp)
     
     def _record_transaction(
         self,
@@ -544,6 +650,46 @@ class CurrencyService:
             # Table might not exist yet
             pass
     
+    def _record_transactions(
+        self,
+        user_id: UUID,
+        transactions: List[Tuple[str, int, int, str, Optional[str]]]
+    ):
+        """
+        Record several currency transactions in one multi-row INSERT.
+        
+        Args:
+            user_id: User ID
+            transactions: (currency_type, amount, balance_after, source, description)
+        """
+        if not transactions:
+            return
+        values = []
+        params = {'user_id': user_id}
+        for i, (currency_type, amount, balance, source, description) in enumerate(transactions):
+            values.append(f"(:user_id, :type_{i}, :amount_{i}, :balance_{i}, :source_{i}, NULL, :desc_{i})")
+            params.update({
+                f'type_{i}': currency_type,
+                f'amount_{i}': amount,
+                f'balance_{i}': balance,
+                f'source_{i}': source,
+                f'desc_{i}': description
+            })
+        try:
+            # Savepoint: a missing table must not abort the caller's transaction
+            with self.db.begin_nested():
+                self.db.execute(
+                    text(f"""
+                        INSERT INTO currency_transactions 
+                        (user_id, currency_type, amount, balance_after, source, source_id, description)
+                        VALUES {", ".join(values)}
+                    """),
+                    params
+                )
+        except Exception:
+            # Table might not exist yet
+            pass
+    
     def get_transaction_history(
         self,
         user_id: UUID,
@@ -0,0 +1,261 @@
+"""
+Dashboard Aggregator - Concurrent Dashboard Snapshot with Per-Learner Cache
+
+GET /api/v1/dashboard needs vocabulary, activity, level, achievement,
+algorithm, review, card and points data. The sections are independent, so
+they run concurrently on a small thread pool (each on its own session) and
+are merged into one snapshot dict:
+
+- Page load latency ~ the slowest section instead of the sum of all
+- Snapshots are cached per learner for a short TTL (DASHBOARD_CACHE_TTL)
+- Answer submission calls invalidate(user_id) so the next load is fresh
+
+Usage:
+    from src.services.dashboard_aggregator import dashboard_aggregator
+
+    snapshot = dashboard_aggregator.get_snapshot(user_id)
+    dashboard_aggregator.invalidate(user_id)   # after an answer is recorded
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+DEFAULT_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL", "30"))
+
+DEFAULT_MAX_WORKERS = int(os.getenv("DASHBOARD_MAX_WORKERS", "8"))
+
+# Expired snapshots are pruned once the cache holds this many learners
+MAX_CACHED_LEARNERS = 10000
+
+
+# =============================================================================
+# Sections (each runs on its own session)
+# =============================================================================
+
+def _vocabulary_section(db: Session, user_id: UUID) -> Dict[str, Any]:
+    from .vocabulary_size import VocabularySizeService
+    return VocabularySizeService(db).get_vocabulary_stats(user_id)
+
+
+def _activity_section(db: Session, user_id: UUID) -> Dict[str, Any]:
+    from .learning_velocity import LearningVelocityService
+    return LearningVelocityService(db).get_activity_summary(user_id)
+
+
+def _level_section(db: Session, user_id: UUID) -> Dict[str, Any]:
+    from .levels import LevelService
+    return LevelService(db).get_level_info(user_id)
+
+
+def _achievements_section(db: Session, user_id: UUID) -> Dict[str, Any]:
+    from .achievements import AchievementService
+    service = AchievementService(db)
+    achievements = service.get_user_achievements(user_id)
+    return {
+        'unlocked': sum(1 for a in achievements if a['unlocked']),
+        'total': len(achievements),
+        'recent': service.get_recent_achievements(user_id, days=7),
+    }
+
+
+def _algorithm_section(db: Session, user_id: UUID) -> str:
+    from ..spaced_repetition.assignment_service import AssignmentService
+    return AssignmentService(db).get_or_assign(user_id, db).value
+
+
+def _reviews_section(db: Session, user_id: UUID) -> Dict[str, Any]:
+    row = db.execute(
+        text("""
+            SELECT
+                COUNT(*) as total_reviews,
+                SUM(CASE WHEN retention_actual THEN 1 ELSE 0 END) as total_correct,
+                COUNT(*) FILTER (WHERE DATE(review_date) = CURRENT_DATE) as reviews_today
+            FROM fsrs_review_history
+            WHERE user_id = :user_id
+        """),
+        {'user_id': user_id}
+    ).fetchone()
+    total_reviews = row[0] or 0 if row else 0
+    total_correct = row[1] or 0 if row else 0
+    return {
+        'total_reviews': total_reviews,
+        'total_correct': total_correct,
+        'reviews_today': row[2] or 0 if row else 0,
+        'retention_rate': total_correct / total_reviews if total_reviews > 0 else 0,
+    }
+
+
+def _cards_section(db: Session, user_id: UUID) -> Dict[str, Any]:
+    result = db.execute(
+        text("""
+            SELECT
+                mastery_level,
+                COUNT(*) as count,
+                SUM(current_interval) as interval_sum,
+                COUNT(current_interval) as interval_count
+            FROM verification_schedule
+            WHERE user_id = :user_id
+            GROUP BY mastery_level
+        """),
+        {'user_id': user_id}
+    )
+    mastery_counts = {
+        'learning': 0, 'familiar': 0, 'known': 0,
+        'mastered': 0, 'leech': 0
+    }
+    interval_sum = 0
+    interval_count = 0
+    for row in result.fetchall():
+        mastery_counts[row[0] or 'learning'] = row[1]
+        interval_sum += row[2] or 0
+        interval_count += row[3] or 0
+    return {
+        'mastery_counts': mastery_counts,
+        'avg_interval': interval_sum / interval_count if interval_count else 0,
+    }
+
+
+def _points_section(db: Session, user_id: UUID) -> Dict[str, int]:
+    row = db.execute(
+        text("""
+            SELECT
+                total_earned,
+                available_points,
+                locked_points,
+                withdrawn_points
+            FROM points_accounts
+            WHERE user_id = :user_id
+        """),
+        {'user_id': user_id}
+    ).fetchone()
+    return {
+        "total_earned": row[0] or 0 if row else 0,
+        "available_points": row[1] or 0 if row else 0,
+        "locked_points": row[2] or 0 if row else 0,
+        "withdrawn_points": row[3] or 0 if row else 0
+    }
+
+
+SECTIONS: Dict[str, Callable[[Session, UUID], Any]] = {
+    'vocabulary': _vocabulary_section,
+    'activity': _activity_section,
+    'level': _level_section,
+    'achievements': _achievements_section,
+    'algorithm': _algorithm_section,
+    'reviews': _reviews_section,
+    'cards': _cards_section,
+    'points': _points_section,
+}
+
+
+# =============================================================================
+# Aggregator
+# =============================================================================
+
+class DashboardAggregator:
+    """Runs dashboard sections concurrently and caches the merged snapshot."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        sections: Optional[Dict[str, Callable[[Session, UUID], Any]]] = None
+    ):
+        """
+        Args:
+            session_factory: Callable returning a DB session (defaults to PostgresConnection)
+            ttl_seconds: How long a snapshot is served from cache (0 disables caching)
+            max_workers: Thread pool size shared by all requests
+            sections: Section name -> fn(session, user_id) (defaults to SECTIONS)
+        """
+        self._session_factory = session_factory
+        self.ttl_seconds = ttl_seconds
+        self.sections = sections or SECTIONS
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dashboard")
+        self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # Bumped on invalidate so a snapshot computed before it is not cached
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _get_session(self) -> Session:
+        if self._session_factory is None:
+            from ..database.postgres_connection import PostgresConnection
+            self._session_factory = PostgresConnection().get_session
+        return self._session_factory()
+
+    def _run_section(self, fn: Callable[[Session, UUID], Any], user_id: UUID) -> Any:
+        db = self._get_session()
+        try:
+            value = fn(db, user_id)
+            db.commit()  # Some sections lazily create rows (XP record, algorithm assignment)
+            return value
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def compute_snapshot(self, user_id: UUID) -> Dict[str, Any]:
+        """Run every section concurrently and merge the results (uncached)."""
+        futures = {
+            name: self._executor.submit(self._run_section, fn, user_id)
+            for name, fn in self.sections.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+    def get_snapshot(self, user_id: UUID) -> Dict[str, Any]:
+        """
+        Dashboard snapshot for a learner, served from cache while fresh.
+
+        Raises:
+            Exception: The first section failure (nothing is cached)
+        """
+        key = str(user_id)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            generation = self._generations.get(key, 0)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        snapshot = self.compute_snapshot(user_id)
+        if self.ttl_seconds > 0:
+            with self._lock:
+                if self._generations.get(key, 0) == generation:
+                    if len(self._cache) >= MAX_CACHED_LEARNERS:
+                        self._prune(time.monotonic())
+                    self._cache[key] = (time.monotonic() + self.ttl_seconds, snapshot)
+        return snapshot
+
+    def _prune(self, now: float):
+        """Drop expired snapshots and their generation counters (lock held)."""
+        for key in [k for k, (expires_at, _) in self._cache.items() if expires_at <= now]:
+            del self._cache[key]
+            self._generations.pop(key, None)
+
+    def invalidate(self, user_id: UUID):
+        """Drop the cached snapshot for a learner (call after recording answers)."""
+        key = str(user_id)
+        with self._lock:
+            self._cache.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self):
+        """Drop all cached snapshots."""
+        with self._lock:
+            for key in self._cache:
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._cache.clear()
+
+
+# Process-wide aggregator (read by the dashboard API, invalidated on answer submission)
+dashboard_aggregator = DashboardAggregator()
@@ -0,0 +1,149 @@
+"""
+Edit Distance Index - Deletion-Neighbourhood Lookup for Orthographic Distractors
+
+SymSpell-style index: every word is stored under all strings obtained by
+deleting up to `max_distance` characters. Two words within Levenshtein
+distance d always share such a deletion variant, so a lookup only verifies
+the handful of words that share a variant with the query instead of
+scanning the whole vocabulary. Results are complete (every word within the
+distance is found), not the first N examined.
+
+Shared by:
+- MCQAssembler._get_orthographic_candidates (via VocabularyStore)
+- scripts/enrich_vocabulary_v2.py (CONFUSED_WITH spelling mining)
+
+Usage:
+    from src.services.edit_distance_index import EditDistanceIndex
+
+    index = EditDistanceIndex(["accept", "except", "expect", "apple"])
+    index.lookup("accept")  # [("except", 2), ("expect", 2)]
+"""
+
+from itertools import combinations
+from typing import Dict, Iterable, List, Set, Tuple
+
+# python-Levenshtein is optional (C implementation); fall back to pure Python
+try:
+    import Levenshtein as _levenshtein
+    HAS_LEVENSHTEIN = True
+except ImportError:
+    _levenshtein = None
+    HAS_LEVENSHTEIN = False
+
+
+def levenshtein_distance(s1: str, s2: str) -> int:
+    """Calculate Levenshtein edit distance between two strings."""
+    if HAS_LEVENSHTEIN:
+        return _levenshtein.distance(s1, s2)
+
+    if len(s1) < len(s2):
+        return levenshtein_distance(s2, s1)
+
+    if len(s2) == 0:
+        return len(s1)
+
+    previous_row = range(len(s2) + 1)
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            insertions = previous_row[j + 1] + 1
+            deletions = current_row[j] + 1
+            substitutions = previous_row[j] + (c1 != c2)
+            current_row.append(min(insertions, deletions, substitutions))
+        previous_row = current_row
+
+    return previous_row[-1]
+
+
+def _deletion_variants(word: str, max_distance: int) -> Set[str]:
+    """All strings reachable from word by deleting 0..max_distance characters."""
+    variants = {word}
+    n = len(word)
+    for d in range(1, min(max_distance, n) + 1):
+        for positions in combinations(range(n), d):
+            skip = set(positions)
+            variants.add(''.join(c for i, c in enumerate(word) if i not in skip))
+    return variants
+
+
+class EditDistanceIndex:
+    """
+    Deletion-neighbourhood index for "all words within distance <= d" queries.
+
+    Matching is case-insensitive; results return the words as they were added.
+    """
+
+    def __init__(self, words: Iterable[str] = (), max_distance: int = 2):
+        """
+        Args:
+            words: Words to index
+            max_distance: Largest distance lookups can ask for
+        """
+        self.max_distance = max_distance
+        self._variants: Dict[str, List[str]] = {}   # deletion variant -> lowercase keys
+        self._forms: Dict[str, List[str]] = {}      # lowercase key -> original forms
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return len(self._forms)
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and word.lower() in self._forms
+
+    def add(self, word: str):
+        """Add a word to the index (no-op for empty strings and duplicates)."""
+        if not word:
+            return
+        key = word.lower()
+        forms = self._forms.get(key)
+        if forms is not None:
+            if word not in forms:
+                forms.append(word)
+            return
+        self._forms[key] = [word]
+        for variant in _deletion_variants(key, self.max_distance):
+            self._variants.setdefault(variant, []).append(key)
+
+    def lookup(
+        self,
+        word: str,
+        max_distance: int = None,
+        include_self: bool = False
+    ) -> List[Tuple[str, int]]:
+        """
+        Find every indexed word within max_distance edits of `word`.
+
+        Args:
+            word: Query word
+            max_distance: Maximum distance (defaults to, and capped at, the
+                index's max_distance)
+            include_self: Include exact (distance 0) matches
+
+        Returns:
+            (word, distance) pairs sorted by distance, then word
+        """
+        if not word:
+            return []
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+
+        query = word.lower()
+        candidates: Set[str] = set()
+        for variant in _deletion_variants(query, max_distance):
+            keys = self._variants.get(variant)
+            if keys:
+                candidates.update(keys)
+
+        results = []
+        for key in candidates:
+            if abs(len(key) - len(query)) > max_distance:
+                continue
+            distance = 0 if key == query else levenshtein_distance(query, key)
+            if distance > max_distance or (distance == 0 and not include_self):
+                continue
+            for form in self._forms[key]:
+                results.append((form, distance))
+
+        results.sort(key=lambda r: (r[1], r[0]))
+        return results
@@ -0,0 +1,276 @@
+"""
+Embedding Matrix - Memory-Mapped Word/Sense Embeddings
+
+The optimize_db.py embedding pass stores 768-d vectors on Neo4j Word and
+Sense nodes. export_embedding_matrix() there also writes them to disk as one
+float32 matrix, so similarity checks run in-process instead of shipping
+embedding lists with every Cypher row.
+
+Files (next to vocabulary.json):
+
+    embeddings.npy         float32 (rows x 768), L2-normalised rows
+    embeddings.keys.json   {"dimensions": 768, "words": [...], "senses": [...]}
+
+Rows are the words (in key order) followed by the senses. The .npy file is
+opened with mmap_mode='r', so workers share the pages and startup does not
+read the matrix.
+
+- Cosine similarity is a dot product of normalised rows, batched per call
+- nearest() is an exact top-k over the matrix (argpartition)
+- Without NumPy or without the exported files, get_embedding_matrix()
+  returns None and callers skip embedding checks
+
+Usage:
+    from src.services.embedding_matrix import get_embedding_matrix
+
+    matrix = get_embedding_matrix()
+    if matrix is not None:
+        sims = matrix.similarities("adopt", ["adapt", "adept"])
+        neighbours = matrix.nearest("adopt", k=10)
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# NumPy is optional; without it there is no in-process matrix
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+
+EMBEDDING_DIMENSIONS = 768
+MATRIX_FILENAME = 'embeddings.npy'
+KEYS_FILENAME = 'embeddings.keys.json'
+
+WORD = 'word'
+SENSE = 'sense'
+
+
+class EmbeddingMatrix:
+    """Normalised embedding rows with word and sense key lookups."""
+
+    def __init__(self, vectors, words: Sequence[str], senses: Sequence[str] = ()):
+        """
+        Args:
+            vectors: (len(words) + len(senses)) x d float32 array of
+                L2-normalised rows (may be a read-only memmap)
+            words: Word names for the first rows
+            senses: Sense IDs for the remaining rows
+        """
+        if len(vectors) != len(words) + len(senses):
+            raise ValueError(
+                f"Matrix has {len(vectors)} rows but {len(words) + len(senses)} keys"
+            )
+        self.vectors = vectors
+        self.words = list(words)
+        self.senses = list(senses)
+        self._rows: Dict[str, Dict[str, int]] = {
+            WORD: {name: i for i, name in enumerate(self.words)},
+            SENSE: {sid: len(self.words) + i for i, sid in enumerate(self.senses)},
+        }
+
+    @property
+    def dimensions(self) -> int:
+        return self.vectors.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    # =========================================================================
+    # BUILD / LOAD
+    # =========================================================================
+
+    @staticmethod
+    def normalize(vectors):
+        """float32 copy with unit-length rows (zero rows stay zero)."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    @classmethod
+    def from_vectors(
+        cls,
+        word_vectors: Dict[str, Sequence[float]],
+        sense_vectors: Optional[Dict[str, Sequence[float]]] = None
+    ) -> 'EmbeddingMatrix':
+        """Build an in-memory matrix from {key: vector} dicts."""
+        sense_vectors = sense_vectors or {}
+        rows = list(word_vectors.values()) + list(sense_vectors.values())
+        vectors = cls.normalize(rows) if rows else np.zeros((0, EMBEDDING_DIMENSIONS), dtype=np.float32)
+        return cls(vectors, list(word_vectors), list(sense_vectors))
+
+    def save(self, directory: Path):
+        """Write embeddings.npy + embeddings.keys.json (atomically replaced)."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        matrix_path = directory / MATRIX_FILENAME
+        keys_path = directory / KEYS_FILENAME
+
+        tmp_matrix = matrix_path.with_suffix('.npy.tmp')
+        with open(tmp_matrix, 'wb') as f:
+            np.save(f, np.ascontiguousarray(self.vectors, dtype=np.float32))
+        tmp_keys = keys_path.with_suffix('.json.tmp')
+        with open(tmp_keys, 'w', encoding='utf-8') as f:
+            json.dump({
+                'dimensions': self.dimensions,
+                'words': self.words,
+                'senses': self.senses,
+            }, f, ensure_ascii=False)
+
+        os.replace(tmp_matrix, matrix_path)
+        os.replace(tmp_keys, keys_path)
+
+    @classmethod
+    def open(cls, directory: Path) -> 'EmbeddingMatrix':
+        """Memory-map an exported matrix (read-only)."""
+        directory = Path(directory)
+        with open(directory / KEYS_FILENAME, 'r', encoding='utf-8') as f:
+            keys = json.load(f)
+        vectors = np.load(directory / MATRIX_FILENAME, mmap_mode='r')
+        if vectors.dtype != np.float32 or vectors.ndim != 2:
+            raise ValueError(f"Expected a 2-d float32 matrix, got {vectors.dtype} {vectors.shape}")
+        return cls(vectors, keys.get('words', []), keys.get('senses', []))
+
+    # =========================================================================
+    # LOOKUPS
+    # =========================================================================
+
+    def row(self, key: str, kind: str = WORD) -> Optional[int]:
+        """Row number for a word name or sense ID (None if not exported)."""
+        return self._rows[kind].get(key)
+
+    def has(self, key: str, kind: str = WORD) -> bool:
+        return key in self._rows[kind]
+
+    def vector(self, key: str, kind: str = WORD):
+        """Normalised vector for a key, or None."""
+        row = self.row(key, kind)
+        return None if row is None else self.vectors[row]
+
+    def similarities(self, key: str, others: Iterable[str], kind: str = WORD):
+        """
+        Cosine similarity between one key and many others in one matrix product.
+
+        Args:
+            key: Word name (or sense ID with kind='sense')
+            others: Keys to compare against
+            kind: 'word' or 'sense'
+
+        Returns:
+            float32 array aligned with `others`; NaN where either key has no
+            embedding
+        """
+        others = list(others)
+        result = np.full(len(others), np.nan, dtype=np.float32)
+        row = self.row(key, kind)
+        if row is None or not others:
+            return result
+
+        rows = self._rows[kind]
+        positions = [i for i, other in enumerate(others) if other in rows]
+        if positions:
+            other_rows = [rows[others[i]] for i in positions]
+            result[positions] = self.vectors[other_rows] @ self.vectors[row]
+        return result
+
+    def nearest(
+        self,
+        key_or_vector,
+        k: int = 10,
+        kind: str = WORD,
+        exclude: Optional[Iterable[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Exact top-k neighbours among keys of the same kind.
+
+        Args:
+            key_or_vector: Key to search around, or a query vector
+            k: Number of neighbours
+            kind: 'word' or 'sense'
+            exclude: Keys never returned (the query key is always excluded)
+
+        Returns:
+            List of (key, similarity), most similar first
+        """
+        if isinstance(key_or_vector, str):
+            query_key = key_or_vector
+            query = self.vector(query_key, kind)
+            if query is None:
+                return []
+        else:
+            query_key = None
+            query = self.normalize(np.asarray(key_or_vector, dtype=np.float32).reshape(1, -1))[0]
+
+        keys = self.words if kind == WORD else self.senses
+        offset = 0 if kind == WORD else len(self.words)
+        if not keys or k <= 0:
+            return []
+
+        scores = np.asarray(self.vectors[offset:offset + len(keys)] @ query, dtype=np.float32)
+        skip = set(exclude or ())
+        if query_key is not None:
+            skip.add(query_key)
+        for key in skip:
+            row = self.row(key, kind)
+            if row is not None:
+                scores[row - offset] = -np.inf
+
+        want = min(k, len(keys))
+        top = np.argpartition(-scores, want - 1)[:want]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(keys[i], float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+
+# ============================================
+# Process-wide matrix
+# ============================================
+
+_matrix: Optional[EmbeddingMatrix] = None
+_matrix_loaded = False
+_matrix_lock = threading.Lock()
+
+
+def default_matrix_dirs() -> List[Path]:
+    """Directories searched for the exported files (same as vocabulary.json)."""
+    configured = os.getenv('EMBEDDING_MATRIX_DIR')
+    if configured:
+        return [Path(configured)]
+    return [
+        Path(__file__).parent.parent.parent / 'data',  # backend/data/
+        Path(__file__).parent.parent.parent.parent / 'data',  # project root/data/
+    ]
+
+
+def get_embedding_matrix() -> Optional[EmbeddingMatrix]:
+    """
+    The shared memory-mapped matrix, opened on first use.
+
+    Returns None (once, without retrying) if NumPy or the exported files
+    are missing.
+    """
+    global _matrix, _matrix_loaded
+    if _matrix_loaded:
+        return _matrix
+
+    with _matrix_lock:
+        if _matrix_loaded:
+            return _matrix
+        if HAS_NUMPY:
+            for directory in default_matrix_dirs():
+                if not (directory / MATRIX_FILENAME).exists():
+                    continue
+                try:
+                    _matrix = EmbeddingMatrix.open(directory)
+                    print(f"  Mapped embedding matrix: {len(_matrix)} x {_matrix.dimensions} ({directory})")
+                    break
+                except (OSError, ValueError) as e:
+                    print(f"WARNING: could not load embedding matrix from {directory}: {e}")
+        _matrix_loaded = True
+        return _matrix
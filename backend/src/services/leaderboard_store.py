@@ -0,0 +1,266 @@
+"""
+Leaderboard Store - Materialized XP Rollups + In-Memory Ranking
+
+XP leaderboards used to aggregate xp_history on every request, so their cost
+grew with history size. Instead:
+
+- learner_xp_rollups (migration 022) holds one row per learner per period
+  bucket ('weekly' = ISO week starting Monday, 'monthly' = calendar month,
+  'all_time' = user_xp.total_xp), upserted by LevelService.add_xp
+- Each process keeps a RankedScores board per period, loaded from the
+  current bucket's rollups and updated in place after every add_xp commit
+- Boards are reloaded when the bucket rolls over or after REFRESH_SECONDS,
+  so XP awarded by other workers shows up within that window
+
+Top-N is a slice of the sorted board; a learner's rank is a binary search.
+
+Usage:
+    from src.services.leaderboard_store import leaderboard_store
+
+    leaderboard_store.top(db, 'weekly', 50)           # [(learner_id, xp), ...]
+    leaderboard_store.rank(db, 'weekly', learner_id)  # (rank, xp) or None
+"""
+
+import bisect
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+PERIODS = ('weekly', 'monthly', 'all_time')
+
+ALL_TIME_BUCKET = date(1970, 1, 1)
+
+REFRESH_SECONDS = float(os.getenv("LEADERBOARD_REFRESH_SECONDS", "60"))
+
+
+def bucket_start(period: str, today: Optional[date] = None) -> date:
+    """
+    First day of the bucket that `today` falls in (UTC).
+
+    Args:
+        period: 'weekly', 'monthly' or 'all_time'
+        today: Reference date (defaults to the current UTC date)
+    """
+    if today is None:
+        today = datetime.utcnow().date()
+    if period == 'weekly':
+        return today - timedelta(days=today.weekday())
+    if period == 'monthly':
+        return today.replace(day=1)
+    if period == 'all_time':
+        return ALL_TIME_BUCKET
+    raise ValueError(f"Invalid period: {period}")
+
+
+# =============================================================================
+# Sorted score board
+# =============================================================================
+
+class RankedScores:
+    """
+    Scores kept sorted by (score DESC, key ASC).
+
+    Lookups (rank, score) are O(log n) / O(1); set/add are a binary search
+    plus a list insert/delete. Keys with a score <= 0 are not ranked.
+    """
+
+    def __init__(self, scores: Optional[Dict[str, int]] = None):
+        self._scores: Dict[str, int] = {}
+        self._order: List[Tuple[int, str]] = []
+        if scores:
+            self._scores = {k: v for k, v in scores.items() if v > 0}
+            self._order = sorted((-v, k) for k, v in self._scores.items())
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._scores
+
+    def score(self, key: str) -> int:
+        return self._scores.get(key, 0)
+
+    def set(self, key: str, score: int):
+        """Set the absolute score of `key`."""
+        old = self._scores.get(key)
+        if old == score:
+            return
+        if old is not None:
+            i = bisect.bisect_left(self._order, (-old, key))
+            del self._order[i]
+            del self._scores[key]
+        if score > 0:
+            self._scores[key] = score
+            bisect.insort(self._order, (-score, key))
+
+    def add(self, key: str, delta: int):
+        """Add `delta` to the score of `key`."""
+        self.set(key, self.score(key) + delta)
+
+    def rank(self, key: str) -> Optional[int]:
+        """1-based rank of `key`, or None if it is not ranked."""
+        score = self._scores.get(key)
+        if score is None:
+            return None
+        return bisect.bisect_left(self._order, (-score, key)) + 1
+
+    def top(self, n: int) -> List[Tuple[str, int]]:
+        """Highest `n` (key, score) pairs."""
+        return [(k, -s) for s, k in self._order[:n]]
+
+
+# =============================================================================
+# Rollup-backed store
+# =============================================================================
+
+_UPSERT_ROLLUPS_SQL = text("""
+    INSERT INTO learner_xp_rollups (learner_id, period, bucket_start, xp, updated_at)
+    SELECT
+        a.learner_id,
+        p.period,
+        p.bucket_start,
+        CASE WHEN p.period = 'all_time' THEN a.total_xp ELSE a.amount END,
+        NOW()
+    FROM unnest(
+        CAST(:learner_ids AS uuid[]), CAST(:amounts AS int[]), CAST(:totals AS int[])
+    ) AS a(learner_id, amount, total_xp)
+    CROSS JOIN (VALUES
+        ('weekly', CAST(:week_start AS date)),
+        ('monthly', CAST(:month_start AS date)),
+        ('all_time', CAST(:all_time_start AS date))
+    ) AS p(period, bucket_start)
+    ON CONFLICT (period, bucket_start, learner_id) DO UPDATE SET
+        xp = CASE
+            WHEN learner_xp_rollups.period = 'all_time' THEN EXCLUDED.xp
+            ELSE learner_xp_rollups.xp + EXCLUDED.xp
+        END,
+        updated_at = NOW()
+""")
+
+
+class LeaderboardStore:
+    """Per-process XP boards backed by learner_xp_rollups."""
+
+    def __init__(self, refresh_seconds: float = REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        # period -> (bucket_start, board, loaded_at monotonic)
+        self._boards: Dict[str, Tuple[date, RankedScores, float]] = {}
+        self._lock = threading.Lock()
+
+    # ============================================
+    # Writes
+    # ============================================
+
+    def record_xp(self, db: Session, learner_id, amount: int, total_xp: int):
+        """
+        Upsert the learner's rollups for an XP award (caller commits).
+
+        Args:
+            db: Database session
+            learner_id: Learner ID
+            amount: XP just awarded
+            total_xp: Learner's new user_xp.total_xp
+        """
+        self.record_xp_batch(db, [(learner_id, amount, total_xp)])
+
+    def record_xp_batch(self, db: Session, awards: Iterable[Tuple[object, int, int]]):
+        """
+        Upsert rollups for several learners in one statement (caller commits).
+
+        Args:
+            db: Database session
+            awards: (learner_id, amount, new total_xp) per learner; each
+                learner at most once
+        """
+        awards = list(awards)
+        if not awards:
+            return
+        today = datetime.utcnow().date()
+        db.execute(_UPSERT_ROLLUPS_SQL, {
+            'learner_ids': [str(learner_id) for learner_id, _, _ in awards],
+            'amounts': [amount for _, amount, _ in awards],
+            'totals': [total_xp for _, _, total_xp in awards],
+            'week_start': bucket_start('weekly', today),
+            'month_start': bucket_start('monthly', today),
+            'all_time_start': ALL_TIME_BUCKET,
+        })
+
+    def apply_xp(self, learner_id, amount: int, total_xp: int):
+        """Apply a committed XP award to the loaded boards."""
+        key = str(learner_id)
+        today = datetime.utcnow().date()
+        with self._lock:
+            for period, (bucket, board, _) in self._boards.items():
+                if bucket != bucket_start(period, today):
+                    continue  # Stale bucket, next read reloads it
+                if period == 'all_time':
+                    board.set(key, total_xp)
+                else:
+                    board.add(key, amount)
+
+    def invalidate(self, period: Optional[str] = None):
+        """Drop loaded boards so the next read reloads from the rollups."""
+        with self._lock:
+            if period is None:
+                self._boards.clear()
+            else:
+                self._boards.pop(period, None)
+
+    # ============================================
+    # Reads
+    # ============================================
+
+    def _load(self, db: Session, period: str, bucket: date) -> RankedScores:
+        result = db.execute(
+            text("""
+                SELECT learner_id, xp
+                FROM learner_xp_rollups
+                WHERE period = :period AND bucket_start = :bucket AND xp > 0
+            """),
+            {'period': period, 'bucket': bucket}
+        )
+        return RankedScores({str(row[0]): int(row[1]) for row in result.fetchall()})
+
+    def board(self, db: Session, period: str) -> RankedScores:
+        """Current board for `period`, (re)loading it if needed."""
+        bucket = bucket_start(period)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._boards.get(period)
+        if cached and cached[0] == bucket and now - cached[2] < self.refresh_seconds:
+            return cached[1]
+
+        board = self._load(db, period, bucket)
+        with self._lock:
+            self._boards[period] = (bucket, board, now)
+        return board
+
+    def top(self, db: Session, period: str, limit: int) -> List[Tuple[str, int]]:
+        """Top `limit` (learner_id, xp) pairs for `period`."""
+        board = self.board(db, period)
+        with self._lock:
+            return board.top(limit)
+
+    def rank(self, db: Session, period: str, learner_id) -> Optional[Tuple[int, int]]:
+        """(rank, xp) of a learner for `period`, or None if unranked."""
+        board = self.board(db, period)
+        key = str(learner_id)
+        with self._lock:
+            rank = board.rank(key)
+            return (rank, board.score(key)) if rank is not None else None
+
+    def scores(self, db: Session, period: str, learner_ids: Iterable) -> Dict[str, int]:
+        """XP of the given learners for `period` (unranked learners omitted)."""
+        board = self.board(db, period)
+        with self._lock:
+            return {str(lid): board.score(str(lid)) for lid in learner_ids if str(lid) in board}
+
+
+# Process-wide store (written by LevelService.add_xp, read by LeaderboardService)
+leaderboard_store = LeaderboardStore()
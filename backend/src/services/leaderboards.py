@@ -10,6 +10,11 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+from src.services.leaderboard_store import leaderboard_store
+
+# Set once learner_xp_rollups (migration 022) is found; the check is not repeated after that
+_xp_rollups_ready = False
+
 
 class LeaderboardService:
     """Service for managing leaderboards."""
@@ -34,6 +39,92 @@ class LeaderboardService:
         except Exception:
             return False
     
+    def _has_xp_rollups(self) -> bool:
+        """Whether learner_xp_rollups (migration 022) exists; cached once found."""
+        global _xp_rollups_ready
+        if not _xp_rollups_ready:
+            try:
+                _xp_rollups_ready = bool(self.db.execute(
+                    text("SELECT to_regclass('public.learner_xp_rollups') IS NOT NULL")
+                ).scalar())
+            except Exception:
+                return False
+        return _xp_rollups_ready
+    
+    def _build_entries(self, ranked: List[tuple], period: str) -> List[Dict]:
+        """
+        Turn ranked (learner_id, xp) pairs into leaderboard entries.
+        
+        Profile fields (and word counts for all_time) are fetched only for
+        the learners being returned.
+        
+        Args:
+            ranked: (learner_id, score) pairs, best first
+            period: Time period ('weekly', 'monthly', 'all_time')
+            
+        Returns:
+            Leaderboard entries in the same shape as the calculated path
+        """
+        if not ranked:
+            return []
+        
+        learner_ids = [learner_id for learner_id, _ in ranked]
+        profiles = {}
+        result = self.db.execute(
+            text("""
+                SELECT 
+                    l.id,
+                    l.display_name,
+                    l.avatar_emoji,
+                    COALESCE(u1.email, u2.email) as email
+                FROM public.learners l
+                LEFT JOIN auth.users u1 ON l.user_id = u1.id
+                LEFT JOIN auth.users u2 ON l.guardian_id = u2.id
+                WHERE l.id = ANY(CAST(:learner_ids AS uuid[]))
+            """),
+            {'learner_ids': learner_ids}
+        )
+        for row in result.fetchall():
+            profiles[str(row[0])] = row
+        
+        word_counts = {}
+        if period == 'all_time':
+            result = self.db.execute(
+                text("""
+                    SELECT 
+                        learner_id,
+                        COUNT(CASE WHEN status = 'verified' THEN 1 END) as words_mastered,
+                        COUNT(CASE WHEN status IN ('hollow', 'learning', 'pending') THEN 1 END) as words_in_progress
+                    FROM learning_progress
+                    WHERE learner_id = ANY(CAST(:learner_ids AS uuid[]))
+                    GROUP BY learner_id
+                """),
+                {'learner_ids': learner_ids}
+            )
+            for row in result.fetchall():
+                word_counts[str(row[0])] = (int(row[1] or 0), int(row[2] or 0))
+        
+        leaderboard = []
+        for rank, (learner_id, score) in enumerate(ranked, start=1):
+            profile = profiles.get(learner_id)
+            if profile is None:
+                continue  # Learner deleted since the board was loaded
+            words_mastered, words_in_progress = word_counts.get(learner_id, (0, 0))
+            leaderboard.append({
+                'rank': rank,
+                'user_id': learner_id,  # Frontend expects user_id, but we're passing learner_id
+                'name': profile[1] or 'Anonymous',
+                'avatar': profile[2] or '🦄',
+                'email': profile[3] or None,
+                'score': score,
+                'longest_streak': 0,
+                'current_streak': 0,
+                'words_mastered': words_mastered,
+                'words_in_progress': words_in_progress
+            })
+        
+        return leaderboard
+    
     def get_global_leaderboard(
         self,
         period: str = 'weekly',
@@ -44,7 +135,10 @@ class LeaderboardService:
         Get global leaderboard.
         
         **Note:** This method uses learner-scoped data (not user-scoped).
-        It queries `xp_history` and `learning_progress` tables using `learner_id`.
+        XP rankings are served from the materialized `learner_xp_rollups`
+        board (calendar week/month buckets, see leaderboard_store); without
+        that table they are calculated from `xp_history`. Other metrics query
+        `learning_progress` using `learner_id`.
         The `leaderboard_entries` table is not used (it's user-scoped and deprecated).
         
         Args:
@@ -57,6 +151,10 @@ class LeaderboardService:
             - rank, user_id (learner_id), name, avatar, email, score, streaks
         """
         print(f"🔍 [LEADERBOARD SERVICE] get_global_leaderboard called: period={period}, limit={limit}, metric={metric}")
+        # XP rankings come from the materialized rollups when migrated
+        if metric == 'xp' and self._has_xp_rollups():
+            return self._build_entries(leaderboard_store.top(self.db, period, limit), period)
+        
         # Check if leaderboard_entries table exists
         has_leaderboard_table = self._table_exists('leaderboard_entries')
         print(f"🔍 [LEADERBOARD SERVICE] has_leaderboard_table: {has_leaderboard_table}")
@@ -387,6 +485,11 @@ class LeaderboardService:
         if not my_learner_ids:
             return []
 
+        if metric == 'xp' and self._has_xp_rollups():
+            scores = leaderboard_store.scores(self.db, period, my_learner_ids)
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            return self._build_entries(ranked, period)
+
         # Get global leaderboard and filter to only show user's learners
         global_list = self.get_global_leaderboard(period, 1000, metric)
         
@@ -433,6 +536,18 @@ class LeaderboardService:
         
         primary_learner_id = str(row[0])
         
+        if metric == 'xp' and self._has_xp_rollups():
+            ranked = leaderboard_store.rank(self.db, period, primary_learner_id)
+            if ranked is None:
+                return None
+            return {
+                'rank': ranked[0],
+                'user_id': str(user_id),
+                'score': ranked[1],
+                'period': period,
+                'metric': metric
+            }
+        
         # Get global list and find index
         # Efficiency Note: Real production apps calculate rank via SQL COUNT(*),
         # but for this repair, fetching the list is safer logic-wise.
@@ -0,0 +1,196 @@
+"""
+Learner Summary Service - Set-Based Dashboard Summaries
+
+Computes the lightweight per-learner summary (level, XP per period, streak,
+vocabulary) for a whole list of learners in a fixed number of grouped
+queries, instead of running LevelService / LearningVelocityService /
+per-learner COUNTs for each one.
+
+- user_xp:           total XP (level from level_curve, in one vectorised pass)
+- learning_progress: vocabulary size, words in progress, words this week,
+                     last active date (GROUP BY learner_id)
+- learner_streaks:   persisted streak state (distinct learning_progress
+                     dates for the last 90 days before migration 023)
+- xp_history:        weekly (7-day) and monthly (30-day) XP (GROUP BY learner_id)
+
+The query count stays fixed regardless of how many learners are requested.
+
+Usage:
+    from src.services.learner_summary import LearnerSummaryService
+
+    summaries = LearnerSummaryService(db).get_summaries([learner_a, learner_b])
+    summaries[str(learner_a)]['current_streak']
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .learning_velocity import LearningVelocityService, streak_from_dates
+from .level_curve import levels_for_xp
+
+
+def empty_summary() -> Dict:
+    """Summary for a learner with no recorded progress (Level 1, nothing learned)."""
+    return {
+        'level': 1,
+        'total_xp': 0,
+        'weekly_xp': 0,
+        'monthly_xp': 0,
+        'current_streak': 0,
+        'vocabulary_size': 0,
+        'words_in_progress': 0,
+        'words_learned_this_week': 0,
+        'last_active_date': None,
+    }
+
+
+class LearnerSummaryService:
+    """Batched learner summaries for parent and coach dashboards."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_summaries(self, learner_ids: List[UUID]) -> Dict[str, Dict]:
+        """
+        Summaries for several learners.
+
+        Args:
+            learner_ids: Learner IDs (from public.learners)
+
+        Returns:
+            {str(learner_id): summary dict} for every requested learner;
+            learners without any data get empty_summary() values
+        """
+        keys = list(dict.fromkeys(str(lid) for lid in learner_ids))
+        summaries = {key: empty_summary() for key in keys}
+        if not keys:
+            return summaries
+
+        params = {'learner_ids': keys}
+        today = date.today()
+        monday = today - timedelta(days=today.weekday())
+
+        # Level and total XP
+        result = self.db.execute(
+            text("""
+                SELECT learner_id, total_xp
+                FROM user_xp
+                WHERE learner_id = ANY(CAST(:learner_ids AS uuid[]))
+            """),
+            params
+        )
+        rows = [row for row in result.fetchall() if str(row[0]) in summaries]
+        levels = levels_for_xp(row[1] or 0 for row in rows)
+        for row, level in zip(rows, levels):
+            summary = summaries[str(row[0])]
+            summary['total_xp'] = row[1] or 0
+            summary['level'] = int(level)
+
+        # Vocabulary and activity counts
+        result = self.db.execute(
+            text("""
+                SELECT
+                    learner_id,
+                    COUNT(CASE WHEN status = 'verified' THEN 1 END) as vocabulary_size,
+                    COUNT(CASE WHEN status IN ('hollow', 'learning', 'pending') THEN 1 END) as words_in_progress,
+                    COUNT(CASE WHEN status = 'verified' AND DATE(learned_at) >= :monday
+                               AND DATE(learned_at) <= :today THEN 1 END) as words_this_week,
+                    MAX(learned_at) as last_active
+                FROM learning_progress
+                WHERE learner_id = ANY(CAST(:learner_ids AS uuid[]))
+                GROUP BY learner_id
+            """),
+            {**params, 'monday': monday, 'today': today}
+        )
+        for row in result.fetchall():
+            summary = summaries.get(str(row[0]))
+            if summary is not None:
+                summary['vocabulary_size'] = row[1] or 0
+                summary['words_in_progress'] = row[2] or 0
+                summary['words_learned_this_week'] = row[3] or 0
+                summary['last_active_date'] = row[4].isoformat() if row[4] else None
+
+        # Streaks: persisted state when migrated, else distinct activity dates
+        velocity = LearningVelocityService(self.db)
+        if velocity.has_streak_table():
+            for key, state in velocity.get_streak_states(keys).items():
+                if key in summaries:
+                    summaries[key]['current_streak'] = state['current_streak']
+        else:
+            self._scan_streaks(summaries, params, today)
+
+        # Period XP
+        result = self.db.execute(
+            text("""
+                SELECT
+                    learner_id,
+                    COALESCE(SUM(CASE WHEN earned_at >= NOW() - INTERVAL '7 days' THEN xp_amount ELSE 0 END), 0) as weekly_xp,
+                    COALESCE(SUM(xp_amount), 0) as monthly_xp
+                FROM xp_history
+                WHERE learner_id = ANY(CAST(:learner_ids AS uuid[]))
+                AND earned_at >= NOW() - INTERVAL '30 days'
+                GROUP BY learner_id
+            """),
+            params
+        )
+        for row in result.fetchall():
+            summary = summaries.get(str(row[0]))
+            if summary is not None:
+                summary['weekly_xp'] = int(row[1] or 0)
+                summary['monthly_xp'] = int(row[2] or 0)
+
+        return summaries
+
+    def _scan_streaks(self, summaries: Dict[str, Dict], params: Dict, today: date):
+        """Streaks from distinct activity dates (before learner_streaks is migrated)."""
+        result = self.db.execute(
+            text("""
+                SELECT DISTINCT learner_id, DATE(learned_at) as activity_date
+                FROM learning_progress
+                WHERE learner_id = ANY(CAST(:learner_ids AS uuid[]))
+                AND learned_at >= CURRENT_DATE - INTERVAL '90 days'
+            """),
+            params
+        )
+        activity: Dict[str, List[date]] = {}
+        for row in result.fetchall():
+            activity.setdefault(str(row[0]), []).append(row[1])
+        for key, dates in activity.items():
+            if key in summaries:
+                summaries[key]['current_streak'] = streak_from_dates(dates, today)
+
+    def get_user_summaries(self, user_ids: List[UUID]) -> Dict[str, Dict]:
+        """
+        Summaries keyed by user ID, using each user's own learner profile.
+
+        Args:
+            user_ids: User IDs (e.g. a parent's children)
+
+        Returns:
+            {str(user_id): summary dict}; users without a learner profile
+            get empty_summary() values
+        """
+        keys = [str(uid) for uid in user_ids]
+        if not keys:
+            return {}
+
+        result = self.db.execute(
+            text("""
+                SELECT DISTINCT ON (user_id) user_id, id
+                FROM public.learners
+                WHERE user_id = ANY(CAST(:user_ids AS uuid[]))
+                ORDER BY user_id, is_parent_profile DESC, created_at ASC
+            """),
+            {'user_ids': keys}
+        )
+        learner_for_user = {str(row[0]): str(row[1]) for row in result.fetchall()}
+        learner_summaries = self.get_summaries(list(learner_for_user.values()))
+
+        return {
+            key: learner_summaries.get(learner_for_user.get(key), empty_summary())
+            for key in keys
+        }
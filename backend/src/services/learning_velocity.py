@@ -4,7 +4,7 @@ Learning Velocity Service
 Tracks learning speed, activity patterns, and streaks.
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime, timedelta, date
 from uuid import UUID
 from sqlalchemy.orm import Session
@@ -22,6 +22,51 @@ STREAK_MULTIPLIERS = {
 }
 
 
+# Set once learner_streaks (migration 023) has been seen
+_streak_table_ready = False
+
+
+def effective_streak(current_streak: int, last_active_date: Optional[date], today: Optional[date] = None) -> int:
+    """
+    Streak shown to the learner from the persisted state.
+    
+    A streak stays alive through the day after the last activity (it can
+    still be extended today) and drops to 0 once a full day is missed.
+    """
+    if today is None:
+        today = date.today()
+    if last_active_date is None or last_active_date < today - timedelta(days=1):
+        return 0
+    return current_streak or 0
+
+
+def streak_from_dates(activity_dates: Iterable[date], today: Optional[date] = None) -> int:
+    """
+    Consecutive active days ending today (or yesterday, see effective_streak).
+    
+    Args:
+        activity_dates: Distinct activity dates (any order)
+        today: Reference date (defaults to date.today())
+    """
+    if today is None:
+        today = date.today()
+    ordered = sorted(set(activity_dates), reverse=True)
+    if not ordered:
+        return 0
+    expected_date = ordered[0]
+    if expected_date > today:
+        expected_date = today
+    streak = 0
+    for activity_date in ordered:
+        if activity_date > expected_date:
+            continue
+        if activity_date != expected_date:
+            break
+        streak += 1
+        expected_date -= timedelta(days=1)
+    return effective_streak(streak, ordered[0] if streak else None, today)
+
+
 class LearningVelocityService:
     """Service for tracking learning velocity and activity patterns."""
     
@@ -84,12 +129,21 @@ class LearningVelocityService:
         - Creating new learning_progress entry
         - Completing a verification review
         
+        Reads the persisted streak state (one row); falls back to scanning
+        learning_progress when learner_streaks is not migrated yet.
+        
         Args:
             user_id: User ID
             
         Returns:
             Number of consecutive days with activity
         """
+        if self.has_streak_table():
+            return self.get_streak_state(user_id)['current_streak']
+        return self._scan_activity_streak(user_id)
+    
+    def _scan_activity_streak(self, user_id: UUID) -> int:
+        """Legacy streak calculation from up to 90 distinct learning_progress dates."""
         # Get all dates with activity (learning progress or verification)
         result = self.db.execute(
             text("""
@@ -103,24 +157,7 @@ class LearningVelocityService:
         )
         
         activity_dates = [row[0] for row in result.fetchall()]
-        
-        if not activity_dates:
-            return 0
-        
-        # Calculate streak
-        streak = 0
-        today = date.today()
-        expected_date = today
-        
-        for activity_date in activity_dates:
-            if activity_date == expected_date:
-                streak += 1
-                expected_date -= timedelta(days=1)
-            elif activity_date < expected_date:
-                # Gap in streak
-                break
-        
-        return streak
+        return streak_from_dates(activity_dates)
     
     def get_learning_rate(self, user_id: UUID, days: int = 30) -> float:
         """
@@ -208,14 +245,20 @@ class LearningVelocityService:
         
         return list(reversed(weekly_data))  # Oldest first
     
-    def record_activity_and_check_streak(self, user_id: UUID) -> Tuple[int, bool, float]:
+    def record_activity_and_check_streak(
+        self,
+        user_id: UUID,
+        learner_id: Optional[UUID] = None
+    ) -> Tuple[int, bool, float]:
         """
         Record today's activity and check if streak was extended.
         
         This should be called when a user completes a review or learns a word.
+        The learner's streak row is updated in one atomic upsert (caller commits).
         
         Args:
             user_id: User ID
+            learner_id: Learner ID (resolved from the user's own profile if None)
             
         Returns:
             Tuple of (current_streak, streak_extended, xp_multiplier)
@@ -223,8 +266,57 @@ class LearningVelocityService:
             - streak_extended: True if this is the first activity today (streak extended)
             - xp_multiplier: The XP multiplier to apply based on streak
         """
+        if learner_id is None:
+            learner_id = progress_crud._get_learner_id_for_user(self.db, user_id)
+        
+        if learner_id is None or not self.has_streak_table():
+            return self._scan_record_activity(user_id)
+        
+        today = date.today()
+        with self.db.begin_nested():  # A failed upsert must not abort the caller's transaction
+            row = self._upsert_streak(learner_id, today)
+        
+        current_streak = row[0]
+        previous_active_date = row[1]
+        
+        # Streak is "extended" if this is the first activity today
+        streak_extended = previous_active_date is None or previous_active_date < today
+        
+        # Calculate XP multiplier based on streak
+        xp_multiplier = self._get_streak_multiplier(current_streak)
+        
+        return current_streak, streak_extended, xp_multiplier
+    
+    def _upsert_streak(self, learner_id: UUID, today: date):
+        """Advance the learner's streak row for activity on `today`; returns (current_streak, previous_active_date)."""
+        return self.db.execute(
+            text("""
+                WITH previous AS (
+                    SELECT last_active_date FROM learner_streaks WHERE learner_id = :learner_id
+                )
+                INSERT INTO learner_streaks (learner_id, current_streak, longest_streak, last_active_date, updated_at)
+                VALUES (:learner_id, 1, 1, :today, NOW())
+                ON CONFLICT (learner_id) DO UPDATE SET
+                    current_streak = CASE
+                        WHEN learner_streaks.last_active_date >= :today THEN learner_streaks.current_streak
+                        WHEN learner_streaks.last_active_date = :yesterday THEN learner_streaks.current_streak + 1
+                        ELSE 1
+                    END,
+                    longest_streak = GREATEST(learner_streaks.longest_streak, CASE
+                        WHEN learner_streaks.last_active_date >= :today THEN learner_streaks.current_streak
+                        WHEN learner_streaks.last_active_date = :yesterday THEN learner_streaks.current_streak + 1
+                        ELSE 1
+                    END),
+                    last_active_date = GREATEST(learner_streaks.last_active_date, :today),
+                    updated_at = NOW()
+                RETURNING current_streak, (SELECT last_active_date FROM previous) AS previous_active_date
+            """),
+            {'learner_id': learner_id, 'today': today, 'yesterday': today - timedelta(days=1)}
+        ).fetchone()
+    
+    def _scan_record_activity(self, user_id: UUID) -> Tuple[int, bool, float]:
+        """Legacy record_activity_and_check_streak (no persisted state)."""
         today = date.today()
-        yesterday = today - timedelta(days=1)
         
         # Check if user already had activity today
         today_activity_result = self.db.execute(
@@ -243,17 +335,149 @@ class LearningVelocityService:
         )
         had_activity_today = (today_activity_result.scalar() or 0) > 1  # > 1 because current activity counts
         
-        # Calculate current streak
-        current_streak = self.calculate_activity_streak(user_id)
-        
-        # Streak is "extended" if this is the first activity today
+        current_streak = self._scan_activity_streak(user_id)
         streak_extended = not had_activity_today
-        
-        # Calculate XP multiplier based on streak
         xp_multiplier = self._get_streak_multiplier(current_streak)
         
         return current_streak, streak_extended, xp_multiplier
     
+    # ============================================
+    # Persisted streak state
+    # ============================================
+    
+    def has_streak_table(self) -> bool:
+        """Whether learner_streaks (migration 023) exists; cached once found."""
+        global _streak_table_ready
+        if not _streak_table_ready:
+            try:
+                _streak_table_ready = bool(self.db.execute(
+                    text("SELECT to_regclass('public.learner_streaks') IS NOT NULL")
+                ).scalar())
+            except Exception:
+                return False
+        return _streak_table_ready
+    
+    def get_streak_state(self, user_id: UUID) -> Dict[str, any]:
+        """
+        Persisted streak state of the user's own learner profile.
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            Dictionary with current_streak (effective today), longest_streak
+            and last_active_date
+        """
+        row = self.db.execute(
+            text("""
+                SELECT s.current_streak, s.longest_streak, s.last_active_date
+                FROM public.learners l
+                JOIN learner_streaks s ON s.learner_id = l.id
+                WHERE l.user_id = :user_id AND l.is_parent_profile = true
+                LIMIT 1
+            """),
+            {'user_id': user_id}
+        ).fetchone()
+        if not row:
+            return {'current_streak': 0, 'longest_streak': 0, 'last_active_date': None}
+        return {
+            'current_streak': effective_streak(row[0], row[2]),
+            'longest_streak': row[1] or 0,
+            'last_active_date': row[2].isoformat() if row[2] else None,
+        }
+    
+    def get_streak_states(self, learner_ids: List[UUID]) -> Dict[str, Dict[str, any]]:
+        """
+        Persisted streak state for several learners in one query.
+        
+        Args:
+            learner_ids: Learner IDs
+            
+        Returns:
+            {str(learner_id): {'current_streak', 'longest_streak', 'last_active_date'}}
+            for learners that have a streak row
+        """
+        if not learner_ids:
+            return {}
+        result = self.db.execute(
+            text("""
+                SELECT learner_id, current_streak, longest_streak, last_active_date
+                FROM learner_streaks
+                WHERE learner_id = ANY(CAST(:learner_ids AS uuid[]))
+            """),
+            {'learner_ids': [str(lid) for lid in learner_ids]}
+        )
+        today = date.today()
+        return {
+            str(row[0]): {
+                'current_streak': effective_streak(row[1], row[3], today),
+                'longest_streak': row[2] or 0,
+                'last_active_date': row[3].isoformat() if row[3] else None,
+            }
+            for row in result.fetchall()
+        }
+    
+    def backfill_streaks(self, user_id: Optional[UUID] = None) -> int:
+        """
+        Rebuild learner_streaks from activity history (caller commits).
+        
+        Activity days are learning_progress dates per learner plus
+        fsrs_review_history dates attributed to the user's own profile.
+        Consecutive-day runs are found with the gaps-and-islands pattern;
+        the latest run is the current streak, the longest run the record.
+        
+        Args:
+            user_id: Only rebuild this user's learners (all learners if None)
+            
+        Returns:
+            Number of learner rows written
+        """
+        user_filter = "AND l.user_id = :user_id" if user_id else ""
+        result = self.db.execute(
+            text(f"""
+                WITH days AS (
+                    SELECT lp.learner_id, DATE(lp.learned_at) AS d
+                    FROM learning_progress lp
+                    JOIN public.learners l ON l.id = lp.learner_id
+                    WHERE lp.learned_at IS NOT NULL {user_filter}
+                    UNION
+                    SELECT l.id, DATE(rh.review_date)
+                    FROM fsrs_review_history rh
+                    JOIN public.learners l ON l.user_id = rh.user_id AND l.is_parent_profile = true
+                    WHERE rh.review_date IS NOT NULL {user_filter}
+                ),
+                islands AS (
+                    SELECT learner_id, d,
+                           d - CAST(ROW_NUMBER() OVER (PARTITION BY learner_id ORDER BY d) AS INT) AS grp
+                    FROM days
+                ),
+                runs AS (
+                    SELECT learner_id, COUNT(*) AS run_length, MAX(d) AS run_end
+                    FROM islands
+                    GROUP BY learner_id, grp
+                ),
+                latest AS (
+                    SELECT DISTINCT ON (learner_id)
+                        learner_id,
+                        run_length AS current_streak,
+                        run_end AS last_active_date,
+                        MAX(run_length) OVER (PARTITION BY learner_id) AS longest_streak
+                    FROM runs
+                    ORDER BY learner_id, run_end DESC
+                )
+                INSERT INTO learner_streaks (learner_id, current_streak, longest_streak, last_active_date, updated_at)
+                SELECT learner_id, current_streak, longest_streak, last_active_date, NOW()
+                FROM latest
+                ON CONFLICT (learner_id) DO UPDATE SET
+                    current_streak = EXCLUDED.current_streak,
+                    longest_streak = GREATEST(learner_streaks.longest_streak, EXCLUDED.longest_streak),
+                    last_active_date = EXCLUDED.last_active_date,
+                    updated_at = NOW()
+            """),
+            {'user_id': user_id} if user_id else {}
+        )
+        return result.rowcount or 0
+    
     def _get_streak_multiplier(self, streak_days: int) -> float:
         """
         Get XP multiplier based on streak length.
@@ -294,7 +518,11 @@ class LearningVelocityService:
         Returns:
             Dictionary with streak details including multiplier info
         """
-        streak = self.calculate_activity_streak(user_id)
+        if self.has_streak_table():
+            state = self.get_streak_state(user_id)
+        else:
+            state = {'current_streak': self._scan_activity_streak(user_id), 'longest_streak': None, 'last_active_date': None}
+        streak = state['current_streak']
         multiplier = self._get_streak_multiplier(streak)
         
         # Calculate next milestone
@@ -315,6 +543,8 @@ class LearningVelocityService:
         
         return {
             "current_streak": streak,
+            "longest_streak": state['longest_streak'],
+            "last_active_date": state['last_active_date'],
             "current_multiplier": multiplier,
             "is_payout_day": streak == 7,
             "next_milestone": next_milestone,
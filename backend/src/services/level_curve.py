@@ -0,0 +1,116 @@
+"""
+Level Curve - In-Process XP Thresholds and Prestige Multipliers
+
+Single source of truth for the level curve used by LevelService and
+CurrencyService (mirrors the calculate_level() SQL function from
+migration 013, without the database round trip):
+
+- Level N needs 100 + (N-1) * 50 XP to advance
+- Cumulative thresholds are precomputed once; lookups are a bisect
+- levels_for_xp() computes many levels at once (NumPy searchsorted)
+- Prestige adds +5% XP per prestige level, up to MAX_PRESTIGE_LEVEL
+
+Usage:
+    from src.services.level_curve import level_for_xp, prestige_multiplier
+
+    level_for_xp(1250)       # {'level': 6, 'xp_to_next': 350, 'xp_in_level': 250}
+    prestige_multiplier(3)   # 1.15
+"""
+
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Union
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+BASE_XP_PER_LEVEL = 100
+XP_STEP_PER_LEVEL = 50
+
+# Threshold of the last level exceeds the INT range of user_xp.total_xp
+MAX_LEVEL = 10000
+
+PRESTIGE_MIN_LEVEL = 60
+MAX_PRESTIGE_LEVEL = 10
+PRESTIGE_XP_BONUS = 0.05
+
+
+# =============================================================================
+# Precomputed tables
+# =============================================================================
+
+def xp_needed_for_level(level: int) -> int:
+    """XP needed to advance from `level` to `level + 1`."""
+    return BASE_XP_PER_LEVEL + (max(level, 1) - 1) * XP_STEP_PER_LEVEL
+
+
+def _build_thresholds() -> List[int]:
+    # thresholds[i] = total XP at which level i + 1 starts
+    thresholds = [0]
+    for level in range(1, MAX_LEVEL):
+        thresholds.append(thresholds[-1] + xp_needed_for_level(level))
+    return thresholds
+
+
+LEVEL_THRESHOLDS: List[int] = _build_thresholds()
+
+PRESTIGE_MULTIPLIERS: List[float] = [
+    round(1.0 + prestige * PRESTIGE_XP_BONUS, 2)
+    for prestige in range(MAX_PRESTIGE_LEVEL + 1)
+]
+
+if HAS_NUMPY:
+    _THRESHOLDS_ARRAY = np.asarray(LEVEL_THRESHOLDS, dtype=np.int64)
+
+
+# =============================================================================
+# Lookups
+# =============================================================================
+
+def xp_for_level(level: int) -> int:
+    """Total XP at which `level` starts (level 1 starts at 0)."""
+    return LEVEL_THRESHOLDS[min(max(level, 1), MAX_LEVEL) - 1]
+
+
+def level_for_xp(total_xp: int) -> Dict:
+    """
+    Level and progress for a total XP amount.
+
+    Args:
+        total_xp: Total XP amount
+
+    Returns:
+        Dictionary with level, xp_to_next, and xp_in_level
+    """
+    level = max(bisect_right(LEVEL_THRESHOLDS, total_xp), 1)
+    return {
+        'level': level,
+        'xp_to_next': xp_needed_for_level(level),
+        'xp_in_level': total_xp - LEVEL_THRESHOLDS[level - 1],
+    }
+
+
+def levels_for_xp(totals: Iterable[int]) -> Union['np.ndarray', List[int]]:
+    """
+    Levels for many total XP amounts at once (leaderboards, summaries).
+
+    Returns:
+        int array of levels when NumPy is available, else a list
+    """
+    if HAS_NUMPY:
+        values = np.asarray(list(totals), dtype=np.int64)
+        return np.maximum(np.searchsorted(_THRESHOLDS_ARRAY, values, side='right'), 1)
+    return [max(bisect_right(LEVEL_THRESHOLDS, total), 1) for total in totals]
+
+
+def prestige_multiplier(prestige_level: int) -> float:
+    """XP multiplier for a prestige level (1.0 = no bonus)."""
+    return PRESTIGE_MULTIPLIERS[min(max(prestige_level, 0), MAX_PRESTIGE_LEVEL)]
+
+
+def can_prestige(level: int, prestige_level: int) -> bool:
+    """Whether a learner at `level` may prestige again."""
+    return level >= PRESTIGE_MIN_LEVEL and prestige_level < MAX_PRESTIGE_LEVEL
@@ -4,12 +4,21 @@ Level/XP Service
 Handles XP awarding, level calculation, and progression tracking.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+from src.services.leaderboard_store import leaderboard_store
+from src.services.level_curve import (
+    MAX_PRESTIGE_LEVEL,
+    PRESTIGE_MIN_LEVEL,
+    can_prestige,
+    level_for_xp,
+    prestige_multiplier,
+)
+
 
 class LevelService:
     """Service for managing XP and levels."""
@@ -59,6 +68,9 @@ class LevelService:
         """
         Award XP to a learner and check for level-up.
         
+        The user_xp upsert and the xp_history insert are one statement
+        (see add_xp_batch), so concurrent awards cannot lose updates.
+        
         Args:
             learner_id: Learner ID (from public.learners)
             amount: XP amount to award
@@ -68,107 +80,174 @@ class LevelService:
         Returns:
             Dictionary with level info and whether level-up occurred
         """
-        # Initialize learner XP if not exists
-        self._ensure_learner_xp(learner_id)
-        
-        # Get current XP (query by learner_id)
-        result = self.db.execute(
-            text("SELECT total_xp, current_level FROM user_xp WHERE learner_id = :learner_id"),
-            {'learner_id': learner_id}
-        )
-        row = result.fetchone()
-        
-        if not row:
-            raise ValueError(f"Learner XP record not found for learner {learner_id}")
-        
-        old_total_xp = row[0] or 0
-        old_level = row[1] or 1
+        results = self.add_xp_batch([(learner_id, amount, source, source_id)])
+        if str(learner_id) not in results:
+            raise ValueError(f"Cannot award XP to learner {learner_id}: no learner profile found")
+        return results[str(learner_id)]
+    
+    def add_xp_batch(
+        self,
+        awards: List[Tuple[UUID, int, str, Optional[UUID]]],
+        commit: bool = True
+    ) -> Dict[str, Dict]:
+        """
+        Award XP to many learners in one round trip.
         
-        # Add XP
-        new_total_xp = old_total_xp + amount
+        A single statement upserts user_xp (total_xp = total_xp + amount)
+        and appends every award to xp_history via a CTE, returning the new
+        totals. Levels are derived from those totals with level_for_xp and
+        written back in one UPDATE (SQL functions still read the level
+        columns). Leaderboard sync and rollups then take one statement each
+        for the whole batch.
         
-        # Calculate new level
-        level_info = self.calculate_level(new_total_xp)
-        new_level = level_info['level']
-        xp_to_next = level_info['xp_to_next']
-        xp_in_level = level_info['xp_in_level']
+        Args:
+            awards: (learner_id, amount, source, source_id) tuples; a learner
+                may appear several times (amounts are summed, history keeps
+                one row per award)
+            commit: Commit when done. With False the caller owns the
+                transaction and in-memory boards catch up on their next refresh.
+            
+        Returns:
+            {str(learner_id): add_xp result dict} for learners that exist
+        """
+        totals: Dict[str, int] = {}
+        for learner_id, amount, _, _ in awards:
+            key = str(learner_id)
+            totals[key] = totals.get(key, 0) + amount
+        if not totals:
+            return {}
         
-        # Update user_xp (using learner_id)
-        self.db.execute(
+        result = self.db.execute(
             text("""
-                UPDATE user_xp
-                SET total_xp = :total_xp,
-                    current_level = :level,
-                    xp_to_next_level = :xp_to_next,
-                    xp_in_current_level = :xp_in_level,
-                    updated_at = NOW()
-                WHERE learner_id = :learner_id
+                WITH awards AS (
+                    SELECT learner_id, amount
+                    FROM unnest(CAST(:learner_ids AS uuid[]), CAST(:amounts AS int[]))
+                        AS a(learner_id, amount)
+                ),
+                awarded AS (
+                    INSERT INTO user_xp (learner_id, user_id, total_xp, updated_at)
+                    SELECT l.id, COALESCE(l.user_id, l.guardian_id), a.amount, NOW()
+                    FROM awards a
+                    JOIN public.learners l ON l.id = a.learner_id
+                    ON CONFLICT (learner_id) DO UPDATE SET
+                        total_xp = user_xp.total_xp + EXCLUDED.total_xp,
+                        updated_at = NOW()
+                    RETURNING learner_id, user_id, total_xp
+                ),
+                history AS (
+                    INSERT INTO xp_history (learner_id, xp_amount, source, source_id, earned_at)
+                    SELECT h.learner_id, h.amount, h.source, h.source_id, NOW()
+                    FROM unnest(
+                        CAST(:history_learner_ids AS uuid[]),
+                        CAST(:history_amounts AS int[]),
+                        CAST(:history_sources AS text[]),
+                        CAST(:history_source_ids AS uuid[])
+                    ) AS h(learner_id, amount, source, source_id)
+                    JOIN awarded USING (learner_id)
+                )
+                SELECT learner_id, user_id, total_xp
+                FROM awarded
             """),
             {
-                'learner_id': learner_id,
-                'total_xp': new_total_xp,
-                'level': new_level,
-                'xp_to_next': xp_to_next,
-                'xp_in_level': xp_in_level
+                'learner_ids': list(totals),
+                'amounts': list(totals.values()),
+                'history_learner_ids': [str(learner_id) for learner_id, _, _, _ in awards],
+                'history_amounts': [amount for _, amount, _, _ in awards],
+                'history_sources': [source for _, _, source, _ in awards],
+                'history_source_ids': [
+                    str(source_id) if source_id else None for _, _, _, source_id in awards
+                ],
             }
         )
+        rows = result.fetchall()
+        if not rows:
+            return {}
         
-        # Record in XP history (using learner_id)
+        # Level columns follow the in-process curve (rows stay locked until commit)
+        level_infos = {str(row[0]): level_for_xp(row[2]) for row in rows}
         self.db.execute(
             text("""
-                INSERT INTO xp_history (learner_id, xp_amount, source, source_id, earned_at)
-                VALUES (:learner_id, :amount, :source, :source_id, NOW())
+                UPDATE user_xp u SET
+                    current_level = v.level,
+                    xp_to_next_level = v.xp_to_next,
+                    xp_in_current_level = v.xp_in_level
+                FROM unnest(
+                    CAST(:learner_ids AS uuid[]),
+                    CAST(:levels AS int[]),
+                    CAST(:xp_to_next AS int[]),
+                    CAST(:xp_in_level AS int[])
+                ) AS v(learner_id, level, xp_to_next, xp_in_level)
+                WHERE u.learner_id = v.learner_id
             """),
             {
-                'learner_id': learner_id,
-                'amount': amount,
-                'source': source,
-                'source_id': source_id
+                'learner_ids': list(level_infos),
+                'levels': [info['level'] for info in level_infos.values()],
+                'xp_to_next': [info['xp_to_next'] for info in level_infos.values()],
+                'xp_in_level': [info['xp_in_level'] for info in level_infos.values()],
             }
         )
         
-        # Update leaderboard (get user_id from learner for backward compatibility)
-        learner_result = self.db.execute(
-            text("""
-                SELECT COALESCE(user_id, guardian_id) 
-                FROM public.learners 
-                WHERE id = :learner_id
-            """),
-            {'learner_id': learner_id}
-        )
-        user_id_row = learner_result.fetchone()
-        if user_id_row and user_id_row[0]:
+        # Legacy leaderboard entries (still keyed by user_id)
+        user_ids = list({str(row[1]) for row in rows if row[1]})
+        if user_ids:
             self.db.execute(
-                text("SELECT update_leaderboard_entry(:user_id)"),
-                {'user_id': user_id_row[0]}
+                text("""
+                    SELECT update_leaderboard_entry(uid)
+                    FROM unnest(CAST(:user_ids AS uuid[])) AS uid
+                """),
+                {'user_ids': user_ids}
             )
         
-        self.db.commit()
-        
-        level_up = new_level > old_level
+        # Materialized leaderboard rollups (savepoint: table may not be migrated yet)
+        rollups = [(str(row[0]), totals[str(row[0])], row[2]) for row in rows]
+        rollups_updated = False
+        try:
+            with self.db.begin_nested():
+                leaderboard_store.record_xp_batch(self.db, rollups)
+            rollups_updated = True
+        except Exception as e:
+            print(f"⚠️ Failed to update leaderboard rollups for {len(rollups)} learners: {e}")
         
-        # Get new unlocks if level up occurred
-        new_unlocks = []
-        if level_up:
+        if commit:
+            self.db.commit()
+            if rollups_updated:
+                for learner_id, amount, total_xp in rollups:
+                    leaderboard_store.apply_xp(learner_id, amount, total_xp)
+        
+        results = {}
+        for row in rows:
+            key = str(row[0])
+            amount = totals[key]
+            new_total_xp = row[2]
+            old_total_xp = new_total_xp - amount
+            old_level = level_for_xp(old_total_xp)['level']
+            new_level = level_infos[key]['level']
+            xp_to_next = level_infos[key]['xp_to_next']
+            xp_in_level = level_infos[key]['xp_in_level']
+            level_up = new_level > old_level
+            
             # Get all unlocks for levels between old and new
-            for level in range(old_level + 1, new_level + 1):
-                unlocks_at_level = self.get_new_unlocks_for_level(level)
-                for unlock in unlocks_at_level:
-                    unlock['unlocked_at_level'] = level
-                    new_unlocks.append(unlock)
+            new_unlocks = []
+            if level_up:
+                for level in range(old_level + 1, new_level + 1):
+                    for unlock in self.get_new_unlocks_for_level(level):
+                        unlock['unlocked_at_level'] = level
+                        new_unlocks.append(unlock)
+            
+            results[key] = {
+                'old_level': old_level,
+                'new_level': new_level,
+                'old_xp': old_total_xp,
+                'new_xp': new_total_xp,
+                'xp_added': amount,
+                'level_up': level_up,
+                'xp_to_next_level': xp_to_next,
+                'xp_in_current_level': xp_in_level,
+                'progress_percentage': int((xp_in_level / xp_to_next) * 100) if xp_to_next > 0 else 0,
+                'new_unlocks': new_unlocks  # List of features unlocked by this level up
+            }
         
-        return {
-            'old_level': old_level,
-            'new_level': new_level,
-            'old_xp': old_total_xp,
-            'new_xp': new_total_xp,
-            'xp_added': amount,
-            'level_up': level_up,
-            'xp_to_next_level': xp_to_next,
-            'xp_in_current_level': xp_in_level,
-            'progress_percentage': int((xp_in_level / xp_to_next) * 100) if xp_to_next > 0 else 0,
-            'new_unlocks': new_unlocks  # List of features unlocked by this level up
-        }
+        return results
     
     def get_level_info(self, learner_id: UUID) -> Dict:  # CHANGED: was user_id
         """
@@ -232,6 +311,9 @@ class LevelService:
         """
         Calculate level from total XP using exponential progression.
         
+        Uses the precomputed thresholds in level_curve (same curve as the
+        calculate_level() SQL function, without a database round trip).
+        
         Formula:
         - Level 1: 0-99 XP (100 XP needed)
         - Level 2: 100-249 XP (150 XP needed)
@@ -244,35 +326,7 @@ class LevelService:
         Returns:
             Dictionary with level, xp_to_next, and xp_in_level
         """
-        # Use database function for consistency
-        result = self.db.execute(
-            text("SELECT * FROM calculate_level(:total_xp)"),
-            {'total_xp': total_xp}
-        )
-        
-        row = result.fetchone()
-        if row:
-            return {
-                'level': row[0],
-                'xp_to_next': row[1],
-                'xp_in_level': row[2]
-            }
-        
-        # Fallback calculation if function not available
-        level = 1
-        xp_needed = 100
-        remaining_xp = total_xp
-        
-        while remaining_xp >= xp_needed:
-            level += 1
-            remaining_xp -= xp_needed
-            xp_needed = 100 + (level - 1) * 50
-        
-        return {
-            'level': level,
-            'xp_to_next': xp_needed,
-            'xp_in_level': remaining_xp
-        }
+        return level_for_xp(total_xp)
     
     def get_xp_history(self, learner_id: UUID, days: int = 30) -> List[Dict]:  # CHANGED: was user_id
         """
@@ -663,14 +717,13 @@ class LevelService:
             }
         
         level_info = self.get_level_info(learner_id)
-        can_prestige = level_info['level'] >= 60 and row[0] < 10
         
         return {
             'prestige_level': row[0],
             'total_xp_lifetime': row[1],
             'last_prestige_at': row[2].isoformat() if row[2] else None,
             'xp_bonus_multiplier': float(row[3]),
-            'can_prestige': can_prestige
+            'can_prestige': can_prestige(level_info['level'], row[0])
         }
     
     def prestige(self, learner_id: UUID) -> Dict:  # CHANGED: was user_id
@@ -690,11 +743,11 @@ class LevelService:
         level_info = self.get_level_info(learner_id)
         prestige_info = self.get_prestige_info(learner_id)
         
-        if level_info['level'] < 60:
-            raise ValueError("Must be level 60 or higher to prestige")
+        if level_info['level'] < PRESTIGE_MIN_LEVEL:
+            raise ValueError(f"Must be level {PRESTIGE_MIN_LEVEL} or higher to prestige")
         
-        if prestige_info['prestige_level'] >= 10:
-            raise ValueError("Maximum prestige level (10) reached")
+        if prestige_info['prestige_level'] >= MAX_PRESTIGE_LEVEL:
+            raise ValueError(f"Maximum prestige level ({MAX_PRESTIGE_LEVEL}) reached")
         
         # Get user_id from learner_id for backward compatibility
         learner_result = self.db.execute(
@@ -712,7 +765,7 @@ class LevelService:
         user_id = user_id_row[0]
         
         new_prestige = prestige_info['prestige_level'] + 1
-        new_multiplier = 1.0 + (new_prestige * 0.05)  # +5% per prestige
+        new_multiplier = prestige_multiplier(new_prestige)  # +5% per prestige
         
         # Update prestige (still uses user_id)
         self.db.execute(
@@ -787,7 +840,16 @@ class LevelService:
         Returns:
             XP multiplier (1.0 = no bonus)
         """
-        prestige_info = self.get_prestige_info(learner_id)
-        return prestige_info.get('xp_bonus_multiplier', 1.0)
+        result = self.db.execute(
+            text("""
+                SELECT p.prestige_level
+                FROM public.learners l
+                JOIN user_prestige p ON p.user_id = COALESCE(l.user_id, l.guardian_id)
+                WHERE l.id = :learner_id
+            """),
+            {'learner_id': learner_id}
+        )
+        row = result.fetchone()
+        return prestige_multiplier(row[0] or 0) if row else 1.0
 
 
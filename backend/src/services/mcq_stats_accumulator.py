@@ -0,0 +1,221 @@
+"""
+MCQ Statistics Accumulator - Write-Behind Aggregation
+
+Buffers per-MCQ statistic deltas (attempts, correct answers, response time,
+distractor selections, ability sums) in process memory and flushes them
+periodically as one INSERT ... ON CONFLICT DO UPDATE batch
+(mcq_stats.upsert_mcq_statistics_deltas).
+
+- Hot MCQs no longer serialise on a read-modify-write + commit per attempt
+- Deltas that fail to flush are merged back and retried on the next flush
+- stop() flushes whatever is pending (called on application shutdown)
+
+Only active between start() and stop(); while stopped,
+mcq_stats._update_mcq_statistics upserts synchronously instead, so
+scripts and tests keep write-through behaviour.
+
+Usage:
+    from src.services.mcq_stats_accumulator import mcq_stats_accumulator
+
+    mcq_stats_accumulator.start()     # app startup
+    mcq_stats_accumulator.metrics()   # {'pending_mcqs': ..., 'pending_attempts': ...}
+    mcq_stats_accumulator.stop()      # app shutdown (final flush)
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from src.database.postgres_crud.mcq_stats import MCQStatsDelta, upsert_mcq_statistics_deltas
+
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = float(os.getenv("MCQ_STATS_FLUSH_INTERVAL", "5"))
+
+# Flush early once this many attempts are buffered
+DEFAULT_MAX_PENDING_ATTEMPTS = int(os.getenv("MCQ_STATS_MAX_PENDING", "5000"))
+
+
+class MCQStatsAccumulator:
+    """In-process buffer of per-MCQ statistic deltas with periodic flush."""
+
+    def __init__(
+        self,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        max_pending_attempts: int = DEFAULT_MAX_PENDING_ATTEMPTS,
+        session_factory: Optional[Callable] = None
+    ):
+        """
+        Args:
+            flush_interval: Seconds between background flushes
+            max_pending_attempts: Buffered attempts that trigger an early flush
+            session_factory: Callable returning a DB session (defaults to PostgresConnection)
+        """
+        self.flush_interval = flush_interval
+        self.max_pending_attempts = max_pending_attempts
+        self._session_factory = session_factory
+
+        self._pending: Dict[Any, MCQStatsDelta] = {}
+        self._pending_attempts = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.flushes = 0
+        self.flush_failures = 0
+        self.rows_flushed = 0
+        self.last_flush_at: Optional[datetime] = None
+        self.last_flush_ms: Optional[float] = None
+        self.last_error_type: Optional[str] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # -------------------------------------------------------------------------
+    # Buffering
+    # -------------------------------------------------------------------------
+
+    def add(self, mcq_id: Any, delta: MCQStatsDelta):
+        """Buffer a delta for one MCQ."""
+        key = str(mcq_id)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = delta
+            else:
+                pending.merge(delta)
+            self._pending_attempts += delta.total_attempts
+            full = self._pending_attempts >= self.max_pending_attempts
+        if full:
+            self._wakeup.set()
+
+    def record_attempt(
+        self,
+        mcq_id: Any,
+        is_correct: bool,
+        response_time_ms: Optional[int] = None,
+        selected_option_source: Optional[str] = None,
+        user_ability_estimate: Optional[float] = None
+    ):
+        """Buffer a single attempt."""
+        delta = MCQStatsDelta()
+        delta.add_attempt(is_correct, response_time_ms, selected_option_source, user_ability_estimate)
+        self.add(mcq_id, delta)
+
+    def _take_pending(self) -> Dict[Any, MCQStatsDelta]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._pending_attempts = 0
+        return pending
+
+    def _restore_pending(self, deltas: Dict[Any, MCQStatsDelta]):
+        """Merge unflushed deltas back (newer deltas may have arrived meanwhile)."""
+        with self._lock:
+            for key, delta in deltas.items():
+                pending = self._pending.get(key)
+                if pending is None:
+                    self._pending[key] = delta
+                else:
+                    delta.merge(pending)
+                    self._pending[key] = delta
+                self._pending_attempts += delta.total_attempts
+
+    # -------------------------------------------------------------------------
+    # Flushing
+    # -------------------------------------------------------------------------
+
+    def _get_session(self):
+        if self._session_factory is None:
+            from src.database.postgres_connection import PostgresConnection
+            self._session_factory = PostgresConnection().get_session
+        return self._session_factory()
+
+    def flush(self) -> int:
+        """
+        Write all buffered deltas in one transaction.
+
+        Returns:
+            Number of MCQ rows upserted (0 if nothing was pending or the
+            flush failed; failed deltas stay buffered)
+        """
+        with self._flush_lock:
+            deltas = self._take_pending()
+            if not deltas:
+                return 0
+
+            start = time.perf_counter()
+            session = self._get_session()
+            try:
+                rows = upsert_mcq_statistics_deltas(session, deltas)
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                self._restore_pending(deltas)
+                self.flush_failures += 1
+                self.last_error_type = type(e).__name__
+                print(f"⚠️ MCQ statistics flush failed ({len(deltas)} MCQs kept pending): {e}")
+                return 0
+            finally:
+                session.close()
+
+            self.flushes += 1
+            self.rows_flushed += rows
+            self.last_flush_at = datetime.utcnow()
+            self.last_flush_ms = (time.perf_counter() - start) * 1000
+            self.last_error_type = None
+            return rows
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._stopping.is_set():
+                break
+            self.flush()
+
+    def start(self):
+        """Start the background flusher (idempotent)."""
+        if self.is_running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="mcq-stats-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the background flusher and flush everything still pending."""
+        thread = self._thread
+        if thread is not None:
+            self._stopping.set()
+            self._wakeup.set()
+            thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    def metrics(self) -> Dict[str, Any]:
+        """Pending-delta and flush metrics."""
+        with self._lock:
+            pending_mcqs = len(self._pending)
+            pending_attempts = self._pending_attempts
+        return {
+            'running': self.is_running,
+            'pending_mcqs': pending_mcqs,
+            'pending_attempts': pending_attempts,
+            'flushes': self.flushes,
+            'flush_failures': self.flush_failures,
+            'rows_flushed': self.rows_flushed,
+            'last_flush_at': self.last_flush_at.isoformat() if self.last_flush_at else None,
+            'last_flush_ms': round(self.last_flush_ms, 2) if self.last_flush_ms is not None else None,
+            'last_error_type': self.last_error_type,
+        }
+
+
+# Process-wide accumulator (started/stopped by src.main)
+mcq_stats_accumulator = MCQStatsAccumulator()
@@ -13,6 +13,7 @@ import random
 
 from ..database.neo4j_connection import Neo4jConnection
 from .levels import LevelService
+from .learning_velocity import LearningVelocityService
 
 
 class MineService:
@@ -59,60 +60,60 @@ class MineService:
             List of block dictionaries with sense_id, word, tier, etc.
         """
         try:
-            with self.neo4j.get_session() as session:
-                # Sample from each frequency band
-                bands = [
-                    (1, 500, 10),      # 10 blocks from top 500
-                    (501, 1000, 10),   # 10 from 501-1000
-                    (1001, 2000, 15),  # 15 from 1001-2000
-                    (2001, 3500, 15),  # 15 from 2001-3500
-                ]
-                
-                all_blocks = []
+            # Sample from each frequency band
+            bands = [
+                (1, 500, 10),      # 10 blocks from top 500
+                (501, 1000, 10),   # 10 from 501-1000
+                (1001, 2000, 15),  # 15 from 1001-2000
+                (2001, 3500, 15),  # 15 from 2001-3500
+            ]
+            
+            all_blocks = []
+            
+            for min_rank, max_rank, count in bands:
+                # Try enriched first, fall back to all if not enough
+                query = """
+                    MATCH (w:Word)-[:HAS_SENSE]->(s:Sense)
+                    WHERE w.frequency_rank >= $min_rank 
+                    AND w.frequency_rank <= $max_rank
+                    AND (s.enriched = true OR s.enriched IS NULL)
+                    WITH w, s, rand() as r
+                    ORDER BY r
+                    LIMIT $count
+                    RETURN 
+                        s.id as sense_id,
+                        w.name as word,
+                        COALESCE(s.definition_en, s.definition, '') as definition_preview,
+                        COALESCE(s.definition_zh_translation, s.definition_zh, '') as definition_zh,
+                        w.frequency_rank as rank,
+                        1 as tier
+                """
                 
-                for min_rank, max_rank, count in bands:
-                    # Try enriched first, fall back to all if not enough
-                    query = """
-                        MATCH (w:Word)-[:HAS_SENSE]->(s:Sense)
-                        WHERE w.frequency_rank >= $min_rank 
-                        AND w.frequency_rank <= $max_rank
-                        AND (s.enriched = true OR s.enriched IS NULL)
-                        WITH w, s, rand() as r
-                        ORDER BY r
-                        LIMIT $count
-                        RETURN 
-                            s.id as sense_id,
-                            w.name as word,
-                            COALESCE(s.definition_en, s.definition, '') as definition_preview,
-                            COALESCE(s.definition_zh_translation, s.definition_zh, '') as definition_zh,
-                            w.frequency_rank as rank,
-                            1 as tier
-                    """
+                try:
+                    result = self.neo4j.execute_read(
+                        "mine.starter_band",
+                        query,
+                        min_rank=min_rank,
+                        max_rank=max_rank,
+                        count=count
+                    )
                     
-                    try:
-                        result = session.run(
-                            query,
-                            min_rank=min_rank,
-                            max_rank=max_rank,
-                            count=count
-                        )
-                        
-                        for record in result:
-                            all_blocks.append({
-                                'sense_id': record['sense_id'],
-                                'word': record['word'],
-                                'definition_preview': (record['definition_preview'] or '')[:100] if record.get('definition_preview') else '',
-                                'definition_zh': record.get('definition_zh') or '',
-                                'rank': record['rank'],
-                                'tier': record['tier'],
-                            })
-                    except Exception as e:
-                        print(f"Warning: Failed to fetch blocks for band {min_rank}-{max_rank}: {e}")
-                        continue
-                
-                # Shuffle and limit
-                random.shuffle(all_blocks)
-                return all_blocks[:limit]
+                    for record in result:
+                        all_blocks.append({
+                            'sense_id': record['sense_id'],
+                            'word': record['word'],
+                            'definition_preview': (record['definition_preview'] or '')[:100] if record.get('definition_preview') else '',
+                            'definition_zh': record.get('definition_zh') or '',
+                            'rank': record['rank'],
+                            'tier': record['tier'],
+                        })
+                except Exception as e:
+                    print(f"Warning: Failed to fetch blocks for band {min_rank}-{max_rank}: {e}")
+                    continue
+            
+            # Shuffle and limit
+            random.shuffle(all_blocks)
+            return all_blocks[:limit]
         except Exception as e:
             print(f"Error in get_starter_pack: {e}")
             import traceback
@@ -280,66 +281,65 @@ class MineService:
             Dictionary with full block information
         """
         try:
-            with self.neo4j.get_session() as session:
-                # Get block data with connections via Word relationships
-                query = """
-                    MATCH (w:Word)-[:HAS_SENSE]->(s:Sense {id: $sense_id})
-                    OPTIONAL MATCH (w)-[r:RELATED_TO|OPPOSITE_TO]-(connected_word:Word)
-                    OPTIONAL MATCH (connected_word)-[:HAS_SENSE]->(connected_sense:Sense)
-                    WHERE connected_sense IS NOT NULL
-                    RETURN 
-                        s.id as sense_id,
-                        w.name as word,
-                        COALESCE(s.definition_en, s.definition, '') as definition_en,
-                        COALESCE(s.definition_zh_translation, s.definition_zh, '') as definition_zh,
-                        COALESCE(s.definition_zh_explanation, '') as definition_zh_explanation,
-                        s.example_en as example_en,
-                        COALESCE(s.example_zh_translation, s.example_zh, '') as example_zh,
-                        COALESCE(s.example_zh_explanation, '') as example_zh_explanation,
-                        w.frequency_rank as rank,
-                        1 as tier,
-                        collect(DISTINCT {
-                            sense_id: connected_sense.id,
-                            word: connected_word.name,
-                            type: type(r)
-                        }) as connections
-                """
-                
-                result = session.run(query, sense_id=sense_id)
-                record = result.single()
-                
-                if not record:
-                    raise ValueError(f"Block not found: {sense_id}")
-                
-                # Get user progress
-                user_progress = self._get_user_progress_for_block(user_id, sense_id)
-                
-                # Calculate dynamic value
-                connection_count = len([c for c in record['connections'] if c.get('sense_id')])
-                total_value = self.calculate_block_value(sense_id, record['tier'], connection_count)
-                
-                return {
-                    'sense_id': record['sense_id'],
-                    'word': record['word'],
-                    'tier': record['tier'],
-                    'base_xp': self.level_service.TIER_BASE_XP.get(record['tier'], 100),
-                    'connection_count': connection_count,
-                    'total_value': total_value,
-                    'rank': record['rank'],
-                    'definition_en': record.get('definition_en') or '',
-                    'definition_zh': (record.get('definition_zh') or '') + ((' ' + record.get('definition_zh_explanation')) if record.get('definition_zh_explanation') else ''),
-                    'example_en': record.get('example_en') or '',
-                    'example_zh': (record.get('example_zh') or '') + ((' ' + record.get('example_zh_explanation')) if record.get('example_zh_explanation') else ''),
-                    'connections': [
-                        {
-                            'sense_id': c.get('sense_id'),
-                            'word': c.get('word'),
-                            'type': c.get('type'),
-                        }
-                        for c in record['connections'] if c.get('sense_id')
-                    ],
-                    'user_progress': user_progress,
-                }
+            # Get block data with connections via Word relationships
+            query = """
+                MATCH (w:Word)-[:HAS_SENSE]->(s:Sense {id: $sense_id})
+                OPTIONAL MATCH (w)-[r:RELATED_TO|OPPOSITE_TO]-(connected_word:Word)
+                OPTIONAL MATCH (connected_word)-[:HAS_SENSE]->(connected_sense:Sense)
+                WHERE connected_sense IS NOT NULL
+                RETURN 
+                    s.id as sense_id,
+                    w.name as word,
+                    COALESCE(s.definition_en, s.definition, '') as definition_en,
+                    COALESCE(s.definition_zh_translation, s.definition_zh, '') as definition_zh,
+                    COALESCE(s.definition_zh_explanation, '') as definition_zh_explanation,
+                    s.example_en as example_en,
+                    COALESCE(s.example_zh_translation, s.example_zh, '') as example_zh,
+                    COALESCE(s.example_zh_explanation, '') as example_zh_explanation,
+                    w.frequency_rank as rank,
+                    1 as tier,
+                    collect(DISTINCT {
+                        sense_id: connected_sense.id,
+                        word: connected_word.name,
+                        type: type(r)
+                    }) as connections
+            """
+            
+            records = self.neo4j.execute_read("mine.block_detail", query, sense_id=sense_id)
+            record = records[0] if records else None
+            
+            if not record:
+                raise ValueError(f"Block not found: {sense_id}")
+            
+            # Get user progress
+            user_progress = self._get_user_progress_for_block(user_id, sense_id)
+            
+            # Calculate dynamic value
+            connection_count = len([c for c in record['connections'] if c.get('sense_id')])
+            total_value = self.calculate_block_value(sense_id, record['tier'], connection_count)
+            
+            return {
+                'sense_id': record['sense_id'],
+                'word': record['word'],
+                'tier': record['tier'],
+                'base_xp': self.level_service.TIER_BASE_XP.get(record['tier'], 100),
+                'connection_count': connection_count,
+                'total_value': total_value,
+                'rank': record['rank'],
+                'definition_en': record.get('definition_en') or '',
+                'definition_zh': (record.get('definition_zh') or '') + ((' ' + record.get('definition_zh_explanation')) if record.get('definition_zh_explanation') else ''),
+                'example_en': record.get('example_en') or '',
+                'example_zh': (record.get('example_zh') or '') + ((' ' + record.get('example_zh_explanation')) if record.get('example_zh_explanation') else ''),
+                'connections': [
+                    {
+                        'sense_id': c.get('sense_id'),
+                        'word': c.get('word'),
+                        'type': c.get('type'),
+                    }
+                    for c in record['connections'] if c.get('sense_id')
+                ],
+                'user_progress': user_progress,
+            }
         except Exception as e:
             print(f"Error in get_block_detail for {sense_id}: {e}")
             import traceback
@@ -556,16 +556,18 @@ class MineService:
         try:
             from ..database.postgres_crud.progress import (
                 create_learning_progress,
-                get_learning_progress_by_learning_point
+                get_learning_progress_by_learning_point,
+                _get_learner_id_for_user
             )
             from ..database.postgres_crud.points import (
-                get_points_account,
+                get_points_account_by_user as get_points_account,
                 create_points_transaction
             )
             
             # Track newly mined vs already in inventory
             mined_count = 0
             skipped_count = 0
+            learner_id = _get_learner_id_for_user(self.db, user_id)
             
             for sense_id in sense_ids:
                 # Check if already exists
@@ -586,10 +588,20 @@ class MineService:
                     user_id=user_id,
                     learning_point_id=sense_id,
                     tier=tier,
-                    status='learning'
+                    status='learning',
+                    learner_id=learner_id
                 )
                 mined_count += 1
             
+            # New learning_progress rows are streak activity (as in the backfill)
+            if mined_count > 0:
+                try:
+                    LearningVelocityService(self.db).record_activity_and_check_streak(user_id, learner_id)
+                    self.db.commit()
+                except Exception as e:
+                    print(f"Warning: Streak update failed for mining batch ({user_id}): {e}")
+                    self.db.rollback()
+            
             # Award points (10 XP per newly mined word)
             xp_gained = mined_count * 10
             
@@ -0,0 +1,307 @@
+"""
+Vocabulary Indexes - Secondary Lookup Structures for VocabularyStore
+
+Built once when the vocabulary is loaded from JSON so that range and
+sampling queries no longer scan every sense. Snapshots store the same
+columns precomputed; from_columns()/from_pools() wrap them without copying.
+
+RankIndex:
+- Senses sorted by frequency rank, with a sub-index per part of speech
+- Range queries are bisect + slice
+- Sampling draws random positions inside the range instead of returning
+  the first N senses in dict order
+
+TrapPoolIndex:
+- Per-(band, POS) candidate pools for survey/MCQ trap selection
+- Samples k traps across several bands in O(k) without materialising the
+  combined candidate list, skipping the target word by rejection
+
+Usage:
+    index = RankIndex(entries)  # (rank, sense_id, word, pos) tuples
+    sense_ids = index.sample_ids(1000, 3000, k=10, pos='n')
+
+    pools = TrapPoolIndex(band_members)  # {band: [(sense_id, word, pos)]}
+    traps = pools.sample(pools.bands_near(2500, 500), k=3, pos='v', exclude_word='accept')
+"""
+
+import random
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+
+def random_positions(lo: int, hi: int, want: int) -> Iterator[int]:
+    """
+    Yield every position in [lo, hi) exactly once, in random order.
+
+    Consumers usually stop after a few items, so for large ranges positions
+    are drawn by rejection sampling (O(k)) and the remainder is only
+    materialised if more than half of the range ends up being consumed.
+    """
+    n = hi - lo
+    if n <= 0:
+        return
+    if n <= want * 4:
+        yield from random.sample(range(lo, hi), n)
+        return
+
+    seen: Set[int] = set()
+    while len(seen) < n // 2:
+        i = random.randrange(lo, hi)
+        if i in seen:
+            continue
+        seen.add(i)
+        yield i
+
+    rest = [i for i in range(lo, hi) if i not in seen]
+    random.shuffle(rest)
+    yield from rest
+
+
+class _RankColumn:
+    """
+    Parallel arrays of (rank, sense_id, word) sorted by rank.
+
+    Any sequences work (lists, or the snapshot's memory-mapped columns);
+    slicing sense_ids must return a list.
+    """
+
+    __slots__ = ('ranks', 'sense_ids', 'words')
+
+    def __init__(self, ranks: Sequence[int], sense_ids: Sequence[str], words: Sequence[str]):
+        self.ranks = ranks
+        self.sense_ids = sense_ids
+        self.words = words
+
+    @classmethod
+    def from_entries(cls, entries: List[Tuple[int, str, str]]) -> '_RankColumn':
+        entries.sort(key=lambda e: e[0])
+        return cls([e[0] for e in entries], [e[1] for e in entries], [e[2] for e in entries])
+
+    def bounds(self, min_rank: int, max_rank: int) -> Tuple[int, int]:
+        return bisect_left(self.ranks, min_rank), bisect_right(self.ranks, max_rank)
+
+
+class RankIndex:
+    """
+    Rank-sorted sense index with per-POS sub-indexes.
+
+    Senses without a frequency rank are not indexed (they never matched a
+    rank range query).
+    """
+
+    def __init__(self, entries: Iterable[Tuple[Optional[int], str, str, Optional[str]]]):
+        """
+        Args:
+            entries: (frequency_rank, sense_id, word, pos) per sense
+        """
+        all_entries: List[Tuple[int, str, str]] = []
+        by_pos: Dict[str, List[Tuple[int, str, str]]] = {}
+        for rank, sense_id, word, pos in entries:
+            if rank is None:
+                continue
+            entry = (rank, sense_id, word or '')
+            all_entries.append(entry)
+            if pos:
+                by_pos.setdefault(pos, []).append(entry)
+
+        self._all = _RankColumn.from_entries(all_entries)
+        self._by_pos = {pos: _RankColumn.from_entries(items) for pos, items in by_pos.items()}
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns: Dict[Optional[str], Tuple[Sequence[int], Sequence[str], Sequence[str]]]
+    ) -> 'RankIndex':
+        """
+        Wrap prebuilt rank-sorted columns without copying them.
+
+        Args:
+            columns: POS (None = all senses) -> (ranks, sense_ids, words)
+        """
+        index = cls.__new__(cls)
+        empty = ([], [], [])
+        index._all = _RankColumn(*columns.get(None, empty))
+        index._by_pos = {
+            pos: _RankColumn(*column) for pos, column in columns.items() if pos is not None
+        }
+        return index
+
+    def __len__(self) -> int:
+        return len(self._all.ranks)
+
+    def _column(self, pos: Optional[str]) -> Optional[_RankColumn]:
+        if pos:
+            return self._by_pos.get(pos)
+        return self._all
+
+    def count(self, min_rank: int, max_rank: int, pos: Optional[str] = None) -> int:
+        """Number of senses with min_rank <= rank <= max_rank."""
+        column = self._column(pos)
+        if column is None:
+            return 0
+        lo, hi = column.bounds(min_rank, max_rank)
+        return max(0, hi - lo)
+
+    def range_ids(self, min_rank: int, max_rank: int, pos: Optional[str] = None) -> List[str]:
+        """All sense IDs in the rank range, in rank order."""
+        column = self._column(pos)
+        if column is None:
+            return []
+        lo, hi = column.bounds(min_rank, max_rank)
+        return column.sense_ids[lo:hi]
+
+    def sample_ids(
+        self,
+        min_rank: int,
+        max_rank: int,
+        k: int,
+        pos: Optional[str] = None,
+        exclude_words: Optional[Set[str]] = None,
+        randomize: bool = True
+    ) -> List[str]:
+        """
+        Pick up to k sense IDs in the rank range.
+
+        Args:
+            min_rank: Minimum frequency rank (inclusive)
+            max_rank: Maximum frequency rank (inclusive)
+            k: Maximum number of sense IDs
+            pos: Optional POS filter (uses the per-POS sub-index)
+            exclude_words: Words whose senses must be skipped
+            randomize: Uniform random sample if True, else lowest ranks first
+
+        Returns:
+            List of sense IDs
+        """
+        column = self._column(pos)
+        if column is None or k <= 0:
+            return []
+        lo, hi = column.bounds(min_rank, max_rank)
+        if hi <= lo:
+            return []
+
+        if not exclude_words and not randomize:
+            return column.sense_ids[lo:min(hi, lo + k)]
+
+        positions = random_positions(lo, hi, k) if randomize else iter(range(lo, hi))
+        words = column.words
+        result = []
+        for i in positions:
+            if exclude_words and words[i] in exclude_words:
+                continue
+            result.append(column.sense_ids[i])
+            if len(result) >= k:
+                break
+        return result
+
+
+class _Pool:
+    """Parallel sense_id/word arrays for one (band, POS) pool."""
+
+    __slots__ = ('sense_ids', 'words')
+
+    def __init__(self, sense_ids: Optional[Sequence[str]] = None, words: Optional[Sequence[str]] = None):
+        self.sense_ids: Sequence[str] = [] if sense_ids is None else sense_ids
+        self.words: Sequence[str] = [] if words is None else words
+
+
+class TrapPoolIndex:
+    """
+    Per-(band, POS) pools for constant-time trap sampling.
+
+    Every band has an "any POS" pool (key (band, None)) plus one pool per
+    part of speech, built in the band index's member order.
+    """
+
+    def __init__(self, band_members: Dict[int, Iterable[Tuple[str, str, Optional[str]]]]):
+        """
+        Args:
+            band_members: band -> (sense_id, word, pos) for each sense in the band
+        """
+        self._pools: Dict[Tuple[int, Optional[str]], _Pool] = {}
+        for band, members in band_members.items():
+            for sense_id, word, pos in members:
+                keys = [(band, None), (band, pos)] if pos else [(band, None)]
+                for key in keys:
+                    pool = self._pools.get(key)
+                    if pool is None:
+                        pool = self._pools[key] = _Pool()
+                    pool.sense_ids.append(sense_id)
+                    pool.words.append(word or '')
+        self.bands = sorted(band_members)
+
+    @classmethod
+    def from_pools(
+        cls,
+        pools: Dict[Tuple[int, Optional[str]], Tuple[Sequence[str], Sequence[str]]]
+    ) -> 'TrapPoolIndex':
+        """
+        Wrap prebuilt pools without copying them.
+
+        Args:
+            pools: (band, POS or None) -> (sense_ids, words); every band
+                needs its (band, None) pool
+        """
+        index = cls.__new__(cls)
+        index._pools = {key: _Pool(*members) for key, members in pools.items()}
+        index.bands = sorted(band for band, pos in pools if pos is None)
+        return index
+
+    def bands_near(self, rank: int, radius: int = 500) -> List[int]:
+        """
+        Bands whose rank span overlaps rank ± radius.
+
+        Band N covers ranks N-999..N (e.g. band 2000 covers 1001-2000).
+        """
+        return [
+            band for band in self.bands
+            if rank - radius <= band and rank + radius >= band - 999
+        ]
+
+    def pool_size(self, band: int, pos: Optional[str] = None) -> int:
+        """Number of senses in a (band, POS) pool."""
+        pool = self._pools.get((band, pos))
+        return len(pool.sense_ids) if pool else 0
+
+    def sample(
+        self,
+        bands: Iterable[int],
+        k: int,
+        pos: Optional[str] = None,
+        exclude_word: Optional[str] = None
+    ) -> List[str]:
+        """
+        Uniformly sample up to k sense IDs from the union of the band pools.
+
+        The pools are treated as one virtual array (prefix offsets + bisect),
+        so only the sampled positions are touched.
+
+        Args:
+            bands: Bands to draw from
+            k: Number of sense IDs wanted
+            pos: Optional POS (uses the (band, POS) pools)
+            exclude_word: Word whose senses are never returned
+
+        Returns:
+            List of sense IDs in random order
+        """
+        pools = [self._pools[(b, pos)] for b in bands if (b, pos) in self._pools]
+        if not pools or k <= 0:
+            return []
+
+        offsets = []
+        total = 0
+        for pool in pools:
+            offsets.append(total)
+            total += len(pool.sense_ids)
+
+        result = []
+        for i in random_positions(0, total, k):
+            p = bisect_right(offsets, i) - 1
+            j = i - offsets[p]
+            if exclude_word is not None and pools[p].words[j] == exclude_word:
+                continue
+            result.append(pools[p].sense_ids[j])
+            if len(result) >= k:
+                break
+        return result
@@ -3,6 +3,11 @@ Vocabulary Size Calculation Service
 
 Calculates vocabulary size and frequency band coverage from learning progress data.
 Based on Nation's Vocabulary Levels Test methodology.
+
+- Vocabulary size is a COUNT(*) over verified learning progress
+- Band coverage ranks verified learning_point_ids through VocabularyStore's
+  in-process rank lookup and buckets them with NumPy (one query per batch
+  of users, no per-word graph calls)
 """
 
 from typing import Dict, List, Optional, Tuple
@@ -11,7 +16,59 @@ from uuid import UUID
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
-from ..database.postgres_crud import progress as progress_crud
+from .vocabulary_store import vocabulary_store
+
+# NumPy is optional; bucketing falls back to a Python loop
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+
+DEFAULT_FREQUENCY_BANDS: Dict[str, Tuple[int, int]] = {
+    "1K": (1, 1000),
+    "2K": (1001, 2000),
+    "3K": (2001, 3000),
+    "4K": (3001, 4000),
+    "5K": (4001, 5000),
+    "6K+": (5001, 999999)  # Everything beyond 5K
+}
+
+
+def count_by_owner(
+    owners: List[int],
+    n_owners: int,
+    ranks=None,
+    min_rank: Optional[int] = None,
+    max_rank: Optional[int] = None
+) -> List[int]:
+    """
+    Count rows per owner, optionally only rows with min_rank <= rank <= max_rank.
+    
+    Args:
+        owners: Owner index (0..n_owners-1) of each row
+        n_owners: Number of owners
+        ranks: Frequency rank of each row (0 = unranked, never in a band)
+        min_rank: Inclusive lower bound
+        max_rank: Inclusive upper bound
+        
+    Returns:
+        Row counts indexed by owner
+    """
+    if HAS_NUMPY:
+        owners = np.asarray(owners, dtype=np.int64)
+        if ranks is not None:
+            ranks = np.asarray(ranks)
+            owners = owners[(ranks >= max(min_rank, 1)) & (ranks <= max_rank)]
+        return np.bincount(owners, minlength=n_owners).tolist()
+    
+    counts = [0] * n_owners
+    for i, owner in enumerate(owners):
+        if ranks is None or (ranks[i] and min_rank <= ranks[i] <= max_rank):
+            counts[owner] += 1
+    return counts
 
 
 class VocabularySizeService:
@@ -30,10 +87,16 @@ class VocabularySizeService:
         Returns:
             Total number of verified learning points (vocabulary size)
         """
-        verified_progress = progress_crud.get_learning_progress_by_user(
-            self.db, user_id, status='verified'
+        result = self.db.execute(
+            text("""
+                SELECT COUNT(*)
+                FROM learning_progress
+                WHERE user_id = :user_id
+                AND status = 'verified'
+            """),
+            {'user_id': user_id}
         )
-        return len(verified_progress)
+        return result.scalar() or 0
     
     def get_frequency_band_coverage(
         self, 
@@ -57,54 +120,66 @@ class VocabularySizeService:
                 Format: {"1K": (1, 1000), "2K": (1001, 2000), ...}
         
         Returns:
-            Dictionary mapping frequency bands to word counts
-            Example: {"1K": 850, "2K": 420, "3K": 380, ...}
+            Dictionary mapping frequency bands to word counts, plus "total"
+            (all verified learning points, ranked or not)
+            Example: {"total": 2100, "1K": 850, "2K": 420, "3K": 380, ...}
         """
-        if frequency_bands is None:
-            # Default frequency bands (can be customized based on your word ranking)
-            frequency_bands = {
-                "1K": (1, 1000),
-                "2K": (1001, 2000),
-                "3K": (2001, 3000),
-                "4K": (3001, 4000),
-                "5K": (5001, 5000),
-                "6K+": (5001, 999999)  # Everything beyond 5K
-            }
-        
-        # Get verified learning points
-        verified_progress = progress_crud.get_learning_progress_by_user(
-            self.db, user_id, status='verified'
-        )
+        return self.get_frequency_band_coverage_for_users([user_id], frequency_bands)[str(user_id)]
+    
+    def get_frequency_band_coverage_for_users(
+        self,
+        user_ids: List[UUID],
+        frequency_bands: Optional[Dict[str, Tuple[int, int]]] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Frequency band coverage for several users in one query.
         
-        # Group by frequency bands
-        # Note: This requires learning_point_id to contain frequency rank info
-        # or we need to join with Neo4j to get frequency_rank
-        # For now, we'll return counts per band if we can determine frequency
+        Verified learning_point_ids are ranked through VocabularyStore's
+        in-process rank lookup and bucketed in bulk; no graph calls.
         
-        # TODO: This requires Neo4j integration to get frequency_rank for each learning_point_id
-        # For MVP, we'll return a simplified version that counts all verified words
+        Args:
+            user_ids: User IDs
+            frequency_bands: Optional custom frequency bands (see get_frequency_band_coverage)
+            
+        Returns:
+            {str(user_id): {"total": n, "1K": n, ...}} for every requested user
+        """
+        if frequency_bands is None:
+            frequency_bands = DEFAULT_FREQUENCY_BANDS
         
-        band_counts = {band: 0 for band in frequency_bands.keys()}
+        keys = [str(uid) for uid in user_ids]
+        coverage = {key: {"total": 0, **{band: 0 for band in frequency_bands}} for key in keys}
+        if not keys:
+            return coverage
         
-        # If we have frequency data in learning_point_id or can query Neo4j:
-        # for progress in verified_progress:
-        #     frequency_rank = get_frequency_rank(progress.learning_point_id)
-        #     for band_name, (min_rank, max_rank) in frequency_bands.items():
-        #         if min_rank <= frequency_rank <= max_rank:
-        #             band_counts[band_name] += 1
-        #             break
+        result = self.db.execute(
+            text("""
+                SELECT user_id, learning_point_id
+                FROM learning_progress
+                WHERE user_id = ANY(CAST(:user_ids AS uuid[]))
+                AND status = 'verified'
+            """),
+            {'user_ids': keys}
+        )
+        rows = result.fetchall()
+        if not rows:
+            return coverage
         
-        # For now, return total count in "All" band
-        total = len(verified_progress)
-        return {
-            "total": total,
-            "1K": 0,  # Placeholder - requires Neo4j integration
-            "2K": 0,
-            "3K": 0,
-            "4K": 0,
-            "5K": 0,
-            "6K+": 0
+        position = {key: i for i, key in enumerate(keys)}
+        owners = [position[str(row[0])] for row in rows]
+        ranks = vocabulary_store.get_frequency_ranks(row[1] for row in rows)
+        
+        totals = count_by_owner(owners, len(keys))
+        band_counts = {
+            band: count_by_owner(owners, len(keys), ranks, min_rank, max_rank)
+            for band, (min_rank, max_rank) in frequency_bands.items()
         }
+        
+        for key, i in position.items():
+            coverage[key]["total"] = totals[i]
+            for band, counts in band_counts.items():
+                coverage[key][band] = counts[i]
+        return coverage
     
     def get_vocabulary_growth_timeline(
         self, 
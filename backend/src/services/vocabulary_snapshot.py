@@ -0,0 +1,646 @@
+"""
+Vocabulary Snapshot - Memory-Mapped Binary Vocabulary Format
+
+Compiles the V3 vocabulary.json into a columnar binary snapshot that can be
+memory-mapped read-only. Every uvicorn worker maps the same file, so the
+pages are shared by the OS page cache and startup no longer pays for a full
+json.load of the vocabulary.
+
+File layout (little-endian):
+
+    HEADER      magic, format version, sense count, section count
+    SECTIONS    (tag, offset, length) table
+    META        JSON metadata (version, exportedAt, stats, source file)
+    STRS        UTF-8 string table (sense IDs, words, index keys, payloads)
+    RECS        fixed-width sense records (see RECORD below)
+    SORT        record numbers sorted by sense ID (for bisect lookups)
+    MEMB        record-number arrays referenced by the index groups
+    BWRD/BFRM/BBND/BPOS
+                index group tables (key, start, count) sorted by key
+    RKGR/RKMB/RKRN
+                rank index: groups keyed by POS ('' = all senses) over
+                record numbers (u32) and ranks (i32) sorted by rank
+    TPGR/TPMB   trap pools: groups keyed "band" or "band/pos" over record
+                numbers in band index order
+
+The rank and trap-pool arrays are read in place (memoryview casts), so
+VocabularyStore wraps them instead of rebuilding its sampling indexes in
+every worker.
+
+Each sense's full dictionary is stored as a compact JSON payload in the
+string table and decoded lazily on first access, so lookups keep returning
+the same dictionaries the JSON loader produced.
+
+Usage:
+    # Build step (after enrich_vocabulary_v2.py)
+    python scripts/build_vocabulary_snapshot.py
+
+    # Loading (done automatically by VocabularyStore)
+    from src.services.vocabulary_snapshot import VocabularySnapshot
+    snapshot = VocabularySnapshot.open(Path('data/vocabulary.snapshot'))
+    sense = snapshot.senses.get("apple.n.01")
+"""
+
+import json
+import mmap
+import struct
+import sys
+from collections.abc import Mapping, Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+MAGIC = b'LXVSNAP\x00'
+FORMAT_VERSION = 2
+SNAPSHOT_SUFFIX = '.snapshot'
+
+HEADER = struct.Struct('<8sIII')      # magic, format_version, sense_count, section_count
+SECTION = struct.Struct('<4sQQ')      # tag, offset, length
+RECORD = struct.Struct('<IIIIIIiI4s')  # id, word, payload (offset/length), rank, band, pos
+GROUP = struct.Struct('<IIII')        # key offset, key length, member start, member count
+U32 = struct.Struct('<I')
+I32 = struct.Struct('<i')
+
+NO_RANK = -1
+BANDS = [1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000]
+OVERFLOW_BAND = 9999
+
+INDEX_SECTIONS = {
+    'by_word': b'BWRD',
+    'by_word_form': b'BFRM',
+    'by_band': b'BBND',
+    'by_pos': b'BPOS',
+}
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, corrupt or incompatible."""
+
+
+def snapshot_path_for(json_path: Path) -> Path:
+    """Return the snapshot path that sits next to a vocabulary JSON file."""
+    return json_path.with_suffix(SNAPSHOT_SUFFIX)
+
+
+def band_for_rank(rank: Optional[int]) -> int:
+    """Map a frequency rank to its band (same bucketing as the JSON indices)."""
+    freq = rank or OVERFLOW_BAND
+    for band in BANDS:
+        if freq <= band:
+            return band
+    return OVERFLOW_BAND
+
+
+# =============================================================================
+# BUILD
+# =============================================================================
+
+class _StringTable:
+    """Append-only, de-duplicated UTF-8 string table."""
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._seen: Dict[bytes, Tuple[int, int]] = {}
+
+    def add(self, value: str, dedupe: bool = True) -> Tuple[int, int]:
+        raw = value.encode('utf-8')
+        if dedupe and raw in self._seen:
+            return self._seen[raw]
+        ref = (len(self._buf), len(raw))
+        self._buf += raw
+        if dedupe:
+            self._seen[raw] = ref
+        return ref
+
+    def to_bytes(self) -> bytes:
+        if len(self._buf) > 0xFFFFFFFF:
+            raise SnapshotError("String table exceeds 4 GiB")
+        return bytes(self._buf)
+
+
+def _extract_lemma(sense_id: str) -> str:
+    parts = sense_id.split('.')
+    return parts[0] if parts else sense_id
+
+
+def build_snapshot(data: Dict[str, Any], output_path: Path, source: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Compile parsed V3 vocabulary data into a binary snapshot file.
+
+    Args:
+        data: Parsed vocabulary.json contents (V3 format)
+        output_path: Destination path for the snapshot
+        source: Optional source file name recorded in the metadata
+
+    Returns:
+        Build statistics (senses, lemmas, bytes)
+    """
+    version = str(data.get('version', '2.0'))
+    if not version.startswith('3'):
+        raise SnapshotError(f"Snapshots require V3 vocabulary data (got V{version})")
+
+    senses: Dict[str, Dict[str, Any]] = data.get('senses', {})
+    indices = data.get('indices', {})
+
+    strings = _StringTable()
+    sense_ids = list(senses.keys())
+    record_of = {sid: i for i, sid in enumerate(sense_ids)}
+
+    # Fixed-width records, in the original JSON order
+    records = bytearray()
+    for sense_id in sense_ids:
+        sense = senses[sense_id]
+        rank = sense.get('frequency_rank')
+        pos = (sense.get('pos') or '').encode('ascii', 'ignore')[:4]
+        id_ref = strings.add(sense_id)
+        word_ref = strings.add(sense.get('word') or '')
+        payload_ref = strings.add(
+            json.dumps(sense, ensure_ascii=False, separators=(',', ':')),
+            dedupe=False
+        )
+        records += RECORD.pack(
+            *id_ref, *word_ref, *payload_ref,
+            rank if isinstance(rank, int) else NO_RANK,
+            band_for_rank(rank),
+            pos,
+        )
+
+    # Record numbers sorted by sense ID bytes, for bisect lookups
+    sort_order = sorted(range(len(sense_ids)), key=lambda i: sense_ids[i].encode('utf-8'))
+    sort_section = b''.join(U32.pack(i) for i in sort_order)
+
+    # byWord is rebuilt from lemmas exactly like the JSON loader does
+    by_word: Dict[str, List[str]] = {}
+    for sense_id in sense_ids:
+        by_word.setdefault(_extract_lemma(sense_id), []).append(sense_id)
+
+    index_data = {
+        'by_word': by_word,
+        'by_word_form': indices.get('byWord', {}),
+        'by_band': indices.get('byBand', {}),
+        'by_pos': indices.get('byPos', {}),
+    }
+
+    members = bytearray()
+    group_sections: Dict[bytes, bytes] = {}
+    for name, tag in INDEX_SECTIONS.items():
+        groups = []
+        for key, ids in index_data[name].items():
+            start = len(members) // U32.size
+            count = 0
+            for sid in ids:
+                if sid in record_of:
+                    members += U32.pack(record_of[sid])
+                    count += 1
+            groups.append((str(key).encode('utf-8'), start, count))
+        groups.sort(key=lambda g: g[0])
+        table = bytearray()
+        for key_bytes, start, count in groups:
+            key_ref = strings.add(key_bytes.decode('utf-8'))
+            table += GROUP.pack(*key_ref, start, count)
+        group_sections[tag] = bytes(table)
+
+    rank_sections = _build_rank_sections(records, strings)
+    pool_sections = _build_trap_pool_sections(indices.get('byBand', {}), record_of, records, strings)
+
+    meta = {
+        'version': version,
+        'exportedAt': data.get('exportedAt'),
+        'stats': data.get('stats', {}),
+        'source': source,
+    }
+
+    sections = [
+        (b'META', json.dumps(meta, ensure_ascii=False).encode('utf-8')),
+        (b'STRS', strings.to_bytes()),
+        (b'RECS', bytes(records)),
+        (b'SORT', sort_section),
+        (b'MEMB', bytes(members)),
+    ] + list(group_sections.items()) + rank_sections + pool_sections
+
+    offset = HEADER.size + SECTION.size * len(sections)
+    table = bytearray()
+    for tag, body in sections:
+        table += SECTION.pack(tag, offset, len(body))
+        offset += len(body)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(sense_ids), len(sections)))
+        f.write(table)
+        for _, body in sections:
+            f.write(body)
+    # Atomic replace so running workers never map a half-written file
+    tmp_path.replace(output_path)
+
+    return {
+        'senses': len(sense_ids),
+        'lemmas': len(by_word),
+        'bytes': output_path.stat().st_size,
+    }
+
+
+def _group_table(groups: List[Tuple[str, int, int]], strings: _StringTable) -> bytes:
+    """Pack (key, start, count) groups sorted by key bytes."""
+    table = bytearray()
+    for key, start, count in sorted(groups, key=lambda g: g[0].encode('utf-8')):
+        table += GROUP.pack(*strings.add(key), start, count)
+    return bytes(table)
+
+
+def _record_fields(records: bytearray, record: int) -> Tuple:
+    return RECORD.unpack_from(records, record * RECORD.size)
+
+
+def _record_pos(fields: Tuple) -> str:
+    return fields[8].rstrip(b'\x00').decode('ascii')
+
+
+def _build_rank_sections(records: bytearray, strings: _StringTable) -> List[Tuple[bytes, bytes]]:
+    """Rank-sorted record numbers and ranks, for all senses and per POS."""
+    count = len(records) // RECORD.size
+    columns: Dict[str, List[Tuple[int, int]]] = {'': []}
+    for record in range(count):
+        fields = _record_fields(records, record)
+        rank = fields[6]
+        if rank == NO_RANK:
+            continue
+        columns[''].append((rank, record))
+        pos = _record_pos(fields)
+        if pos:
+            columns.setdefault(pos, []).append((rank, record))
+
+    groups = []
+    members = bytearray()
+    ranks = bytearray()
+    for key, entries in columns.items():
+        entries.sort(key=lambda e: e[0])  # Stable: ties keep record order
+        groups.append((key, len(members) // U32.size, len(entries)))
+        for rank, record in entries:
+            members += U32.pack(record)
+            ranks += I32.pack(rank)
+    return [
+        (b'RKGR', _group_table(groups, strings)),
+        (b'RKMB', bytes(members)),
+        (b'RKRN', bytes(ranks)),
+    ]
+
+
+def _build_trap_pool_sections(
+    by_band: Dict[str, List[str]],
+    record_of: Dict[str, int],
+    records: bytearray,
+    strings: _StringTable
+) -> List[Tuple[bytes, bytes]]:
+    """Per-(band, POS) record pools in band index order."""
+    pools: Dict[str, List[int]] = {}
+    for band, ids in by_band.items():
+        band = int(band)
+        pools.setdefault(str(band), [])
+        for sid in ids:
+            record = record_of.get(sid)
+            if record is None:
+                continue
+            pools[str(band)].append(record)
+            pos = _record_pos(_record_fields(records, record))
+            if pos:
+                pools.setdefault(f'{band}/{pos}', []).append(record)
+
+    groups = []
+    members = bytearray()
+    for key, pool in pools.items():
+        groups.append((key, len(members) // U32.size, len(pool)))
+        for record in pool:
+            members += U32.pack(record)
+    return [
+        (b'TPGR', _group_table(groups, strings)),
+        (b'TPMB', bytes(members)),
+    ]
+
+
+def build_snapshot_file(json_path: Path, output_path: Optional[Path] = None) -> Dict[str, Any]:
+    """Build a snapshot from a vocabulary.json file on disk."""
+    json_path = Path(json_path)
+    output_path = Path(output_path) if output_path else snapshot_path_for(json_path)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return build_snapshot(data, output_path, source=json_path.name)
+
+
+# =============================================================================
+# LOAD
+# =============================================================================
+
+class _SenseMapping(Mapping):
+    """Read-only sense_id -> sense dict mapping backed by the snapshot."""
+
+    def __init__(self, snapshot: 'VocabularySnapshot'):
+        self._snapshot = snapshot
+
+    def __getitem__(self, sense_id: str) -> Dict[str, Any]:
+        record = self._snapshot.find_record(sense_id)
+        if record is None:
+            raise KeyError(sense_id)
+        return self._snapshot.sense_at(record)
+
+    def __contains__(self, sense_id: object) -> bool:
+        return isinstance(sense_id, str) and self._snapshot.find_record(sense_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for record in range(len(self._snapshot)):
+            yield self._snapshot.sense_id_at(record)
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+
+class _IndexMapping(Mapping):
+    """Read-only key -> [sense_id, ...] mapping over an index group table."""
+
+    def __init__(
+        self,
+        snapshot: 'VocabularySnapshot',
+        offset: int,
+        length: int,
+        key_type: Callable[[str], Any] = str
+    ):
+        self._snapshot = snapshot
+        self._offset = offset
+        self._count = length // GROUP.size
+        self._key_type = key_type
+
+    def _group(self, i: int) -> Tuple[int, int, int, int]:
+        return GROUP.unpack_from(self._snapshot._mm, self._offset + i * GROUP.size)
+
+    def _key_bytes(self, i: int) -> bytes:
+        key_off, key_len, _, _ = self._group(i)
+        return self._snapshot._string_bytes(key_off, key_len)
+
+    def _find(self, key: Any) -> Optional[int]:
+        target = str(key).encode('utf-8')
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_bytes(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._key_bytes(lo) == target:
+            return lo
+        return None
+
+    def records(self, key: Any) -> Tuple[int, ...]:
+        """Record numbers for a key (empty tuple if missing)."""
+        i = self._find(key)
+        if i is None:
+            return ()
+        _, _, start, count = self._group(i)
+        return self._snapshot._members(start, count)
+
+    def __getitem__(self, key: Any) -> List[str]:
+        i = self._find(key)
+        if i is None:
+            raise KeyError(key)
+        _, _, start, count = self._group(i)
+        sense_id_at = self._snapshot.sense_id_at
+        return [sense_id_at(r) for r in self._snapshot._members(start, count)]
+
+    def __contains__(self, key: object) -> bool:
+        return self._find(key) is not None
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(self._count):
+            yield self._key_type(self._key_bytes(i).decode('utf-8'))
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class RecordColumn(Sequence):
+    """A field of each record in a record-number array, read on access."""
+
+    def __init__(self, records: Sequence[int], field: Callable[[int], Any]):
+        self._records = records
+        self._field = field
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._field(r) for r in self._records[i]]
+        return self._field(self._records[i])
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class VocabularySnapshot:
+    """
+    Read-only, memory-mapped view of a compiled vocabulary snapshot.
+
+    Exposes dict-compatible mappings (senses, by_word, by_word_form,
+    by_band, by_pos) plus direct access to the fixed-width record columns.
+    """
+
+    def __init__(self, path: Path, cache_size: int = 4096):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            self._file.close()
+            raise SnapshotError(f"Empty snapshot file: {self.path}") from e
+
+        try:
+            self._parse_header()
+        except Exception:
+            self.close()
+            raise
+
+        self._decode = lru_cache(maxsize=cache_size)(self._decode_payload)
+        self._views: List[memoryview] = []
+
+        self.senses = _SenseMapping(self)
+        self.by_word = self._index('by_word')
+        self.by_word_form = self._index('by_word_form')
+        self.by_band = self._index('by_band', key_type=int)
+        self.by_pos = self._index('by_pos')
+
+    @classmethod
+    def open(cls, path: Path, **kwargs) -> 'VocabularySnapshot':
+        """Open and validate a snapshot file."""
+        return cls(path, **kwargs)
+
+    def _parse_header(self):
+        if len(self._mm) < HEADER.size:
+            raise SnapshotError(f"Truncated snapshot: {self.path}")
+        magic, fmt, count, n_sections = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise SnapshotError(f"Not a vocabulary snapshot: {self.path}")
+        if fmt != FORMAT_VERSION:
+            raise SnapshotError(
+                f"Unsupported snapshot format {fmt} (expected {FORMAT_VERSION}); rebuild it"
+            )
+        self._count = count
+        self._sections: Dict[bytes, Tuple[int, int]] = {}
+        for i in range(n_sections):
+            tag, offset, length = SECTION.unpack_from(self._mm, HEADER.size + i * SECTION.size)
+            if offset + length > len(self._mm):
+                raise SnapshotError(f"Section {tag!r} out of bounds in {self.path}")
+            self._sections[tag] = (offset, length)
+
+        for tag in (b'META', b'STRS', b'RECS', b'SORT', b'MEMB', b'RKGR', b'RKMB', b'RKRN', b'TPGR', b'TPMB'):
+            if tag not in self._sections:
+                raise SnapshotError(f"Missing section {tag!r} in {self.path}")
+
+        meta_off, meta_len = self._sections[b'META']
+        self.meta: Dict[str, Any] = json.loads(self._mm[meta_off:meta_off + meta_len])
+        self._strs_off = self._sections[b'STRS'][0]
+        self._recs_off = self._sections[b'RECS'][0]
+        self._sort_off = self._sections[b'SORT'][0]
+        self._memb_off = self._sections[b'MEMB'][0]
+
+    def _index(self, name: str, key_type: Callable[[str], Any] = str) -> _IndexMapping:
+        offset, length = self._sections.get(INDEX_SECTIONS[name], (0, 0))
+        return _IndexMapping(self, offset, length, key_type=key_type)
+
+    def close(self):
+        """Unmap the file. Mappings and columns become unusable afterwards."""
+        for view in reversed(getattr(self, '_views', [])):
+            view.release()
+        self._views = []
+        if getattr(self, '_mm', None) is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def version(self) -> str:
+        return str(self.meta.get('version', '3.0'))
+
+    # -------------------------------------------------------------------------
+    # Record access
+    # -------------------------------------------------------------------------
+
+    def _string_bytes(self, offset: int, length: int) -> bytes:
+        start = self._strs_off + offset
+        return self._mm[start:start + length]
+
+    def _record(self, record: int) -> Tuple:
+        return RECORD.unpack_from(self._mm, self._recs_off + record * RECORD.size)
+
+    def _members(self, start: int, count: int) -> Tuple[int, ...]:
+        return struct.unpack_from(f'<{count}I', self._mm, self._memb_off + start * U32.size)
+
+    def _id_bytes(self, record: int) -> bytes:
+        id_off, id_len = struct.unpack_from('<II', self._mm, self._recs_off + record * RECORD.size)
+        return self._string_bytes(id_off, id_len)
+
+    def sense_id_at(self, record: int) -> str:
+        """Sense ID stored in a record."""
+        return self._id_bytes(record).decode('utf-8')
+
+    def word_at(self, record: int) -> str:
+        """Word form stored in a record."""
+        fields = self._record(record)
+        return self._string_bytes(fields[2], fields[3]).decode('utf-8')
+
+    def rank_at(self, record: int) -> Optional[int]:
+        """Frequency rank of a record (None if the sense has no rank)."""
+        rank = self._record(record)[6]
+        return None if rank == NO_RANK else rank
+
+    def band_at(self, record: int) -> int:
+        """Frequency band of a record."""
+        return self._record(record)[7]
+
+    def pos_at(self, record: int) -> str:
+        """Part of speech of a record."""
+        return self._record(record)[8].rstrip(b'\x00').decode('ascii')
+
+    def sense_at(self, record: int) -> Dict[str, Any]:
+        """Decoded sense dictionary for a record (cached)."""
+        return self._decode(record)
+
+    def _decode_payload(self, record: int) -> Dict[str, Any]:
+        fields = self._record(record)
+        return json.loads(self._string_bytes(fields[4], fields[5]))
+
+    # -------------------------------------------------------------------------
+    # Precomputed sampling indexes
+    # -------------------------------------------------------------------------
+
+    def _array(self, tag: bytes, start: int, count: int, fmt: str) -> Sequence[int]:
+        """count 4-byte ints of a section, in place (a copy on big-endian hosts)."""
+        offset = self._sections[tag][0] + start * 4
+        if sys.byteorder != 'little':
+            return struct.unpack_from(f'<{count}{fmt}', self._mm, offset)
+        base = memoryview(self._mm)
+        view = base[offset:offset + count * 4].cast(fmt)
+        self._views += [base, view]
+        return view
+
+    def _groups(self, tag: bytes) -> Iterator[Tuple[str, int, int]]:
+        offset, length = self._sections[tag]
+        for i in range(length // GROUP.size):
+            key_off, key_len, start, count = GROUP.unpack_from(self._mm, offset + i * GROUP.size)
+            yield self._string_bytes(key_off, key_len).decode('utf-8'), start, count
+
+    def rank_columns(self) -> Dict[Optional[str], Tuple[Sequence[int], Sequence[int]]]:
+        """
+        Rank-sorted columns for RankIndex.
+
+        Returns:
+            POS (None = all senses) -> (ranks, record numbers)
+        """
+        return {
+            key or None: (
+                self._array(b'RKRN', start, count, 'i'),
+                self._array(b'RKMB', start, count, 'I'),
+            )
+            for key, start, count in self._groups(b'RKGR')
+        }
+
+    def trap_pools(self) -> Dict[Tuple[int, Optional[str]], Sequence[int]]:
+        """
+        Record pools for TrapPoolIndex.
+
+        Returns:
+            (band, POS or None) -> record numbers in band index order
+        """
+        pools = {}
+        for key, start, count in self._groups(b'TPGR'):
+            band, _, pos = key.partition('/')
+            pools[(int(band), pos or None)] = self._array(b'TPMB', start, count, 'I')
+        return pools
+
+    def sense_id_column(self, records: Sequence[int]) -> RecordColumn:
+        """Sense IDs of the given records, decoded on access."""
+        return RecordColumn(records, self.sense_id_at)
+
+    def word_column(self, records: Sequence[int]) -> RecordColumn:
+        """Words of the given records, decoded on access."""
+        return RecordColumn(records, self.word_at)
+
+    def find_record(self, sense_id: str) -> Optional[int]:
+        """Binary-search the sorted ID column for a sense's record number."""
+        target = sense_id.encode('utf-8')
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            record = U32.unpack_from(self._mm, self._sort_off + mid * U32.size)[0]
+            if self._id_bytes(record) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count:
+            record = U32.unpack_from(self._mm, self._sort_off + lo * U32.size)[0]
+            if self._id_bytes(record) == target:
+                return record
+        return None
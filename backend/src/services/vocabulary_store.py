@@ -10,6 +10,14 @@ V3 Changes:
 - 'other_senses' embedded for polysemy checking
 - 'connections.confused' for CONFUSED_WITH relationships
 
+Snapshot loading:
+- If a compiled vocabulary.snapshot (see vocabulary_snapshot.py) sits next to
+  vocabulary.json and is not older than it, the store memory-maps the
+  snapshot instead of parsing the JSON. Workers share the mapped pages and
+  startup is near-instant; the rank and trap-pool indexes are mapped from
+  the snapshot too, so nothing is decoded per worker. The public API is
+  unchanged.
+
 Usage:
     from src.services.vocabulary_store import vocabulary_store
     
@@ -26,8 +34,38 @@ Usage:
 
 import json
 import random
+import re
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, Iterable, List, Optional, Any, Set, Tuple
+
+# NumPy is optional; rank lookups fall back to plain lists
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+from .vocabulary_snapshot import VocabularySnapshot, SnapshotError, snapshot_path_for
+from .vocabulary_indexes import RankIndex, TrapPoolIndex
+from .edit_distance_index import EditDistanceIndex
+
+
+# Learning point IDs can carry an index suffix: 'call.v.01_99'
+_INDEX_SUFFIX = re.compile(r'^(.+\.\w+\.\d+)_\d+$')
+
+
+def normalize_sense_id(sense_id: str) -> str:
+    """
+    Normalize sense_id by stripping index suffix.
+    
+    Examples:
+        - 'call.v.01_99' -> 'call.v.01'
+        - 'be.v.01_0' -> 'be.v.01'
+        - 'drop.n.02' -> 'drop.n.02' (unchanged)
+    """
+    match = _INDEX_SUFFIX.match(sense_id)
+    return match.group(1) if match else sense_id
 
 
 class VocabularyStore:
@@ -54,12 +92,19 @@ class VocabularyStore:
         self._senses: Dict[str, Dict[str, Any]] = {}
         self._loaded = False
         self._version = None
+        self._snapshot: Optional[VocabularySnapshot] = None
         
         # Indices (V3 format)
         self._by_word: Dict[str, List[str]] = {}
         self._by_band: Dict[int, List[str]] = {}
         self._by_pos: Dict[str, List[str]] = {}
         
+        # Secondary indices (built once after loading)
+        self._rank_index = RankIndex([])
+        self._trap_pools = TrapPoolIndex({})
+        self._edit_index: Optional[EditDistanceIndex] = None  # built lazily
+        self._rank_lookup: Optional[Dict[str, int]] = None  # built lazily
+        
         # Legacy V2 compatibility
         self._words: Dict[str, Dict[str, Any]] = {}  # V2 only
         self._relationships: Dict[str, Dict[str, List[str]]] = {}  # V2 only
@@ -69,7 +114,7 @@ class VocabularyStore:
         VocabularyStore._initialized = True
     
     def _load_data(self) -> bool:
-        """Load vocabulary data from JSON file."""
+        """Load vocabulary data from the binary snapshot or the JSON file."""
         if self._loaded:
             return True
         
@@ -79,6 +124,18 @@ class VocabularyStore:
             Path(__file__).parent.parent.parent.parent / 'data' / 'vocabulary.json',  # project root/data/
         ]
         
+        # Prefer a compiled snapshot that is at least as new as its JSON
+        for path in possible_paths:
+            snapshot_file = snapshot_path_for(path)
+            if not snapshot_file.exists():
+                continue
+            if path.exists() and snapshot_file.stat().st_mtime < path.stat().st_mtime:
+                print(f"WARNING: {snapshot_file} is older than {path.name}, ignoring it. "
+                      f"Run build_vocabulary_snapshot.py to rebuild.")
+                continue
+            if self._load_snapshot(snapshot_file):
+                return True
+        
         data_file = None
         for path in possible_paths:
             if path.exists():
@@ -106,6 +163,7 @@ class VocabularyStore:
                 # V2 format: legacy compatibility
                 self._load_v2_data(data)
             
+            self._build_secondary_indices()
             self._loaded = True
             print(f"  Loaded vocabulary V{self._version}: {len(self._senses)} senses")
             return True
@@ -116,6 +174,68 @@ class VocabularyStore:
             traceback.print_exc()
             return False
     
+    def _load_snapshot(self, snapshot_file: Path) -> bool:
+        """Memory-map a compiled vocabulary snapshot (V3 only)."""
+        try:
+            snapshot = VocabularySnapshot.open(snapshot_file)
+        except (OSError, SnapshotError) as e:
+            print(f"WARNING: could not load snapshot {snapshot_file}: {e}")
+            return False
+        
+        self._snapshot = snapshot
+        self._version = snapshot.version
+        self._senses = snapshot.senses
+        self._by_word = snapshot.by_word
+        self._by_word_form = snapshot.by_word_form
+        self._by_band = snapshot.by_band
+        self._by_pos = snapshot.by_pos
+        
+        self._map_snapshot_indices()
+        self._loaded = True
+        print(f"  Mapped vocabulary snapshot V{self._version}: {len(self._senses)} senses ({snapshot_file.name})")
+        return True
+    
+    def _iter_index_entries(self):
+        """
+        Yield (frequency_rank, sense_id, word, pos) for every sense.
+        
+        Snapshots are read from the fixed-width record columns so building
+        indices never decodes sense payloads.
+        """
+        if self._snapshot is not None:
+            snap = self._snapshot
+            for record in range(len(snap)):
+                yield snap.rank_at(record), snap.sense_id_at(record), snap.word_at(record), snap.pos_at(record)
+            return
+        
+        for sense_id, sense in self._senses.items():
+            yield sense.get('frequency_rank'), sense_id, sense.get('word', ''), sense.get('pos')
+    
+    def _build_secondary_indices(self):
+        """Build rank-sorted and (band, POS) lookup structures for sampling queries."""
+        entries = list(self._iter_index_entries())
+        self._rank_index = RankIndex(entries)
+        self._rank_lookup = None
+        
+        word_pos = {sense_id: (word, pos) for _, sense_id, word, pos in entries}
+        self._trap_pools = TrapPoolIndex({
+            band: [(sid, *word_pos[sid]) for sid in sense_ids if sid in word_pos]
+            for band, sense_ids in self._by_band.items()
+        })
+    
+    def _map_snapshot_indices(self):
+        """Wrap the snapshot's precomputed rank/trap-pool arrays (nothing is decoded)."""
+        snap = self._snapshot
+        self._rank_index = RankIndex.from_columns({
+            pos: (ranks, snap.sense_id_column(records), snap.word_column(records))
+            for pos, (ranks, records) in snap.rank_columns().items()
+        })
+        self._rank_lookup = None
+        self._trap_pools = TrapPoolIndex.from_pools({
+            key: (snap.sense_id_column(records), snap.word_column(records))
+            for key, records in snap.trap_pools().items()
+        })
+    
     def _extract_lemma(self, sense_id: str) -> str:
         """
         Extract lemma from sense_id.
@@ -188,6 +308,19 @@ class VocabularyStore:
         """Get the vocabulary schema version."""
         return self._version or 'unknown'
     
+    @property
+    def is_memory_mapped(self) -> bool:
+        """Check if data is served from a memory-mapped snapshot (shared across processes)."""
+        return self._snapshot is not None
+    
+    def get_all_sense_ids(self) -> List[str]:
+        """
+        Get every sense ID in vocabulary order.
+        
+        Cheap for snapshots (only the ID column is read, no payloads decoded).
+        """
+        return list(self._senses.keys())
+    
     # =========================================================================
     # CORE LOOKUP METHODS
     # =========================================================================
@@ -422,40 +555,80 @@ class VocabularyStore:
         max_rank: int,
         pos: Optional[str] = None,
         exclude_words: Optional[Set[str]] = None,
-        limit: int = 100
+        limit: int = 100,
+        randomize: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Get senses within a frequency rank range.
         
+        Uses the rank-sorted index (bisect + slice), so the cost depends on
+        the number of results rather than the vocabulary size.
+        
         Args:
             min_rank: Minimum frequency rank
             max_rank: Maximum frequency rank
             pos: Optional POS filter
             exclude_words: Words to exclude
             limit: Maximum results
+            randomize: Random sample within the range (default) instead of
+                lowest ranks first
             
         Returns:
             List of sense data dictionaries
         """
-        exclude_words = exclude_words or set()
-        results = []
+        sense_ids = self._rank_index.sample_ids(
+            min_rank,
+            max_rank,
+            limit,
+            pos=pos,
+            exclude_words=exclude_words,
+            randomize=randomize
+        )
+        return [self._senses[sid] for sid in sense_ids if sid in self._senses]
+    
+    def _get_rank_lookup(self) -> Dict[str, int]:
+        """
+        Map of learning point ID -> frequency rank.
         
-        for sense in self._senses.values():
-            rank = sense.get('frequency_rank')
-            if rank is None:
-                continue
-            if not (min_rank <= rank <= max_rank):
-                continue
-            if pos and sense.get('pos') != pos:
-                continue
-            if sense.get('word') in exclude_words:
-                continue
-            
-            results.append(sense)
-            if len(results) >= limit:
-                break
+        Keys are sense IDs plus bare words (lowercased, best rank of their
+        senses), since learning points may be recorded either way.
+        """
+        if self._rank_lookup is None:
+            lookup: Dict[str, int] = {}
+            word_ranks: Dict[str, int] = {}
+            for rank, sense_id, word, _ in self._iter_index_entries():
+                if not rank:
+                    continue
+                lookup[sense_id] = rank
+                if word:
+                    key = word.lower()
+                    if rank < word_ranks.get(key, rank + 1):
+                        word_ranks[key] = rank
+            for word, rank in word_ranks.items():
+                lookup.setdefault(word, rank)
+            self._rank_lookup = lookup
+        return self._rank_lookup
+    
+    def get_frequency_ranks(self, learning_point_ids: Iterable[str]):
+        """
+        Frequency ranks for a batch of learning point IDs.
         
-        return results
+        Args:
+            learning_point_ids: Sense IDs (e.g. "apple.n.01", index suffixes
+                like "call.v.01_99" are stripped) or words
+            
+        Returns:
+            int32 NumPy array aligned with the input (list without NumPy);
+            0 where the ID has no known rank
+        """
+        lookup = self._get_rank_lookup()
+        ranks = []
+        for lp_id in learning_point_ids:
+            lp_id = normalize_sense_id(str(lp_id))
+            ranks.append(lookup.get(lp_id) or lookup.get(lp_id.lower(), 0))
+        if HAS_NUMPY:
+            return np.asarray(ranks, dtype=np.int32)
+        return ranks
     
     def get_senses_by_pos(self, pos: str, limit: int = 100) -> List[Dict[str, Any]]:
         """
@@ -485,7 +658,8 @@ class VocabularyStore:
         """
         Get random senses to use as trap/distractor options.
         
-        For survey/MCQ generation.
+        For survey/MCQ generation. Samples from the precomputed (band, POS)
+        pools, so the cost is O(count) regardless of vocabulary size.
         
         Args:
             exclude_word: Word to exclude (the target word)
@@ -496,34 +670,39 @@ class VocabularyStore:
         Returns:
             List of sense data dictionaries
         """
-        candidates = []
-        
         if rank:
-            # Get senses from nearby bands
-            search_radius = 500
-            for band in self._by_band:
-                band_min = band - 999  # e.g., band 2000 covers 1001-2000
-                band_max = band
-                if rank - search_radius <= band_max and rank + search_radius >= band_min:
-                    for sid in self._by_band[band]:
-                        sense = self._senses.get(sid)
-                        if sense and sense.get('word') != exclude_word:
-                            if pos and sense.get('pos') != pos:
-                                continue
-                            candidates.append(sense)
+            # Pools from nearby bands (e.g., band 2000 covers 1001-2000)
+            bands = self._trap_pools.bands_near(rank, radius=500)
         else:
-            # Get random senses from any band
-            for sid, sense in self._senses.items():
-                if sense.get('word') != exclude_word:
-                    if pos and sense.get('pos') != pos:
-                        continue
-                    candidates.append(sense)
+            # Pools from any band
+            bands = self._trap_pools.bands
         
-        # Random sample
-        if len(candidates) <= count:
-            return candidates
+        sense_ids = self._trap_pools.sample(bands, count, pos=pos, exclude_word=exclude_word)
+        return [self._senses[sid] for sid in sense_ids if sid in self._senses]
+    
+    def get_edit_distance_index(self) -> EditDistanceIndex:
+        """
+        Get the edit-distance index over all lemmas.
         
-        return random.sample(candidates, count)
+        Built on first use (not at startup), so workers that never generate
+        MCQs don't pay for it.
+        """
+        if self._edit_index is None:
+            self._edit_index = EditDistanceIndex(self._by_word.keys(), max_distance=2)
+        return self._edit_index
+    
+    def get_words_within_distance(self, word: str, max_distance: int = 2) -> List[Tuple[str, int]]:
+        """
+        Get every lemma within `max_distance` edits of a word (orthographic distractors).
+        
+        Args:
+            word: Target word
+            max_distance: Maximum Levenshtein distance (1-2)
+            
+        Returns:
+            List of (lemma, distance) tuples, closest first, excluding the word itself
+        """
+        return self.get_edit_distance_index().lookup(word, max_distance=max_distance)
     
     # =========================================================================
     # BLOCK/DETAIL METHODS
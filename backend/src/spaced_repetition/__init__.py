@@ -6,7 +6,8 @@ Implements adaptive spaced repetition with A/B testing support for:
 - FSRS Algorithm (machine learning, modern)
 
 Key Components:
-- algorithm_interface.py: Abstract interface for both algorithms
+- algorithm_interface.py: Abstract interface for both algorithms (scalar
+  process_review and columnar process_reviews)
 - fsrs_service.py: FSRS library wrapper
 - sm2_service.py: SM-2+ implementation
 - assignment_service.py: User algorithm assignment for A/B testing
@@ -17,6 +18,8 @@ from .algorithm_interface import (
     ReviewResult,
     CardState,
     PerformanceRating,
+    ReviewBatch,
+    ReviewBatchResult,
     get_algorithm_for_user,
 )
 from .fsrs_service import FSRSService
@@ -34,6 +37,8 @@ __all__ = [
     'ReviewResult',
     'CardState',
     'PerformanceRating',
+    'ReviewBatch',
+    'ReviewBatchResult',
     'get_algorithm_for_user',
     # Services
     'FSRSService',
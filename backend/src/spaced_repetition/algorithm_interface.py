@@ -7,16 +7,28 @@ allowing SM-2+ and FSRS to be used interchangeably.
 Key Classes:
 - CardState: Represents the state of a learning card
 - ReviewResult: Result of processing a review
+- ReviewBatch / ReviewBatchResult: Columnar (NumPy) input and output of
+  process_reviews(), for simulation and backfills over many reviews
 - SpacedRepetitionAlgorithm: Abstract base class for algorithms
 """
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime, date, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Sequence
 from uuid import UUID
 from enum import IntEnum
 import json
+import math
+import operator
+
+# NumPy is optional; only the batch API (process_reviews) needs it
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
 
 
 class PerformanceRating(IntEnum):
@@ -172,6 +184,151 @@ class ReviewResult:
         }
 
 
+# ============================================
+# Columnar batch API
+# ============================================
+
+# exp/pow through the math module, one element at a time. NumPy's SIMD
+# exp/pow may differ from libm in the last bit, and the batch path must
+# reproduce the scalar path exactly; +, -, *, / and comparisons are
+# correctly rounded in both, so only these need the detour.
+if HAS_NUMPY:
+    _libm_pow = np.frompyfunc(operator.pow, 2, 1)
+    _libm_exp = np.frompyfunc(math.exp, 1, 1)
+
+
+def libm_pow(base, exponent):
+    """Elementwise `base ** exponent` with Python float semantics (float64 array)."""
+    return np.asarray(_libm_pow(base, exponent), dtype=np.float64)
+
+
+def libm_exp(values):
+    """Elementwise math.exp (float64 array)."""
+    return np.asarray(_libm_exp(values), dtype=np.float64)
+
+
+@dataclass
+class ReviewBatch:
+    """
+    One review per row, as columns.
+    
+    Rows are independent: to replay a card's history, call process_reviews
+    once per step with the previous result's columns. Columns left as None
+    get CardState defaults; NaN marks a missing value in float columns.
+    
+    FSRS reads stability/difficulty/elapsed_days (NaN stability or
+    difficulty = new card); SM-2+ reads ease_factor/current_interval/
+    consecutive_correct. Both read the counters and response times.
+    """
+    ratings: Any  # PerformanceRating values (0-4)
+    elapsed_days: Any = None  # Days since last review (NaN = never reviewed)
+    stability: Any = None
+    difficulty: Any = None
+    ease_factor: Any = None
+    current_interval: Any = None
+    consecutive_correct: Any = None
+    total_reviews: Any = None
+    total_correct: Any = None
+    is_leech: Any = None
+    mastery_level: Any = None
+    avg_response_time_ms: Any = None
+    response_time_ms: Any = None  # This review's response time (NaN = not timed)
+    
+    def __post_init__(self):
+        if not HAS_NUMPY:
+            raise RuntimeError("ReviewBatch requires NumPy")
+        self.ratings = np.asarray(self.ratings, dtype=np.int64)
+        n = len(self.ratings)
+        if n and (self.ratings.min() < PerformanceRating.AGAIN or self.ratings.max() > PerformanceRating.PERFECT):
+            raise ValueError("Ratings must be PerformanceRating values (0-4)")
+        
+        def column(values, dtype, default):
+            if values is None:
+                return np.full(n, default, dtype=dtype)
+            values = np.asarray(values, dtype=dtype)
+            if values.shape != (n,):
+                raise ValueError(f"Expected {n} values per column, got shape {values.shape}")
+            return values
+        
+        self.elapsed_days = column(self.elapsed_days, np.float64, np.nan)
+        self.stability = column(self.stability, np.float64, np.nan)
+        self.difficulty = column(self.difficulty, np.float64, np.nan)
+        self.ease_factor = column(self.ease_factor, np.float64, 2.5)
+        self.current_interval = column(self.current_interval, np.int64, 1)
+        self.consecutive_correct = column(self.consecutive_correct, np.int64, 0)
+        self.total_reviews = column(self.total_reviews, np.int64, 0)
+        self.total_correct = column(self.total_correct, np.int64, 0)
+        self.is_leech = column(self.is_leech, bool, False)
+        self.mastery_level = column(self.mastery_level, object, 'learning')
+        self.avg_response_time_ms = column(self.avg_response_time_ms, np.float64, np.nan)
+        self.response_time_ms = column(self.response_time_ms, np.float64, np.nan)
+    
+    def __len__(self) -> int:
+        return len(self.ratings)
+    
+    @classmethod
+    def from_states(
+        cls,
+        states: Sequence[CardState],
+        ratings: Sequence[int],
+        review_date: Optional[date] = None,
+        response_times_ms: Optional[Sequence[Optional[int]]] = None,
+    ) -> 'ReviewBatch':
+        """
+        Build a batch from CardState objects (one review each).
+        
+        A state without positive stability is a new card for FSRS.
+        """
+        review_date = review_date or date.today()
+        
+        def floats(values):
+            return [np.nan if v is None else v for v in values]
+        
+        return cls(
+            ratings=[int(r) for r in ratings],
+            elapsed_days=floats(
+                (review_date - s.last_review_date).days if s.last_review_date else None
+                for s in states
+            ),
+            stability=floats(s.stability or None for s in states),
+            difficulty=floats(s.difficulty if s.stability else None for s in states),
+            ease_factor=[s.ease_factor for s in states],
+            current_interval=[s.current_interval for s in states],
+            consecutive_correct=[s.consecutive_correct for s in states],
+            total_reviews=[s.total_reviews for s in states],
+            total_correct=[s.total_correct for s in states],
+            is_leech=[s.is_leech for s in states],
+            mastery_level=[s.mastery_level for s in states],
+            avg_response_time_ms=floats(s.avg_response_time_ms for s in states),
+            response_time_ms=floats(response_times_ms) if response_times_ms is not None else None,
+        )
+
+
+@dataclass
+class ReviewBatchResult:
+    """
+    Updated columns from process_reviews, aligned with the input rows.
+    
+    Values match what process_review puts in ReviewResult/new_state for the
+    same card and rating, except `retrievability`, which is the predicted
+    recall at the review itself (before it), as predict_retention gives.
+    """
+    interval_days: Any
+    was_correct: Any
+    stability: Any  # NaN for SM-2+
+    difficulty: Any
+    retrievability: Any
+    ease_factor: Any
+    consecutive_correct: Any
+    total_reviews: Any
+    total_correct: Any
+    is_leech: Any
+    became_leech: Any
+    mastery_level: Any
+    mastery_changed: Any
+    avg_response_time_ms: Any  # NaN when never timed
+
+
 class SpacedRepetitionAlgorithm(ABC):
     """
     Abstract base class for spaced repetition algorithms.
@@ -249,6 +406,78 @@ class SpacedRepetitionAlgorithm(ABC):
         """
         pass
     
+    @abstractmethod
+    def process_reviews(self, batch: ReviewBatch) -> ReviewBatchResult:
+        """
+        Process many reviews at once over NumPy columns.
+        
+        Same results as calling process_review row by row (see
+        ReviewBatch for the columns each algorithm reads).
+        
+        Args:
+            batch: One review per row
+            
+        Returns:
+            ReviewBatchResult with one value per row in each column
+        """
+        pass
+    
+    def _batch_counters(self, batch: ReviewBatch, was_correct) -> Dict[str, Any]:
+        """Consecutive/total counters and response-time average (process_review rules)."""
+        total_reviews = batch.total_reviews + 1
+        old_avg = batch.avg_response_time_ms
+        response_time = batch.response_time_ms
+        with np.errstate(invalid='ignore'):
+            rolling = np.trunc((old_avg * batch.total_reviews + response_time) / total_reviews)
+        avg = np.where(
+            np.isnan(response_time),
+            old_avg,
+            np.where(np.isnan(old_avg), response_time, rolling),
+        )
+        return {
+            'consecutive_correct': np.where(was_correct, batch.consecutive_correct + 1, 0),
+            'total_reviews': total_reviews,
+            'total_correct': batch.total_correct + was_correct.astype(np.int64),
+            'avg_response_time_ms': avg,
+        }
+    
+    def _detect_leeches(
+        self,
+        consecutive_correct,
+        ease_factor,
+        stability,
+        total_reviews,
+        total_correct,
+        failure_threshold: int = 3,
+        ease_threshold: float = 1.5,
+    ):
+        """detect_leech over columns of new states (which start unflagged)."""
+        with np.errstate(invalid='ignore'):
+            unstable = ~np.isnan(stability) & (stability < 0.5)
+        low_accuracy = (total_reviews >= 5) & (
+            total_correct / np.maximum(total_reviews, 1) < 0.3
+        )
+        return (
+            (consecutive_correct <= -failure_threshold)
+            | (ease_factor < ease_threshold)
+            | unstable
+            | low_accuracy
+        )
+    
+    def _mastery_levels(self, is_leech, consecutive_correct, current_interval):
+        """calculate_mastery_level over columns."""
+        return np.select(
+            [
+                is_leech,
+                consecutive_correct < 3,
+                consecutive_correct < 5,
+                current_interval < 180,
+                current_interval < 365 * 2,
+            ],
+            ['leech', 'learning', 'familiar', 'known', 'mastered'],
+            default='permanent',
+        ).astype(object)
+    
     def calculate_mastery_level(self, state: CardState) -> str:
         """
         Calculate mastery level from card state.
@@ -326,14 +555,13 @@ def get_algorithm_for_user(user_id: UUID, db_session=None) -> SpacedRepetitionAl
         SpacedRepetitionAlgorithm instance (SM2PlusService or FSRSService)
     """
     from .sm2_service import SM2PlusService
-    from .fsrs_service import FSRSService
+    from .fsrs_service import FSRSService, FSRS_AVAILABLE
     from .assignment_service import get_user_algorithm
     
     algorithm_type = get_user_algorithm(user_id, db_session)
     
-    # TEMPORARY: Force SM-2+ until FSRS library API is updated
-    # The fsrs 6.x library changed API significantly (repeat() -> review_card())
-    # if algorithm_type == 'fsrs':
-    #     return FSRSService()
+    # Fall back to SM-2+ where the fsrs library is not installed
+    if algorithm_type == 'fsrs' and FSRS_AVAILABLE:
+        return FSRSService()
     return SM2PlusService()
 
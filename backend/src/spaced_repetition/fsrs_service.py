@@ -13,14 +13,23 @@ Key Concepts:
 - Difficulty: How hard this word is (learned from all users)
 - Retention: Probability you'll remember at review time
 
+Requires fsrs>=6 (21-parameter FSRS-6 model). process_review() drives the
+library's Scheduler at day granularity (learning_steps=(),
+relearning_steps=(), enable_fuzzing=False); process_reviews() evaluates the
+same memory model over NumPy columns and matches it bit for bit. The batch
+formulas are copied from fsrs 6.3.2 (6.3.0/6.3.1 do not clamp same-day Hard
+growth), so process_reviews() refuses other versions.
+
 Reference: https://github.com/open-spaced-repetition/fsrs4anki
 """
 
 import logging
-from datetime import date, datetime, timedelta
+from importlib import metadata
+from datetime import date, datetime, time, timedelta, timezone
 from typing import Optional, Dict, Any
 from uuid import UUID
 import json
+import math
 
 try:
     from fsrs import Scheduler, Card, Rating, State
@@ -33,9 +42,16 @@ from .algorithm_interface import (
     SpacedRepetitionAlgorithm,
     CardState,
     ReviewResult,
+    ReviewBatch,
+    ReviewBatchResult,
     PerformanceRating,
+    HAS_NUMPY,
+    libm_pow,
 )
 
+if HAS_NUMPY:
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,6 +72,17 @@ class FSRSService(SpacedRepetitionAlgorithm):
     # Maximum interval
     MAX_INTERVAL = 365 * 2  # 2 years
     
+    # FSRS-6 bounds (as in fsrs.scheduler)
+    STABILITY_MIN = 0.001
+    DIFFICULTY_MIN = 1.0
+    DIFFICULTY_MAX = 10.0
+    
+    # FSRS-6 weights (w[19] short-term exponent, w[20] decay); fsrs<6 has fewer
+    PARAMETER_COUNT = 21
+    
+    # Release whose Scheduler formulas process_reviews() copies
+    FSRS_VERSION = '6.3.2'
+    
     def __init__(self, parameters: Optional[Dict[str, Any]] = None):
         """
         Initialize FSRS service.
@@ -66,22 +93,39 @@ class FSRSService(SpacedRepetitionAlgorithm):
         if not FSRS_AVAILABLE:
             raise RuntimeError("FSRS library not installed. Run: pip install fsrs")
         
-        self._fsrs = Scheduler()
-        
-        # Apply custom parameters if provided
-        if parameters:
-            self._apply_parameters(parameters)
+        self._fsrs_version = metadata.version('fsrs')
+        self._fsrs = self._build_scheduler(parameters or {})
+        if len(self._fsrs.parameters) != self.PARAMETER_COUNT:
+            raise RuntimeError(
+                f"FSRSService needs the FSRS-6 model ({self.PARAMETER_COUNT} parameters, "
+                f"got {len(self._fsrs.parameters)}). Run: pip install 'fsrs>=6,<7'"
+            )
     
-    def _apply_parameters(self, parameters: Dict[str, Any]) -> None:
-        """Apply custom FSRS parameters."""
-        # The fsrs library allows parameter customization
-        # Parameters are typically learned from user review history
+    def _build_scheduler(self, parameters: Dict[str, Any]) -> 'Scheduler':
+        """
+        Day-granularity Scheduler with optional custom parameters.
+        
+        The Scheduler derives its decay from the weights at construction,
+        so custom parameters build a new one instead of patching attributes.
+        Parameters are typically learned from user review history.
+        """
+        options = {
+            'learning_steps': (),
+            'relearning_steps': (),
+            'enable_fuzzing': False,
+            'maximum_interval': parameters.get('maximum_interval', self.MAX_INTERVAL),
+            'desired_retention': parameters.get(
+                'desired_retention', parameters.get('request_retention', self.TARGET_RETENTION)
+            ),
+        }
         if 'w' in parameters:
-            self._fsrs.w = parameters['w']
-        if 'request_retention' in parameters:
-            self._fsrs.request_retention = parameters['request_retention']
-        if 'maximum_interval' in parameters:
-            self._fsrs.maximum_interval = parameters['maximum_interval']
+            options['parameters'] = parameters['w']
+        return Scheduler(**options)
+    
+    @staticmethod
+    def _to_datetime(day: date) -> datetime:
+        """Midnight UTC of a review date (the Scheduler requires UTC datetimes)."""
+        return datetime.combine(day, time.min, tzinfo=timezone.utc)
     
     @property
     def algorithm_type(self) -> str:
@@ -107,30 +151,31 @@ class FSRSService(SpacedRepetitionAlgorithm):
         """
         Convert our CardState to FSRS Card.
         
-        If we have stored FSRS state, restore it.
-        Otherwise, create a new Card.
+        Memory state comes from the stability/difficulty/last_review_date
+        columns (what ReviewBatch.from_states reads); the stored FSRS state
+        only contributes the card state and step. A card without positive
+        stability (never reviewed, or saved by fsrs<6 as "New") is new.
         """
-        if state.fsrs_state:
-            # Restore from stored state
-            try:
-                card = Card()
-                card.stability = state.fsrs_state.get('stability', 0)
-                card.difficulty = state.fsrs_state.get('difficulty', 0.5)
-                card.reps = state.fsrs_state.get('reps', 0)
-                card.lapses = state.fsrs_state.get('lapses', 0)
-                card.elapsed_days = state.fsrs_state.get('elapsed_days', 0)
-                card.scheduled_days = state.fsrs_state.get('scheduled_days', 0)
-                card.state = State(state.fsrs_state.get('state', 0))
-                if state.fsrs_state.get('due'):
-                    card.due = datetime.fromisoformat(state.fsrs_state['due'])
-                if state.fsrs_state.get('last_review'):
-                    card.last_review = datetime.fromisoformat(state.fsrs_state['last_review'])
-                return card
-            except Exception as e:
-                logger.warning(f"Failed to restore FSRS state, creating new card: {e}")
-        
-        # Create new card
-        return Card()
+        card_id = state.learning_progress_id
+        if not state.stability or state.difficulty is None:
+            return Card(card_id=card_id)
+        
+        stored = state.fsrs_state or {}
+        try:
+            card_state = State(stored.get('state'))
+        except ValueError:
+            card_state = State.Review
+        step = None if card_state == State.Review else (stored.get('step') or 0)
+        last_review = self._to_datetime(state.last_review_date) if state.last_review_date else None
+        return Card(
+            card_id=card_id,
+            state=card_state,
+            step=step,
+            stability=state.stability,
+            difficulty=state.difficulty,
+            due=self._to_datetime(state.scheduled_date) if state.scheduled_date else last_review,
+            last_review=last_review,
+        )
     
     def _fsrs_card_to_state(self, card: 'Card') -> Dict[str, Any]:
         """
@@ -139,11 +184,8 @@ class FSRSService(SpacedRepetitionAlgorithm):
         return {
             'stability': card.stability,
             'difficulty': card.difficulty,
-            'reps': card.reps,
-            'lapses': card.lapses,
-            'elapsed_days': card.elapsed_days,
-            'scheduled_days': card.scheduled_days,
-            'state': card.state.value if hasattr(card.state, 'value') else int(card.state),
+            'state': card.state.value,
+            'step': card.step,
             'due': card.due.isoformat() if card.due else None,
             'last_review': card.last_review.isoformat() if card.last_review else None,
         }
@@ -157,7 +199,7 @@ class FSRSService(SpacedRepetitionAlgorithm):
     ) -> CardState:
         """Initialize a new FSRS card."""
         # Create FSRS Card
-        fsrs_card = Card()
+        fsrs_card = Card(card_id=learning_progress_id)
         
         # Note: FSRS difficulty is learned, not set initially
         # We store initial_difficulty for our own tracking
@@ -193,10 +235,8 @@ class FSRSService(SpacedRepetitionAlgorithm):
         - Elapsed time since last review
         - Target retention (90%)
         """
-        review_datetime = datetime.combine(
-            review_date or date.today(),
-            datetime.min.time()
-        )
+        review_date = review_date or date.today()
+        review_datetime = self._to_datetime(review_date)
         
         # Convert to FSRS Card
         fsrs_card = self._card_to_fsrs_card(state)
@@ -209,11 +249,7 @@ class FSRSService(SpacedRepetitionAlgorithm):
         difficulty_before = fsrs_card.difficulty
         
         # Process review with FSRS
-        scheduling_info = self._fsrs.repeat(fsrs_card, review_datetime)
-        
-        # Get the scheduled card for our rating
-        scheduled = scheduling_info[fsrs_rating]
-        new_fsrs_card = scheduled.card
+        new_fsrs_card, _ = self._fsrs.review_card(fsrs_card, fsrs_rating, review_datetime)
         
         # Determine if correct
         was_correct = rating >= PerformanceRating.GOOD
@@ -224,12 +260,12 @@ class FSRSService(SpacedRepetitionAlgorithm):
         else:
             new_consecutive = 0
         
-        # Calculate interval
-        new_interval = new_fsrs_card.scheduled_days
+        # Calculate interval (whole days: no learning steps, no fuzz)
+        new_interval = (new_fsrs_card.due - review_datetime).days
         new_interval = min(new_interval, self.MAX_INTERVAL)
         
         # Get retention prediction
-        retention = self._fsrs.get_retrievability(new_fsrs_card, review_datetime)
+        retention = self._fsrs.get_card_retrievability(new_fsrs_card, review_datetime)
         
         # Update totals
         new_total_reviews = state.total_reviews + 1
@@ -254,8 +290,8 @@ class FSRSService(SpacedRepetitionAlgorithm):
             learning_point_id=state.learning_point_id,
             algorithm_type='fsrs',
             current_interval=new_interval,
-            scheduled_date=(review_date or date.today()) + timedelta(days=new_interval),
-            last_review_date=review_date or date.today(),
+            scheduled_date=review_date + timedelta(days=new_interval),
+            last_review_date=review_date,
             total_reviews=new_total_reviews,
             total_correct=new_total_correct,
             ease_factor=state.ease_factor,  # Keep for compatibility
@@ -290,12 +326,132 @@ class FSRSService(SpacedRepetitionAlgorithm):
                 'stability_after': round(new_fsrs_card.stability, 3),
                 'difficulty_before': round(difficulty_before, 3) if difficulty_before else None,
                 'difficulty_after': round(new_fsrs_card.difficulty, 3),
-                'fsrs_state': new_fsrs_card.state.name if hasattr(new_fsrs_card.state, 'name') else str(new_fsrs_card.state),
-                'reps': new_fsrs_card.reps,
-                'lapses': new_fsrs_card.lapses,
+                'fsrs_state': new_fsrs_card.state.name,
             },
         )
     
+    def process_reviews(self, batch: ReviewBatch) -> ReviewBatchResult:
+        """
+        Process a batch of reviews with the FSRS-6 memory model.
+        
+        Reads stability, difficulty (NaN = new card), elapsed_days and the
+        counters. Every expression follows fsrs.Scheduler term by term (same
+        operand order, exp/pow through libm), so every column equals what
+        process_review returns for the same card and rating, and
+        retrievability equals predict_retention on the review date.
+        
+        Raises:
+            RuntimeError: If the installed fsrs is not FSRS_VERSION
+        """
+        if self._fsrs_version != self.FSRS_VERSION:
+            raise RuntimeError(
+                f"process_reviews copies the fsrs=={self.FSRS_VERSION} formulas "
+                f"(installed: {self._fsrs_version}). Run: pip install 'fsrs=={self.FSRS_VERSION}'"
+            )
+        
+        w = self._fsrs.parameters
+        decay = -w[20]
+        factor = 0.9 ** (1 / decay) - 1
+        
+        # FSRS rating (Again=1 .. Easy=4); Perfect maps to Easy
+        ratings = batch.ratings
+        fsrs_ratings = np.minimum(ratings, PerformanceRating.EASY) + 1
+        was_correct = ratings >= PerformanceRating.GOOD
+        
+        # Per-rating terms (index = FSRS rating), computed with scalar math
+        rated = range(1, 5)
+        initial_stability = np.array([0.0] + [max(w[r - 1], self.STABILITY_MIN) for r in rated])
+        initial_difficulty = np.array([0.0] + [
+            min(max(w[4] - (math.e ** (w[5] * (r - 1))) + 1, self.DIFFICULTY_MIN), self.DIFFICULTY_MAX)
+            for r in rated
+        ])
+        delta_difficulty = np.array([0.0] + [-(w[6] * (r - 3)) for r in rated])
+        short_term_growth = np.array([0.0] + [math.e ** (w[17] * (r - 3 + w[18])) for r in rated])
+        recall_modifier = np.array([1.0, 1.0, w[15], 1.0, w[16]])  # Hard penalty / Easy bonus
+        
+        stability = batch.stability
+        difficulty = batch.difficulty
+        elapsed = batch.elapsed_days
+        
+        new_card = np.isnan(stability) | np.isnan(difficulty)
+        reviewed = ~np.isnan(elapsed)
+        short_term = ~new_card & reviewed & (elapsed < 1)
+        long_term = ~new_card & ~short_term
+        
+        # Retrievability at the review (0 without a previous review)
+        retrievability = np.zeros(len(batch))
+        known = ~new_card & reviewed
+        retrievability[known] = libm_pow(
+            1 + factor * np.maximum(elapsed[known], 0) / stability[known], decay
+        )
+        
+        new_stability = np.empty(len(batch))
+        new_stability[new_card] = initial_stability[fsrs_ratings[new_card]]
+        
+        s = stability[short_term]
+        r = fsrs_ratings[short_term]
+        growth = short_term_growth[r] * libm_pow(s, -w[19])
+        growth = np.where(r >= 2, np.maximum(growth, 1.0), growth)  # Hard, Good, Easy (fsrs 6.3.2)
+        new_stability[short_term] = s * growth
+        
+        forget = long_term & (fsrs_ratings == 1)
+        s, d, ret = stability[forget], difficulty[forget], retrievability[forget]
+        new_stability[forget] = np.minimum(
+            w[11]
+            * libm_pow(d, -w[12])
+            * (libm_pow(s + 1, w[13]) - 1)
+            * libm_pow(math.e, (1 - ret) * w[14]),
+            s / (math.e ** (w[17] * w[18])),
+        )
+        
+        recall = long_term & (fsrs_ratings > 1)
+        s, d, ret = stability[recall], difficulty[recall], retrievability[recall]
+        new_stability[recall] = s * (
+            1
+            + (math.e ** w[8])
+            * (11 - d)
+            * libm_pow(s, -w[9])
+            * (libm_pow(math.e, (1 - ret) * w[10]) - 1)
+            * recall_modifier[fsrs_ratings[recall]]
+        )
+        new_stability = np.maximum(new_stability, self.STABILITY_MIN)
+        
+        # Difficulty: linear damping, then mean reversion towards D0(Easy)
+        easy_difficulty = w[4] - (math.e ** (w[5] * (4 - 1))) + 1
+        damped = difficulty + (10.0 - difficulty) * delta_difficulty[fsrs_ratings] / 9.0
+        new_difficulty = w[7] * easy_difficulty + (1 - w[7]) * damped
+        new_difficulty = np.minimum(np.maximum(new_difficulty, self.DIFFICULTY_MIN), self.DIFFICULTY_MAX)
+        new_difficulty[new_card] = initial_difficulty[fsrs_ratings[new_card]]
+        
+        interval_scale = (self._fsrs.desired_retention ** (1 / decay)) - 1
+        new_interval = np.rint((new_stability / factor) * interval_scale).astype(np.int64)
+        new_interval = np.minimum(np.maximum(new_interval, 1), self._fsrs.maximum_interval)
+        new_interval = np.minimum(new_interval, self.MAX_INTERVAL)
+        
+        counters = self._batch_counters(batch, was_correct)
+        is_leech = self._detect_leeches(
+            counters['consecutive_correct'], batch.ease_factor, new_stability,
+            counters['total_reviews'], counters['total_correct'],
+        )
+        mastery = self._fsrs_mastery_levels(is_leech, new_stability)
+        
+        return ReviewBatchResult(
+            interval_days=new_interval,
+            was_correct=was_correct,
+            stability=new_stability,
+            difficulty=new_difficulty,
+            retrievability=retrievability,
+            ease_factor=batch.ease_factor,
+            consecutive_correct=counters['consecutive_correct'],
+            total_reviews=counters['total_reviews'],
+            total_correct=counters['total_correct'],
+            is_leech=is_leech,
+            became_leech=is_leech & ~batch.is_leech,
+            mastery_level=mastery,
+            mastery_changed=mastery != batch.mastery_level,
+            avg_response_time_ms=counters['avg_response_time_ms'],
+        )
+    
     def predict_retention(
         self,
         state: CardState,
@@ -306,15 +462,12 @@ class FSRSService(SpacedRepetitionAlgorithm):
         
         FSRS has native retention prediction using its forgetting curve model.
         """
-        target_datetime = datetime.combine(
-            target_date or date.today(),
-            datetime.min.time()
-        )
+        target_datetime = self._to_datetime(target_date or date.today())
         
         fsrs_card = self._card_to_fsrs_card(state)
         
         try:
-            retention = self._fsrs.get_retrievability(fsrs_card, target_datetime)
+            retention = self._fsrs.get_card_retrievability(fsrs_card, target_datetime)
             return max(0.0, min(1.0, retention))
         except Exception as e:
             logger.warning(f"FSRS retention prediction failed: {e}")
@@ -342,6 +495,14 @@ class FSRSService(SpacedRepetitionAlgorithm):
         else:
             return 'permanent'
     
+    def _fsrs_mastery_levels(self, is_leech, stability):
+        """_calculate_fsrs_mastery over columns."""
+        return np.select(
+            [is_leech, stability < 5, stability < 30, stability < 180, stability < 730],
+            ['leech', 'learning', 'familiar', 'known', 'mastered'],
+            default='permanent',
+        ).astype(object)
+    
     def optimize_parameters(
         self,
         review_history: list,
@@ -12,6 +12,9 @@ Key Features:
 Formula:
     ease_factor += (0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
     interval = previous_interval * ease_factor
+
+process_reviews() applies the same rules to NumPy columns (one review per
+row) for simulations and backfills.
 """
 
 import logging
@@ -23,9 +26,16 @@ from .algorithm_interface import (
     SpacedRepetitionAlgorithm,
     CardState,
     ReviewResult,
+    ReviewBatch,
+    ReviewBatchResult,
     PerformanceRating,
+    HAS_NUMPY,
+    libm_exp,
 )
 
+if HAS_NUMPY:
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -196,6 +206,66 @@ class SM2PlusService(SpacedRepetitionAlgorithm):
             },
         )
     
+    def process_reviews(self, batch: ReviewBatch) -> ReviewBatchResult:
+        """
+        Process a batch of reviews with the SM-2+ rules of process_review.
+        
+        Reads ease_factor, current_interval, consecutive_correct, the
+        counters and elapsed_days (for the retrievability column).
+        """
+        ratings = batch.ratings
+        was_correct = ratings >= PerformanceRating.GOOD
+        
+        # Per-rating EF change, computed with the scalar formula
+        ef_changes = np.array([
+            0.1 - (5 - q) * (0.08 + (5 - q) * 0.02) for q in range(1, 6)
+        ])
+        new_ef = batch.ease_factor + ef_changes[ratings]
+        new_ef = np.maximum(self.EF_MIN, np.minimum(self.EF_MAX, new_ef))
+        
+        counters = self._batch_counters(batch, was_correct)
+        consecutive = counters['consecutive_correct']
+        
+        initial = np.array(self.INITIAL_INTERVALS)
+        step = np.clip(consecutive - 1, 0, len(initial) - 1)
+        new_interval = np.where(
+            ~was_correct,
+            1,
+            np.where(
+                consecutive <= len(initial),
+                initial[step],
+                np.trunc(batch.current_interval * new_ef).astype(np.int64),
+            ),
+        )
+        new_interval = np.minimum(new_interval, self.INTERVAL_MAX)
+        
+        total_reviews = counters['total_reviews']
+        total_correct = counters['total_correct']
+        difficulty = self._calculate_difficulties(new_ef, total_reviews, total_correct)
+        
+        stability = np.full(len(batch), np.nan)
+        is_leech = self._detect_leeches(consecutive, new_ef, stability, total_reviews, total_correct)
+        mastery = self._mastery_levels(is_leech, consecutive, new_interval)
+        
+        return ReviewBatchResult(
+            interval_days=new_interval,
+            was_correct=was_correct,
+            stability=stability,
+            difficulty=difficulty,
+            retrievability=self._estimate_retentions(
+                batch.elapsed_days, batch.current_interval, batch.ease_factor
+            ),
+            ease_factor=new_ef,
+            consecutive_correct=consecutive,
+            total_reviews=total_reviews,
+            total_correct=total_correct,
+            is_leech=is_leech,
+            became_leech=is_leech & ~batch.is_leech,
+            mastery_level=mastery,
+            mastery_changed=mastery != batch.mastery_level,
+            avg_response_time_ms=counters['avg_response_time_ms'],
+        )
+    
     def predict_retention(
         self,
         state: CardState,
@@ -243,6 +313,28 @@ class SM2PlusService(SpacedRepetitionAlgorithm):
         
         return max(0.0, min(1.0, retention))
     
+    def _estimate_retentions(self, elapsed_days, current_interval, ease_factor):
+        """_estimate_retention over columns (NaN elapsed_days = never reviewed)."""
+        stability = current_interval * (ease_factor / self.EF_DEFAULT)
+        stability = np.where(stability <= 0, 1, stability)
+        reviewed = ~np.isnan(elapsed_days) & (elapsed_days > 0)
+        
+        retention = np.where(np.isnan(elapsed_days), 0.5, 1.0)
+        if reviewed.any():
+            decayed = libm_exp(-elapsed_days[reviewed] / stability[reviewed])
+            retention[reviewed] = np.maximum(0.0, np.minimum(1.0, decayed))
+        return retention
+    
+    def _calculate_difficulties(self, ease_factor, total_reviews, total_correct):
+        """_calculate_difficulty over columns."""
+        ef_factor = 1.0 - (ease_factor - self.EF_MIN) / (self.EF_MAX - self.EF_MIN)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            error_rate = np.where(
+                total_reviews > 0, 1.0 - (total_correct / total_reviews), 0.5
+            )
+        difficulty = 0.6 * ef_factor + 0.4 * error_rate
+        return np.maximum(0.0, np.minimum(1.0, difficulty))
+    
     def _calculate_difficulty(
         self,
         ease_factor: float,
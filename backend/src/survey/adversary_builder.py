@@ -6,14 +6,26 @@ Builds CONFUSED_WITH relationships for trap generation in LexiSurvey.
 The Hunter Algorithm:
 - Filter A (Morphology): Levenshtein Distance <= 2
 - Filter B (Phonetic): Sound-alike detection (optional)
-- Filter C (Semantic): Existing RELATED_TO edges flagged as semantic traps
+- Filter C (Semantic): Existing RELATED_TO edges flagged as semantic traps,
+  plus embedding neighbours from a local ANN index (see below)
 
 Goal: Find "Trap Candidates" for high-frequency words (Rank 1-4000).
+
+Batching:
+- Words, ranks and RELATED_TO edges are read in two queries up front;
+  morphology/phonetic candidates come from an in-memory rank window
+- Semantic neighbours for every word come from one batched query against
+  an AnnIndex over the exported embedding matrix (no per-word vector
+  queries); skipped if no matrix has been exported
+- CONFUSED_WITH edges are written with UNWIND in batches
 """
 
 import Levenshtein
+from bisect import bisect_left, bisect_right
 from typing import List, Dict, Tuple, Optional
 from src.database.neo4j_connection import Neo4jConnection
+from src.services.ann_index import AnnIndex
+from src.services.embedding_matrix import get_embedding_matrix
 
 # Optional: Phonetic matching (requires Fuzzy library)
 try:
@@ -29,6 +41,18 @@ class AdversaryBuilder:
     The "Hunter" - Finds trap candidates using multiple filters.
     """
     
+    # Candidates must be within this many ranks of the source word
+    RANK_WINDOW = 500
+    
+    # Embedding neighbours per word, and the similarity band they must fall in.
+    # The upper bound matches LexiSurveyEngine.SIMILARITY_THRESHOLD, above
+    # which traps are rejected as near-synonyms at question time.
+    SEMANTIC_NEIGHBOURS = 5
+    SEMANTIC_MIN_SIMILARITY = 0.45
+    SEMANTIC_MAX_SIMILARITY = 0.6
+    
+    WRITE_BATCH_SIZE = 1000
+    
     def __init__(self, conn: Neo4jConnection, max_rank: int = 4000):
         """
         Initialize the Adversary Builder.
@@ -45,6 +69,13 @@ class AdversaryBuilder:
             "semantic": 0,
             "total": 0
         }
+        
+        # Loaded once per run
+        self._ranks: Dict[str, int] = {}
+        self._words_by_rank: List[str] = []
+        self._rank_values: List[int] = []
+        self._related: Dict[str, List[str]] = {}
+        self._neighbours: Dict[str, List[Tuple[str, float]]] = {}
     
     def run(self, dry_run: bool = False):
         """
@@ -58,65 +89,122 @@ class AdversaryBuilder:
         print(f"   Mode: {'DRY RUN' if dry_run else 'LIVE'}\n")
         
         with self.conn.get_session() as session:
-            # 1. Fetch high-frequency words
-            words = self._fetch_high_frequency_words(session)
-            print(f"📊 Found {len(words)} high-frequency words to process\n")
+            # 1. Fetch high-frequency words and their RELATED_TO edges
+            self._ranks = self._fetch_high_frequency_words(session)
+            self._words_by_rank = sorted(self._ranks, key=self._ranks.get)
+            self._rank_values = [self._ranks[w] for w in self._words_by_rank]
+            self._related = self._fetch_related_words(session)
+            print(f"📊 Found {len(self._ranks)} high-frequency words to process\n")
             
-            # 2. Process each word through Hunter filters
-            for i, word in enumerate(words, 1):
+            # 2. Semantic neighbours for all words in one batch
+            self._neighbours = self._find_semantic_neighbours(self._words_by_rank)
+            
+            # 3. Process each word through Hunter filters (in memory)
+            rows = []
+            for i, word in enumerate(self._words_by_rank, 1):
                 if i % 100 == 0:
-                    print(f"   Progress: {i}/{len(words)} words processed...")
+                    print(f"   Progress: {i}/{len(self._words_by_rank)} words processed...")
                 
-                self._hunt_traps(session, word, dry_run)
+                for trap_word, reason, distance in self._hunt_traps(word):
+                    rows.append({"source": word, "target": trap_word, "reason": reason, "distance": distance})
+            
+            # 4. Create relationships
+            if dry_run:
+                for row in rows:
+                    print(f"   [DRY RUN] Would create: {row['source']} -[:CONFUSED_WITH {{reason: '{row['reason']}', distance: {row['distance']}}}]-> {row['target']}")
+            else:
+                self._create_confused_with_relationships(session, rows)
             
-            # 3. Report results
+            # 5. Report results
             self._print_summary(dry_run)
     
-    def _fetch_high_frequency_words(self, session) -> List[str]:
+    def _fetch_high_frequency_words(self, session) -> Dict[str, int]:
         """
         Fetch all words with frequency_rank <= max_rank.
         
         Returns:
-            List of word names
+            Dict of word name -> frequency rank, in rank order
         """
         result = session.run("""
             MATCH (w:Word)
             WHERE w.frequency_rank <= $max_rank
-            RETURN w.name as word
+            RETURN w.name as word, w.frequency_rank as rank
             ORDER BY w.frequency_rank ASC
         """, max_rank=self.max_rank)
         
-        return [record["word"] for record in result]
+        return {record["word"]: record["rank"] for record in result}
+    
+    def _fetch_related_words(self, session) -> Dict[str, List[str]]:
+        """
+        Fetch every RELATED_TO edge between high-frequency words in one query.
+        
+        Returns:
+            Dict of source word -> related word names
+        """
+        result = session.run("""
+            MATCH (source:Word)-[:RELATED_TO]->(target:Word)
+            WHERE source.frequency_rank <= $max_rank
+              AND target.frequency_rank <= $max_rank
+            RETURN source.name as source, collect(target.name) as targets
+        """, max_rank=self.max_rank)
+        
+        return {record["source"]: list(record["targets"]) for record in result}
     
-    def _hunt_traps(self, session, source_word: str, dry_run: bool):
+    def _find_semantic_neighbours(self, words: List[str]) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        Embedding neighbours of every word, from one batched ANN query.
+        
+        Returns:
+            Dict of word -> (neighbour, similarity) within the semantic band;
+            empty if no embedding matrix has been exported
+        """
+        matrix = get_embedding_matrix()
+        if matrix is None:
+            print("⚠️  No embedding matrix found (run optimize_db.py). Embedding neighbours skipped.")
+            return {}
+        
+        index = AnnIndex.build(matrix, keys=words)
+        print(f"🧭 Querying {len(index)} words against the {index.backend} ANN index...")
+        neighbours = index.query_keys(words, k=self.SEMANTIC_NEIGHBOURS * 2)
+        
+        return {
+            word: [
+                (other, sim) for other, sim in found
+                if self.SEMANTIC_MIN_SIMILARITY <= sim < self.SEMANTIC_MAX_SIMILARITY
+            ][:self.SEMANTIC_NEIGHBOURS]
+            for word, found in neighbours.items()
+        }
+    
+    def _rank_window(self, source_word: str) -> List[str]:
+        """High-frequency words within RANK_WINDOW ranks of the source (excluding it)."""
+        rank = self._ranks[source_word]
+        lo = bisect_left(self._rank_values, rank - self.RANK_WINDOW)
+        hi = bisect_right(self._rank_values, rank + self.RANK_WINDOW)
+        return [w for w in self._words_by_rank[lo:hi] if w != source_word]
+    
+    def _hunt_traps(self, source_word: str) -> List[Tuple[str, str, int]]:
         """
         Apply all Hunter filters to find trap candidates for a word.
         
         Args:
-            session: Neo4j session
             source_word: Source word to find traps for
-            dry_run: If True, don't create relationships
+            
+        Returns:
+            Deduplicated list of (trap_word, reason, distance) tuples
         """
         # Filter A: Morphology (Levenshtein Distance)
-        morphology_traps = self._filter_morphology(session, source_word)
+        morphology_traps = self._filter_morphology(source_word)
         
         # Filter B: Phonetic (Sound-alikes)
-        phonetic_traps = self._filter_phonetic(session, source_word) if PHONETIC_AVAILABLE else []
+        phonetic_traps = self._filter_phonetic(source_word) if PHONETIC_AVAILABLE else []
         
-        # Filter C: Semantic (Existing RELATED_TO)
-        semantic_traps = self._filter_semantic(session, source_word)
+        # Filter C: Semantic (Existing RELATED_TO + embedding neighbours)
+        semantic_traps = self._filter_semantic(source_word)
         
         # Combine and deduplicate
-        all_traps = self._combine_traps(morphology_traps, phonetic_traps, semantic_traps)
-        
-        # Create relationships
-        for trap_word, reason, distance in all_traps:
-            if not dry_run:
-                self._create_confused_with_relationship(session, source_word, trap_word, reason, distance)
-            else:
-                print(f"   [DRY RUN] Would create: {source_word} -[:CONFUSED_WITH {{reason: '{reason}', distance: {distance}}}]-> {trap_word}")
+        return self._combine_traps(morphology_traps, phonetic_traps, semantic_traps)
     
-    def _filter_morphology(self, session, source_word: str) -> List[Tuple[str, str, int]]:
+    def _filter_morphology(self, source_word: str) -> List[Tuple[str, str, int]]:
         """
         Filter A: Find words with Levenshtein Distance <= 2.
         
@@ -127,19 +215,8 @@ class AdversaryBuilder:
         """
         traps = []
         
-        # Fetch all words in similar rank range (±500) for efficiency
-        result = session.run("""
-            MATCH (source:Word {name: $source})
-            MATCH (target:Word)
-            WHERE target.frequency_rank <= $max_rank
-              AND target.name <> $source
-              AND abs(target.frequency_rank - source.frequency_rank) <= 500
-            RETURN target.name as word
-        """, source=source_word, max_rank=self.max_rank)
-        
-        candidates = [record["word"] for record in result]
-        
-        for candidate in candidates:
+        # Candidates in similar rank range (±500)
+        for candidate in self._rank_window(source_word):
             distance = Levenshtein.distance(source_word.lower(), candidate.lower())
             
             if distance <= 2 and distance > 0:  # Distance > 0 excludes identical words
@@ -148,7 +225,7 @@ class AdversaryBuilder:
         
         return traps
     
-    def _filter_phonetic(self, session, source_word: str) -> List[Tuple[str, str, int]]:
+    def _filter_phonetic(self, source_word: str) -> List[Tuple[str, str, int]]:
         """
         Filter B: Find sound-alike words using Metaphone.
         
@@ -161,19 +238,7 @@ class AdversaryBuilder:
         traps = []
         source_meta = metaphone(source_word.lower())
         
-        # Fetch candidate words
-        result = session.run("""
-            MATCH (source:Word {name: $source})
-            MATCH (target:Word)
-            WHERE target.frequency_rank <= $max_rank
-              AND target.name <> $source
-              AND abs(target.frequency_rank - source.frequency_rank) <= 500
-            RETURN target.name as word
-        """, source=source_word, max_rank=self.max_rank)
-        
-        candidates = [record["word"] for record in result]
-        
-        for candidate in candidates:
+        for candidate in self._rank_window(source_word):
             candidate_meta = metaphone(candidate.lower())
             
             # Check if metaphone codes match
@@ -185,9 +250,9 @@ class AdversaryBuilder:
         
         return traps
     
-    def _filter_semantic(self, session, source_word: str) -> List[Tuple[str, str, int]]:
+    def _filter_semantic(self, source_word: str) -> List[Tuple[str, str, int]]:
         """
-        Filter C: Find existing RELATED_TO relationships and flag as semantic traps.
+        Filter C: Flag RELATED_TO words and close embedding neighbours as semantic traps.
         
         These are words that are related but commonly confused (e.g., affect/effect).
         
@@ -195,15 +260,15 @@ class AdversaryBuilder:
             List of (trap_word, reason, distance) tuples
         """
         traps = []
+        seen = set()
         
-        result = session.run("""
-            MATCH (source:Word {name: $source})-[:RELATED_TO]->(target:Word)
-            WHERE target.frequency_rank <= $max_rank
-            RETURN target.name as word
-        """, source=source_word, max_rank=self.max_rank)
-        
-        for record in result:
-            trap_word = record["word"]
+        candidates = self._related.get(source_word, []) + [
+            word for word, _ in self._neighbours.get(source_word, [])
+        ]
+        for trap_word in candidates:
+            if trap_word in seen or trap_word == source_word:
+                continue
+            seen.add(trap_word)
             # Calculate Levenshtein distance for consistency
             distance = Levenshtein.distance(source_word.lower(), trap_word.lower())
             traps.append((trap_word, "Semantic", distance))
@@ -236,32 +301,30 @@ class AdversaryBuilder:
         
         return combined
     
-    def _create_confused_with_relationship(self, session, source: str, target: str, reason: str, distance: int):
+    def _create_confused_with_relationships(self, session, rows: List[Dict]):
         """
-        Create a CONFUSED_WITH relationship in Neo4j.
+        Create CONFUSED_WITH relationships in Neo4j, WRITE_BATCH_SIZE per query.
         
         Args:
             session: Neo4j session
-            source: Source word name
-            target: Target word name
-            reason: Reason for confusion ("Look-alike", "Sound-alike", "Semantic")
-            distance: Levenshtein distance (or 0 for semantic)
+            rows: Dicts with source, target, reason ("Look-alike",
+                "Sound-alike", "Semantic") and distance (Levenshtein)
         """
-        # Create bidirectional relationship (words can confuse each other)
         query = """
-        MATCH (source:Word {name: $source})
-        MATCH (target:Word {name: $target})
+        UNWIND $rows AS row
+        MATCH (source:Word {name: row.source})
+        MATCH (target:Word {name: row.target})
         MERGE (source)-[r:CONFUSED_WITH]->(target)
-        SET r.reason = $reason,
-            r.distance = $distance,
+        SET r.reason = row.reason,
+            r.distance = row.distance,
             r.source = 'adversary_builder_v7.1'
         RETURN count(r) as created
         """
         
-        result = session.run(query, source=source, target=target, reason=reason, distance=distance)
-        
-        if result.single()["created"] > 0:
-            self.stats["total"] += 1
+        for start in range(0, len(rows), self.WRITE_BATCH_SIZE):
+            batch = rows[start:start + self.WRITE_BATCH_SIZE]
+            result = session.run(query, rows=batch)
+            self.stats["total"] += result.single()["created"]
     
     def _print_summary(self, dry_run: bool):
         """Print summary statistics."""
@@ -21,8 +21,14 @@ Algorithm:
 4. Stop when confidence threshold reached
 
 V3 Changes:
-- Support VocabularyStore as optional fallback (in-memory JSON)
-- Neo4j still primary for survey (more complex queries)
+- Question generation can run entirely on the in-memory VocabularyStore:
+  rank-indexed target pick with an exclusion set, traps from
+  connections.confused, fillers from nearby ranks - no graph round trips
+  per survey step
+- Neo4j is used when the store is not loaded
+- Trap similarity is checked against the memory-mapped embedding matrix
+  (one batched dot product); embeddings are only fetched from Neo4j when
+  no matrix has been exported
 """
 
 import random
@@ -30,10 +36,10 @@ import math
 import logging
 from typing import Optional, List, Dict, Any, Tuple, Union
 
-# Neo4j connection (primary for survey)
+# Neo4j connection (used when the VocabularyStore is not loaded)
 from src.database.neo4j_connection import Neo4jConnection
 
-# VocabularyStore (optional fallback)
+# VocabularyStore (in-memory question generation)
 try:
     from src.services.vocabulary_store import vocabulary_store, VocabularyStore
     VOCABULARY_STORE_AVAILABLE = True
@@ -41,6 +47,9 @@ except ImportError:
     VOCABULARY_STORE_AVAILABLE = False
     vocabulary_store = None
 
+# In-process embedding matrix (exported by optimize_db.py)
+from src.services.embedding_matrix import get_embedding_matrix
+
 logger = logging.getLogger(__name__)
 
 from src.survey.models import (
@@ -93,13 +102,16 @@ class LexiSurveyEngine:
     # Duplicate prevention
     RECENT_WORDS_WINDOW = 20  # Exclude recent words
     
+    # In-memory generation: senses sampled per rank window before filtering
+    STORE_SAMPLE_SIZE = 12
+    
     def __init__(self, conn: Optional[Neo4jConnection] = None, use_vocabulary_store: bool = False):
         """
         Initialize the V2 engine.
         
         Args:
-            conn: Neo4j connection (primary data source for survey)
-            use_vocabulary_store: If True and Neo4j unavailable, use VocabularyStore
+            conn: Neo4j connection (used when the VocabularyStore is off or not loaded)
+            use_vocabulary_store: Generate questions from the in-memory VocabularyStore
         """
         self.conn = conn
         self.adapter = SchemaAdapter()
@@ -573,46 +585,55 @@ class LexiSurveyEngine:
         """
         Generate a complete question payload for a word near the target rank.
         
-        Uses SchemaAdapter to query Neo4j and creates:
+        Served from the in-memory VocabularyStore when enabled (no graph
+        round trips), otherwise from Neo4j. Creates:
         - 1-5 target definitions (correct answers)
         - 0-3 trap definitions (from confused words)
         - Filler definitions
         - "Unknown" option
         """
-        with self.conn.get_session() as session:
-            # Get recently used words to avoid repetition
-            recently_used_words = [
-                h.get("word", "").lower() 
-                for h in state.history[-self.RECENT_WORDS_WINDOW:]
-                if h.get("word")
-            ]
-            
-            # Fetch target word at this rank
-            word, actual_rank, target_embedding = self._fetch_target_word(
-                session, rank, recently_used_words
+        # Get recently used words to avoid repetition
+        recently_used_words = [
+            h.get("word", "").lower()
+            for h in state.history[-self.RECENT_WORDS_WINDOW:]
+            if h.get("word")
+        ]
+
+        if self._store_ready():
+            word, actual_rank, target_sense_id = self._pick_target_from_store(
+                rank, recently_used_words
             )
-            
-            # Generate options
-            options, option_metadata = self._generate_options(
-                session, word, actual_rank, target_embedding
+            options, option_metadata = self._generate_options_from_store(
+                word, actual_rank, target_sense_id
             )
-            
-            # Create question payload
-            question_id = f"q_{actual_rank}_{random.randint(10000, 99999)}"
-            
-            payload = QuestionPayload(
-                question_id=question_id,
-                word=word,
-                rank=actual_rank,
-                options=options,
-                time_limit=12
-            )
-            
-            # Store metadata for later
-            payload._option_metadata = option_metadata
-            state.current_rank = actual_rank
-            
-            return payload
+        else:
+            with self.conn.get_session() as session:
+                # Fetch target word at this rank
+                word, actual_rank, target_embedding = self._fetch_target_word(
+                    session, rank, recently_used_words
+                )
+
+                # Generate options
+                options, option_metadata = self._generate_options(
+                    session, word, actual_rank, target_embedding
+                )
+
+        # Create question payload
+        question_id = f"q_{actual_rank}_{random.randint(10000, 99999)}"
+
+        payload = QuestionPayload(
+            question_id=question_id,
+            word=word,
+            rank=actual_rank,
+            options=options,
+            time_limit=12
+        )
+
+        # Store metadata for later
+        payload._option_metadata = option_metadata
+        state.current_rank = actual_rank
+
+        return payload
     
     def _fetch_target_word(
         self, 
@@ -631,6 +652,8 @@ class LexiSurveyEngine:
         """
         search_radius = 50
         max_attempts = 3
+        # Embeddings only cross the wire when there is no local matrix
+        with_embedding = get_embedding_matrix() is None
         word = None
         actual_rank = rank
         embedding = None
@@ -647,12 +670,15 @@ class LexiSurveyEngine:
                     WITH b, rand() as r 
                     ORDER BY r 
                     LIMIT 1
-                    RETURN b.name as word, b.embedding as embedding, b.frequency_rank as rank
+                    RETURN b.name as word,
+                           CASE WHEN $with_embedding THEN b.embedding END as embedding,
+                           b.frequency_rank as rank
                 """
                 params = {
                     "min_r": max(51, rank - search_radius),
                     "max_r": min(8000, rank + search_radius),
-                    "excluded_words": [w.lower() for w in excluded_words if w]
+                    "excluded_words": [w.lower() for w in excluded_words if w],
+                    "with_embedding": with_embedding
                 }
             else:
                 query = """
@@ -664,11 +690,14 @@ class LexiSurveyEngine:
                     WITH b, rand() as r 
                     ORDER BY r 
                     LIMIT 1
-                    RETURN b.name as word, b.embedding as embedding, b.frequency_rank as rank
+                    RETURN b.name as word,
+                           CASE WHEN $with_embedding THEN b.embedding END as embedding,
+                           b.frequency_rank as rank
                 """
                 params = {
                     "min_r": max(51, rank - search_radius),
-                    "max_r": min(8000, rank + search_radius)
+                    "max_r": min(8000, rank + search_radius),
+                    "with_embedding": with_embedding
                 }
             
             result = session.run(query, **params)
@@ -707,10 +736,16 @@ class LexiSurveyEngine:
         - Fillers (random definitions from nearby ranks)
         - 1 "Unknown" option
         """
-        options = []
-        target_metadata = {}
+        target_definitions = self._fetch_target_definitions(session, target_word)
+        trap_definitions = self._fetch_traps(session, target_word, target_embedding)
+        filler_definitions = self._fetch_fillers(session, target_word, rank)
         
-        # Step 1: Fetch target definitions
+        return self._assemble_options(
+            target_word, target_definitions, trap_definitions, filler_definitions
+        )
+    
+    def _fetch_target_definitions(self, session, target_word: str) -> List[Dict]:
+        """Fetch the target word's definitions, primary sense first."""
         target_query = """
             MATCH (t:Word {name: $target_word})-[:HAS_SENSE]->(s:Sense)
             WHERE s.definition_zh IS NOT NULL
@@ -741,6 +776,24 @@ class LexiSurveyEngine:
                     "weight": record.get("weight", 1.0)
                 })
         
+        return target_definitions
+    
+    def _assemble_options(
+        self,
+        target_word: str,
+        target_definitions: List[Dict],
+        trap_definitions: List[Dict],
+        filler_definitions: List[Dict]
+    ) -> Tuple[List[QuestionOption], Dict]:
+        """
+        Build the 6 shuffled options (unknown last) and their metadata.
+        
+        Definitions come from Neo4j or the VocabularyStore; both use the
+        same dict shape (text, sense_id, definition_en, example_zh, ...).
+        """
+        options = []
+        target_metadata = {}
+        
         # Deduplicate target definitions by text before adding
         seen_texts = set()
         unique_targets = []
@@ -758,7 +811,6 @@ class LexiSurveyEngine:
         
         for i in range(num_targets):
             target_def = unique_targets[i]
-            target_def = target_definitions[i]
             option_id = f"target_{target_word}_{i}"
             options.append(QuestionOption(
                 id=option_id,
@@ -779,9 +831,7 @@ class LexiSurveyEngine:
                 metadata["example_en"] = target_def["example_en"]
             target_metadata[option_id] = metadata
         
-        # Step 2: Fetch trap definitions
-        trap_definitions = self._fetch_traps(session, target_word, target_embedding)
-        
+        # Add trap options
         num_traps = min(len(trap_definitions), 2)  # Max 2 traps
         for i in range(num_traps):
             if len(options) >= 5:
@@ -808,9 +858,6 @@ class LexiSurveyEngine:
                 metadata["word_name"] = trap_def["word_name"]
             target_metadata[option_id] = metadata
         
-        # Step 3: Fetch filler definitions
-        filler_definitions = self._fetch_fillers(session, target_word, rank)
-        
         # Add enough fillers to reach 5 options (before unknown)
         filler_idx = 0
         while len(options) < 5 and filler_idx < len(filler_definitions):
@@ -847,7 +894,7 @@ class LexiSurveyEngine:
                 is_correct=False
             ))
         
-        # Step 4: Add "Unknown" option
+        # Add "Unknown" option
         options.append(QuestionOption(
             id="unknown_option",
             text="我不知道",
@@ -880,31 +927,65 @@ class LexiSurveyEngine:
                    ts.definition_en as definition_en,
                    ts.example_zh as example_zh,
                    ts.example_en as example_en,
-                   trap.embedding as embedding
+                   CASE WHEN $with_embedding THEN trap.embedding END as embedding
             ORDER BY ts.usage_ratio DESC
             LIMIT 5
         """
         
-        results = session.run(trap_query, target_word=target_word)
+        results = session.run(
+            trap_query,
+            target_word=target_word,
+            with_embedding=get_embedding_matrix() is None
+        )
         traps = []
+        trap_embeddings = []
         
         for record in results:
             text = record.get("text")
             if text:
-                # Validate trap using embedding similarity if available
-                trap_embedding = record.get("embedding")
-                if self._validate_trap(target_embedding, trap_embedding):
-                    traps.append({
-                        "text": text,
-                        "word_id": record.get("word_id", "unknown"),
-                        "word_name": record.get("word_name"),
-                        "sense_id": record.get("sense_id"),
-                        "definition_en": record.get("definition_en"),
-                        "example_zh": record.get("example_zh"),
-                        "example_en": record.get("example_en")
-                    })
-        
-        return traps[:3]  # Max 3 traps
+                traps.append({
+                    "text": text,
+                    "word_id": record.get("word_id", "unknown"),
+                    "word_name": record.get("word_name"),
+                    "sense_id": record.get("sense_id"),
+                    "definition_en": record.get("definition_en"),
+                    "example_zh": record.get("example_zh"),
+                    "example_en": record.get("example_en")
+                })
+                trap_embeddings.append(record.get("embedding"))
+        
+        return self._filter_traps(target_word, traps, target_embedding, trap_embeddings)[:3]  # Max 3 traps
+    
+    def _filter_traps(
+        self,
+        target_word: str,
+        traps: List[Dict],
+        target_embedding: Optional[List[float]] = None,
+        trap_embeddings: Optional[List[Optional[List[float]]]] = None
+    ) -> List[Dict]:
+        """
+        Drop traps too similar to the target (similarity >= SIMILARITY_THRESHOLD).
+        
+        Uses one batched dot product against the local embedding matrix when
+        the target word is in it; otherwise falls back to the per-trap
+        embeddings returned by Neo4j. Traps without an embedding are kept.
+        """
+        if not traps:
+            return traps
+        
+        matrix = get_embedding_matrix()
+        if matrix is not None and matrix.has(target_word):
+            similarities = matrix.similarities(
+                target_word, [t.get("word_name") or "" for t in traps]
+            )
+            # NaN (no embedding) compares False, so the trap is kept
+            return [t for t, sim in zip(traps, similarities) if not sim >= self.SIMILARITY_THRESHOLD]
+        
+        trap_embeddings = trap_embeddings or [None] * len(traps)
+        return [
+            t for t, emb in zip(traps, trap_embeddings)
+            if self._validate_trap(target_embedding, emb)
+        ]
     
     def _validate_trap(
         self, 
@@ -985,6 +1066,148 @@ class LexiSurveyEngine:
         
         return fillers
     
+    # =========================================================================
+    # IN-MEMORY GENERATION (VocabularyStore)
+    # =========================================================================
+    
+    def _store_ready(self) -> bool:
+        """True if questions can be generated from the loaded VocabularyStore."""
+        return (
+            self.use_vocabulary_store
+            and (vocabulary_store.is_loaded or not self.conn)
+        )
+    
+    def _is_usable_sense(self, sense: Dict[str, Any], excluded_words) -> bool:
+        """Same filters as the Cypher queries: rank > 50, length >= 3, has zh definition."""
+        word = (sense.get("word") or "").lower()
+        return (
+            len(word) >= 3
+            and (sense.get("frequency_rank") or 0) > 50
+            and bool(sense.get("definition_zh"))
+            and word not in excluded_words
+        )
+    
+    def _sense_definition(self, sense: Dict[str, Any], sense_id: Optional[str] = None) -> Dict:
+        """Convert a VocabularyStore sense into an option definition dict."""
+        sense_id = sense_id or sense.get("id")
+        return {
+            "text": sense.get("definition_zh"),
+            "word_id": sense_id,
+            "word_name": sense.get("word"),
+            "sense_id": sense_id,
+            "definition_en": sense.get("definition_en"),
+            "example_zh": sense.get("example_zh_translation", sense.get("example_zh")),
+            "example_en": sense.get("example_en"),
+        }
+    
+    def _pick_target_from_store(
+        self,
+        rank: int,
+        excluded_words: List[str]
+    ) -> Tuple[str, int, Optional[str]]:
+        """
+        Pick a target sense near the rank from the rank index.
+        
+        Mirrors _fetch_target_word: ±50 ranks, doubling the radius up to
+        three times, skipping recently used words.
+        
+        Returns:
+            (word, actual_rank, sense_id)
+        """
+        excluded = {w.lower() for w in excluded_words if w}
+        search_radius = 50
+        
+        for attempt in range(3):
+            candidates = vocabulary_store.get_senses_by_rank_range(
+                max(51, rank - search_radius),
+                min(8000, rank + search_radius),
+                exclude_words=excluded,
+                limit=self.STORE_SAMPLE_SIZE
+            )
+            for sense in candidates:
+                if self._is_usable_sense(sense, excluded):
+                    return sense["word"], int(sense["frequency_rank"]), sense.get("id")
+            search_radius *= 2
+        
+        logger.warning(f"No word found for rank {rank}, using fallback")
+        return "example", rank, None
+    
+    def _generate_options_from_store(
+        self,
+        target_word: str,
+        rank: int,
+        target_sense_id: Optional[str]
+    ) -> Tuple[List[QuestionOption], Dict]:
+        """Generate the same 6 options as _generate_options from the VocabularyStore."""
+        target_senses = self._store_target_senses(target_word, target_sense_id)
+        target_definitions = [
+            self._sense_definition(sense, sense_id)
+            for sense_id, sense in target_senses
+            if sense.get("definition_zh")
+        ]
+        trap_definitions = self._store_traps(target_word, [sid for sid, _ in target_senses])
+        filler_definitions = self._store_fillers(target_word, rank)
+        
+        return self._assemble_options(
+            target_word, target_definitions, trap_definitions, filler_definitions
+        )
+    
+    def _store_target_senses(
+        self,
+        target_word: str,
+        target_sense_id: Optional[str]
+    ) -> List[Tuple[str, Dict]]:
+        """
+        Senses of the target word, primary sense first (max 5).
+        
+        The primary sense is the one named after the word (e.g. bank.n.01),
+        matching the sense_match_bonus ordering of the Cypher query.
+        """
+        sense_ids = list(vocabulary_store.get_sense_ids_for_word(target_word.lower()))
+        if target_sense_id and target_sense_id not in sense_ids:
+            sense_ids.insert(0, target_sense_id)
+        
+        prefix = target_word.lower() + "."
+        sense_ids.sort(key=lambda sid: not sid.startswith(prefix))
+        
+        senses = []
+        for sense_id in sense_ids[:5]:
+            sense = vocabulary_store.get_sense(sense_id)
+            if sense:
+                senses.append((sense_id, sense))
+        return senses
+    
+    def _store_traps(self, target_word: str, target_sense_ids: List[str]) -> List[Dict]:
+        """Trap definitions from connections.confused, validated against the embedding matrix."""
+        traps = []
+        seen = set()
+        for sense_id in target_sense_ids:
+            for confused in vocabulary_store.get_confused_senses(sense_id):
+                trap_id = confused["sense_id"]
+                if trap_id in seen or (confused.get("word") or "").lower() == target_word.lower():
+                    continue
+                seen.add(trap_id)
+                trap_sense = vocabulary_store.get_sense(trap_id)
+                if trap_sense and trap_sense.get("definition_zh"):
+                    traps.append(self._sense_definition(trap_sense, trap_id))
+        return self._filter_traps(target_word, traps)[:3]  # Max 3 traps
+    
+    def _store_fillers(self, target_word: str, rank: int) -> List[Dict]:
+        """Filler definitions sampled from ranks within ±200 of the target."""
+        excluded = {target_word.lower()}
+        senses = vocabulary_store.get_senses_by_rank_range(
+            max(51, rank - 200),
+            min(8000, rank + 200),
+            exclude_words=excluded,
+            limit=self.STORE_SAMPLE_SIZE
+        )
+        fillers = [
+            self._sense_definition(sense)
+            for sense in senses
+            if self._is_usable_sense(sense, excluded)
+        ]
+        return fillers[:6]
+    
     # =========================================================================
     # FINAL METRICS CALCULATION
     # =========================================================================
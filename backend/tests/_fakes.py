@@ -0,0 +1,28 @@
+"""
+Shared database fakes for unit tests.
+
+Each test module keeps its own session router (the SQL it expects differs per
+service); FakeResult is the one thing they share, standing in for the result
+of Session.execute().
+"""
+
+_UNSET = object()
+
+
+class FakeResult:
+    """Canned rows; scalar() is the first column of the first row unless given."""
+
+    def __init__(self, rows=(), scalar=_UNSET):
+        self._rows = list(rows)
+        self._scalar = scalar
+
+    def fetchall(self):
+        return self._rows
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def scalar(self):
+        if self._scalar is not _UNSET:
+            return self._scalar
+        return self._rows[0][0] if self._rows else None
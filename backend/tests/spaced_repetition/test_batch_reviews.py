@@ -0,0 +1,272 @@
+"""
+Conformance tests for the columnar batch API (process_reviews).
+
+Random cards are reviewed once through the scalar path and once as a batch,
+and every column must match bit for bit:
+- SM-2+: against SM2PlusService.process_review / predict_retention
+- FSRS: against FSRSService.process_review / predict_retention, which
+  drive fsrs.Scheduler (fsrs==6.3.2) at day granularity
+"""
+
+import random
+from datetime import date, timedelta
+from importlib import metadata
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from src.spaced_repetition import FSRSService, SM2PlusService
+from src.spaced_repetition.algorithm_interface import (
+    CardState,
+    PerformanceRating,
+    ReviewBatch,
+)
+
+REVIEW_DATE = date(2025, 3, 1)
+MASTERY_LEVELS = ['learning', 'familiar', 'known', 'mastered', 'permanent', 'leech']
+
+
+def assert_bitwise_equal(batch_values, scalar_values):
+    """Equal float64 bit patterns (NaN only where the scalar value is missing)."""
+    batch_values = np.asarray(batch_values, dtype=np.float64)
+    scalar_values = np.array(
+        [np.nan if v is None else v for v in scalar_values], dtype=np.float64
+    )
+    assert np.array_equal(np.isnan(batch_values), np.isnan(scalar_values))
+    finite = ~np.isnan(scalar_values)
+    mismatched = np.flatnonzero(
+        batch_values[finite].view(np.uint64) != scalar_values[finite].view(np.uint64)
+    )
+    assert not len(mismatched), (
+        f"{len(mismatched)} rows differ, e.g. {batch_values[finite][mismatched[0]]!r} "
+        f"!= {scalar_values[finite][mismatched[0]]!r}"
+    )
+
+
+def _random_sm2_state(rng: random.Random, user_id) -> CardState:
+    total_reviews = rng.randint(0, 40)
+    reviewed = total_reviews > 0 and rng.random() < 0.9
+    return CardState(
+        user_id=user_id,
+        learning_progress_id=rng.randint(1, 10**6),
+        learning_point_id='word.n.01',
+        current_interval=rng.randint(0, 400),
+        last_review_date=REVIEW_DATE - timedelta(days=rng.randint(-2, 400)) if reviewed else None,
+        total_reviews=total_reviews,
+        total_correct=rng.randint(0, total_reviews),
+        mastery_level=rng.choice(MASTERY_LEVELS),
+        is_leech=rng.random() < 0.1,
+        ease_factor=rng.uniform(1.3, 3.0),
+        consecutive_correct=rng.randint(0, 12),
+        avg_response_time_ms=rng.randint(300, 9000) if rng.random() < 0.7 else None,
+    )
+
+
+class TestSM2Conformance:
+    """SM2PlusService.process_reviews == process_review, row by row."""
+
+    def setup_method(self):
+        self.service = SM2PlusService()
+        rng = random.Random(7)
+        user_id = uuid4()
+        self.states = [_random_sm2_state(rng, user_id) for _ in range(3000)]
+        self.ratings = [rng.randint(0, 4) for _ in self.states]
+        self.response_times = [
+            rng.randint(200, 15000) if rng.random() < 0.8 else None for _ in self.states
+        ]
+
+    def test_bitwise_equal_to_scalar_path(self):
+        batch = ReviewBatch.from_states(self.states, self.ratings, REVIEW_DATE, self.response_times)
+        result = self.service.process_reviews(batch)
+        scalar = [
+            self.service.process_review(state, PerformanceRating(rating), rt, REVIEW_DATE)
+            for state, rating, rt in zip(self.states, self.ratings, self.response_times)
+        ]
+
+        assert result.interval_days.tolist() == [r.next_interval_days for r in scalar]
+        assert result.was_correct.tolist() == [r.was_correct for r in scalar]
+        assert result.consecutive_correct.tolist() == [r.new_state.consecutive_correct for r in scalar]
+        assert result.total_reviews.tolist() == [r.new_state.total_reviews for r in scalar]
+        assert result.total_correct.tolist() == [r.new_state.total_correct for r in scalar]
+        assert result.is_leech.tolist() == [r.new_state.is_leech for r in scalar]
+        assert result.became_leech.tolist() == [r.became_leech for r in scalar]
+        assert result.mastery_level.tolist() == [r.new_state.mastery_level for r in scalar]
+        assert result.mastery_changed.tolist() == [r.mastery_changed for r in scalar]
+        assert_bitwise_equal(result.ease_factor, [r.new_state.ease_factor for r in scalar])
+        assert_bitwise_equal(result.difficulty, [r.new_state.difficulty for r in scalar])
+        assert_bitwise_equal(result.avg_response_time_ms, [r.new_state.avg_response_time_ms for r in scalar])
+        assert_bitwise_equal(
+            result.retrievability,
+            [self.service.predict_retention(state, REVIEW_DATE) for state in self.states],
+        )
+
+    def test_replay_matches_sequential_reviews(self):
+        """Feeding results back as the next batch replays a history."""
+        states = self.states[:200]
+        rng = random.Random(11)
+        batch = ReviewBatch.from_states(states, self.ratings[:200], REVIEW_DATE)
+        for step in range(5):
+            ratings = [rng.randint(0, 4) for _ in states]
+            result = self.service.process_reviews(
+                ReviewBatch(
+                    ratings=ratings,
+                    ease_factor=batch.ease_factor,
+                    current_interval=batch.current_interval,
+                    consecutive_correct=batch.consecutive_correct,
+                    total_reviews=batch.total_reviews,
+                    total_correct=batch.total_correct,
+                )
+            )
+            states = [
+                self.service.process_review(state, PerformanceRating(rating), review_date=REVIEW_DATE).new_state
+                for state, rating in zip(states, ratings)
+            ]
+            batch = ReviewBatch(
+                ratings=ratings,
+                ease_factor=result.ease_factor,
+                current_interval=result.interval_days,
+                consecutive_correct=result.consecutive_correct,
+                total_reviews=result.total_reviews,
+                total_correct=result.total_correct,
+            )
+            assert result.interval_days.tolist() == [s.current_interval for s in states]
+            assert_bitwise_equal(result.ease_factor, [s.ease_factor for s in states])
+
+    def test_rejects_out_of_range_ratings(self):
+        with pytest.raises(ValueError):
+            ReviewBatch(ratings=[2, 5])
+
+
+def _random_fsrs_state(rng: random.Random, user_id) -> CardState:
+    kind = rng.random()
+    total_reviews = rng.randint(1, 40)
+    state = CardState(
+        user_id=user_id,
+        learning_progress_id=rng.randint(1, 10**6),
+        learning_point_id='word.n.01',
+        algorithm_type='fsrs',
+        total_reviews=total_reviews,
+        total_correct=rng.randint(0, total_reviews),
+        mastery_level=rng.choice(MASTERY_LEVELS),
+        is_leech=rng.random() < 0.1,
+        consecutive_correct=rng.randint(0, 12),
+        avg_response_time_ms=rng.randint(300, 9000) if rng.random() < 0.7 else None,
+    )
+    if kind < 0.1:
+        return state  # New card
+    elapsed = rng.choice([-1, 0, 0, 1, 2, 3]) if kind < 0.3 else rng.randint(1, 800)
+    state.stability = rng.uniform(0.01, 900)
+    state.difficulty = rng.uniform(1.0, 10.0)
+    state.last_review_date = REVIEW_DATE - timedelta(days=elapsed)
+    state.fsrs_state = {'state': rng.choice([1, 2, 2, 2, 3])}
+    return state
+
+
+class TestFSRSConformance:
+    """FSRSService.process_reviews == process_review, row by row."""
+
+    def setup_method(self):
+        self.service = FSRSService()
+        rng = random.Random(3)
+        user_id = uuid4()
+        self.states = [_random_fsrs_state(rng, user_id) for _ in range(3000)]
+        self.ratings = [rng.randint(0, 4) for _ in self.states]
+        self.response_times = [
+            rng.randint(200, 15000) if rng.random() < 0.8 else None for _ in self.states
+        ]
+
+    def test_bitwise_equal_to_scalar_path(self):
+        batch = ReviewBatch.from_states(self.states, self.ratings, REVIEW_DATE, self.response_times)
+        result = self.service.process_reviews(batch)
+        scalar = [
+            self.service.process_review(state, PerformanceRating(rating), rt, REVIEW_DATE)
+            for state, rating, rt in zip(self.states, self.ratings, self.response_times)
+        ]
+
+        assert result.interval_days.tolist() == [r.next_interval_days for r in scalar]
+        assert result.was_correct.tolist() == [r.was_correct for r in scalar]
+        assert result.consecutive_correct.tolist() == [r.new_state.consecutive_correct for r in scalar]
+        assert result.total_reviews.tolist() == [r.new_state.total_reviews for r in scalar]
+        assert result.total_correct.tolist() == [r.new_state.total_correct for r in scalar]
+        assert result.is_leech.tolist() == [r.new_state.is_leech for r in scalar]
+        assert result.became_leech.tolist() == [r.became_leech for r in scalar]
+        assert result.mastery_level.tolist() == [r.new_state.mastery_level for r in scalar]
+        assert result.mastery_changed.tolist() == [r.mastery_changed for r in scalar]
+        assert_bitwise_equal(result.stability, [r.new_state.stability for r in scalar])
+        assert_bitwise_equal(result.difficulty, [r.new_state.difficulty for r in scalar])
+        assert_bitwise_equal(result.avg_response_time_ms, [r.new_state.avg_response_time_ms for r in scalar])
+        assert_bitwise_equal(
+            result.retrievability,
+            [self.service.predict_retention(state, REVIEW_DATE) for state in self.states],
+        )
+
+    def test_scheduled_state_round_trips(self):
+        """A reviewed card is restored from its saved state for the next review."""
+        state = self.states[-1]
+        first = self.service.process_review(state, PerformanceRating.GOOD, review_date=REVIEW_DATE)
+        assert first.new_state.fsrs_state['state'] == 2  # State.Review (no learning steps)
+        assert first.next_review_date == REVIEW_DATE + timedelta(days=first.next_interval_days)
+
+        later = REVIEW_DATE + timedelta(days=first.next_interval_days)
+        second = self.service.process_review(first.new_state, PerformanceRating.GOOD, review_date=later)
+        assert second.new_state.stability > first.new_state.stability
+
+    def test_rejects_pre_fsrs6_models(self, monkeypatch):
+        from src.spaced_repetition import fsrs_service
+
+        class _Fsrs5Scheduler:
+            def __init__(self, **options):
+                self.parameters = (0.4,) * 19
+
+        monkeypatch.setattr(fsrs_service, 'Scheduler', _Fsrs5Scheduler)
+        with pytest.raises(RuntimeError, match='FSRS-6'):
+            FSRSService()
+
+    def test_formulas_copied_from_pinned_release(self):
+        """process_reviews copies fsrs 6.3.2; an upgrade must revisit it."""
+        assert FSRSService.FSRS_VERSION == '6.3.2'
+        assert metadata.version('fsrs') == FSRSService.FSRS_VERSION
+
+    def test_batch_rejects_other_fsrs_versions(self, monkeypatch):
+        """Only process_reviews depends on the pinned release."""
+        from src.spaced_repetition import fsrs_service
+
+        monkeypatch.setattr(fsrs_service.metadata, 'version', lambda name: '6.3.3')
+        service = FSRSService()
+        result = service.process_review(self.states[-1], PerformanceRating.GOOD, review_date=REVIEW_DATE)
+        assert result.next_interval_days >= 1
+
+        batch = ReviewBatch.from_states(self.states[:3], self.ratings[:3], REVIEW_DATE)
+        with pytest.raises(RuntimeError, match='fsrs==6.3.2'):
+            service.process_reviews(batch)
+
+    def test_same_day_hard_growth_is_clamped(self):
+        """Same-day Hard on a stable card: growth below 1 is clamped (fsrs 6.3.2)."""
+        state = CardState(
+            user_id=uuid4(),
+            learning_progress_id=1,
+            learning_point_id='word.n.01',
+            algorithm_type='fsrs',
+            last_review_date=REVIEW_DATE,
+            stability=50.0,
+            difficulty=5.0,
+            fsrs_state={'state': 2},
+        )
+        w = self.service._fsrs.parameters
+        assert np.e ** (w[17] * (2 - 3 + w[18])) * 50.0 ** -w[19] < 1
+
+        batch = ReviewBatch.from_states([state], [PerformanceRating.HARD], REVIEW_DATE)
+        assert batch.elapsed_days.tolist() == [0]
+        result = self.service.process_reviews(batch)
+        scalar = self.service.process_review(state, PerformanceRating.HARD, review_date=REVIEW_DATE)
+
+        assert scalar.new_state.stability == 50.0
+        assert_bitwise_equal(result.stability, [scalar.new_state.stability])
+        assert result.interval_days.tolist() == [scalar.next_interval_days]
+
+    def test_mastery_follows_stability(self):
+        batch = ReviewBatch(ratings=[2, 2, 0], stability=[1.0, 60.0, 0.2], difficulty=[5.0, 5.0, 9.0], elapsed_days=[1, 40, 3])
+        result = self.service.process_reviews(batch)
+        assert result.mastery_level[1] in ('known', 'mastered')
+        assert result.is_leech[2] == (result.stability[2] < 0.5)
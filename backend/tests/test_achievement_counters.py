@@ -0,0 +1,141 @@
+"""
+Tests for incremental achievement evaluation (AchievementService.record_event).
+
+Counter storage and unlocking are replaced with in-memory fakes so the
+threshold-crossing logic can be checked without a database.
+"""
+
+import uuid
+
+import pytest
+
+from src.services import achievements
+from src.services.achievements import AchievementService
+from tests._fakes import FakeResult
+
+
+def _achievement(code, requirement_type, requirement_value):
+    # Same column order as AchievementService._get_definitions
+    return (uuid.uuid4(), code, code, None, None, None, None, 'test',
+            requirement_type, requirement_value, 0, 0, 0, 'bronze')
+
+
+class _FakeDB:
+    def commit(self):
+        pass
+
+
+@pytest.fixture
+def service(monkeypatch):
+    rows = [
+        _achievement('learn_1', 'blocks_learned', 1),
+        _achievement('learn_10', 'blocks_learned', 10),
+        _achievement('learn_11', 'blocks_learned', 11),
+        _achievement('master_1', 'mastered_count', 1),
+        _achievement('streak_3', 'streak_days', 3),
+        _achievement('streak_7', 'streak_days', 7),
+        _achievement('vocab_100', 'vocabulary_size', 100),
+    ]
+    monkeypatch.setitem(achievements._definitions_cache, 'loaded_at', 0.0)
+
+    svc = AchievementService(_FakeDB())
+    svc.counters = {}
+    svc.unlocked = set()
+    svc.full_checks = 0
+    svc.vocabulary_size = 0
+
+    def fake_select(statement, params=None):
+        if 'FROM user_achievements' in str(statement):
+            return FakeResult([(achievement_id,) for achievement_id in svc.unlocked])
+        return FakeResult(rows)
+
+    def write_counters(user_id, values, increment):
+        for counter, value in values.items():
+            svc.counters[counter] = (svc.counters.get(counter, 0) + value) if increment else value
+        return {counter: svc.counters[counter] for counter in values}
+
+    def unlock(user_id, achievement_id, achievement):
+        if achievement_id in svc.unlocked:
+            return False
+        svc.unlocked.add(achievement_id)
+        return True
+
+    def full_check(user_id):
+        svc.full_checks += 1
+        svc.counters.update({t: 0 for t in achievements.COUNTER_TYPES})
+        return []
+
+    svc.db.execute = fake_select
+    monkeypatch.setattr(svc, 'get_counters', lambda user_id: dict(svc.counters))
+    monkeypatch.setattr(svc, '_write_counters', write_counters)
+    monkeypatch.setattr(svc, '_unlock_achievement', unlock)
+    monkeypatch.setattr(svc, 'check_achievements', full_check)
+    monkeypatch.setattr(svc.vocab_service, 'calculate_vocabulary_size', lambda user_id: svc.vocabulary_size)
+    return svc
+
+
+def _codes(unlocked):
+    return sorted(a['code'] for a in unlocked)
+
+
+class TestRecordEvent:
+    """Only achievements whose threshold was crossed are unlocked."""
+
+    def test_unseeded_user_gets_full_recompute(self, service):
+        service.record_event('u1', increments={'blocks_learned': 1})
+        assert service.full_checks == 1
+
+    def test_crossing_single_threshold(self, service):
+        service.counters = {'blocks_learned': 9}
+        assert _codes(service.record_event('u1', increments={'blocks_learned': 1})) == ['learn_10']
+        assert service.counters['blocks_learned'] == 10
+
+    def test_delta_crossing_several_thresholds(self, service):
+        service.counters = {'blocks_learned': 0}
+        unlocked = service.record_event('u1', increments={'blocks_learned': 11})
+        assert _codes(unlocked) == ['learn_1', 'learn_10', 'learn_11']
+
+    def test_no_crossing_no_unlock(self, service):
+        service.counters = {'blocks_learned': 12, 'streak_days': 8}
+        assert service.record_event('u1', increments={'blocks_learned': 1}, values={'streak_days': 9}) == []
+
+    def test_absolute_value_and_alias(self, service):
+        service.counters = {'streak_days': 2, 'blocks_mastered': 0}
+        unlocked = service.record_event('u1', increments={'mastered_count': 1}, values={'streak_days': 7})
+        assert _codes(unlocked) == ['master_1', 'streak_3', 'streak_7']
+
+    def test_decrease_does_not_unlock(self, service):
+        service.counters = {'blocks_mastered': 1}
+        assert service.record_event('u1', increments={'blocks_mastered': -1}) == []
+        assert service.counters['blocks_mastered'] == 0
+
+    def test_untracked_types_ignored(self, service):
+        service.counters = {'blocks_learned': 0}
+        assert service.record_event('u1', increments={'vocabulary_size': 100}) == []
+        assert 'vocabulary_size' not in service.counters
+
+
+class TestRecomputedTypes:
+    """Point-in-time requirement types are re-read on each event."""
+
+    def test_vocabulary_size_unlocks_through_record_event(self, service):
+        service.counters = {'blocks_learned': 12}
+        service.vocabulary_size = 100
+        unlocked = service.record_event('u1', increments={'blocks_learned': 1})
+        assert _codes(unlocked) == ['vocab_100']
+        assert service.full_checks == 0
+
+    def test_vocabulary_size_below_threshold(self, service):
+        service.counters = {'blocks_learned': 12}
+        service.vocabulary_size = 99
+        assert service.record_event('u1', increments={'blocks_learned': 1}) == []
+
+    def test_not_read_once_earned(self, service, monkeypatch):
+        service.counters = {'blocks_learned': 12}
+        service.vocabulary_size = 100
+        service.record_event('u1', increments={'blocks_learned': 1})
+
+        def unexpected(user_id):
+            raise AssertionError('vocabulary size re-read after unlock')
+        monkeypatch.setattr(service.vocab_service, 'calculate_vocabulary_size', unexpected)
+        assert service.record_event('u1', increments={'blocks_learned': 1}) == []
@@ -0,0 +1,141 @@
+"""
+Tests for the batched nearest-neighbour index and the AdversaryBuilder
+pipeline that uses it (run against a fake Neo4j session).
+"""
+
+import numpy as np
+import pytest
+
+from src.services import ann_index
+from src.services.ann_index import AnnIndex
+from src.services.embedding_matrix import EmbeddingMatrix
+from src.survey import adversary_builder
+from src.survey.adversary_builder import AdversaryBuilder
+
+
+def _matrix(n=300, dims=24, seed=11):
+    rng = np.random.default_rng(seed)
+    words = {f'w{i}': rng.normal(size=dims) for i in range(n)}
+    return EmbeddingMatrix.from_vectors(words)
+
+
+def _brute_force(matrix, key, k, keys):
+    query = matrix.vector(key)
+    scored = sorted(
+        ((other, float(matrix.vector(other) @ query)) for other in keys if other != key),
+        key=lambda item: -item[1]
+    )
+    return [other for other, _ in scored[:k]]
+
+
+class TestExactBackend:
+    """NumPy fallback returns the exact top-k."""
+
+    def setup_method(self):
+        self.matrix = _matrix()
+        self.keys = [f'w{i}' for i in range(0, 300, 2)]
+        self.index = AnnIndex.build(self.matrix, keys=self.keys + ['missing'], use_hnsw=False)
+
+    def test_subset_and_backend(self):
+        assert len(self.index) == 150
+        assert 'missing' not in self.index
+        assert self.index.backend == 'exact'
+
+    def test_batch_matches_brute_force(self, monkeypatch):
+        monkeypatch.setattr(ann_index, 'QUERY_BLOCK_SIZE', 16)  # Exercise several blocks
+        result = self.index.query_keys(self.keys + ['w1'], k=5)
+        assert 'w1' not in result  # Not indexed
+        for key in self.keys:
+            assert [other for other, _ in result[key]] == _brute_force(self.matrix, key, 5, self.keys)
+            sims = [sim for _, sim in result[key]]
+            assert sims == sorted(sims, reverse=True)
+
+    def test_query_vector_without_exclusion(self):
+        [found] = self.index.query_vectors(self.matrix.vector('w0'), k=1)
+        assert found[0][0] == 'w0'
+        assert found[0][1] == pytest.approx(1.0, abs=1e-5)
+
+    def test_k_larger_than_index(self):
+        small = AnnIndex.build(self.matrix, keys=['w0', 'w2'], use_hnsw=False)
+        assert [w for w, _ in small.query_keys(['w0'], k=10)['w0']] == ['w2']
+
+
+@pytest.mark.skipif(not ann_index.HAS_HNSWLIB, reason="hnswlib not installed")
+class TestHnswBackend:
+    """HNSW agrees with the exact search at small sizes."""
+
+    def test_recall(self):
+        matrix = _matrix()
+        keys = matrix.words
+        exact = AnnIndex.build(matrix, use_hnsw=False).query_keys(keys, k=5)
+        approx = AnnIndex.build(matrix, use_hnsw=True).query_keys(keys, k=5)
+        hits = sum(len({w for w, _ in exact[k]} & {w for w, _ in approx[k]}) for k in keys)
+        assert hits / (5 * len(keys)) > 0.95
+
+
+class _Result:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def single(self):
+        return self.rows[0]
+
+
+class _FakeSession:
+    """Routes Cypher by substring, records writes."""
+
+    def __init__(self, words, related):
+        self.words = words
+        self.related = related
+        self.writes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, **params):
+        if 'UNWIND $rows' in query:
+            self.writes.extend(params['rows'])
+            return _Result([{'created': len(params['rows'])}])
+        if 'RELATED_TO' in query:
+            return _Result([{'source': s, 'targets': t} for s, t in self.related.items()])
+        return _Result([{'word': w, 'rank': r} for w, r in self.words.items()])
+
+
+class _FakeConn:
+    def __init__(self, session):
+        self.session = session
+
+    def get_session(self):
+        return self.session
+
+
+class TestAdversaryBuilderBatch:
+    """All filters run in memory; writes are batched."""
+
+    def test_run(self, monkeypatch):
+        words = {'adopt': 100, 'adapt': 120, 'accept': 130, 'except': 1400, 'embrace': 140}
+        matrix = EmbeddingMatrix.from_vectors({
+            'adopt': [1.0, 0.0],
+            'embrace': [0.5, 0.8],   # cos ~0.53: semantic neighbour
+            'adapt': [1.0, 0.05],    # ~1.0: too similar, not a semantic trap
+        })
+        monkeypatch.setattr(adversary_builder, 'get_embedding_matrix', lambda: matrix)
+        monkeypatch.setattr(adversary_builder, 'PHONETIC_AVAILABLE', False)
+        session = _FakeSession(words, related={'accept': ['adopt']})
+
+        builder = AdversaryBuilder(_FakeConn(session), max_rank=4000)
+        builder.WRITE_BATCH_SIZE = 2
+        builder.run()
+
+        pairs = {(w['source'], w['target']): w['reason'] for w in session.writes}
+        assert pairs[('adopt', 'adapt')] == 'Look-alike'
+        assert pairs[('adopt', 'embrace')] == 'Semantic'
+        assert pairs[('accept', 'adopt')] == 'Semantic'
+        assert ('accept', 'except') not in pairs  # Outside the ±500 rank window
+        assert builder.stats['total'] == len(session.writes)
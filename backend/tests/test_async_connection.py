@@ -0,0 +1,137 @@
+"""
+Tests for the async database layer and the sync router that uses it.
+
+URL translation is pure; batch_sync runs against a fake AsyncSession, so
+neither asyncpg nor a database is needed.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+from src.api import sync as sync_api
+from src.api.sync import BatchSyncRequest, SyncAction, batch_sync
+from src.database import async_connection
+from src.database.async_connection import to_async_url
+from tests._fakes import FakeResult
+
+
+class TestToAsyncUrl:
+    """libpq URL -> asyncpg URL + connect args."""
+
+    def test_scheme_and_libpq_params(self):
+        url, args = to_async_url(
+            "postgresql://postgres:pw@db.example.co:6543/postgres?sslmode=require&connect_timeout=10"
+        )
+        assert url == "postgresql+asyncpg://postgres:pw@db.example.co:6543/postgres"
+        assert args['ssl'] == 'require'
+        assert args['timeout'] == 10
+
+    def test_driver_suffix_and_defaults(self):
+        url, args = to_async_url("postgres+psycopg2://u@localhost/db?options=-csearch_path%3Dpublic")
+        assert url == "postgresql+asyncpg://u@localhost/db?options=-csearch_path%3Dpublic"
+        assert args['ssl'] == 'prefer'
+
+    def test_pooler_safe_statements(self):
+        _, args = to_async_url("postgresql://u@localhost/db")
+        assert args['statement_cache_size'] == 0
+        assert args['prepared_statement_cache_size'] == 0
+        assert args['prepared_statement_name_func']() != args['prepared_statement_name_func']()
+
+    def test_missing_driver(self, monkeypatch):
+        monkeypatch.setattr(async_connection, 'HAS_ASYNC_DB', False)
+        with pytest.raises(RuntimeError):
+            async_connection.get_async_engine()
+
+
+class _FakeAsyncSession:
+    """Records awaited statements and run_sync calls."""
+
+    def __init__(self, existing=False):
+        self.existing = existing
+        self.statements = []
+        self.synced = []
+        self.committed = False
+
+    async def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+        return FakeResult([(1,)] if self.existing else [])
+
+    async def run_sync(self, fn, *args):
+        self.synced.append((fn, args))
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+
+class TestBatchSync:
+    """Actions are applied through the async session."""
+
+    def _request(self, *actions):
+        return BatchSyncRequest(actions=[
+            SyncAction(type=kind, sense_id='bank.n.01', payload=payload, timestamp=0)
+            for kind, payload in actions
+        ])
+
+    def test_mixed_actions(self):
+        db = _FakeAsyncSession()
+        user_id = uuid.uuid4()
+        response = asyncio.run(batch_sync(self._request(
+            ('START_FORGING', None),
+            ('UPDATE_PROGRESS', {'status': 'learning'}),
+            ('COMPLETE_VERIFICATION', None),
+            ('UNKNOWN', None),
+        ), user_id=user_id, db=db))
+        assert response.synced == 2
+        assert response.failed == 2
+        assert db.synced == [
+            (sync_api._start_forging, (user_id, 'bank.n.01')),
+            (sync_api._record_activity, (user_id,)),
+            (sync_api._check_achievements, (user_id, 1, 0, None)),
+        ]
+        assert db.committed
+
+    def test_existing_progress_is_not_recreated(self):
+        db = _FakeAsyncSession(existing=True)
+        response = asyncio.run(batch_sync(
+            self._request(('START_FORGING', None)), user_id=uuid.uuid4(), db=db
+        ))
+        assert response.synced == 1
+        assert db.synced == []
+
+    def test_completed_verification_checks_achievements(self):
+        db = _FakeAsyncSession()
+        user_id = uuid.uuid4()
+        response = asyncio.run(batch_sync(self._request(
+            ('COMPLETE_VERIFICATION', {'verification_id': str(uuid.uuid4()), 'passed': True}),
+        ), user_id=user_id, db=db))
+        assert response.synced == 1
+        assert db.synced == [(sync_api._check_achievements, (user_id, 0, 1, None))]
+
+    def test_achievement_path(self, monkeypatch):
+        calls = []
+
+        class _Achievements:
+            def __init__(self, db):
+                pass
+
+            def check_achievements(self, user_id):
+                calls.append(('full', user_id))
+                return []
+
+            def record_event(self, user_id, increments=None, values=None):
+                calls.append(('event', increments, values))
+                return []
+
+        monkeypatch.setattr(sync_api, 'AchievementService', _Achievements)
+        user_id = uuid.uuid4()
+        sync_api._check_achievements(None, user_id, 2, 0, 4)
+        sync_api._check_achievements(None, user_id, 2, 1, 4)
+        assert calls == [
+            ('event', {'blocks_learned': 2}, {'streak_days': 4}),
+            ('full', user_id),
+        ]
@@ -0,0 +1,247 @@
+"""
+Tests for the set-based /verification/review/batch path.
+
+A fake session stands in for Postgres: it serves card states for the bulk
+SELECT and records the multi-row UPDATE and INSERT, so the tests check the
+statement count, per-item errors and all-or-nothing commits.
+"""
+
+import uuid
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from src.api import verification
+from src.services import learning_velocity
+from src.api.verification import BatchReviewRequest, ProcessReviewRequest
+from src.spaced_repetition import SM2PlusService
+from tests._fakes import FakeResult
+
+
+USER_ID = uuid.uuid4()
+LEARNER_ID = uuid.uuid4()
+
+
+def _progress_row(progress_id, learner_id=LEARNER_ID, scheduled=True):
+    """lp.id, lp.learner_id, then CARD_STATE_COLUMNS."""
+    if not scheduled:
+        return (progress_id, learner_id) + (None,) * 17
+    return (
+        progress_id, learner_id,
+        progress_id, f'word{progress_id}.n.01', 'sm2_plus', 3,
+        date.today(), date.today() - timedelta(days=3), 4, 3, 'learning', False,
+        2.5, 2, None, 0.5, None, None, 1200,
+    )
+
+
+class _FakeSession:
+    def __init__(self, rows, fail_on=None):
+        self.rows = rows
+        self.fail_on = fail_on
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.executed.append((sql, params))
+        if self.fail_on and self.fail_on in sql:
+            raise RuntimeError('connection lost')
+        if 'FROM public.learners' in sql:
+            return FakeResult([(LEARNER_ID,)])
+        if 'FROM learning_progress lp' in sql:
+            ids = set(params['learning_progress_ids'])
+            return FakeResult([row for row in self.rows if row[0] in ids])
+        if 'INSERT INTO learner_streaks' in sql:
+            return FakeResult([(1, None)])
+        return FakeResult([])
+
+    @contextmanager
+    def begin_nested(self):
+        yield
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def statements(self, fragment):
+        return [params for sql, params in self.executed if fragment in sql]
+
+
+@pytest.fixture(autouse=True)
+def sm2(monkeypatch):
+    monkeypatch.setattr(verification, 'get_algorithm_for_user', lambda user_id, db: SM2PlusService())
+
+
+@pytest.fixture(autouse=True)
+def achievement_events(monkeypatch):
+    events = []
+
+    class _Achievements:
+        def __init__(self, db):
+            pass
+
+        def record_event(self, user_id, increments=None, values=None):
+            events.append((user_id, increments, values))
+            return []
+
+    monkeypatch.setattr(verification, 'AchievementService', _Achievements)
+    return events
+
+
+@pytest.fixture
+def streak_table(monkeypatch):
+    monkeypatch.setattr(learning_velocity, '_streak_table_ready', True)
+
+
+def _batch(*reviews, learner_id=LEARNER_ID):
+    return BatchReviewRequest(
+        reviews=[ProcessReviewRequest(learning_progress_id=pid, performance_rating=rating)
+                 for pid, rating in reviews],
+        learner_id=learner_id,
+    )
+
+
+class TestBulkStatements:
+    """One SELECT, one UPDATE and one INSERT regardless of batch size."""
+
+    def test_single_statement_per_step(self):
+        db = _FakeSession([_progress_row(i) for i in (1, 2, 3)])
+        response = verification.process_batch_review(_batch((1, 2), (2, 0), (3, 3)), USER_ID, db)
+
+        assert response.total_succeeded == 3
+        assert len(db.statements('FROM learning_progress lp')) == 1
+        updates = db.statements('UPDATE verification_schedule vs')
+        inserts = db.statements('INSERT INTO fsrs_review_history')
+        assert len(updates) == 1 and len(inserts) == 1
+        assert updates[0]['learning_progress_id'] == [1, 2, 3]
+        assert inserts[0]['performance_rating'] == [2, 0, 3]
+        assert inserts[0]['elapsed_days'] == [3, 3, 3]
+        assert db.commits == 1
+
+    def test_matches_single_review_path(self):
+        db = _FakeSession([_progress_row(1)])
+        response = verification.process_batch_review(_batch((1, 2)), USER_ID, db)
+
+        state = verification._card_state_from_row(USER_ID, _progress_row(1)[2:])
+        expected = SM2PlusService().process_review(state, verification.PerformanceRating(2), review_date=date.today())
+        item = response.results[0]
+        assert item.next_interval_days == expected.next_interval_days
+        assert item.next_review_date == expected.next_review_date.isoformat()
+        assert db.statements('UPDATE verification_schedule vs')[0]['ease_factor'] == [expected.new_state.ease_factor]
+
+    def test_repeated_card_chains_state(self):
+        db = _FakeSession([_progress_row(1)])
+        verification.process_batch_review(_batch((1, 2), (1, 2)), USER_ID, db)
+
+        update = db.statements('UPDATE verification_schedule vs')[0]
+        history = db.statements('INSERT INTO fsrs_review_history')[0]
+        assert update['learning_progress_id'] == [1]
+        assert update['total_reviews'] == [6]
+        assert history['learning_progress_id'] == [1, 1]
+
+
+class TestStreak:
+    """Reviews advance the daily streak of the user's own profile."""
+
+    def test_batch_records_activity_once(self, streak_table):
+        db = _FakeSession([_progress_row(1), _progress_row(2)])
+        verification.process_batch_review(_batch((1, 2), (2, 3)), USER_ID, db)
+
+        upserts = db.statements('INSERT INTO learner_streaks')
+        assert len(upserts) == 1
+        assert upserts[0]['learner_id'] == LEARNER_ID
+        assert db.commits == 1
+
+    def test_no_successful_review_no_activity(self, streak_table):
+        db = _FakeSession([])
+        verification.process_batch_review(_batch((9, 2), learner_id=None), USER_ID, db)
+        assert not db.statements('INSERT INTO learner_streaks')
+
+    def test_single_review_records_activity(self, streak_table, monkeypatch):
+        state = verification._card_state_from_row(USER_ID, _progress_row(1)[2:])
+        monkeypatch.setattr(verification, '_get_card_state', lambda db, user_id, pid: state)
+        db = _FakeSession([])
+        verification.process_review(ProcessReviewRequest(learning_progress_id=1, performance_rating=2), USER_ID, db)
+
+        assert len(db.statements('INSERT INTO learner_streaks')) == 1
+        assert db.commits == 1
+
+
+class TestAchievementEvents:
+    """Committed reviews update the achievement counters incrementally."""
+
+    def test_batch_event_counts_reviews_and_mastery(self, streak_table, achievement_events):
+        rows = [_progress_row(1), _progress_row(2)]
+        rows[1] = rows[1][:10] + ('mastered',) + rows[1][11:]
+        db = _FakeSession(rows)
+        verification.process_batch_review(_batch((1, 2), (2, 0), (1, 3)), USER_ID, db)
+
+        (user_id, increments, values), = achievement_events
+        assert user_id == USER_ID
+        assert increments['total_reviews'] == 3
+        assert increments['blocks_mastered'] == -1
+        assert values == {'streak_days': 1}
+
+    def test_failed_items_only_emit_nothing(self, achievement_events):
+        db = _FakeSession([])
+        verification.process_batch_review(_batch((9, 2), learner_id=None), USER_ID, db)
+        assert achievement_events == []
+
+    def test_single_review_event(self, streak_table, achievement_events, monkeypatch):
+        state = verification._card_state_from_row(USER_ID, _progress_row(1)[2:])
+        monkeypatch.setattr(verification, '_get_card_state', lambda db, user_id, pid: state)
+        verification.process_review(
+            ProcessReviewRequest(learning_progress_id=1, performance_rating=2), USER_ID, _FakeSession([])
+        )
+        (_, increments, values), = achievement_events
+        assert increments == {'total_reviews': 1, 'blocks_mastered': 0}
+        assert values == {'streak_days': 1}
+
+
+class TestItemErrors:
+    """Validation failures are reported per item and not written."""
+
+    def test_missing_mismatched_and_unscheduled(self):
+        rows = [
+            _progress_row(1),
+            _progress_row(2, learner_id=uuid.uuid4()),
+            _progress_row(3, scheduled=False),
+        ]
+        db = _FakeSession(rows)
+        response = verification.process_batch_review(_batch((1, 2), (2, 2), (3, 2), (4, 2)), USER_ID, db)
+
+        errors = {item.learning_progress_id: item.error for item in response.results}
+        assert errors == {
+            1: None,
+            2: 'Learner mismatch',
+            3: 'Card state not found',
+            4: 'Learning progress not found',
+        }
+        assert response.total_failed == 3
+        assert db.statements('UPDATE verification_schedule vs')[0]['learning_progress_id'] == [1]
+
+    def test_nothing_to_write(self):
+        db = _FakeSession([])
+        response = verification.process_batch_review(_batch((9, 2), learner_id=None), USER_ID, db)
+
+        assert response.results[0].error == 'Card state not found'
+        assert not db.statements('UPDATE verification_schedule')
+        assert not db.statements('INSERT INTO fsrs_review_history')
+
+
+class TestAllOrNothing:
+    """A failed write rolls back the whole batch."""
+
+    def test_history_failure_rolls_back(self):
+        db = _FakeSession([_progress_row(1), _progress_row(2)], fail_on='INSERT INTO fsrs_review_history')
+        with pytest.raises(HTTPException) as exc:
+            verification.process_batch_review(_batch((1, 2), (2, 2)), USER_ID, db)
+
+        assert exc.value.status_code == 500
+        assert db.commits == 0
+        assert db.rollbacks == 1
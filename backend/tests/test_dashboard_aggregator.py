@@ -0,0 +1,99 @@
+"""
+Tests for the concurrent dashboard aggregator.
+
+Sections are replaced with small functions so concurrency, caching and
+invalidation can be checked without a database.
+"""
+
+import threading
+import time
+import uuid
+
+import pytest
+
+from src.services.dashboard_aggregator import DashboardAggregator
+
+
+class _Session:
+    def __init__(self, log):
+        self.log = log
+
+    def commit(self):
+        self.log.append('commit')
+
+    def rollback(self):
+        self.log.append('rollback')
+
+    def close(self):
+        self.log.append('close')
+
+
+def _make(sections, ttl=30):
+    log = []
+    aggregator = DashboardAggregator(
+        session_factory=lambda: _Session(log),
+        ttl_seconds=ttl,
+        max_workers=4,
+        sections=sections,
+    )
+    return aggregator, log
+
+
+class TestDashboardAggregator:
+    """Snapshot assembly, caching and invalidation."""
+
+    def test_sections_run_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def section(name):
+            def run(db, user_id):
+                barrier.wait()  # Deadlocks (times out) unless all three run at once
+                return name
+            return run
+
+        aggregator, log = _make({name: section(name) for name in ('a', 'b', 'c')})
+        assert aggregator.get_snapshot(uuid.uuid4()) == {'a': 'a', 'b': 'b', 'c': 'c'}
+        assert log.count('commit') == 3
+        assert log.count('close') == 3
+
+    def test_cached_until_invalidated(self):
+        calls = []
+        aggregator, _ = _make({'n': lambda db, user_id: calls.append(1) or len(calls)})
+        user_id = uuid.uuid4()
+        assert aggregator.get_snapshot(user_id) == {'n': 1}
+        assert aggregator.get_snapshot(user_id) == {'n': 1}
+        aggregator.invalidate(user_id)
+        assert aggregator.get_snapshot(user_id) == {'n': 2}
+        assert aggregator.get_snapshot(uuid.uuid4()) == {'n': 3}
+
+    def test_ttl_expiry(self):
+        calls = []
+        aggregator, _ = _make({'n': lambda db, user_id: calls.append(1) or len(calls)}, ttl=0.05)
+        user_id = uuid.uuid4()
+        aggregator.get_snapshot(user_id)
+        time.sleep(0.1)
+        assert aggregator.get_snapshot(user_id) == {'n': 2}
+
+    def test_invalidate_during_compute_is_not_cached(self):
+        user_id = uuid.uuid4()
+        calls = []
+
+        def section(db, uid):
+            calls.append(1)
+            if len(calls) == 1:
+                aggregator.invalidate(uid)  # Answer submitted while the snapshot was computed
+            return len(calls)
+
+        aggregator, _ = _make({'n': section})
+        assert aggregator.get_snapshot(user_id) == {'n': 1}
+        assert aggregator.get_snapshot(user_id) == {'n': 2}
+
+    def test_failure_rolls_back_and_is_not_cached(self):
+        def broken(db, user_id):
+            raise RuntimeError('db down')
+
+        aggregator, log = _make({'ok': lambda db, user_id: 1, 'broken': broken})
+        with pytest.raises(RuntimeError):
+            aggregator.get_snapshot(uuid.uuid4())
+        assert 'rollback' in log
+        assert aggregator._cache == {}
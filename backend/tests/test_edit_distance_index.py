@@ -0,0 +1,74 @@
+"""
+Tests for the deletion-neighbourhood edit distance index.
+"""
+
+import random
+import string
+
+import pytest
+
+from src.services import edit_distance_index
+from src.services.edit_distance_index import EditDistanceIndex, levenshtein_distance
+
+
+WORDS = [
+    'accept', 'except', 'expect', 'affect', 'effect', 'advice', 'advise',
+    'lose', 'loose', 'quite', 'quiet', 'quit', 'then', 'than', 'that',
+    'desert', 'dessert', 'breath', 'breathe', 'a', 'an', 'at', 'cat', 'cut',
+]
+
+
+class TestLevenshteinDistance:
+    """The shared distance function, with and without the C extension."""
+
+    @pytest.mark.parametrize('use_c', [True, False])
+    def test_known_distances(self, use_c, monkeypatch):
+        if not use_c:
+            monkeypatch.setattr(edit_distance_index, 'HAS_LEVENSHTEIN', False)
+        assert levenshtein_distance('kitten', 'sitting') == 3
+        assert levenshtein_distance('accept', 'except') == 2
+        assert levenshtein_distance('', 'abc') == 3
+        assert levenshtein_distance('same', 'same') == 0
+
+
+class TestEditDistanceIndex:
+    """Index lookups must match a brute-force scan exactly."""
+
+    def setup_method(self):
+        self.index = EditDistanceIndex(WORDS, max_distance=2)
+
+    def test_lookup_sorted_by_distance(self):
+        assert self.index.lookup('quiet') == [('quit', 1), ('quite', 2)]
+
+    def test_lookup_excludes_self_by_default(self):
+        words = [w for w, _ in self.index.lookup('accept')]
+        assert 'accept' not in words
+        assert ('accept', 0) in self.index.lookup('accept', include_self=True)
+
+    def test_lookup_distance_one(self):
+        assert self.index.lookup('cat', max_distance=1) == [('at', 1), ('cut', 1)]
+
+    def test_query_not_in_index(self):
+        assert ('expect', 1) in self.index.lookup('expert')
+
+    def test_case_insensitive_and_preserves_forms(self):
+        index = EditDistanceIndex(['Paris', 'parks'])
+        assert index.lookup('PARKS') == [('Paris', 1)]
+        assert index.lookup('paris', include_self=True) == [('Paris', 0), ('parks', 1)]
+        assert 'PARIS' in index
+
+    def test_matches_brute_force(self):
+        rng = random.Random(42)
+        vocab = sorted({
+            ''.join(rng.choice('abcde') for _ in range(rng.randint(1, 6)))
+            for _ in range(400)
+        })
+        index = EditDistanceIndex(vocab, max_distance=2)
+        for _ in range(100):
+            query = ''.join(rng.choice(string.ascii_lowercase[:6]) for _ in range(rng.randint(1, 7)))
+            expected = sorted(
+                ((w, levenshtein_distance(query, w)) for w in vocab
+                 if 0 < levenshtein_distance(query, w) <= 2),
+                key=lambda r: (r[1], r[0])
+            )
+            assert index.lookup(query) == expected
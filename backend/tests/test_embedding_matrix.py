@@ -0,0 +1,94 @@
+"""
+Tests for the memory-mapped embedding matrix and survey trap filtering.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from src.services import embedding_matrix
+from src.services.embedding_matrix import EmbeddingMatrix, get_embedding_matrix
+from src.survey import lexisurvey_engine
+from src.survey.lexisurvey_engine import LexiSurveyEngine
+
+
+def _random_vectors(keys, seed=3, dims=16):
+    rng = np.random.default_rng(seed)
+    return {key: rng.normal(size=dims).tolist() for key in keys}
+
+
+def _python_cosine(v1, v2):
+    dot = sum(a * b for a, b in zip(v1, v2))
+    return dot / (math.sqrt(sum(a * a for a in v1)) * math.sqrt(sum(b * b for b in v2)))
+
+
+class TestEmbeddingMatrix:
+    """Batched similarities and nearest neighbours."""
+
+    def setup_method(self):
+        self.words = _random_vectors(['adopt', 'adapt', 'adept', 'bank'])
+        self.senses = _random_vectors(['adopt.v.01', 'bank.n.01'], seed=5)
+        self.matrix = EmbeddingMatrix.from_vectors(self.words, self.senses)
+
+    def test_similarities_match_scalar_cosine(self):
+        sims = self.matrix.similarities('adopt', ['adapt', 'missing', 'bank'])
+        assert sims[0] == pytest.approx(_python_cosine(self.words['adopt'], self.words['adapt']), abs=1e-5)
+        assert np.isnan(sims[1])
+        assert sims[2] == pytest.approx(_python_cosine(self.words['adopt'], self.words['bank']), abs=1e-5)
+        assert np.isnan(self.matrix.similarities('missing', ['adopt'])).all()
+
+    def test_sense_rows_are_separate(self):
+        assert self.matrix.row('adopt.v.01', kind='sense') == 4
+        assert not self.matrix.has('adopt.v.01')
+        sims = self.matrix.similarities('adopt.v.01', ['bank.n.01'], kind='sense')
+        assert sims[0] == pytest.approx(
+            _python_cosine(self.senses['adopt.v.01'], self.senses['bank.n.01']), abs=1e-5
+        )
+
+    def test_nearest_matches_brute_force(self):
+        expected = sorted(
+            ((w, _python_cosine(self.words['adopt'], v)) for w, v in self.words.items() if w != 'adopt'),
+            key=lambda item: -item[1]
+        )
+        result = self.matrix.nearest('adopt', k=2)
+        assert [w for w, _ in result] == [w for w, _ in expected[:2]]
+        assert [w for w, _ in self.matrix.nearest('adopt', k=5, exclude=['bank'])] == \
+            [w for w, _ in expected if w != 'bank']
+
+    def test_save_and_memory_map(self, tmp_path):
+        self.matrix.save(tmp_path)
+        opened = EmbeddingMatrix.open(tmp_path)
+        assert isinstance(opened.vectors, np.memmap)
+        assert opened.words == self.matrix.words and opened.senses == self.matrix.senses
+        np.testing.assert_array_equal(opened.vectors, self.matrix.vectors)
+
+    def test_shared_matrix_missing_files(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('EMBEDDING_MATRIX_DIR', str(tmp_path))
+        monkeypatch.setattr(embedding_matrix, '_matrix', None)
+        monkeypatch.setattr(embedding_matrix, '_matrix_loaded', False)
+        assert get_embedding_matrix() is None
+
+
+class TestTrapFiltering:
+    """LexiSurveyEngine drops traps that are too similar to the target."""
+
+    def _engine(self, monkeypatch, matrix):
+        monkeypatch.setattr(lexisurvey_engine, 'get_embedding_matrix', lambda: matrix)
+        return LexiSurveyEngine(conn=object())
+
+    def test_matrix_filter(self, monkeypatch):
+        matrix = EmbeddingMatrix.from_vectors({
+            'adopt': [1.0, 0.0],
+            'adapt': [1.0, 0.1],   # ~0.99: too close, dropped
+            'adept': [0.0, 1.0],   # 0.0: kept
+        })
+        engine = self._engine(monkeypatch, matrix)
+        traps = [{'word_name': 'adapt'}, {'word_name': 'adept'}, {'word_name': 'unknown'}]
+        assert engine._filter_traps('adopt', traps) == [{'word_name': 'adept'}, {'word_name': 'unknown'}]
+
+    def test_fallback_to_row_embeddings(self, monkeypatch):
+        engine = self._engine(monkeypatch, None)
+        traps = [{'word_name': 'adapt'}, {'word_name': 'adept'}]
+        kept = engine._filter_traps('adopt', traps, [1.0, 0.0], [[1.0, 0.1], None])
+        assert kept == [{'word_name': 'adept'}]
@@ -0,0 +1,38 @@
+"""
+Tests for the internal-token guard on /internal/metrics.
+"""
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from src.middleware import auth
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/internal/metrics", dependencies=[Depends(auth.require_internal_token)])
+    def metrics():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+class TestRequireInternalToken:
+    """Only callers presenting INTERNAL_API_TOKEN get through."""
+
+    def test_disabled_without_configured_token(self, client, monkeypatch):
+        monkeypatch.setattr(auth, 'INTERNAL_API_TOKEN', None)
+        assert client.get("/internal/metrics", headers={"X-Internal-Token": "x"}).status_code == 404
+
+    def test_rejects_missing_or_wrong_token(self, client, monkeypatch):
+        monkeypatch.setattr(auth, 'INTERNAL_API_TOKEN', 's3cret')
+        assert client.get("/internal/metrics").status_code == 403
+        assert client.get("/internal/metrics", headers={"X-Internal-Token": "nope"}).status_code == 403
+
+    def test_accepts_matching_token(self, client, monkeypatch):
+        monkeypatch.setattr(auth, 'INTERNAL_API_TOKEN', 's3cret')
+        response = client.get("/internal/metrics", headers={"X-Internal-Token": "s3cret"})
+        assert response.status_code == 200
@@ -0,0 +1,186 @@
+"""
+Tests for the materialized leaderboard store.
+
+RankedScores is exercised directly; LeaderboardStore runs against a fake
+session returning rollup rows, so bucket handling and in-place updates can
+be checked without a database.
+"""
+
+from datetime import date
+
+import pytest
+
+from src.services.leaderboard_store import (
+    ALL_TIME_BUCKET,
+    LeaderboardStore,
+    RankedScores,
+    bucket_start,
+)
+from tests._fakes import FakeResult
+
+
+class _RollupSession:
+    """Serves learner_xp_rollups rows per period and counts loads."""
+
+    def __init__(self, rows_by_period):
+        self.rows_by_period = rows_by_period
+        self.loads = 0
+        self.executed = []
+
+    def execute(self, statement, params=None):
+        params = params or {}
+        self.executed.append((str(statement), params))
+        if 'FROM learner_xp_rollups' in str(statement):
+            self.loads += 1
+            return FakeResult(self.rows_by_period.get(params['period'], []))
+        return FakeResult([])
+
+
+class TestBucketStart:
+    """Period bucket boundaries."""
+
+    def test_weekly_starts_monday(self):
+        assert bucket_start('weekly', date(2026, 10, 16)) == date(2026, 10, 12)
+        assert bucket_start('weekly', date(2026, 10, 12)) == date(2026, 10, 12)
+
+    def test_monthly_and_all_time(self):
+        assert bucket_start('monthly', date(2026, 10, 16)) == date(2026, 10, 1)
+        assert bucket_start('all_time', date(2026, 10, 16)) == ALL_TIME_BUCKET
+
+    def test_invalid_period(self):
+        with pytest.raises(ValueError):
+            bucket_start('daily')
+
+
+class TestRankedScores:
+    """Sorted board operations."""
+
+    def setup_method(self):
+        self.board = RankedScores({'a': 50, 'b': 120, 'c': 80, 'zero': 0})
+
+    def test_initial_order(self):
+        assert self.board.top(10) == [('b', 120), ('c', 80), ('a', 50)]
+        assert len(self.board) == 3
+        assert 'zero' not in self.board
+
+    def test_rank(self):
+        assert self.board.rank('b') == 1
+        assert self.board.rank('a') == 3
+        assert self.board.rank('missing') is None
+
+    def test_add_moves_entry(self):
+        self.board.add('a', 100)
+        assert self.board.top(2) == [('a', 150), ('b', 120)]
+        assert self.board.rank('c') == 3
+
+    def test_new_key_and_removal(self):
+        self.board.add('d', 90)
+        assert self.board.rank('d') == 2
+        self.board.set('b', 0)
+        assert 'b' not in self.board
+        assert self.board.top(10) == [('d', 90), ('c', 80), ('a', 50)]
+
+    def test_ties_break_by_key(self):
+        board = RankedScores({'y': 10, 'x': 10})
+        assert board.top(2) == [('x', 10), ('y', 10)]
+        assert board.rank('y') == 2
+
+    def test_matches_full_sort(self):
+        import random
+        rng = random.Random(7)
+        board = RankedScores()
+        expected = {}
+        for _ in range(500):
+            key = f'l{rng.randrange(40)}'
+            delta = rng.randrange(-20, 60)
+            board.add(key, delta)
+            expected[key] = expected.get(key, 0) + delta
+            if expected[key] <= 0:
+                expected[key] = 0
+        ordered = sorted(((k, v) for k, v in expected.items() if v > 0), key=lambda kv: (-kv[1], kv[0]))
+        assert board.top(100) == ordered
+        for position, (key, _) in enumerate(ordered, start=1):
+            assert board.rank(key) == position
+
+
+class TestLeaderboardStore:
+    """Loading, caching and in-place updates."""
+
+    def setup_method(self):
+        self.session = _RollupSession({
+            'weekly': [('l1', 30), ('l2', 70)],
+            'all_time': [('l1', 1000), ('l2', 400)],
+        })
+        self.store = LeaderboardStore(refresh_seconds=3600)
+
+    def test_top_and_rank(self):
+        assert self.store.top(self.session, 'weekly', 10) == [('l2', 70), ('l1', 30)]
+        assert self.store.rank(self.session, 'weekly', 'l1') == (2, 30)
+        assert self.store.rank(self.session, 'weekly', 'l3') is None
+        assert self.session.loads == 1
+
+    def test_apply_xp_updates_loaded_boards(self):
+        self.store.top(self.session, 'weekly', 10)
+        self.store.top(self.session, 'all_time', 10)
+        self.store.apply_xp('l1', 50, 1050)
+        assert self.store.rank(self.session, 'weekly', 'l1') == (1, 80)
+        assert self.store.rank(self.session, 'all_time', 'l1') == (1, 1050)
+        assert self.session.loads == 2
+
+    def test_invalidate_reloads(self):
+        self.store.top(self.session, 'weekly', 10)
+        self.store.invalidate('weekly')
+        self.store.top(self.session, 'weekly', 10)
+        assert self.session.loads == 2
+
+    def test_scores_subset(self):
+        assert self.store.scores(self.session, 'weekly', ['l1', 'l3']) == {'l1': 30}
+
+    def test_record_xp_upserts_three_buckets(self):
+        self.store.record_xp(self.session, 'l1', 25, 1025)
+        sql, params = self.session.executed[-1]
+        assert 'ON CONFLICT (period, bucket_start, learner_id) DO UPDATE' in sql
+        assert params['learner_ids'] == ['l1']
+        assert params['amounts'] == [25]
+        assert params['totals'] == [1025]
+        assert params['all_time_start'] == ALL_TIME_BUCKET
+
+    def test_record_xp_batch_is_one_statement(self):
+        self.store.record_xp_batch(self.session, [('l1', 25, 1025), ('l2', 5, 40)])
+        assert len(self.session.executed) == 1
+        assert self.session.executed[0][1]['amounts'] == [25, 5]
+        self.store.record_xp_batch(self.session, [])
+        assert len(self.session.executed) == 1
+
+
+class _ScalarSession:
+    """Answers the to_regclass probe and counts how often it runs."""
+
+    def __init__(self, exists):
+        self.exists = exists
+        self.probes = 0
+
+    def execute(self, statement, params=None):
+        self.probes += 1
+        exists = self.exists
+        return type('_Scalar', (), {'scalar': lambda self: exists})()
+
+
+class TestXpRollupsCheck:
+    """The learner_xp_rollups probe is cached once the table is found."""
+
+    def test_positive_result_is_cached(self, monkeypatch):
+        from src.services import leaderboards
+        monkeypatch.setattr(leaderboards, '_xp_rollups_ready', False)
+
+        missing = _ScalarSession(exists=False)
+        service = leaderboards.LeaderboardService(missing)
+        assert not service._has_xp_rollups()
+        assert not service._has_xp_rollups()
+        assert missing.probes == 2
+
+        present = _ScalarSession(exists=True)
+        service = leaderboards.LeaderboardService(present)
+        assert service._has_xp_rollups()
+        assert service._has_xp_rollups()
+        assert present.probes == 1
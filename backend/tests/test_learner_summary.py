@@ -0,0 +1,101 @@
+"""
+Tests for batched learner summaries (LearnerSummaryService).
+
+A fake session answers each grouped query from canned rows, so the tests
+check how results are stitched together and that the number of queries
+does not grow with the number of learners.
+"""
+
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.services import learning_velocity
+from src.services.learner_summary import LearnerSummaryService, empty_summary
+from tests._fakes import FakeResult
+
+
+class _SummarySession:
+    """Routes each summary query to canned rows by the table it reads."""
+
+    def __init__(self, xp=(), progress=(), activity=(), history=(), learners=(), streaks=None):
+        self.responses = [
+            ('to_regclass', FakeResult(scalar=streaks is not None)),
+            ('FROM learner_streaks', list(streaks or ())),
+            ('FROM public.learners', list(learners)),
+            ('FROM user_xp', list(xp)),
+            ('DISTINCT learner_id', list(activity)),
+            ('FROM learning_progress', list(progress)),
+            ('FROM xp_history', list(history)),
+        ]
+        self.queries = 0
+
+    def execute(self, statement, params=None):
+        self.queries += 1
+        sql = str(statement)
+        for marker, rows in self.responses:
+            if marker in sql:
+                return rows if isinstance(rows, FakeResult) else FakeResult(rows)
+        raise AssertionError(f'unexpected query: {sql}')
+
+
+@pytest.fixture(autouse=True)
+def reset_streak_table_flag(monkeypatch):
+    monkeypatch.setattr(learning_velocity, '_streak_table_ready', False)
+
+
+class TestLearnerSummaryService:
+    """Grouped queries stitched into per-learner summaries."""
+
+    def setup_method(self):
+        self.learners = [uuid.uuid4() for _ in range(5)]
+        a, b = self.learners[0], self.learners[1]
+        active = datetime(2026, 10, 16, 9, 30)
+        self.session = _SummarySession(
+            xp=[(a, 1250), (b, 80)],
+            progress=[(a, 40, 5, 3, active)],
+            activity=[(a, date.today()), (a, date.today() - timedelta(days=1))],
+            history=[(a, 200, 900)],
+        )
+
+    def test_fixed_query_count(self):
+        LearnerSummaryService(self.session).get_summaries(self.learners)
+        assert self.session.queries == 5  # includes the learner_streaks existence check
+
+    def test_persisted_streaks(self):
+        a = self.learners[0]
+        self.session = _SummarySession(streaks=[(a, 9, 12, date.today() - timedelta(days=1))])
+        summaries = LearnerSummaryService(self.session).get_summaries(self.learners)
+        assert summaries[str(a)]['current_streak'] == 9
+        assert summaries[str(self.learners[1])]['current_streak'] == 0
+
+    def test_values(self):
+        a, b, c = (str(lid) for lid in self.learners[:3])
+        summaries = LearnerSummaryService(self.session).get_summaries(self.learners)
+        assert summaries[a] == {
+            'level': 6,
+            'total_xp': 1250,
+            'weekly_xp': 200,
+            'monthly_xp': 900,
+            'current_streak': 2,
+            'vocabulary_size': 40,
+            'words_in_progress': 5,
+            'words_learned_this_week': 3,
+            'last_active_date': '2026-10-16T09:30:00',
+        }
+        assert summaries[b]['total_xp'] == 80
+        assert summaries[b]['vocabulary_size'] == 0
+        assert summaries[c] == empty_summary()
+
+    def test_empty_input_runs_no_queries(self):
+        assert LearnerSummaryService(self.session).get_summaries([]) == {}
+        assert self.session.queries == 0
+
+    def test_user_summaries_resolve_learner_profiles(self):
+        child_user, no_profile_user = uuid.uuid4(), uuid.uuid4()
+        self.session.responses[2] = ('FROM public.learners', [(child_user, self.learners[0])])
+        summaries = LearnerSummaryService(self.session).get_user_summaries([child_user, no_profile_user])
+        assert summaries[str(child_user)]['total_xp'] == 1250
+        assert summaries[str(no_profile_user)] == empty_summary()
+        assert self.session.queries == 6
@@ -0,0 +1,74 @@
+"""
+Tests for the shared level curve (level_curve).
+
+The precomputed thresholds must agree with the original step-by-step
+loop (and the calculate_level() SQL function it mirrors).
+"""
+
+from src.services import level_curve
+from src.services.currencies import CurrencyService
+from src.services.level_curve import (
+    level_for_xp,
+    levels_for_xp,
+    prestige_multiplier,
+    xp_for_level,
+)
+from src.services.levels import LevelService
+
+
+def _loop_level(total_xp):
+    """The original while-loop from LevelService / CurrencyService."""
+    level = 1
+    xp_needed = 100
+    remaining_xp = total_xp
+    while remaining_xp >= xp_needed:
+        level += 1
+        remaining_xp -= xp_needed
+        xp_needed = 100 + (level - 1) * 50
+    return {'level': level, 'xp_to_next': xp_needed, 'xp_in_level': remaining_xp}
+
+
+class TestLevelForXp:
+    """Bisect lookup over cumulative thresholds."""
+
+    def test_matches_loop(self):
+        for total_xp in list(range(0, 3000)) + [10**5, 123456, 10**6 + 7]:
+            assert level_for_xp(total_xp) == _loop_level(total_xp)
+
+    def test_boundaries(self):
+        assert xp_for_level(1) == 0
+        assert xp_for_level(2) == 100
+        assert xp_for_level(3) == 250
+        assert level_for_xp(249)['level'] == 2
+        assert level_for_xp(250) == {'level': 3, 'xp_to_next': 200, 'xp_in_level': 0}
+
+    def test_thresholds_cover_int_column(self):
+        assert level_curve.LEVEL_THRESHOLDS[-1] > 2**31 - 1
+
+    def test_services_use_curve_without_db(self):
+        assert LevelService(None).calculate_level(1250) == _loop_level(1250)
+        assert CurrencyService(None)._calculate_level(1250) == _loop_level(1250)
+
+
+class TestLevelsForXp:
+    """Vectorised lookup agrees with the scalar one."""
+
+    def test_matches_scalar(self):
+        totals = [0, 99, 100, 1250, 45000, 999999]
+        assert [int(level) for level in levels_for_xp(totals)] == [
+            level_for_xp(total)['level'] for total in totals
+        ]
+
+    def test_list_fallback(self, monkeypatch):
+        monkeypatch.setattr(level_curve, 'HAS_NUMPY', False)
+        assert levels_for_xp([0, 100, 1250]) == [1, 2, 6]
+
+
+class TestPrestigeMultiplier:
+    """+5% per prestige level, clamped to the supported range."""
+
+    def test_values(self):
+        assert prestige_multiplier(0) == 1.0
+        assert prestige_multiplier(3) == 1.15
+        assert prestige_multiplier(10) == 1.5
+        assert prestige_multiplier(25) == 1.5
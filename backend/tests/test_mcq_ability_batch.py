@@ -0,0 +1,100 @@
+"""
+Tests for batched ability estimation (MCQAdaptiveService.estimate_abilities).
+
+A fake session answers the schedule (DISTINCT ON) and attempt-history
+queries from in-memory rows, so the tests check the query count and how
+estimates are derived from the rows.
+"""
+
+import uuid
+from collections import namedtuple
+
+import pytest
+
+from src.database.postgres_crud import mcq_stats
+from src.mcq_adaptive import AbilitySource, MCQAdaptiveService
+from tests._fakes import FakeResult
+
+Schedule = namedtuple('Schedule', [
+    'learning_point_id', 'stability', 'difficulty', 'retention_probability',
+    'ease_factor', 'consecutive_correct', 'total_reviews',
+])
+
+
+class _Session:
+    """Routes the two estimator queries by SQL substring."""
+
+    def __init__(self, schedules=(), attempts=()):
+        self.schedules = {s.learning_point_id: s for s in schedules}
+        self.attempts = attempts  # (sense_id, is_correct, difficulty) most recent first
+        self.executed = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.executed.append((sql, params))
+        if 'FROM learning_progress' in sql:
+            return FakeResult([self.schedules[i] for i in params['sense_ids'] if i in self.schedules])
+        if 'FROM mcq_attempts' in sql:
+            rows = []
+            for sense_id in params['sense_ids']:
+                mine = [a for a in self.attempts if a[0] == sense_id]
+                for rn, (_, correct, difficulty) in enumerate(mine[:params['recent_limit']], 1):
+                    rows.append((sense_id, correct, len(mine), difficulty if rn <= 20 else None))
+            return FakeResult(rows)
+        raise AssertionError(f"Unexpected query: {sql}")
+
+
+USER = uuid.uuid4()
+
+
+class TestEstimateAbilities:
+    """Schedule first, then history, then default - in two queries."""
+
+    def test_two_queries_for_whole_session(self):
+        session = _Session(
+            schedules=[
+                Schedule('fsrs.n.01', 5.0, 0.2, 0.9, None, None, 4),
+                Schedule('sm2.v.01', None, None, None, 2.5, 3, 2),
+            ],
+            attempts=[('hist.n.01', True, 0.5), ('hist.n.01', False, None)],
+        )
+        sense_ids = ['fsrs.n.01', 'sm2.v.01', 'hist.n.01'] + [f'new{i}.n.01' for i in range(17)]
+        estimates = MCQAdaptiveService(session).estimate_abilities(USER, sense_ids)
+
+        assert len(session.executed) == 2
+        assert 'DISTINCT ON' in session.executed[0][0]
+        assert set(session.executed[1][1]['sense_ids']) == set(sense_ids) - {'fsrs.n.01', 'sm2.v.01'}
+
+        assert estimates['fsrs.n.01'].source == AbilitySource.FSRS
+        assert estimates['fsrs.n.01'].ability == pytest.approx(0.8 * 0.6 + 0.9 * 0.4)
+        assert estimates['sm2.v.01'].source == AbilitySource.SM2_PLUS
+        assert estimates['sm2.v.01'].ability == pytest.approx((2.5 - 1.3) / 1.7 * 0.8 + 0.12)
+        assert estimates['hist.n.01'].source == AbilitySource.HISTORY
+        assert estimates['hist.n.01'].data_points == 2
+        assert estimates['new0.n.01'].source == AbilitySource.DEFAULT
+        assert estimates['new0.n.01'].ability == 0.5
+
+    def test_suffixed_ids_match_normalised_progress(self):
+        session = _Session(schedules=[Schedule('call.v.01', 5.0, 0.5, 0.5, None, None, 1)])
+        estimates = MCQAdaptiveService(session).estimate_abilities(USER, ['call.v.01_99'])
+        assert 'call.v.01' in session.executed[0][1]['sense_ids']
+        assert estimates['call.v.01_99'].source == AbilitySource.FSRS
+        assert len(session.executed) == 1  # History not needed
+
+    def test_single_sense_wrapper(self):
+        session = _Session()
+        estimate = MCQAdaptiveService(session).estimate_ability(USER, 'x.n.01', use_fsrs_data=False)
+        assert estimate.source == AbilitySource.DEFAULT
+        assert len(session.executed) == 1
+
+
+class TestAbilityFromAttempts:
+    """Shared formula used by the per-sense and batched history paths."""
+
+    def test_recency_weighting_and_difficulty(self):
+        assert mcq_stats.ability_from_attempts([]) == 0.5
+        assert mcq_stats.ability_from_attempts([(True, None)] * 3) == 1.0
+        # Correct on a hard MCQ adds (1 - 0.2) * 0.1
+        assert mcq_stats.ability_from_attempts([(True, 0.2), (False, None)]) == pytest.approx(
+            1 / 1.95 + 0.08
+        )
@@ -0,0 +1,52 @@
+"""
+Tests for selecting served MCQ options from the stored distractor pool.
+"""
+
+import random
+
+import pytest
+
+from src.mcq_adaptive import select_option_indices_from_pool, select_options_from_pool
+
+
+def _pool():
+    """1 correct + 8 distractors across tiers, correct answer not first."""
+    options = [
+        {'text': f'd{i}', 'is_correct': False, 'source': 'confused', 'tier': tier}
+        for i, tier in enumerate([1, 1, 2, 3, 3, 4, 5, 5])
+    ]
+    options.insert(3, {'text': 'right', 'is_correct': True, 'source': 'target'})
+    return options
+
+
+class TestSelectOptionIndices:
+    """Pool indices returned must describe the served options exactly."""
+
+    @pytest.mark.parametrize('ability', [0.1, 0.5, 0.9])
+    def test_indices_point_at_selected_options(self, ability):
+        pool = _pool()
+        indices, correct_index = select_option_indices_from_pool(pool, 5, user_ability=ability)
+        assert len(indices) == 6
+        assert len(set(indices)) == 6
+        assert indices[correct_index] == 3
+        assert pool[indices[correct_index]]['is_correct']
+
+    @pytest.mark.parametrize('ability', [0.1, 0.5, 0.9])
+    def test_wrapper_matches_index_selection(self, ability):
+        pool = _pool()
+        random.seed(11)
+        indices, idx_correct = select_option_indices_from_pool(pool, 5, user_ability=ability)
+        random.seed(11)
+        options, opt_correct = select_options_from_pool(pool, 5, user_ability=ability)
+        assert options == [pool[i] for i in indices]
+        assert opt_correct == idx_correct
+
+    def test_high_ability_gets_hardest_distractors(self):
+        pool = _pool()
+        indices, correct_index = select_option_indices_from_pool(pool, 3, user_ability=0.9, shuffle=False)
+        assert correct_index == 0
+        assert sorted(pool[i]['tier'] for i in indices[1:]) == [1, 1, 2]
+
+    def test_missing_correct_option(self):
+        with pytest.raises(ValueError):
+            select_option_indices_from_pool([{'text': 'x', 'is_correct': False}], 3)
@@ -0,0 +1,90 @@
+"""
+Tests for the MCQ generation pipeline (batching, checkpointing, resume).
+
+Generation runs in-process (workers=0) with a stubbed chunk generator and
+an in-memory batch writer, so no database or vocabulary is needed.
+"""
+
+import pytest
+
+from src import mcq_pipeline
+from src.mcq_pipeline import MCQPipeline, SenseCheckpoint
+
+
+def _fake_generate(sense_ids):
+    results = []
+    for sense_id in sense_ids:
+        if sense_id.startswith('bad'):
+            results.append((sense_id, [], 'boom'))
+        elif sense_id.startswith('empty'):
+            results.append((sense_id, [], None))
+        else:
+            rows = [{'sense_id': sense_id, 'mcq_type': t} for t in ('meaning', 'usage')]
+            results.append((sense_id, rows, None))
+    return results
+
+
+@pytest.fixture
+def stub_workers(monkeypatch):
+    monkeypatch.setattr(mcq_pipeline, '_init_worker', lambda mcq_type_filter=None: None)
+    monkeypatch.setattr(mcq_pipeline, '_generate_chunk', _fake_generate)
+
+
+class TestMCQPipeline:
+    """In-process pipeline runs against a recording writer."""
+
+    def _pipeline(self, tmp_path, batches, **kwargs):
+        def write(rows):
+            batches.append(list(rows))
+            return len(rows)
+        return MCQPipeline(
+            workers=0, chunk_size=2, batch_rows=4, skip_existing=False,
+            checkpoint_path=tmp_path / 'ckpt.txt', write_batch=write, **kwargs
+        )
+
+    def test_batches_hold_whole_senses(self, tmp_path, stub_workers):
+        batches = []
+        stats = self._pipeline(tmp_path, batches).run(['a', 'b', 'c', 'empty1', 'd'])
+        assert stats.mcqs_written == 8
+        assert stats.senses_stored == 4
+        assert stats.senses_empty == 1
+        assert stats.by_type == {'meaning': 4, 'usage': 4}
+        for batch in batches:
+            senses = [r['sense_id'] for r in batch]
+            for sense_id in set(senses):
+                assert senses.count(sense_id) == 2
+
+    def test_checkpoint_records_committed_senses_only(self, tmp_path, stub_workers):
+        batches = []
+        stats = self._pipeline(tmp_path, batches).run(['a', 'bad1', 'empty1'])
+        assert stats.senses_failed == 1
+        assert SenseCheckpoint(tmp_path / 'ckpt.txt').load() == {'a', 'empty1'}
+
+    def test_resume_skips_checkpointed_senses(self, tmp_path, stub_workers):
+        SenseCheckpoint(tmp_path / 'ckpt.txt').record(['a', 'b'])
+        batches = []
+        stats = self._pipeline(tmp_path, batches).run(['a', 'b', 'c'], resume=True)
+        assert stats.senses_skipped == 2
+        assert {r['sense_id'] for batch in batches for r in batch} == {'c'}
+
+    def test_fresh_run_resets_checkpoint(self, tmp_path, stub_workers):
+        SenseCheckpoint(tmp_path / 'ckpt.txt').record(['a'])
+        batches = []
+        stats = self._pipeline(tmp_path, batches).run(['a'])
+        assert stats.senses_skipped == 0
+        assert stats.mcqs_written == 2
+
+    def test_failed_batch_is_not_checkpointed(self, tmp_path, stub_workers, monkeypatch):
+        monkeypatch.setattr(mcq_pipeline.time, 'sleep', lambda s: None)
+
+        def failing_write(rows):
+            raise RuntimeError('db down')
+
+        pipeline = MCQPipeline(
+            workers=0, skip_existing=False, checkpoint_path=tmp_path / 'ckpt.txt',
+            write_batch=failing_write, max_retries=2
+        )
+        stats = pipeline.run(['a', 'b'])
+        assert stats.senses_failed == 2
+        assert stats.mcqs_written == 0
+        assert SenseCheckpoint(tmp_path / 'ckpt.txt').load() == set()
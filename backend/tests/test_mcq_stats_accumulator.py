@@ -0,0 +1,153 @@
+"""
+Tests for write-behind MCQ statistics aggregation.
+
+A recording session stands in for the database; the assertions cover how
+attempts are folded into deltas and how flushes batch and retry them.
+"""
+
+import json
+import uuid
+
+from src.database.postgres_crud.mcq_stats import MCQStatsDelta, upsert_mcq_statistics_deltas
+from src.services.mcq_stats_accumulator import MCQStatsAccumulator
+
+
+class _RecordingSession:
+    """Minimal Session stand-in that records executed statements."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def execute(self, statement, params=None):
+        if self.fail:
+            raise RuntimeError('db down')
+        self.executed.append((str(statement), params or {}))
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+
+class TestMCQStatsDelta:
+    """Folding attempts into a delta."""
+
+    def test_add_attempts(self):
+        delta = MCQStatsDelta()
+        delta.add_attempt(True, 1200, 'target', 0.8)
+        delta.add_attempt(False, 800, 'confused', 0.4)
+        delta.add_attempt(False, None, 'confused', None)
+        assert delta.total_attempts == 3
+        assert delta.correct_attempts == 1
+        assert delta.total_response_time_ms == 2000
+        assert delta.distractor_selections == {'target': 1, 'confused': 2}
+        assert delta.ability_count_correct == 1
+        assert delta.ability_count_wrong == 1
+        assert abs(delta.ability_sum_wrong - 0.4) < 1e-9
+
+    def test_merge(self):
+        a, b = MCQStatsDelta(), MCQStatsDelta()
+        a.add_attempt(True, 100, 'target', 0.5)
+        b.add_attempt(False, 300, 'opposite', 0.5)
+        a.merge(b)
+        assert a.total_attempts == 2
+        assert a.total_response_time_ms == 400
+        assert a.distractor_selections == {'target': 1, 'opposite': 1}
+
+
+class TestUpsert:
+    """The batched INSERT ... ON CONFLICT statement."""
+
+    def test_one_row_per_mcq_sorted(self):
+        ids = [uuid.uuid4() for _ in range(3)]
+        deltas = {}
+        for mcq_id in ids:
+            deltas[mcq_id] = MCQStatsDelta()
+            deltas[mcq_id].add_attempt(True, 1000, 'target', 0.5)
+        session = _RecordingSession()
+        assert upsert_mcq_statistics_deltas(session, deltas) == 3
+        assert len(session.executed) == 1
+        sql, params = session.executed[0]
+        assert 'ON CONFLICT (mcq_id) DO UPDATE' in sql
+        assert 'total_attempts = mcq_statistics.total_attempts + excluded.total_attempts' in sql
+        assert [params[f'mcq_id_{i}'] for i in range(3)] == sorted(str(i) for i in ids)
+        assert json.loads(params['sel_0']) == {'target': 1}
+
+    def test_chunks_large_batches(self, monkeypatch):
+        from src.database.postgres_crud import mcq_stats
+        monkeypatch.setattr(mcq_stats, 'STATS_UPSERT_CHUNK', 2)
+        deltas = {}
+        for _ in range(5):
+            delta = MCQStatsDelta()
+            delta.add_attempt(False)
+            deltas[uuid.uuid4()] = delta
+        session = _RecordingSession()
+        assert upsert_mcq_statistics_deltas(session, deltas) == 5
+        assert len(session.executed) == 3
+
+
+class TestMCQStatsAccumulator:
+    """Buffering, flushing and retry of pending deltas."""
+
+    def test_flush_aggregates_per_mcq(self):
+        session = _RecordingSession()
+        acc = MCQStatsAccumulator(session_factory=lambda: session)
+        mcq_a, mcq_b = uuid.uuid4(), uuid.uuid4()
+        for _ in range(4):
+            acc.record_attempt(mcq_a, True, 1000, 'target', 0.6)
+        acc.record_attempt(mcq_b, False, 500, 'confused', 0.3)
+        assert acc.metrics()['pending_mcqs'] == 2
+        assert acc.metrics()['pending_attempts'] == 5
+
+        assert acc.flush() == 2
+        assert session.commits == 1
+        _, params = session.executed[0]
+        totals = {params[f'mcq_id_{i}']: params[f'total_{i}'] for i in range(2)}
+        assert totals == {str(mcq_a): 4, str(mcq_b): 1}
+        assert acc.metrics()['pending_attempts'] == 0
+
+    def test_failed_flush_keeps_deltas(self):
+        session = _RecordingSession(fail=True)
+        acc = MCQStatsAccumulator(session_factory=lambda: session)
+        mcq_id = uuid.uuid4()
+        acc.record_attempt(mcq_id, True)
+        assert acc.flush() == 0
+        assert session.rollbacks == 1
+        acc.record_attempt(mcq_id, False)
+
+        metrics = acc.metrics()
+        assert metrics['flush_failures'] == 1
+        assert metrics['last_error_type'] == 'RuntimeError'
+        assert metrics['pending_mcqs'] == 1
+        assert metrics['pending_attempts'] == 2
+
+        session.fail = False
+        assert acc.flush() == 1
+        _, params = session.executed[0]
+        assert params['total_0'] == 2
+        assert params['correct_0'] == 1
+        assert acc.metrics()['last_error_type'] is None
+
+    def test_stop_flushes_pending(self):
+        session = _RecordingSession()
+        acc = MCQStatsAccumulator(flush_interval=3600, session_factory=lambda: session)
+        acc.start()
+        assert acc.is_running
+        acc.record_attempt(uuid.uuid4(), True)
+        acc.stop()
+        assert not acc.is_running
+        assert session.commits == 1
+        assert acc.metrics()['pending_attempts'] == 0
+
+    def test_empty_flush_is_noop(self):
+        session = _RecordingSession()
+        acc = MCQStatsAccumulator(session_factory=lambda: session)
+        assert acc.flush() == 0
+        assert session.executed == []
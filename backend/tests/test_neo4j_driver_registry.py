@@ -0,0 +1,133 @@
+"""
+Tests for the shared Neo4j driver registry and managed transactions.
+
+GraphDatabase.driver is replaced by a fake driver, so no Neo4j server is
+needed; the tests check sharing, close semantics, access modes and timing.
+"""
+
+import pytest
+from neo4j import READ_ACCESS, WRITE_ACCESS
+
+from src.database import neo4j_connection
+from src.database.neo4j_connection import Neo4jConnection, QueryMetrics
+
+
+class _FakeTx:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def run(self, cypher, params):
+        self.queries.append((cypher, params))
+        return iter(self.rows)
+
+
+class _FakeSession:
+    def __init__(self, driver, access_mode):
+        self.driver = driver
+        self.access_mode = access_mode
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_read(self, work):
+        self.driver.calls.append(('read', self.access_mode))
+        return work(_FakeTx(self.driver.rows))
+
+    def execute_write(self, work):
+        self.driver.calls.append(('write', self.access_mode))
+        return work(_FakeTx(self.driver.rows))
+
+
+class _FakeDriver:
+    def __init__(self, uri, auth=None, **config):
+        self.uri = uri
+        self.config = config
+        self.closed = False
+        self.calls = []
+        self.rows = [{'n': 1}]
+
+    def session(self, default_access_mode=WRITE_ACCESS, **kwargs):
+        if isinstance(self.rows, Exception):
+            raise self.rows
+        return _FakeSession(self, default_access_mode)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_drivers(monkeypatch):
+    created = []
+
+    def driver(uri, auth=None, **config):
+        created.append(_FakeDriver(uri, auth, **config))
+        return created[-1]
+
+    monkeypatch.setattr(neo4j_connection.GraphDatabase, 'driver', driver)
+    monkeypatch.setattr(neo4j_connection, '_drivers', {})
+    neo4j_connection.neo4j_query_metrics.reset()
+    return created
+
+
+def _connect(**kwargs):
+    return Neo4jConnection(uri='bolt://graph:7687', user='neo4j', password='pw', **kwargs)
+
+
+class TestDriverRegistry:
+    """One driver per (uri, user) for the whole process."""
+
+    def test_connections_share_driver(self, fake_drivers):
+        a, b = _connect(), _connect()
+        assert a.driver is b.driver
+        assert len(fake_drivers) == 1
+        assert fake_drivers[0].config['max_connection_pool_size'] == neo4j_connection.MAX_POOL_SIZE
+
+    def test_close_keeps_shared_driver_open(self, fake_drivers):
+        conn = _connect()
+        conn.close()
+        assert not fake_drivers[0].closed
+        neo4j_connection.close_all_drivers()
+        assert fake_drivers[0].closed
+        assert _connect().driver is fake_drivers[1]
+
+    def test_private_driver_is_closed(self, fake_drivers):
+        conn = _connect(shared=False)
+        conn.close()
+        assert fake_drivers[0].closed
+
+
+class TestManagedTransactions:
+    """execute_read / execute_write access modes and timing."""
+
+    def test_read_uses_read_access(self, fake_drivers):
+        conn = _connect()
+        assert conn.execute_read('test.read', 'RETURN $n AS n', n=1) == [{'n': 1}]
+        assert fake_drivers[0].calls == [('read', READ_ACCESS)]
+        conn.execute_write('test.write', 'CREATE (n)')
+        assert fake_drivers[0].calls[-1] == ('write', WRITE_ACCESS)
+
+    def test_metrics_per_query_name(self, fake_drivers):
+        conn = _connect()
+        conn.execute_read('test.read', 'RETURN 1')
+        conn.execute_read('test.read', 'RETURN 1')
+        fake_drivers[0].rows = RuntimeError('unavailable')
+        with pytest.raises(RuntimeError):
+            conn.execute_read('test.failing', 'RETURN 1')
+        snapshot = neo4j_connection.neo4j_query_metrics.snapshot()
+        assert snapshot['test.read']['count'] == 2
+        assert snapshot['test.failing']['errors'] == 1
+
+
+class TestQueryMetrics:
+    """Ordering by total time."""
+
+    def test_slowest_first(self):
+        metrics = QueryMetrics()
+        metrics.record('fast', 0.001)
+        metrics.record('slow', 0.5)
+        assert list(metrics.snapshot()) == ['slow', 'fast']
+        assert metrics.snapshot()['slow']['avg_ms'] == 500.0
@@ -0,0 +1,75 @@
+"""
+Tests for the instrumented connection pools in postgres_connection.
+
+The pools are exercised on in-memory SQLite engines; only pooling and
+metrics are under test, not the Postgres connect arguments.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from src.database import postgres_connection
+from src.database.postgres_connection import (
+    TimedNullPool,
+    TimedQueuePool,
+    pool_metrics,
+)
+
+
+class TestQueuePoolMetrics:
+    """Checked-out, overflow and checkout counters in queue mode."""
+
+    def setup_method(self):
+        self.engine = create_engine(
+            "sqlite://", poolclass=TimedQueuePool,
+            pool_size=2, max_overflow=1, pool_timeout=0.05
+        )
+
+    def teardown_method(self):
+        self.engine.dispose()
+
+    def test_connections_are_reused(self):
+        for _ in range(5):
+            self.engine.connect().close()
+        metrics = pool_metrics(self.engine)
+        assert metrics['mode'] == 'queue'
+        assert metrics['checkouts'] == 5
+        assert metrics['connects'] == 1
+        assert metrics['checked_out'] == 0
+
+    def test_overflow_and_timeout(self):
+        connections = [self.engine.connect() for _ in range(3)]
+        metrics = pool_metrics(self.engine)
+        assert metrics['checked_out'] == 3
+        assert metrics['overflow'] == 1
+        with pytest.raises(PoolTimeoutError):
+            self.engine.connect()
+        assert pool_metrics(self.engine)['timeouts'] == 1
+        for connection in connections:
+            connection.close()
+
+
+class TestNullPoolMetrics:
+    """Null mode opens a connection per checkout."""
+
+    def test_connect_per_checkout(self):
+        engine = create_engine("sqlite://", poolclass=TimedNullPool)
+        engine.connect().close()
+        engine.connect().close()
+        metrics = pool_metrics(engine)
+        assert metrics['mode'] == 'null'
+        assert metrics['connects'] == 2
+        assert 'checked_out' not in metrics
+
+
+class TestPoolMode:
+    """DB_POOL_MODE selection."""
+
+    def test_uninitialized_shared_engine(self, monkeypatch):
+        monkeypatch.setattr(postgres_connection, '_engine', None)
+        assert pool_metrics() == {'initialized': False}
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            postgres_connection._create_engine("postgresql://localhost/db", pool_mode="session")
@@ -0,0 +1,177 @@
+"""
+Tests for persisted streak state in LearningVelocityService.
+
+Pure streak rules are tested directly; the atomic upsert path runs against
+a fake session that returns what the RETURNING clause would.
+"""
+
+import uuid
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+
+from src.services import learning_velocity
+from src.services.learning_velocity import LearningVelocityService, effective_streak, streak_from_dates
+from tests._fakes import FakeResult
+
+
+TODAY = date(2026, 10, 16)
+
+
+class TestEffectiveStreak:
+    """A streak survives until a full day is missed."""
+
+    def test_active_today_or_yesterday(self):
+        assert effective_streak(5, TODAY, TODAY) == 5
+        assert effective_streak(5, TODAY - timedelta(days=1), TODAY) == 5
+
+    def test_missed_day_resets(self):
+        assert effective_streak(5, TODAY - timedelta(days=2), TODAY) == 0
+        assert effective_streak(5, None, TODAY) == 0
+
+
+class TestStreakFromDates:
+    """Scan fallback follows the same rule as the persisted state."""
+
+    def test_consecutive_days(self):
+        dates = [TODAY - timedelta(days=i) for i in (2, 0, 1, 5)]
+        assert streak_from_dates(dates, TODAY) == 3
+
+    def test_run_ending_yesterday_is_alive(self):
+        dates = [TODAY - timedelta(days=i) for i in (1, 2)]
+        assert streak_from_dates(dates, TODAY) == 2
+
+    def test_stale_run(self):
+        assert streak_from_dates([TODAY - timedelta(days=3)], TODAY) == 0
+        assert streak_from_dates([], TODAY) == 0
+
+
+class _Row(tuple):
+    pass
+
+
+class _StreakSession:
+    """Answers the streak upsert with a canned (current_streak, previous_active_date)."""
+
+    def __init__(self, returning):
+        self.returning = returning
+        self.executed = []
+
+    @contextmanager
+    def begin_nested(self):
+        yield
+
+    def execute(self, statement, params=None):
+        self.executed.append((str(statement), params))
+        return FakeResult([self.returning] if self.returning else [], scalar=True)
+
+
+@pytest.fixture
+def ready(monkeypatch):
+    monkeypatch.setattr(learning_velocity, '_streak_table_ready', True)
+
+
+class TestRecordActivity:
+    """record_activity_and_check_streak with persisted state."""
+
+    def test_first_activity_today_extends(self, ready):
+        session = _StreakSession((7, date.today() - timedelta(days=1)))
+        streak, extended, multiplier = LearningVelocityService(session).record_activity_and_check_streak(
+            uuid.uuid4(), uuid.uuid4()
+        )
+        assert (streak, extended, multiplier) == (7, True, 2.0)
+        sql, params = session.executed[-1]
+        assert 'ON CONFLICT (learner_id) DO UPDATE' in sql
+        assert params['yesterday'] == params['today'] - timedelta(days=1)
+
+    def test_repeat_activity_today_does_not_extend(self, ready):
+        session = _StreakSession((3, date.today()))
+        streak, extended, _ = LearningVelocityService(session).record_activity_and_check_streak(
+            uuid.uuid4(), uuid.uuid4()
+        )
+        assert (streak, extended) == (3, False)
+
+    def test_new_learner(self, ready):
+        session = _StreakSession((1, None))
+        streak, extended, multiplier = LearningVelocityService(session).record_activity_and_check_streak(
+            uuid.uuid4(), uuid.uuid4()
+        )
+        assert (streak, extended, multiplier) == (1, True, 1.0)
+
+
+class _MineSession:
+    """Session for the /mine forging paths: nothing exists yet, commits are counted."""
+
+    def __init__(self):
+        self.commits = 0
+
+    def execute(self, statement, params=None):
+        return FakeResult([])
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def refresh(self, instance):
+        pass
+
+
+@pytest.fixture
+def streak_calls(monkeypatch):
+    calls = []
+
+    def record(self, user_id, learner_id=None):
+        calls.append((user_id, learner_id))
+        return 1, True, 1.0
+    monkeypatch.setattr(LearningVelocityService, 'record_activity_and_check_streak', record)
+    return calls
+
+
+class TestMineActivity:
+    """Forging blocks through /mine advances the learner's streak."""
+
+    def test_start_forging(self, monkeypatch, streak_calls):
+        import asyncio
+        from types import SimpleNamespace
+        from src.api import mine as mine_api
+
+        user_id, learner_id = uuid.uuid4(), uuid.uuid4()
+        monkeypatch.setattr(mine_api, '_get_learner_id_for_user', lambda db, uid: learner_id)
+        monkeypatch.setattr(
+            mine_api, 'create_learning_progress',
+            lambda **kwargs: SimpleNamespace(id=11, status='pending', learner_id=kwargs['learner_id']),
+        )
+        monkeypatch.setattr(mine_api, 'create_verification_schedule', lambda **kwargs: SimpleNamespace(id=12))
+
+        session = _MineSession()
+        response = asyncio.run(mine_api.start_forging('apple.n.01', None, user_id, session))
+        assert response.delta_discovered == 1
+        assert streak_calls == [(user_id, learner_id)]
+        assert session.commits == 1
+
+    def test_process_mining_batch(self, monkeypatch, streak_calls):
+        from types import SimpleNamespace
+        from src.database.postgres_crud import points, progress
+        from src.services.mine import MineService
+
+        user_id, learner_id = uuid.uuid4(), uuid.uuid4()
+        created = []
+        monkeypatch.setattr(progress, '_get_learner_id_for_user', lambda db, uid: learner_id)
+        monkeypatch.setattr(
+            progress, 'get_learning_progress_by_learning_point',
+            lambda db, uid, sense_id, tier: sense_id == 'bank.n.01',
+        )
+        monkeypatch.setattr(progress, 'create_learning_progress', lambda db, **kwargs: created.append(kwargs))
+        account = SimpleNamespace(total_earned=0, available_points=0, locked_points=0, withdrawn_points=0)
+        monkeypatch.setattr(points, 'get_points_account_by_user', lambda db, uid: account)
+        monkeypatch.setattr(points, 'create_points_transaction', lambda db, **kwargs: None)
+
+        service = MineService(_MineSession(), neo4j=object())
+        result = service.process_mining_batch(user_id, ['apple.n.01', 'bank.n.01'])
+        assert result['mined_count'] == 1
+        assert result['new_wallet_balance']['total_earned'] == 10
+        assert created[0]['learner_id'] == learner_id
+        assert streak_calls == [(user_id, learner_id)]
@@ -0,0 +1,121 @@
+"""
+Tests for LexiSurveyEngine question generation from the VocabularyStore.
+
+A small fake store (backed by the real RankIndex) replaces the singleton,
+and the engine has no Neo4j connection, so any graph access would fail.
+"""
+
+import pytest
+
+from src.services.vocabulary_indexes import RankIndex
+from src.survey import lexisurvey_engine
+from src.survey.lexisurvey_engine import LexiSurveyEngine
+from src.survey.models import SurveyState
+
+
+def _sense(sense_id, word, rank, confused=()):
+    return {
+        'id': sense_id,
+        'word': word,
+        'pos': sense_id.split('.')[1],
+        'frequency_rank': rank,
+        'definition_zh': f'{sense_id} 定義',
+        'definition_en': f'{sense_id} definition',
+        'example_en': f'An example of {word}.',
+        'connections': {'confused': [{'sense_id': c, 'reason': 'sound'} for c in confused]},
+    }
+
+
+class _FakeStore:
+    """The VocabularyStore methods the engine uses."""
+
+    is_loaded = True
+
+    def __init__(self, senses):
+        self._senses = {s['id']: s for s in senses}
+        self._rank_index = RankIndex(
+            (s['frequency_rank'], s['id'], s['word'], s['pos']) for s in senses
+        )
+
+    def get_sense(self, sense_id):
+        return self._senses.get(sense_id)
+
+    def get_sense_ids_for_word(self, word):
+        return [sid for sid in self._senses if sid.split('.')[0] == word]
+
+    def get_confused_senses(self, sense_id):
+        refs = self._senses[sense_id]['connections']['confused']
+        return [
+            {'sense_id': ref['sense_id'], 'word': self._senses[ref['sense_id']]['word']}
+            for ref in refs if ref['sense_id'] in self._senses
+        ]
+
+    def get_senses_by_rank_range(self, min_rank, max_rank, exclude_words=None, limit=100, **kwargs):
+        ids = self._rank_index.sample_ids(min_rank, max_rank, limit, exclude_words=exclude_words)
+        return [self._senses[sid] for sid in ids]
+
+
+def _vocabulary():
+    senses = [
+        _sense('adopt.v.01', 'adopt', 2000, confused=('adapt.v.01', 'adept.a.01')),
+        _sense('adopt.v.02', 'adopt', 2000),
+        _sense('adapt.v.01', 'adapt', 2150),
+        _sense('adept.a.01', 'adept', 4100),
+        _sense('to.x.01', 'to', 1990),
+    ]
+    senses += [_sense(f'filler{i}.n.01', f'filler{i}', 1900 + i * 10) for i in range(20)]
+    return senses
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(lexisurvey_engine, 'vocabulary_store', _FakeStore(_vocabulary()))
+    monkeypatch.setattr(lexisurvey_engine, 'VOCABULARY_STORE_AVAILABLE', True)
+    monkeypatch.setattr(lexisurvey_engine, 'get_embedding_matrix', lambda: None)
+    return LexiSurveyEngine(conn=None, use_vocabulary_store=True)
+
+
+class TestTargetPick:
+    """Rank-indexed target selection."""
+
+    def test_target_near_rank_and_filtered(self, engine):
+        for _ in range(20):
+            word, rank, sense_id = engine._pick_target_from_store(2000, [])
+            assert len(word) >= 3
+            assert 1950 <= rank <= 2050
+            assert sense_id
+
+    def test_recent_words_excluded(self, engine):
+        recent = ['adopt'] + [f'filler{i}' for i in range(20)]
+        word, rank, _ = engine._pick_target_from_store(2000, recent)
+        assert word == 'adapt'  # Only reachable after widening the radius
+        assert rank == 2150
+
+    def test_fallback_when_nothing_in_range(self, engine):
+        assert engine._pick_target_from_store(7500, []) == ('example', 7500, None)
+
+
+class TestOptions:
+    """Targets, confused-with traps and fillers without Neo4j."""
+
+    def test_traps_from_confused_connections(self, engine):
+        traps = engine._store_traps('adopt', ['adopt.v.01', 'adopt.v.02'])
+        assert [t['sense_id'] for t in traps] == ['adapt.v.01', 'adept.a.01']
+        assert traps[0]['word_name'] == 'adapt'
+
+    def test_question_payload(self, engine, monkeypatch):
+        monkeypatch.setattr(engine, '_pick_target_from_store', lambda rank, excluded: ('adopt', 2000, 'adopt.v.01'))
+        state = SurveyState(session_id='s1', current_rank=1500)
+        payload = engine._generate_question_payload(2000, state)
+
+        assert payload.word == 'adopt'
+        assert len(payload.options) == 6
+        assert payload.options[-1].type == 'unknown'
+        by_type = {}
+        for option in payload.options:
+            by_type.setdefault(option.type, []).append(option)
+        assert {o.text for o in by_type['target']} == {'adopt.v.01 定義', 'adopt.v.02 定義'}
+        assert len(by_type['trap']) == 2
+        assert all(o.text.startswith('filler') for o in by_type['filler'])
+        assert payload._option_metadata['target_adopt_0']['is_primary_sense']
+        assert state.current_rank == 2000
@@ -0,0 +1,120 @@
+"""
+Tests for VocabularyStore secondary indexes.
+"""
+
+import random
+
+from src.services.vocabulary_indexes import RankIndex, TrapPoolIndex, random_positions
+
+
+def _entries(n=200):
+    """(rank, sense_id, word, pos) with alternating POS and one unranked sense."""
+    entries = []
+    for i in range(1, n + 1):
+        pos = 'n' if i % 2 else 'v'
+        entries.append((i * 10, f'w{i}.{pos}.01', f'w{i}', pos))
+    entries.append((None, 'unranked.n.01', 'unranked', 'n'))
+    random.Random(7).shuffle(entries)
+    return entries
+
+
+class TestRandomPositions:
+    """Tests for the random position generator."""
+
+    def test_small_range_is_permutation(self):
+        assert sorted(random_positions(5, 15, want=10)) == list(range(5, 15))
+
+    def test_large_range_is_permutation(self):
+        assert sorted(random_positions(0, 1000, want=3)) == list(range(1000))
+
+    def test_empty_range(self):
+        assert list(random_positions(10, 10, want=3)) == []
+
+
+class TestRankIndex:
+    """Tests for rank range queries and sampling."""
+
+    def setup_method(self):
+        self.index = RankIndex(_entries())
+
+    def test_unranked_senses_not_indexed(self):
+        assert len(self.index) == 200
+
+    def test_range_ids_in_rank_order(self):
+        assert self.index.range_ids(100, 140) == [
+            'w10.v.01', 'w11.n.01', 'w12.v.01', 'w13.n.01', 'w14.v.01'
+        ]
+
+    def test_count_with_pos(self):
+        assert self.index.count(10, 2000) == 200
+        assert self.index.count(10, 2000, pos='n') == 100
+        assert self.index.count(10, 2000, pos='x') == 0
+        assert self.index.count(3000, 4000) == 0
+
+    def test_deterministic_sample_matches_linear_scan(self):
+        ids = self.index.sample_ids(500, 1500, k=5, pos='v', randomize=False)
+        assert ids == ['w50.v.01', 'w52.v.01', 'w54.v.01', 'w56.v.01', 'w58.v.01']
+
+    def test_random_sample_stays_in_range(self):
+        ids = self.index.sample_ids(500, 1500, k=20, pos='n')
+        assert len(ids) == 20
+        assert len(set(ids)) == 20
+        for sense_id in ids:
+            rank = int(sense_id.split('.')[0][1:]) * 10
+            assert 500 <= rank <= 1500
+            assert '.n.' in sense_id
+
+    def test_random_sample_is_not_first_n(self):
+        seen = set()
+        for _ in range(20):
+            seen.update(self.index.sample_ids(10, 2000, k=5))
+        assert len(seen) > 5
+
+    def test_exclude_words(self):
+        ids = self.index.sample_ids(100, 130, k=10, exclude_words={'w11', 'w12'})
+        assert sorted(ids) == ['w10.v.01', 'w13.n.01']
+
+    def test_limit_larger_than_range(self):
+        assert len(self.index.sample_ids(10, 50, k=100)) == 5
+
+
+class TestTrapPoolIndex:
+    """Tests for (band, POS) trap pools."""
+
+    def setup_method(self):
+        self.pools = TrapPoolIndex({
+            1000: [('a.n.01', 'a', 'n'), ('a.v.01', 'a', 'v'), ('b.n.01', 'b', 'n')],
+            2000: [('c.n.01', 'c', 'n'), ('d.v.01', 'd', 'v'), ('e.n.01', 'e', 'n')],
+            3000: [('f.n.01', 'f', 'n')],
+            9999: [('g.r.01', 'g', 'r')],
+        })
+
+    def test_pool_sizes(self):
+        assert self.pools.pool_size(1000) == 3
+        assert self.pools.pool_size(1000, 'n') == 2
+        assert self.pools.pool_size(2000, 'r') == 0
+
+    def test_bands_near(self):
+        assert self.pools.bands_near(1500, 500) == [1000, 2000]
+        assert self.pools.bands_near(2500, 400) == [3000]
+        assert self.pools.bands_near(9500, 500) == [9999]
+
+    def test_sample_excludes_target_word(self):
+        for _ in range(20):
+            traps = self.pools.sample([1000, 2000], k=3, exclude_word='a')
+            assert len(traps) == 3
+            assert not any(t.startswith('a.') for t in traps)
+
+    def test_sample_respects_pos(self):
+        traps = self.pools.sample(self.pools.bands, k=10, pos='n', exclude_word='c')
+        assert sorted(traps) == ['a.n.01', 'b.n.01', 'e.n.01', 'f.n.01']
+
+    def test_sample_covers_all_bands(self):
+        seen = set()
+        for _ in range(200):
+            seen.update(self.pools.sample(self.pools.bands, k=1))
+        assert len(seen) == 8
+
+    def test_sample_unknown_pool(self):
+        assert self.pools.sample([1000], k=3, pos='x') == []
+        assert self.pools.sample([5000], k=3) == []
@@ -0,0 +1,122 @@
+"""
+Tests for frequency band coverage in VocabularySizeService.
+
+Learning progress rows come from a fake session and ranks from a stubbed
+VocabularyStore lookup, so bucketing is checked without a database.
+"""
+
+import uuid
+
+import pytest
+
+from src.services import vocabulary_size
+from src.services.vocabulary_size import VocabularySizeService, count_by_owner
+from tests._fakes import FakeResult
+
+
+RANKS = {
+    'the.x.01': 1,
+    'apple.n.01': 950,
+    'bank.n.01': 1500,
+    'accept.v.01': 4500,
+    'quixotic.s.01': 12000,
+}
+
+
+class _ProgressSession:
+    """Returns verified (user_id, learning_point_id) rows for the requested users."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    def execute(self, statement, params=None):
+        self.queries += 1
+        wanted = set(params['user_ids']) if 'user_ids' in params else {str(params['user_id'])}
+        rows = [row for row in self.rows if row[0] in wanted]
+        if 'COUNT(*)' in str(statement):
+            return FakeResult(scalar=len(rows))
+        return FakeResult(rows=rows)
+
+
+@pytest.fixture(autouse=True)
+def stub_ranks(monkeypatch):
+    def get_frequency_ranks(ids):
+        import numpy as np
+        return np.asarray([RANKS.get(i, 0) for i in ids], dtype=np.int32)
+    monkeypatch.setattr(vocabulary_size.vocabulary_store, 'get_frequency_ranks', get_frequency_ranks)
+
+
+class TestCountByOwner:
+    """Vectorised and fallback bucketing agree."""
+
+    @pytest.mark.parametrize('has_numpy', [True, False])
+    def test_counts(self, monkeypatch, has_numpy):
+        monkeypatch.setattr(vocabulary_size, 'HAS_NUMPY', has_numpy)
+        owners = [0, 0, 1, 2, 2, 2]
+        ranks = [5, 0, 1000, 1001, 2000, 50]
+        assert count_by_owner(owners, 4) == [2, 1, 3, 0]
+        assert count_by_owner(owners, 4, ranks, 1, 1000) == [1, 1, 1, 0]
+        assert count_by_owner(owners, 4, ranks, 1001, 2000) == [0, 0, 2, 0]
+        # Unranked rows never fall in a band, even one starting at 0
+        assert count_by_owner(owners, 4, ranks, 0, 10) == [1, 0, 0, 0]
+
+
+class TestBandCoverage:
+    """Coverage from verified learning points."""
+
+    def setup_method(self):
+        self.alice, self.bob, self.carol = (str(uuid.uuid4()) for _ in range(3))
+        self.session = _ProgressSession([
+            (self.alice, 'the.x.01'),
+            (self.alice, 'apple.n.01'),
+            (self.alice, 'bank.n.01'),
+            (self.alice, 'unknown.n.01'),
+            (self.bob, 'accept.v.01'),
+            (self.bob, 'quixotic.s.01'),
+        ])
+        self.service = VocabularySizeService(self.session)
+
+    def test_single_user(self):
+        coverage = self.service.get_frequency_band_coverage(self.alice)
+        assert coverage == {'total': 4, '1K': 2, '2K': 1, '3K': 0, '4K': 0, '5K': 0, '6K+': 0}
+
+    def test_many_users_one_query(self):
+        coverage = self.service.get_frequency_band_coverage_for_users([self.alice, self.bob, self.carol])
+        assert self.session.queries == 1
+        assert coverage[self.bob]['5K'] == 1
+        assert coverage[self.bob]['6K+'] == 1
+        assert coverage[self.carol] == {'total': 0, '1K': 0, '2K': 0, '3K': 0, '4K': 0, '5K': 0, '6K+': 0}
+
+    def test_custom_bands(self):
+        coverage = self.service.get_frequency_band_coverage(self.alice, {'core': (1, 2000)})
+        assert coverage == {'total': 4, 'core': 3}
+
+    def test_vocabulary_size_counts(self):
+        assert self.service.calculate_vocabulary_size(self.bob) == 2
+
+    def test_index_suffixed_ids_are_ranked(self, monkeypatch):
+        """'call.v.01_99'-style IDs fall in the band of their sense (store lookup unstubbed)."""
+        from src.services.vocabulary_store import VocabularyStore
+        store = vocabulary_size.vocabulary_store
+        monkeypatch.setattr(store, 'get_frequency_ranks', lambda ids: VocabularyStore.get_frequency_ranks(store, ids))
+        monkeypatch.setattr(store, '_get_rank_lookup', lambda: RANKS)
+        dave = str(uuid.uuid4())
+        service = VocabularySizeService(_ProgressSession([(dave, 'apple.n.01_3'), (dave, 'accept.v.01_12')]))
+        coverage = service.get_frequency_band_coverage(dave)
+        assert coverage == {'total': 2, '1K': 1, '2K': 0, '3K': 0, '4K': 0, '5K': 1, '6K+': 0}
+
+
+class TestStoreRankLookup:
+    """VocabularyStore.get_frequency_ranks resolves sense IDs and bare words (unstubbed)."""
+
+    def test_sense_ids_and_words(self, monkeypatch):
+        from src.services.vocabulary_store import VocabularyStore
+        store = VocabularyStore()
+        entries = [(120, 'bank.n.01', 'bank', 'n'), (3400, 'bank.v.01', 'bank', 'v'), (None, 'zzz.n.01', 'zzz', 'n')]
+        monkeypatch.setattr(store, '_iter_index_entries', lambda: iter(entries))
+        monkeypatch.setattr(store, '_rank_lookup', None)
+        ranks = VocabularyStore.get_frequency_ranks(
+            store, ['bank.v.01', 'Bank', 'zzz.n.01', 'missing', 'bank.v.01_99']
+        )
+        assert list(ranks) == [3400, 120, 0, 0, 3400]
@@ -0,0 +1,176 @@
+"""
+Tests for the memory-mapped vocabulary snapshot format.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.vocabulary_indexes import RankIndex, TrapPoolIndex
+from src.services.vocabulary_store import VocabularyStore
+from src.services.vocabulary_snapshot import (
+    SnapshotError,
+    VocabularySnapshot,
+    band_for_rank,
+    build_snapshot,
+)
+
+
+def _sense(sense_id, word, pos, rank, confused=None):
+    return {
+        'id': sense_id,
+        'word': word,
+        'pos': pos,
+        'frequency_rank': rank,
+        'definition_en': f'definition of {word}',
+        'definition_zh': '定義',
+        'connections': {'related': [], 'opposite': [], 'confused': confused or []},
+        'other_senses': [],
+        'network': {'hop_1_count': 1, 'total_xp': 120},
+    }
+
+
+@pytest.fixture
+def v3_data():
+    senses = {
+        'bank.n.01': _sense('bank.n.01', 'bank', 'n', 850),
+        'bank.v.01': _sense('bank.v.01', 'bank', 'v', 850),
+        'were.v.01': _sense('were.v.01', 'were', 'v', 12),
+        'accept.v.01': _sense('accept.v.01', 'accept', 'v', 1500,
+                              confused=[{'sense_id': 'except.r.01', 'reason': 'spelling'}]),
+        'except.r.01': _sense('except.r.01', 'except', 'r', 1400),
+        'zebra.n.01': _sense('zebra.n.01', 'zebra', 'n', None),
+    }
+    return {
+        'version': '3.0',
+        'exportedAt': '2025-01-01T00:00:00',
+        'stats': {'senses': len(senses)},
+        'senses': senses,
+        'indices': {
+            'byWord': {'bank': ['bank.n.01', 'bank.v.01'], 'were': ['were.v.01']},
+            'byBand': {
+                '1000': ['bank.n.01', 'bank.v.01', 'were.v.01'],
+                '2000': ['accept.v.01', 'except.r.01'],
+                '9999': ['zebra.n.01'],
+            },
+            'byPos': {
+                'n': ['bank.n.01', 'zebra.n.01'],
+                'v': ['bank.v.01', 'were.v.01', 'accept.v.01'],
+                'r': ['except.r.01'],
+            },
+        },
+    }
+
+
+@pytest.fixture
+def snapshot(v3_data, tmp_path):
+    path = tmp_path / 'vocabulary.snapshot'
+    build_snapshot(v3_data, path)
+    snap = VocabularySnapshot.open(path)
+    yield snap
+    snap.close()
+
+
+class TestVocabularySnapshot:
+    """Round-trip tests for build_snapshot / VocabularySnapshot."""
+
+    def test_senses_round_trip(self, v3_data, snapshot):
+        assert len(snapshot.senses) == len(v3_data['senses'])
+        for sense_id, sense in v3_data['senses'].items():
+            assert snapshot.senses[sense_id] == sense
+
+    def test_sense_iteration_preserves_json_order(self, v3_data, snapshot):
+        assert list(snapshot.senses) == list(v3_data['senses'])
+
+    def test_missing_sense(self, snapshot):
+        assert 'missing.n.01' not in snapshot.senses
+        assert snapshot.senses.get('missing.n.01') is None
+        with pytest.raises(KeyError):
+            snapshot.senses['missing.n.01']
+
+    def test_by_word_is_lemma_based(self, snapshot):
+        assert snapshot.by_word['bank'] == ['bank.n.01', 'bank.v.01']
+        assert snapshot.by_word.get('were') == ['were.v.01']
+        assert snapshot.by_word.get('nothing', []) == []
+
+    def test_band_and_pos_indices(self, v3_data, snapshot):
+        assert list(snapshot.by_band) == [1000, 2000, 9999]
+        for band, ids in v3_data['indices']['byBand'].items():
+            assert snapshot.by_band[int(band)] == ids
+        for pos, ids in v3_data['indices']['byPos'].items():
+            assert snapshot.by_pos[pos] == ids
+
+    def test_record_columns(self, snapshot):
+        record = snapshot.find_record('accept.v.01')
+        assert record is not None
+        assert snapshot.word_at(record) == 'accept'
+        assert snapshot.rank_at(record) == 1500
+        assert snapshot.band_at(record) == 2000
+        assert snapshot.pos_at(record) == 'v'
+        assert snapshot.rank_at(snapshot.find_record('zebra.n.01')) is None
+
+    def test_band_for_rank(self):
+        assert band_for_rank(1) == 1000
+        assert band_for_rank(1000) == 1000
+        assert band_for_rank(1001) == 2000
+        assert band_for_rank(8500) == 9999
+        assert band_for_rank(None) == 9999
+
+    def test_rejects_v2_data(self, tmp_path):
+        with pytest.raises(SnapshotError):
+            build_snapshot({'version': '2.0', 'senses': {}}, tmp_path / 'v2.snapshot')
+
+    def test_rejects_non_snapshot_file(self, tmp_path):
+        path = tmp_path / 'bogus.snapshot'
+        path.write_bytes(b'not a snapshot at all')
+        with pytest.raises(SnapshotError):
+            VocabularySnapshot.open(path)
+
+
+class TestMappedIndexes:
+    """Precomputed rank/trap-pool arrays match the indexes built from JSON."""
+
+    @pytest.fixture
+    def mapped(self, snapshot):
+        store = SimpleNamespace(_snapshot=snapshot)
+        VocabularyStore._map_snapshot_indices(store)
+        return store
+
+    @pytest.fixture
+    def built(self, v3_data):
+        senses = v3_data['senses']
+        rank_index = RankIndex(
+            (s['frequency_rank'], sid, s['word'], s['pos']) for sid, s in senses.items()
+        )
+        trap_pools = TrapPoolIndex({
+            int(band): [(sid, senses[sid]['word'], senses[sid]['pos']) for sid in ids]
+            for band, ids in v3_data['indices']['byBand'].items()
+        })
+        return SimpleNamespace(_rank_index=rank_index, _trap_pools=trap_pools)
+
+    def test_rank_ranges(self, mapped, built):
+        for pos in (None, 'n', 'v', 'r', 'x'):
+            for lo, hi in ((0, 10000), (12, 850), (851, 1499), (1400, 1500)):
+                assert mapped._rank_index.range_ids(lo, hi, pos) == built._rank_index.range_ids(lo, hi, pos)
+                assert mapped._rank_index.count(lo, hi, pos) == built._rank_index.count(lo, hi, pos)
+        assert len(mapped._rank_index) == len(built._rank_index) == 5
+
+    def test_rank_sample_excludes_words(self, mapped):
+        sample = mapped._rank_index.sample_ids(0, 2000, k=10, exclude_words={'bank'})
+        assert sorted(sample) == ['accept.v.01', 'except.r.01', 'were.v.01']
+
+    def test_trap_pools(self, mapped, built):
+        assert mapped._trap_pools.bands == built._trap_pools.bands == [1000, 2000, 9999]
+        for band in (1000, 2000, 9999):
+            for pos in (None, 'n', 'v', 'r'):
+                assert mapped._trap_pools.pool_size(band, pos) == built._trap_pools.pool_size(band, pos)
+        traps = mapped._trap_pools.sample([1000], k=5, pos='v', exclude_word='bank')
+        assert traps == ['were.v.01']
+
+    def test_close_releases_columns(self, v3_data, tmp_path):
+        path = tmp_path / 'closing.snapshot'
+        build_snapshot(v3_data, path)
+        snap = VocabularySnapshot.open(path)
+        columns = snap.rank_columns()
+        assert list(columns[None][0]) == [12, 850, 850, 1400, 1500]
+        snap.close()  # Must not fail with exported buffers
@@ -0,0 +1,134 @@
+"""
+Tests for the single-statement XP award path (LevelService.add_xp_batch).
+
+A fake session plays the role of Postgres: the award statement returns the
+rows RETURNING would produce, so the tests check that one statement carries
+the upsert and history insert, and how levels are derived from the totals.
+"""
+
+import uuid
+from contextlib import contextmanager
+
+import pytest
+
+from src.services import levels
+from src.services.level_curve import level_for_xp
+from src.services.levels import LevelService
+from tests._fakes import FakeResult
+
+
+class _AwardSession:
+    """Applies awards to in-memory totals, mimicking the upsert's RETURNING."""
+
+    def __init__(self, totals, users=None):
+        self.totals = totals
+        self.users = users or {}
+        self.executed = []
+        self.commits = 0
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.executed.append((sql, params))
+        if 'INSERT INTO user_xp' in sql:
+            rows = []
+            for learner_id, amount in zip(params['learner_ids'], params['amounts']):
+                if learner_id not in self.totals:
+                    continue  # No learner profile: the JOIN drops it
+                self.totals[learner_id] += amount
+                rows.append((learner_id, self.users.get(learner_id), self.totals[learner_id]))
+            return FakeResult(rows)
+        if 'FROM level_unlocks' in sql:
+            return FakeResult([('unlock', 'feature', 'Unlock', None, None, None, None)])
+        return FakeResult([])
+
+    @contextmanager
+    def begin_nested(self):
+        yield
+
+    def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture(autouse=True)
+def isolated_leaderboard_store(monkeypatch):
+    applied = []
+    monkeypatch.setattr(levels.leaderboard_store, 'record_xp_batch', lambda db, rows: None)
+    monkeypatch.setattr(levels.leaderboard_store, 'apply_xp', lambda *args: applied.append(args))
+    return applied
+
+
+class TestAddXp:
+    """One award is one upsert-with-history statement."""
+
+    def setup_method(self):
+        self.learner = str(uuid.uuid4())
+        self.user = str(uuid.uuid4())
+        self.session = _AwardSession({self.learner: 90}, {self.learner: self.user})
+
+    def test_single_statement_upsert_and_history(self):
+        result = LevelService(self.session).add_xp(self.learner, 20, 'review')
+        award_sql, params = self.session.executed[0]
+        assert 'total_xp = user_xp.total_xp + EXCLUDED.total_xp' in award_sql
+        assert 'calculate_level' not in award_sql
+        assert 'INSERT INTO xp_history' in award_sql
+        assert 'RETURNING' in award_sql
+        assert params['history_sources'] == ['review']
+        assert result['old_xp'] == 90
+        assert result['new_xp'] == 110
+        assert result['level_up'] is True
+        assert result['new_unlocks'][0]['unlocked_at_level'] == 2
+        assert self.session.commits == 1
+
+    def test_level_columns_from_curve(self):
+        LevelService(self.session).add_xp(self.learner, 200, 'review')
+        level_sql, params = self.session.executed[1]
+        info = level_for_xp(290)
+        assert 'UPDATE user_xp u SET' in level_sql
+        assert params['learner_ids'] == [self.learner]
+        assert params['levels'] == [info['level']]
+        assert params['xp_to_next'] == [info['xp_to_next']]
+        assert params['xp_in_level'] == [info['xp_in_level']]
+
+    def test_leaderboard_sync_is_batched(self, isolated_leaderboard_store):
+        LevelService(self.session).add_xp(self.learner, 5, 'review')
+        sync_sql, params = self.session.executed[2]
+        assert 'update_leaderboard_entry' in sync_sql
+        assert params['user_ids'] == [self.user]
+        assert isolated_leaderboard_store == [(self.learner, 5, 95)]
+
+    def test_unknown_learner(self):
+        with pytest.raises(ValueError):
+            LevelService(self.session).add_xp(uuid.uuid4(), 10, 'review')
+
+
+class TestAddXpBatch:
+    """Many learners (and repeated learners) in one call."""
+
+    def test_amounts_summed_history_kept_per_award(self):
+        a, b = str(uuid.uuid4()), str(uuid.uuid4())
+        session = _AwardSession({a: 0, b: 240})
+        results = LevelService(session).add_xp_batch([
+            (a, 15, 'word_learned', None),
+            (b, 10, 'review', None),
+            (a, 50, 'goal', uuid.uuid4()),
+        ])
+        award_sql, params = session.executed[0]
+        assert params['learner_ids'] == [a, b]
+        assert params['amounts'] == [65, 10]
+        assert params['history_amounts'] == [15, 10, 50]
+        assert params['history_source_ids'][0] is None
+        assert results[a]['new_xp'] == 65
+        assert results[b]['new_level'] == 3
+        assert results[b]['old_level'] == 2
+
+    def test_no_commit_defers_board_update(self, isolated_leaderboard_store):
+        learner = str(uuid.uuid4())
+        session = _AwardSession({learner: 0})
+        LevelService(session).add_xp_batch([(learner, 5, 'review', None)], commit=False)
+        assert session.commits == 0
+        assert isolated_leaderboard_store == []
+
+    def test_empty_batch_runs_no_queries(self):
+        session = _AwardSession({})
+        assert LevelService(session).add_xp_batch([]) == {}
+        assert session.executed == []